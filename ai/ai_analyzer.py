@@ -8,27 +8,142 @@ import logging
 from typing import Dict, List, Any, Optional
 from openai import AsyncOpenAI
 
+from ai.ai_cache import get_feature_ttl, make_cache_key, get_cached_response, save_cached_response
+
 logger = logging.getLogger(__name__)
 
 MAX_RETRIES = 3
-RETRY_DELAYS = [3, 6, 12]  
+
+# Глобальный лимит одновременных запросов к API (общий для всех функций AI)
+AI_MAX_CONCURRENCY = int(os.getenv('AI_MAX_CONCURRENCY', '4'))
+BACKOFF_BASE_DELAY = 3
+BACKOFF_MAX_DELAY = 60
+
+_ai_semaphore = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+
+# Общая пауза после 429: пока она не истекла, новые запросы не отправляются
+_backoff_until = 0.0
+_backoff_level = 0
+
+# Запросы, которые выполняются прямо сейчас: ключ кэша -> Future с текстом ответа
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    """Проверяет, является ли ошибка ответом 429 (rate limit)"""
+    return getattr(error, "status_code", None) == 429 or "429" in str(error)
+
+
+def _get_retry_after(error: Exception) -> Optional[float]:
+    """Достает Retry-After из ответа API, если сервер его прислал"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _register_rate_limit(error: Exception) -> float:
+    """Продлевает общую паузу после 429 и возвращает ее длительность"""
+    global _backoff_until, _backoff_level
+    delay = _get_retry_after(error)
+    if delay is None:
+        delay = min(BACKOFF_BASE_DELAY * (2 ** _backoff_level), BACKOFF_MAX_DELAY)
+    _backoff_level += 1
+    now = asyncio.get_running_loop().time()
+    _backoff_until = max(_backoff_until, now + delay)
+    return delay
+
+
+async def _wait_for_backoff() -> None:
+    """Ждет окончания общей паузы после 429"""
+    loop = asyncio.get_running_loop()
+    while True:
+        remaining = _backoff_until - loop.time()
+        if remaining <= 0:
+            return
+        await asyncio.sleep(remaining)
 
 
 async def _call_with_retry(client, **kwargs):
-    """Выполняет запрос к API с повторными попытками при rate limit (429)"""
-    last_error = None
+    """
+    Выполняет запрос к API через глобальный ограничитель параллельности.
+    При rate limit (429) включается общая для всех запросов пауза с экспоненциальным ростом
+    """
+    global _backoff_level
     for attempt in range(MAX_RETRIES + 1):
-        try:
-            return await client.chat.completions.create(**kwargs)
-        except Exception as e:
-            last_error = e
-            if "429" in str(e) and attempt < MAX_RETRIES:
-                delay = RETRY_DELAYS[attempt]
-                logger.info(f"Rate limit (429), waiting {delay}s before retry {attempt + 1}/{MAX_RETRIES}...")
-                await asyncio.sleep(delay)
-            else:
-                raise
-    raise last_error
+        await _wait_for_backoff()
+        async with _ai_semaphore:
+            # Пауза могла начаться, пока запрос ждал свободного слота
+            await _wait_for_backoff()
+            try:
+                response = await client.chat.completions.create(**kwargs)
+                _backoff_level = 0
+                return response
+            except Exception as e:
+                if not _is_rate_limit_error(e) or attempt >= MAX_RETRIES:
+                    raise
+                delay = _register_rate_limit(e)
+                logger.info(f"Rate limit (429), shared backoff {delay:.0f}s before retry {attempt + 1}/{MAX_RETRIES}...")
+
+
+async def _cached_completion(client, feature: Optional[str] = None, **kwargs) -> str:
+    """
+    Возвращает текст ответа модели с учетом кэша.
+
+    Одинаковые запросы, выполняющиеся одновременно, объединяются в один вызов API.
+
+    Args:
+        client: Клиент API
+        feature: Функция AI (определяет TTL кэша, см. ai_cache.FEATURE_TTLS)
+        **kwargs: Аргументы chat.completions.create
+
+    Returns:
+        Текст ответа без пробелов по краям
+    """
+    ttl = get_feature_ttl(feature)
+    cache_key = make_cache_key(kwargs)
+
+    if ttl > 0:
+        cached = await get_cached_response(cache_key)
+        if cached is not None:
+            logger.info(f"AI response for '{feature}' served from cache")
+            return cached
+
+    inflight = _inflight.get(cache_key)
+    while inflight is not None:
+        logger.info(f"AI request for '{feature}' joined an in-flight call")
+        # wait не пробрасывает отмену общего вызова ожидающим (а отмена ожидающего не отменяет вызов)
+        await asyncio.wait([inflight])
+        if not inflight.cancelled():
+            return inflight.result()
+        # Запрос, выполнявший вызов, отменен - выполняем вызов сами (или присоединяемся к новому)
+        inflight = _inflight.get(cache_key)
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[cache_key] = future
+    try:
+        response = await _call_with_retry(client, **kwargs)
+        content = response.choices[0].message.content.strip()
+        if ttl > 0:
+            await save_cached_response(cache_key, feature, kwargs.get("model", ""), content, ttl)
+        future.set_result(content)
+        return content
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(e)
+            # Помечаем исключение как полученное, даже если ожидающих нет
+            future.exception()
+        raise
+    finally:
+        if _inflight.get(cache_key) is future:
+            del _inflight[cache_key]
+
 
 OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
 
@@ -91,8 +206,9 @@ async def analyze_training_statistics(
 
 Пиши как дружелюбный тренер, без сложных терминов. Используй эмодзи для наглядности."""
 
-        response = await _call_with_retry(
+        analysis = await _cached_completion(
             ai_client,
+            feature="training_stats",
             model="google/gemini-2.0-flash-exp:free",
             messages=[
                 {
@@ -108,7 +224,6 @@ async def analyze_training_statistics(
             max_tokens=500
         )
 
-        analysis = response.choices[0].message.content.strip()
         logger.info(f"AI analysis generated successfully for training stats")
         return analysis
 
@@ -173,8 +288,9 @@ async def analyze_health_statistics(
 
 Пиши как дружелюбный врач, без медицинских терминов. Используй эмодзи для наглядности."""
 
-        response = await _call_with_retry(
+        analysis = await _cached_completion(
             ai_client,
+            feature="health_stats",
             model="google/gemini-2.0-flash-exp:free",
             messages=[
                 {
@@ -190,7 +306,6 @@ async def analyze_health_statistics(
             max_tokens=500
         )
 
-        analysis = response.choices[0].message.content.strip()
         logger.info(f"AI analysis generated successfully for health stats")
         return analysis
 
@@ -0,0 +1,152 @@
+"""
+Кэш ответов AI с хранением в SQLite
+
+Ключ кэша строится из нормализованного промпта, модели и параметров запроса,
+поэтому повторное открытие той же статистики не вызывает модель заново.
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import aiosqlite
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
+
+# Время жизни кэша по функциям AI (в секундах). 0 = не кэшировать
+FEATURE_TTLS = {
+    'training_stats': 6 * 3600,
+    'health_stats': 6 * 3600,
+    'training_plan': 24 * 3600,
+    'workout_correction': 24 * 3600,
+    'race_preparation': 12 * 3600,
+    'race_tactics': 24 * 3600,
+    'result_prediction': 12 * 3600,
+    'psychologist': 0,  # Живой диалог не кэшируем
+}
+DEFAULT_TTL = 3600
+
+
+def get_feature_ttl(feature: Optional[str]) -> int:
+    """Возвращает TTL кэша для функции AI"""
+    if feature is None:
+        return 0
+    return FEATURE_TTLS.get(feature, DEFAULT_TTL)
+
+
+def _normalize_text(text: Any) -> str:
+    """Схлопывает пробельные символы, чтобы форматирование промпта не влияло на ключ"""
+    if not isinstance(text, str):
+        return text
+    return " ".join(text.split())
+
+
+def make_cache_key(request: Dict[str, Any]) -> str:
+    """
+    Строит ключ кэша для запроса к модели
+
+    Args:
+        request: Аргументы chat.completions.create (model, messages, temperature, ...)
+
+    Returns:
+        SHA-256 от нормализованного запроса
+    """
+    messages = [
+        {"role": m.get("role"), "content": _normalize_text(m.get("content"))}
+        for m in request.get("messages", [])
+    ]
+    params = {k: v for k, v in request.items() if k not in ("model", "messages")}
+    payload = json.dumps(
+        {"model": request.get("model"), "messages": messages, "params": params},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_cached_response(cache_key: str) -> Optional[str]:
+    """
+    Получить ответ из кэша
+
+    Args:
+        cache_key: Ключ кэша
+
+    Returns:
+        Текст ответа или None, если записи нет или она устарела
+    """
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            async with db.execute(
+                "SELECT response FROM ai_response_cache WHERE cache_key = ? AND expires_at > ?",
+                (cache_key, time.time())
+            ) as cursor:
+                row = await cursor.fetchone()
+            if not row:
+                return None
+            await db.execute(
+                "UPDATE ai_response_cache SET hits = hits + 1 WHERE cache_key = ?",
+                (cache_key,)
+            )
+            await db.commit()
+            return row[0]
+    except Exception as e:
+        logger.warning(f"AI cache read failed: {e}")
+        return None
+
+
+async def save_cached_response(
+    cache_key: str,
+    feature: str,
+    model: str,
+    response: str,
+    ttl: int
+) -> None:
+    """
+    Сохранить ответ модели в кэш
+
+    Args:
+        cache_key: Ключ кэша
+        feature: Функция AI
+        model: Модель
+        response: Текст ответа
+        ttl: Время жизни записи в секундах
+    """
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            await db.execute(
+                """
+                INSERT OR REPLACE INTO ai_response_cache
+                (cache_key, feature, model, response, hits, expires_at)
+                VALUES (?, ?, ?, ?, 0, ?)
+                """,
+                (cache_key, feature, model, response, time.time() + ttl)
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"AI cache write failed: {e}")
+
+
+async def cleanup_expired_cache() -> int:
+    """
+    Удалить устаревшие записи кэша
+
+    Returns:
+        Количество удаленных записей
+    """
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            cursor = await db.execute(
+                "DELETE FROM ai_response_cache WHERE expires_at <= ?",
+                (time.time(),)
+            )
+            await db.commit()
+            if cursor.rowcount:
+                logger.info(f"Removed {cursor.rowcount} expired AI cache entries")
+            return cursor.rowcount
+    except Exception as e:
+        logger.warning(f"AI cache cleanup failed: {e}")
+        return 0
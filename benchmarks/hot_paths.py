@@ -0,0 +1,395 @@
+"""
+Бенчмарк горячих путей бота на синтетической базе
+
+Замеряет (на копии базы, чтобы прогоны были сравнимы):
+- add_training_flow - сохранение тренировки и все шаги после него
+  (рейтинг, уровень, недельные цели, достижения), как в обработчике подтверждения
+- training_statistics_week / training_statistics_month - get_training_statistics
+- leaderboard_top / leaderboard_rank - экраны рейтингов
+- notification_tick - один тик notification_scheduler (часть пользователей "к сроку")
+- achievements_check - check_and_award_achievements
+- graph_render - generate_graphs за месяц
+- pdf_export - create_training_pdf за месяц
+- keyboard_render - построение страницы календаря и меню настроек
+  без кэша (build) и из кэша клавиатур (cached)
+
+Результат - JSON для сравнения между коммитами.
+
+Запуск:
+    python -m benchmarks.hot_paths --users 200 --years 2 --seed 42 --output bench.json
+    python -m benchmarks.hot_paths --output new.json --compare bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Dict, Any, List, Callable, Awaitable, Optional
+
+from benchmarks.prediction_benchmark import _percentile
+from benchmarks.synthetic_data import USER_ID_BASE, WEEKDAYS_RU, generate_database
+
+# Доля пользователей, у которых напоминания и отчеты приходятся на минуту тика
+DUE_FRACTION = 0.05
+# Рост p50 больше этого порога при сравнении считается регрессией (%)
+REGRESSION_THRESHOLD = 20.0
+
+
+class RecordingBot:
+    """Бот для бенчмарка: считает отправки вместо обращения к Telegram"""
+
+    def __init__(self):
+        self.sent = 0
+
+    async def _record(self, *args, **kwargs):
+        self.sent += 1
+
+    send_message = _record
+    send_document = _record
+    send_photo = _record
+
+
+def _summary(latencies: List[float]) -> Dict[str, Any]:
+    return {
+        'iterations': len(latencies),
+        'p50_ms': _percentile(latencies, 50),
+        'p95_ms': _percentile(latencies, 95),
+        'mean_ms': round(statistics.mean(latencies), 3) if latencies else None,
+        'min_ms': round(min(latencies), 3) if latencies else None
+    }
+
+
+async def _measure(
+    iterations: int,
+    step: Callable[[int], Awaitable[Optional[Dict[str, float]]]]
+) -> Dict[str, Any]:
+    """
+    Выполнить шаг iterations раз и собрать латентности
+
+    step может вернуть словарь {этап: мс} - тогда в результат попадет разбивка по этапам.
+    """
+    latencies = []
+    stages: Dict[str, List[float]] = {}
+    for iteration in range(iterations):
+        started = time.perf_counter()
+        breakdown = await step(iteration)
+        latencies.append((time.perf_counter() - started) * 1000)
+        for stage, elapsed in (breakdown or {}).items():
+            stages.setdefault(stage, []).append(elapsed)
+
+    result = _summary(latencies)
+    if stages:
+        result['stages'] = {stage: _summary(values) for stage, values in stages.items()}
+    return result
+
+
+async def _timed_stage(breakdown: Dict[str, float], stage: str, coro) -> Any:
+    started = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        breakdown[stage] = (time.perf_counter() - started) * 1000
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+async def _prepare_due_users(db_path: str, user_ids: List[int]) -> None:
+    """Назначить выбранным пользователям напоминания и отчеты на текущую минуту"""
+    import aiosqlite
+    import pytz
+
+    now = datetime.now(pytz.timezone('Europe/Moscow'))
+    current_time = now.strftime('%H:%M')
+    weekday = WEEKDAYS_RU[now.weekday()]
+
+    async with aiosqlite.connect(db_path) as db:
+        await db.executemany(
+            """
+            UPDATE user_settings
+            SET timezone = 'Europe/Moscow',
+                daily_pulse_weight_time = ?,
+                weekly_report_day = ?,
+                weekly_report_time = ?,
+                training_reminders_enabled = 1,
+                training_reminder_days = ?,
+                training_reminder_time = ?
+            WHERE user_id = ?
+            """,
+            [
+                (current_time, weekday, current_time, json.dumps([weekday], ensure_ascii=False), current_time, user_id)
+                for user_id in user_ids
+            ]
+        )
+        await db.commit()
+
+
+async def run_suite(db_path: str, users: int, iterations: int, seed: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Прогнать все бенчмарки на базе db_path
+
+    Args:
+        db_path: Путь к рабочей копии базы (будет изменена)
+        users: Количество пользователей в базе
+        iterations: Повторов каждого бенчмарка
+        seed: Seed выбора пользователей
+
+    Returns:
+        Словарь {бенчмарк: сводка латентностей или {'error': ...}}
+    """
+    os.environ['DB_PATH'] = db_path
+    rng = random.Random(seed)
+    user_ids = [USER_ID_BASE + index for index in range(users)]
+
+    def pick_user() -> int:
+        return rng.choice(user_ids)
+
+    async def add_training_flow(iteration: int) -> Dict[str, float]:
+        from database.queries import add_training
+        from database.level_queries import calculate_and_update_user_level
+        from ratings.rating_updater import update_single_user_rating
+        from ratings.achievements_checker import check_and_award_achievements
+        from utils.goals_checker import check_weekly_goals
+
+        user_id = pick_user()
+        bot = RecordingBot()
+        data = {
+            'user_id': user_id,
+            'training_type': 'кросс',
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'time': '07:30',
+            'duration': 50,
+            'distance': 10.0,
+            'avg_pace': '5:00',
+            'pace_unit': 'мин/км',
+            'avg_pulse': 148,
+            'max_pulse': 171,
+            'fatigue_level': 6
+        }
+        breakdown = {}
+        await _timed_stage(breakdown, 'add_training', add_training(data))
+        await _timed_stage(breakdown, 'rating', update_single_user_rating(user_id))
+        await _timed_stage(breakdown, 'level', calculate_and_update_user_level(user_id))
+        await _timed_stage(breakdown, 'weekly_goals', check_weekly_goals(user_id, bot, 'кросс'))
+        await _timed_stage(breakdown, 'achievements', check_and_award_achievements(user_id, bot))
+        return breakdown
+
+    async def training_statistics_week(iteration: int) -> None:
+        from database.queries import get_training_statistics
+        await get_training_statistics(pick_user(), 'week')
+
+    async def training_statistics_month(iteration: int) -> None:
+        from database.queries import get_training_statistics
+        await get_training_statistics(pick_user(), 'month')
+
+    async def leaderboard_top(iteration: int) -> None:
+        from ratings.leaderboard import get_top
+        for period in ('global', 'week', 'month', 'season'):
+            await get_top(period, 10)
+
+    async def leaderboard_rank(iteration: int) -> None:
+        from ratings.leaderboard import get_rank
+        user_id = pick_user()
+        for period in ('global', 'week', 'month', 'season'):
+            await get_rank(user_id, period)
+
+    async def notification_tick(iteration: int) -> Dict[str, float]:
+        from notifications.notification_scheduler import send_daily_reminders, send_training_reminders
+        # Планировщик запускает отчеты фоновой задачей - здесь пайплайн ожидается целиком
+        from notifications.weekly_reports import send_weekly_reports
+        bot = RecordingBot()
+        breakdown = {}
+        await _timed_stage(breakdown, 'daily_reminders', send_daily_reminders(bot))
+        await _timed_stage(breakdown, 'weekly_reports', send_weekly_reports(bot))
+        await _timed_stage(breakdown, 'training_reminders', send_training_reminders(bot))
+        return breakdown
+
+    async def achievements_check(iteration: int) -> None:
+        from ratings.achievements_checker import check_and_award_achievements
+        await check_and_award_achievements(pick_user(), RecordingBot())
+
+    async def graph_render(iteration: int) -> Dict[str, float]:
+        from database.queries import get_trainings_by_period
+        from bot.graphs import generate_graphs
+        breakdown = {}
+        workouts = await _timed_stage(breakdown, 'load', get_trainings_by_period(pick_user(), 'month'))
+        started = time.perf_counter()
+        generate_graphs(workouts, 'month', 30)
+        breakdown['render'] = (time.perf_counter() - started) * 1000
+        return breakdown
+
+    async def pdf_export(iteration: int) -> Dict[str, float]:
+        from database.queries import get_trainings_by_period, get_training_statistics
+        from bot.pdf_export import create_training_pdf
+        user_id = pick_user()
+        breakdown = {}
+        trainings = await _timed_stage(breakdown, 'load', get_trainings_by_period(user_id, 'month'))
+        stats = await get_training_statistics(user_id, 'month')
+        await _timed_stage(breakdown, 'render', create_training_pdf(trainings, "Месяц", stats, user_id))
+        return breakdown
+
+    async def keyboard_render(iteration: int) -> Dict[str, float]:
+        from bot.calendar_keyboard import CalendarKeyboard
+        from settings.settings_keyboards import get_settings_menu_keyboard
+
+        month = datetime(2020 + iteration // 12 % 10, iteration % 12 + 1, 1)
+        max_date = datetime.now()
+        breakdown = {}
+
+        started = time.perf_counter()
+        CalendarKeyboard._create_days_calendar(month, 'cal', max_date, True, 'cancel')
+        breakdown['calendar_build'] = (time.perf_counter() - started) * 1000
+
+        CalendarKeyboard.create_calendar(1, month, 'cal', max_date=max_date, show_cancel=True)
+        started = time.perf_counter()
+        CalendarKeyboard.create_calendar(1, month, 'cal', max_date=max_date, show_cancel=True)
+        breakdown['calendar_cached'] = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        get_settings_menu_keyboard.__wrapped__(False)
+        breakdown['menu_build'] = (time.perf_counter() - started) * 1000
+
+        get_settings_menu_keyboard(False)
+        started = time.perf_counter()
+        get_settings_menu_keyboard(False)
+        breakdown['menu_cached'] = (time.perf_counter() - started) * 1000
+        return breakdown
+
+    benchmarks = [
+        ('add_training_flow', add_training_flow),
+        ('training_statistics_week', training_statistics_week),
+        ('training_statistics_month', training_statistics_month),
+        ('leaderboard_top', leaderboard_top),
+        ('leaderboard_rank', leaderboard_rank),
+        ('notification_tick', notification_tick),
+        ('achievements_check', achievements_check),
+        ('graph_render', graph_render),
+        ('pdf_export', pdf_export),
+        ('keyboard_render', keyboard_render),
+    ]
+
+    results = {}
+    for name, step in benchmarks:
+        try:
+            if name == 'notification_tick':
+                await _prepare_due_users(db_path, rng.sample(user_ids, max(1, int(users * DUE_FRACTION))))
+            results[name] = await _measure(iterations, step)
+        except Exception as e:
+            # Бенчмарк, которому не хватает окружения (шрифты, aiogram, matplotlib), не прерывает прогон
+            results[name] = {'error': f"{type(e).__name__}: {e}"}
+        print(f"{name}: {json.dumps(results[name], ensure_ascii=False)}", file=sys.stderr)
+
+    return results
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any],
+                    threshold: float = REGRESSION_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Сравнить p50 бенчмарков с базовым прогоном
+
+    Returns:
+        Список {'name', 'baseline_ms', 'current_ms', 'change_percent', 'regression'}
+    """
+    rows = []
+    for name, result in current['results'].items():
+        base = baseline.get('results', {}).get(name, {})
+        if 'p50_ms' not in result or not base.get('p50_ms'):
+            continue
+        change = (result['p50_ms'] - base['p50_ms']) / base['p50_ms'] * 100
+        rows.append({
+            'name': name,
+            'baseline_ms': base['p50_ms'],
+            'current_ms': result['p50_ms'],
+            'change_percent': round(change, 1),
+            'regression': change > threshold
+        })
+    return rows
+
+
+async def run_benchmark(users: int, years: int, seed: int, iterations: int,
+                        source_db: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Подготовить базу (сгенерировать или скопировать) и прогнать бенчмарки
+
+    Returns:
+        Полный отчет: метаданные, сводка по данным и результаты
+    """
+    workdir = tempfile.mkdtemp(prefix='bot-bench-')
+    db_path = os.path.join(workdir, 'bench.sqlite')
+    try:
+        if source_db:
+            shutil.copyfile(source_db, db_path)
+            dataset = {'db_path': source_db}
+        else:
+            dataset = await generate_database(db_path, users, years, seed)
+
+        results = await run_suite(db_path, users, iterations, seed)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'users': users,
+            'years': years,
+            'seed': seed,
+            'iterations': iterations
+        },
+        'dataset': dataset,
+        'results': results
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк горячих путей бота")
+    parser.add_argument('--users', type=int, default=200, help="Количество пользователей")
+    parser.add_argument('--years', type=int, default=2, help="Лет истории тренировок")
+    parser.add_argument('--seed', type=int, default=42, help="Seed генерации и выбора пользователей")
+    parser.add_argument('--iterations', type=int, default=20, help="Повторов каждого бенчмарка")
+    parser.add_argument('--db', help="Готовая база (из benchmarks.synthetic_data) вместо генерации")
+    parser.add_argument('--output', help="Файл для JSON-отчета (по умолчанию stdout)")
+    parser.add_argument('--compare', help="JSON-отчет предыдущего прогона для сравнения")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Порог регрессии p50, %%")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args.users, args.years, args.seed, args.iterations, args.db))
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            report['comparison'] = compare_results(report, json.load(f), args.threshold)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    if any(row['regression'] for row in report.get('comparison', [])):
+        for row in report['comparison']:
+            if row['regression']:
+                print(f"РЕГРЕССИЯ {row['name']}: {row['baseline_ms']} -> {row['current_ms']} мс "
+                      f"({row['change_percent']:+.1f}%)", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
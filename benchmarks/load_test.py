@@ -0,0 +1,425 @@
+"""
+Нагрузочный тест без Telegram: сценарии пользователей через настоящий Dispatcher
+
+Диспетчер собирается так же, как в main.py (create_dispatcher), а Bot работает
+через RecordingSession - локальную замену Bot API, которая принимает
+send/edit/answer и записывает вызовы. Виртуальные пользователи из синтетической
+базы (benchmarks.synthetic_data) проходят многошаговые сценарии: добавление
+тренировки, статистика, соревнования, рейтинги, здоровье, кабинет тренера.
+
+Отчет: обновлений в секунду, p50/p99 обработки обновления и обработчиков,
+задержка event loop, вызовы Bot API, необработанные обновления и ошибки.
+
+Запуск:
+    python -m benchmarks.load_test --users 200 --concurrency 50 --rounds 3 --output load.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, get_args
+
+from benchmarks.prediction_benchmark import _percentile
+from benchmarks.synthetic_data import USER_ID_BASE, generate_database
+
+# Шаг сценария: ('text', текст сообщения) или ('callback', callback_data)
+Step = Tuple[str, str]
+
+LOOP_LAG_INTERVAL = 0.01  # секунды между замерами задержки event loop
+
+# Сценарии и их веса в смеси нагрузки
+JOURNEY_WEIGHTS = {
+    'add_training': 3,
+    'statistics': 3,
+    'competitions': 2,
+    'ratings': 2,
+    'health': 1,
+    'coach': 1,
+}
+
+
+def build_journey(name: str, user: Dict[str, Any]) -> List[Step]:
+    """
+    Шаги сценария для пользователя
+
+    Args:
+        name: Название сценария (ключ JOURNEY_WEIGHTS)
+        user: {'id', 'students'} - у тренеров список учеников
+    """
+    if name == 'add_training':
+        return [
+            ('text', "➕ Добавить тренировку"),
+            ('callback', "training_type:кросс"),
+            ('text', "📅 Сегодня"),
+            ('text', "00:45:00"),
+            ('text', "9.5"),
+            ('text', "146"),
+            ('text', "171"),
+            ('text', "⏭️ Пропустить"),
+            ('callback', "fatigue:6"),
+        ]
+    if name == 'statistics':
+        return [
+            ('text', "📊 Мои тренировки"),
+            ('callback', "period:week"),
+            ('callback', "period:month"),
+            ('callback', "back_to_menu"),
+        ]
+    if name == 'competitions':
+        return [
+            ('text', "🏃 Соревнования"),
+            ('callback', "comp:upcoming"),
+            ('callback', "comp:my"),
+            ('callback', "comp:my_results"),
+            ('callback', "comp:my_results:year"),
+            ('callback', "comp:personal_records"),
+            ('callback', "comp:stats:show"),
+        ]
+    if name == 'ratings':
+        return [
+            ('text', "🏆 Рейтинги и достижения"),
+            ('callback', "achievements:my_rating"),
+            ('callback', "achievements:top10"),
+            ('callback', "achievements:my_achievements"),
+        ]
+    if name == 'health':
+        return [
+            ('text', "❤️ Здоровье"),
+        ]
+    if name == 'coach' and user['students']:
+        student_id = user['students'][0]
+        return [
+            ('text', "👨‍🏫 Кабинет тренера"),
+            ('callback', "coach:students"),
+            ('callback', f"coach:student:{student_id}"),
+            ('callback', f"coach:student_trainings:{student_id}"),
+        ]
+    return [('text', "/start")]
+
+
+def _make_session_class():
+    """Класс RecordingSession (aiogram импортируется после настройки DB_PATH)"""
+    from aiogram.client.session.base import BaseSession
+    from aiogram.types import Chat, Message, User
+
+    class RecordingSession(BaseSession):
+        """Замена Bot API: принимает любые методы, записывает их и возвращает правдоподобный ответ"""
+
+        def __init__(self, latency: float = 0.0):
+            super().__init__()
+            self.latency = latency
+            self.calls: Counter = Counter()
+            self._message_ids = itertools.count(1_000_000)
+
+        async def make_request(self, bot, method, timeout: Optional[int] = None):
+            self.calls[type(method).__name__] += 1
+            if self.latency:
+                await asyncio.sleep(self.latency)
+
+            returning = getattr(method, '__returning__', bool)
+            options = get_args(returning) or (returning,)
+            if Message in options:
+                chat_id = getattr(method, 'chat_id', None)
+                return Message(
+                    message_id=getattr(method, 'message_id', None) or next(self._message_ids),
+                    date=datetime.now(),
+                    chat=Chat(id=int(chat_id) if isinstance(chat_id, int) else 0, type='private'),
+                    text=getattr(method, 'text', None) or getattr(method, 'caption', None)
+                ).as_(bot)
+            if User in options:
+                return User(id=bot.id, is_bot=True, first_name="Load test").as_(bot)
+            if getattr(returning, '__origin__', None) is list:
+                return []
+            return True
+
+        async def close(self) -> None:
+            pass
+
+        async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+            if False:
+                yield b''
+
+    return RecordingSession
+
+
+class UpdateFactory:
+    """Создает объекты Update от имени пользователей"""
+
+    def __init__(self, bot):
+        from aiogram import types
+        self.types = types
+        self.bot = bot
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+
+    def _user(self, user_id: int):
+        return self.types.User(id=user_id, is_bot=False, first_name=f"User {user_id}", username=f"user{user_id}")
+
+    def _chat(self, user_id: int):
+        return self.types.Chat(id=user_id, type='private')
+
+    def build(self, user_id: int, step: Step):
+        kind, payload = step
+        update_id = next(self._update_ids)
+        now = datetime.now()
+
+        if kind == 'text':
+            return self.types.Update(
+                update_id=update_id,
+                message=self.types.Message(
+                    message_id=next(self._message_ids),
+                    date=now,
+                    chat=self._chat(user_id),
+                    from_user=self._user(user_id),
+                    text=payload
+                )
+            )
+
+        return self.types.Update(
+            update_id=update_id,
+            callback_query=self.types.CallbackQuery(
+                id=str(update_id),
+                from_user=self._user(user_id),
+                chat_instance=str(user_id),
+                data=payload,
+                message=self.types.Message(
+                    message_id=next(self._message_ids),
+                    date=now,
+                    chat=self._chat(user_id),
+                    from_user=self.types.User(id=self.bot.id, is_bot=True, first_name="Load test"),
+                    text="..."
+                )
+            )
+        )
+
+
+async def _monitor_loop_lag(samples: List[float], stop: asyncio.Event) -> None:
+    """Замер задержки event loop: насколько позже запланированного просыпается sleep"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + LOOP_LAG_INTERVAL
+        await asyncio.sleep(LOOP_LAG_INTERVAL)
+        samples.append(max(0.0, loop.time() - expected) * 1000)
+
+
+async def _load_users(db_path: str, users: int) -> List[Dict[str, Any]]:
+    """Пользователи синтетической базы и ученики тренеров"""
+    import aiosqlite
+
+    async with aiosqlite.connect(db_path) as db:
+        async with db.execute(
+            "SELECT coach_id, student_id FROM coach_links WHERE status = 'active' ORDER BY coach_id, student_id"
+        ) as cursor:
+            links = await cursor.fetchall()
+
+    students: Dict[int, List[int]] = {}
+    for coach_id, student_id in links:
+        students.setdefault(coach_id, []).append(student_id)
+
+    return [
+        {'id': USER_ID_BASE + index, 'students': students.get(USER_ID_BASE + index, [])}
+        for index in range(users)
+    ]
+
+
+async def run_load_test(
+    db_path: str,
+    users: int,
+    concurrency: int,
+    rounds: int,
+    seed: int,
+    api_latency: float = 0.0
+) -> Dict[str, Any]:
+    """
+    Прогнать сценарии пользователей через диспетчер
+
+    Args:
+        db_path: Рабочая копия синтетической базы (будет изменена)
+        users: Количество пользователей в базе
+        concurrency: Сколько пользователей проходят сценарии одновременно
+        rounds: Сколько сценариев проходит каждый пользователь
+        seed: Seed выбора сценариев
+        api_latency: Искусственная задержка ответа Bot API (секунды)
+
+    Returns:
+        Сводка нагрузочного теста
+    """
+    os.environ['DB_PATH'] = db_path
+
+    from aiogram import Bot
+    from aiogram.dispatcher.event.bases import UNHANDLED
+    from main import create_dispatcher
+    from monitoring.metrics import registry, HANDLER_DURATION
+
+    session = _make_session_class()(latency=api_latency)
+    bot = Bot(token="42:LOAD-TEST", session=session)
+    dp = create_dispatcher()
+    factory = UpdateFactory(bot)
+    registry.reset()
+
+    rng = random.Random(seed)
+    user_list = await _load_users(db_path, users)
+    coaches = [user for user in user_list if user['students']]
+    names = list(JOURNEY_WEIGHTS)
+    weights = [JOURNEY_WEIGHTS[name] for name in names]
+
+    plans = []
+    for user in user_list:
+        journeys = []
+        for _ in range(rounds):
+            name = rng.choices(names, weights=weights)[0]
+            if name == 'coach' and not user['students']:
+                # Сценарий тренера проходит случайный тренер вместо обычного пользователя
+                journeys.append(('coach', rng.choice(coaches) if coaches else user))
+            else:
+                journeys.append((name, user))
+        plans.append(journeys)
+
+    latencies: List[float] = []
+    journey_latencies: Dict[str, List[float]] = {}
+    unhandled: Counter = Counter()
+    errors: Counter = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run_user(journeys):
+        async with semaphore:
+            for name, user in journeys:
+                for step in build_journey(name, user):
+                    update = factory.build(user['id'], step)
+                    started = time.perf_counter()
+                    try:
+                        result = await dp.feed_update(bot, update)
+                        if result is UNHANDLED:
+                            unhandled[f"{name}: {step[1]}"] += 1
+                    except Exception as e:
+                        errors[f"{name}: {step[1]}: {type(e).__name__}: {e}"[:200]] += 1
+                    elapsed = (time.perf_counter() - started) * 1000
+                    latencies.append(elapsed)
+                    journey_latencies.setdefault(name, []).append(elapsed)
+
+    lag_samples: List[float] = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(_monitor_loop_lag(lag_samples, stop))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run_user(journeys) for journeys in plans))
+    wall = time.perf_counter() - started
+
+    stop.set()
+    await lag_task
+
+    handler_stats = registry.to_json()['metrics'].get(HANDLER_DURATION.name, [])
+    handlers = sorted(handler_stats, key=lambda item: item['p99'], reverse=True)
+
+    return {
+        'updates': len(latencies),
+        'wall_seconds': round(wall, 2),
+        'updates_per_second': round(len(latencies) / wall, 1) if wall else None,
+        'update_latency_ms': {
+            'p50': _percentile(latencies, 50),
+            'p99': _percentile(latencies, 99),
+            'max': round(max(latencies), 3) if latencies else None
+        },
+        'journeys': {
+            name: {
+                'updates': len(values),
+                'p50_ms': _percentile(values, 50),
+                'p99_ms': _percentile(values, 99)
+            }
+            for name, values in sorted(journey_latencies.items())
+        },
+        'handlers': [
+            {
+                'handler': item['labels']['handler'],
+                'count': item['count'],
+                'p50_ms': round(item['p50'] * 1000, 3),
+                'p99_ms': round(item['p99'] * 1000, 3)
+            }
+            for item in handlers
+        ],
+        'event_loop_lag_ms': {
+            'p50': _percentile(lag_samples, 50),
+            'p99': _percentile(lag_samples, 99),
+            'max': round(max(lag_samples), 3) if lag_samples else None
+        },
+        'bot_api_calls': dict(session.calls.most_common()),
+        'unhandled': dict(unhandled.most_common()),
+        'errors': dict(errors.most_common(20))
+    }
+
+
+async def run(users: int, years: int, seed: int, concurrency: int, rounds: int,
+              api_latency: float, source_db: Optional[str] = None) -> Dict[str, Any]:
+    """Подготовить базу и прогнать нагрузочный тест"""
+    workdir = tempfile.mkdtemp(prefix='bot-load-')
+    db_path = os.path.join(workdir, 'load.sqlite')
+    try:
+        if source_db:
+            shutil.copyfile(source_db, db_path)
+            dataset = {'db_path': source_db}
+        else:
+            dataset = await generate_database(db_path, users, years, seed)
+
+        result = await run_load_test(db_path, users, concurrency, rounds, seed, api_latency)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        'meta': {
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'users': users,
+            'years': years,
+            'seed': seed,
+            'concurrency': concurrency,
+            'rounds': rounds,
+            'api_latency_ms': api_latency * 1000
+        },
+        'dataset': dataset,
+        'result': result
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Нагрузочный тест диспетчера без Telegram")
+    parser.add_argument('--users', type=int, default=200, help="Количество пользователей")
+    parser.add_argument('--years', type=int, default=1, help="Лет истории тренировок")
+    parser.add_argument('--seed', type=int, default=42, help="Seed генерации и сценариев")
+    parser.add_argument('--concurrency', type=int, default=50, help="Одновременно активных пользователей")
+    parser.add_argument('--rounds', type=int, default=3, help="Сценариев на пользователя")
+    parser.add_argument('--api-latency-ms', type=float, default=0.0, help="Задержка ответа Bot API, мс")
+    parser.add_argument('--db', help="Готовая база (из benchmarks.synthetic_data) вместо генерации")
+    parser.add_argument('--output', help="Файл для JSON-отчета (по умолчанию stdout)")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(
+        args.users, args.years, args.seed, args.concurrency, args.rounds,
+        args.api_latency_ms / 1000, args.db
+    ))
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+
+    result = report['result']
+    print(
+        f"{result['updates']} обновлений за {result['wall_seconds']} с "
+        f"({result['updates_per_second']}/с), p50 {result['update_latency_ms']['p50']} мс, "
+        f"p99 {result['update_latency_ms']['p99']} мс, ошибок {sum(result['errors'].values())}",
+        file=sys.stderr
+    )
+
+
+if __name__ == '__main__':
+    main()
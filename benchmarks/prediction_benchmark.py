@@ -0,0 +1,134 @@
+"""
+Бенчмарк локального прогноза результатов против сохраненных прогнозов AI
+
+Для каждого прогноза из result_predictions ищется фактический результат пользователя
+на этой дистанции после даты прогноза. С локальным прогнозом сравниваются только
+прогнозы, времена которых посчитал AI (source IS NULL). Локальный прогноз строится только по данным,
+которые были доступны на дату прогноза.
+
+Запуск:
+    python -m benchmarks.prediction_benchmark --db database.sqlite
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from typing import Dict, Any, List, Optional
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    """Перцентиль без numpy (значения уже в мс)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 3)
+
+
+def _error_percent(predicted: Optional[float], actual: float) -> Optional[float]:
+    """Относительная ошибка прогноза в процентах"""
+    if not predicted:
+        return None
+    return abs(predicted - actual) / actual * 100
+
+
+async def run_benchmark(db_path: str) -> Dict[str, Any]:
+    """
+    Сравнивает локальный прогноз и сохраненные прогнозы AI по латентности и точности
+
+    Args:
+        db_path: Путь к базе данных
+
+    Returns:
+        Сводка в виде словаря (сериализуется в JSON)
+    """
+    os.environ['DB_PATH'] = db_path
+
+    import aiosqlite
+    from utils.time_formatter import parse_time_to_seconds
+    from training_assistant.ta_queries import get_prediction_performances, get_weekly_running_volume
+    from training_assistant.services.race_predictor_engine import predict_locally
+
+    async with aiosqlite.connect(db_path) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute("""
+            SELECT rp.id, rp.user_id, rp.distance, rp.predicted_time_realistic, rp.source,
+                   date(rp.created_at) AS predicted_on,
+                   (
+                       SELECT cp.finish_seconds
+                       FROM competition_participants cp
+                       JOIN competitions c ON cp.competition_id = c.id
+                       WHERE cp.user_id = rp.user_id
+                       AND ABS(cp.distance - rp.distance) < 0.1
+                       AND cp.finish_seconds > 0
+                       AND c.date >= date(rp.created_at)
+                       ORDER BY c.date ASC
+                       LIMIT 1
+                   ) AS actual_time
+            FROM result_predictions rp
+        """) as cursor:
+            predictions = [dict(row) for row in await cursor.fetchall()]
+
+    load_latencies = []
+    compute_latencies = []
+    local_errors = []
+    ai_errors = []
+    with_actual = 0
+
+    for row in predictions:
+        started = time.perf_counter()
+        performances = await get_prediction_performances(row['user_id'], before_date=row['predicted_on'])
+        weekly_volume = await get_weekly_running_volume(row['user_id'], end_date=row['predicted_on'])
+        loaded = time.perf_counter()
+        local = predict_locally(row['distance'], performances, weekly_volume)
+        finished = time.perf_counter()
+
+        load_latencies.append((loaded - started) * 1000)
+        compute_latencies.append((finished - loaded) * 1000)
+
+        actual = row['actual_time']
+        if not actual:
+            continue
+        with_actual += 1
+
+        if local:
+            local_errors.append(_error_percent(local['seconds']['realistic'], actual))
+        # Сохраненные после перехода на локальный прогноз содержат его же времена - с ними не сравниваем
+        if row['source'] == 'local':
+            continue
+        ai_error = _error_percent(parse_time_to_seconds(row['predicted_time_realistic'] or ''), actual)
+        if ai_error is not None:
+            ai_errors.append(ai_error)
+
+    return {
+        'predictions_total': len(predictions),
+        'predictions_with_actual_result': with_actual,
+        'local': {
+            'load_ms_p50': _percentile(load_latencies, 50),
+            'load_ms_p95': _percentile(load_latencies, 95),
+            'compute_ms_p50': _percentile(compute_latencies, 50),
+            'compute_ms_p95': _percentile(compute_latencies, 95),
+            'mean_abs_error_percent': round(statistics.mean(local_errors), 2) if local_errors else None,
+            'evaluated': len(local_errors)
+        },
+        'stored_ai': {
+            'mean_abs_error_percent': round(statistics.mean(ai_errors), 2) if ai_errors else None,
+            'evaluated': len(ai_errors)
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк локального прогноза результатов")
+    parser.add_argument('--db', default=os.getenv('DB_PATH', 'database.sqlite'), help="Путь к базе данных")
+    args = parser.parse_args()
+
+    result = asyncio.run(run_benchmark(args.db))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
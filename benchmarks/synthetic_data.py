@@ -0,0 +1,337 @@
+"""
+Генератор синтетической базы данных для бенчмарков
+
+Создает реалистичную БД: пользователи с настройками, годы тренировок всех типов,
+метрики здоровья, соревнования с участниками и результатами, связи тренер-ученик
+и достижения. Генерация детерминирована: одинаковые seed и anchor_date дают
+одинаковую базу.
+
+Запуск:
+    python -m benchmarks.synthetic_data --db /tmp/bench.sqlite --users 200 --years 2 --seed 42
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+USER_ID_BASE = 100_000
+
+TRAINING_TYPES = ['кросс', 'интервальная', 'силовая', 'плавание', 'велотренировка']
+WEEKDAYS_RU = ['Понедельник', 'Вторник', 'Среда', 'Четверг', 'Пятница', 'Суббота', 'Воскресенье']
+CITIES = ['Москва', 'Санкт-Петербург', 'Казань', 'Екатеринбург', 'Новосибирск', 'Сочи', 'Нижний Новгород', 'Пермь']
+ORGANIZERS = ['Russia Running', 'Лига героев', 'Беговое сообщество', 'IRONSTAR', 'Московский марафон']
+EXERCISES = ['Приседания 4x10', 'Становая тяга 3x8', 'Жим лежа 4x8', 'Планка 3x60с', 'Выпады 3x12']
+RUNNING_DISTANCES = [5.0, 10.0, 21.1, 42.195]
+ACHIEVEMENT_IDS = ['first_competition', 'ten_k_first', 'half_marathon_first', 'marathon_first']
+
+
+def _format_time(seconds: float) -> str:
+    """Время в формате ЧЧ:ММ:СС"""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def _format_pace(seconds_per_km: float) -> str:
+    """Темп в формате М:СС"""
+    seconds = int(round(seconds_per_km))
+    return f"{seconds // 60}:{seconds % 60:02d}"
+
+
+def _make_users(rng: random.Random, users: int) -> List[Dict[str, Any]]:
+    """Профили пользователей: активность, предпочитаемые типы, базовый темп"""
+    profiles = []
+    for index in range(users):
+        weights = [rng.uniform(0.2, 1.0) for _ in TRAINING_TYPES]
+        # Большинство пользователей - бегуны
+        weights[0] += 2.0
+        profiles.append({
+            'user_id': USER_ID_BASE + index,
+            'username': f"user{index}",
+            'name': f"Спортсмен {index}",
+            'gender': rng.choice(['male', 'female']),
+            'birth_year': rng.randint(1965, 2005),
+            'per_week': rng.choice([1, 2, 3, 3, 4, 4, 5, 6, 7]),
+            'type_weights': weights,
+            'pace': rng.uniform(240, 420),  # базовый темп бега, сек/км
+            'is_coach': False
+        })
+    return profiles
+
+
+def _training_row(rng: random.Random, profile: Dict[str, Any], day: date) -> tuple:
+    """Одна тренировка пользователя (колонки как в add_training)"""
+    t_type = rng.choices(TRAINING_TYPES, weights=profile['type_weights'])[0]
+    duration = rng.randint(30, 120)
+    distance = avg_pace = pace_unit = exercises = intervals = calculated_volume = None
+    swimming_location = pool_length = swimming_styles = None
+
+    if t_type in ('кросс', 'интервальная'):
+        pace = profile['pace'] * rng.uniform(0.85, 1.15)
+        distance = round(duration * 60 / pace, 2)
+        avg_pace = _format_pace(pace)
+        pace_unit = 'мин/км'
+        if t_type == 'интервальная':
+            intervals = f"{rng.randint(4, 10)}x{rng.choice([400, 800, 1000])}м"
+    elif t_type == 'велотренировка':
+        distance = round(duration / 60 * rng.uniform(20, 32), 2)
+        avg_pace = f"{distance / (duration / 60):.1f}"
+        pace_unit = 'км/ч'
+    elif t_type == 'плавание':
+        distance = round(rng.uniform(1.0, 3.5), 2)
+        swimming_location = rng.choice(['бассейн', 'бассейн', 'открытая вода'])
+        pool_length = rng.choice([25, 50]) if swimming_location == 'бассейн' else None
+        swimming_styles = json.dumps(['вольный стиль'])
+    else:
+        exercises = "\n".join(rng.sample(EXERCISES, 3))
+
+    avg_pulse = rng.randint(120, 165)
+    return (
+        profile['user_id'], t_type, day.isoformat(), f"{rng.randint(6, 21):02d}:{rng.choice(['00', '15', '30', '45'])}",
+        duration, distance, avg_pace, pace_unit, avg_pulse, avg_pulse + rng.randint(10, 30),
+        exercises, intervals, calculated_volume,
+        None, None, rng.choice([None, None, 'Хорошо', 'Тяжело', 'Легко']), rng.randint(3, 9),
+        swimming_location, pool_length, swimming_styles, None
+    )
+
+
+async def generate_database(
+    db_path: str,
+    users: int = 200,
+    years: int = 2,
+    seed: int = 42,
+    anchor_date: Optional[date] = None
+) -> Dict[str, Any]:
+    """
+    Сгенерировать синтетическую базу данных
+
+    Args:
+        db_path: Путь к файлу БД (существующий файл перезаписывается)
+        users: Количество пользователей
+        years: Сколько лет истории тренировок
+        seed: Seed генератора случайных чисел
+        anchor_date: "Сегодня" для данных (по умолчанию текущая дата)
+
+    Returns:
+        Сводка: количество строк по таблицам и время генерации
+    """
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.environ['DB_PATH'] = db_path
+
+    import aiosqlite
+    from database.queries import init_db, calculate_pulse_zones
+
+    started = time.perf_counter()
+    rng = random.Random(seed)
+    today = anchor_date or datetime.now().date()
+    first_day = today - timedelta(days=365 * years)
+
+    await init_db()
+    profiles = _make_users(rng, users)
+
+    # Тренеры - около 5% пользователей, у каждого несколько учеников
+    coach_links = []
+    coaches = rng.sample(profiles, max(1, users // 20))
+    coach_ids = {coach['user_id'] for coach in coaches}
+    students = [p for p in profiles if p['user_id'] not in coach_ids]
+    for coach in coaches:
+        coach['is_coach'] = True
+        for student in rng.sample(students, min(len(students), rng.randint(3, 15))):
+            coach_links.append((coach['user_id'], student['user_id'], 'active', f"L{coach['user_id']}-{student['user_id']}"))
+
+    user_rows = []
+    settings_rows = []
+    trainings = []
+    health = []
+    for profile in profiles:
+        type_goals = {}
+        if rng.random() < 0.3:
+            type_goals['кросс'] = rng.choice([20, 30, 40, 50])
+        if rng.random() < 0.1:
+            type_goals['силовая'] = rng.choice([60, 90, 120])
+
+        user_rows.append((profile['user_id'], profile['username'], rng.choice(['новичок', 'любитель', 'профи'])))
+        birth_date = f"{profile['birth_year']}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        weight, height, max_pulse = round(rng.uniform(50, 95), 1), rng.randint(155, 195), rng.randint(175, 200)
+        # Зоны - как при вводе максимального пульса в настройках (set_pulse_zones_manual)
+        zones = await calculate_pulse_zones(max_pulse)
+        settings_rows.append((
+            profile['user_id'], profile['name'], birth_date, profile['gender'], weight, height, max_pulse,
+            *zones['zone1'], *zones['zone2'], *zones['zone3'], *zones['zone4'], *zones['zone5'],
+            rng.choice([None, 20, 30, 40, 60]), rng.choice([None, 3, 4, 5]), json.dumps(type_goals, ensure_ascii=False),
+            rng.choice(['км', 'км', 'км', 'мили']), rng.choice(['Europe/Moscow', 'Europe/Moscow', 'Asia/Yekaterinburg']),
+            f"{rng.randint(6, 10):02d}:{rng.choice(['00', '30'])}" if rng.random() < 0.6 else None,
+            rng.choice(WEEKDAYS_RU), f"{rng.randint(8, 21):02d}:00",
+            1 if rng.random() < 0.3 else 0, json.dumps(rng.sample(WEEKDAYS_RU, 3), ensure_ascii=False), "07:00",
+            1 if profile['is_coach'] else 0, f"C{profile['user_id']}" if profile['is_coach'] else None
+        ))
+
+        # Тренировки: per_week в среднем, с перерывами и изменением формы
+        day = first_day
+        probability = profile['per_week'] / 7
+        while day <= today:
+            if rng.random() < probability:
+                trainings.append(_training_row(rng, profile, day))
+                if rng.random() < 0.05:
+                    trainings.append(_training_row(rng, profile, day))
+            day += timedelta(days=1)
+
+        # Метрики здоровья: у 70% пользователей, заполнены ~60% дней за последний год
+        if rng.random() < 0.7:
+            day = max(first_day, today - timedelta(days=365))
+            pulse = rng.randint(48, 70)
+            weight = round(rng.uniform(50, 95), 1)
+            while day <= today:
+                if rng.random() < 0.6:
+                    health.append((
+                        profile['user_id'], day.isoformat(), pulse + rng.randint(-4, 6),
+                        round(weight + rng.uniform(-1.5, 1.5), 1), round(rng.uniform(5, 9.5), 1),
+                        rng.randint(1, 5), rng.randint(1, 5), rng.randint(1, 5), rng.randint(1, 5)
+                    ))
+                day += timedelta(days=1)
+
+    # Соревнования: прошедшие за весь период и предстоящие на полгода вперед
+    competitions = []
+    competitions_count = max(20, users // 2)
+    for index in range(competitions_count):
+        comp_date = first_day + timedelta(days=rng.randint(0, 365 * years + 180))
+        distances = sorted(rng.sample(RUNNING_DISTANCES, rng.randint(1, 4)))
+        competitions.append({
+            'id': index + 1,
+            'date': comp_date,
+            'distances': distances,
+            'row': (
+                index + 1, f"{rng.choice(['Забег', 'Марафон', 'Полумарафон', 'Трейл'])} {rng.choice(CITIES)} {index}",
+                comp_date.isoformat(), rng.choice(CITIES), json.dumps([str(d) for d in distances]),
+                rng.choice(['марафон', 'полумарафон', 'забег', 'трейл']), 'бег', rng.choice(ORGANIZERS),
+                'finished' if comp_date < today else 'upcoming', 1 if rng.random() < 0.7 else 0,
+                f"https://example.org/competition/{index}"
+            )
+        })
+
+    participants = []
+    for profile in profiles:
+        for competition in rng.sample(competitions, min(len(competitions), rng.randint(0, 12))):
+            distance = rng.choice(competition['distances'])
+            finish_seconds = distance * profile['pace'] * rng.uniform(0.9, 1.1)
+            target = _format_time(finish_seconds * rng.uniform(0.92, 1.02))
+            if competition['date'] < today:
+                status = rng.choices(['finished', 'dnf', 'dns'], weights=[90, 5, 5])[0]
+                finished = status == 'finished'
+                participants.append((
+                    competition['id'], profile['user_id'], distance, target,
+                    _format_time(finish_seconds) if finished else None,
+                    rng.randint(1, 2000) if finished else None, rng.randint(1, 300) if finished else None,
+                    status
+                ))
+            else:
+                participants.append((competition['id'], profile['user_id'], distance, target, None, None, None, 'registered'))
+
+    achievements = [
+        (profile['user_id'], achievement_id)
+        for profile in profiles
+        for achievement_id in ACHIEVEMENT_IDS
+        if rng.random() < 0.3
+    ]
+
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute("BEGIN")
+        await db.executemany("INSERT INTO users (id, username, level) VALUES (?, ?, ?)", user_rows)
+        await db.executemany(
+            """
+            INSERT INTO user_settings (
+                user_id, name, birth_date, gender, weight, height, max_pulse,
+                zone1_min, zone1_max, zone2_min, zone2_max, zone3_min, zone3_max,
+                zone4_min, zone4_max, zone5_min, zone5_max,
+                weekly_volume_goal, weekly_trainings_goal, training_type_goals,
+                distance_unit, timezone, daily_pulse_weight_time, weekly_report_day, weekly_report_time,
+                training_reminders_enabled, training_reminder_days, training_reminder_time,
+                is_coach, coach_link_code
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            settings_rows
+        )
+        await db.executemany(
+            """
+            INSERT INTO trainings
+            (user_id, type, date, time, duration, distance, avg_pace, pace_unit, avg_pulse, max_pulse, exercises, intervals, calculated_volume, description, results, comment, fatigue_level, swimming_location, pool_length, swimming_styles, swimming_sets)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            trainings
+        )
+        await db.executemany(
+            """
+            INSERT INTO health_metrics
+            (user_id, date, morning_pulse, weight, sleep_duration, sleep_quality, mood, stress_level, energy_level)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            health
+        )
+        await db.executemany(
+            """
+            INSERT INTO competitions
+            (id, name, date, city, distances, type, sport_type, organizer, status, is_official, source_url)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [competition['row'] for competition in competitions]
+        )
+        await db.executemany(
+            """
+            INSERT OR IGNORE INTO competition_participants
+            (competition_id, user_id, distance, target_time, finish_time, place_overall, place_age_category, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            participants
+        )
+        await db.executemany(
+            "INSERT INTO coach_links (coach_id, student_id, status, link_code) VALUES (?, ?, ?, ?)",
+            coach_links
+        )
+        await db.executemany("INSERT INTO achievements (user_id, name) VALUES (?, ?)", achievements)
+        await db.commit()
+
+    # Рейтинги и снимки лидербордов строятся штатным пересчетом
+    from ratings.rating_updater import update_all_ratings
+    await update_all_ratings()
+
+    return {
+        'db_path': db_path,
+        'seed': seed,
+        'anchor_date': today.isoformat(),
+        'users': users,
+        'years': years,
+        'rows': {
+            'trainings': len(trainings),
+            'health_metrics': len(health),
+            'competitions': len(competitions),
+            'competition_participants': len(participants),
+            'coach_links': len(coach_links),
+            'achievements': len(achievements)
+        },
+        'generation_seconds': round(time.perf_counter() - started, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Генерация синтетической БД для бенчмарков")
+    parser.add_argument('--db', default='bench.sqlite', help="Путь к создаваемой базе данных")
+    parser.add_argument('--users', type=int, default=200, help="Количество пользователей")
+    parser.add_argument('--years', type=int, default=2, help="Лет истории тренировок")
+    parser.add_argument('--seed', type=int, default=42, help="Seed генератора")
+    parser.add_argument('--anchor-date', help="Дата 'сегодня' для данных (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    anchor = datetime.strptime(args.anchor_date, '%Y-%m-%d').date() if args.anchor_date else None
+    summary = asyncio.run(generate_database(args.db, args.users, args.years, args.seed, anchor))
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+
+
+if __name__ == '__main__':
+    main()
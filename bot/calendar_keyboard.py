@@ -7,11 +7,13 @@
 4 - Выбор десятилетия
 """
 
-from datetime import datetime, timedelta
+from datetime import date as date_type, datetime, timedelta
 from calendar import monthrange
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from typing import Optional
 
+from bot.keyboard_cache import keyboard_cache
+
 
 class CalendarKeyboard:
     """Класс для создания календарной клавиатуры"""
@@ -46,20 +48,36 @@ class CalendarKeyboard:
         if current_date is None:
             current_date = datetime.now()
 
+        # Клавиатура зависит только от страницы календаря (месяц, год, десятилетие,
+        # век), месяца max_date и отметки "сегодня" - по ним она и кэшируется
+        today = datetime.now().date()
+        year = current_date.year
         if calendar_format == 1:
-            return CalendarKeyboard._create_days_calendar(current_date, callback_prefix, max_date, show_cancel, cancel_callback)
+            page = (year, current_date.month)
+            today_marker = today.day if (today.year, today.month) == page else None
+            build = lambda: CalendarKeyboard._create_days_calendar(current_date, callback_prefix, max_date, show_cancel, cancel_callback, today)
         elif calendar_format == 2:
-            return CalendarKeyboard._create_months_calendar(current_date, callback_prefix, max_date, show_cancel, cancel_callback)
+            page, today_marker = year, None
+            build = lambda: CalendarKeyboard._create_months_calendar(current_date, callback_prefix, max_date, show_cancel, cancel_callback)
         elif calendar_format == 3:
-            return CalendarKeyboard._create_years_calendar(current_date, callback_prefix, max_date, show_cancel, cancel_callback)
+            page, today_marker = year // 10, None
+            build = lambda: CalendarKeyboard._create_years_calendar(current_date, callback_prefix, max_date, show_cancel, cancel_callback)
         elif calendar_format == 4:
-            return CalendarKeyboard._create_decades_calendar(current_date, callback_prefix, max_date, show_cancel, cancel_callback)
+            page, today_marker = year // 100, None
+            build = lambda: CalendarKeyboard._create_decades_calendar(current_date, callback_prefix, max_date, show_cancel, cancel_callback)
         else:
             raise ValueError(f"Неверный формат календаря: {calendar_format}")
 
+        key = (
+            'calendar', calendar_format, page, callback_prefix,
+            (max_date.year, max_date.month) if max_date else None,
+            show_cancel, cancel_callback if show_cancel else None, today_marker
+        )
+        return keyboard_cache.get_or_build(key, build)
+
     @staticmethod
-    def _create_days_calendar(date: datetime, prefix: str, max_date: Optional[datetime] = None, show_cancel: bool = False, cancel_callback: str = "cancel") -> InlineKeyboardMarkup:
-        """Создает календарь с днями месяца"""
+    def _create_days_calendar(date: datetime, prefix: str, max_date: Optional[datetime] = None, show_cancel: bool = False, cancel_callback: str = "cancel", today: Optional[date_type] = None) -> InlineKeyboardMarkup:
+        """Создает календарь с днями месяца (today - отмечаемый день, по умолчанию текущий)"""
         keyboard = []
 
         year = date.year
@@ -104,7 +122,8 @@ class CalendarKeyboard:
                 InlineKeyboardButton(text=" ", callback_data=f"{prefix}_empty")
             )
 
-        today = datetime.now().date()
+        if today is None:
+            today = datetime.now().date()
         for day in range(1, days_in_month + 1):
             day_date = datetime(year, month, day)
 
@@ -372,36 +391,26 @@ class CalendarKeyboard:
         """
         Заменяет префикс в callback_data всех кнопок клавиатуры
 
+        Кнопки без префикса переиспользуются, исходная клавиатура не меняется.
+        Вместо замены лучше сразу строить календарь с нужным префиксом
+        (create_calendar/handle_navigation поддерживают многословные префиксы).
+
         :param keyboard: исходная клавиатура
         :param old_prefix: старый префикс для замены
         :param new_prefix: новый префикс
         :return: новая клавиатура с замененными префиксами
         """
-        from aiogram.types import InlineKeyboardButton
-        import logging
-        logger = logging.getLogger(__name__)
-
-        keyboard_json = keyboard.model_dump()
-        new_rows = []
-        replaced_count = 0
-
-        for row in keyboard_json.get('inline_keyboard', []):
-            new_row = []
-            for btn in row:
-                callback_data = btn.get('callback_data', '')
-                if callback_data.startswith(f'{old_prefix}_'):
-                    old_callback = callback_data
-                    callback_data = callback_data.replace(f'{old_prefix}_', f'{new_prefix}_', 1)
-                    replaced_count += 1
-                    logger.debug(f"Заменен префикс: {old_callback} -> {callback_data}")
-
-                new_row.append(InlineKeyboardButton(
-                    text=btn['text'],
-                    callback_data=callback_data
-                ))
-            new_rows.append(new_row)
-
-        logger.info(f"Заменено префиксов: {replaced_count} ({old_prefix} -> {new_prefix})")
+        old_start = f'{old_prefix}_'
+        new_start = f'{new_prefix}_'
+
+        new_rows = [
+            [
+                btn.model_copy(update={'callback_data': new_start + btn.callback_data[len(old_start):]})
+                if btn.callback_data and btn.callback_data.startswith(old_start) else btn
+                for btn in row
+            ]
+            for row in keyboard.inline_keyboard
+        ]
         return InlineKeyboardMarkup(inline_keyboard=new_rows)
 
     @staticmethod
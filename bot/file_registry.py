@@ -0,0 +1,216 @@
+"""
+Реестр файлов, уже загруженных в Telegram
+
+Графики и PDF-отчеты отправляются как байты (BufferedInputFile), и Telegram
+каждый раз принимает загрузку заново, даже если содержимое не изменилось.
+После первой отправки Telegram возвращает file_id, по которому тот же файл
+можно отправить любому пользователю без загрузки, поэтому file_id
+сохраняется в SQLite по хэшу содержимого, а повторная отправка того же
+содержимого идет по file_id.
+
+Попадания бывают только при полностью совпадающих байтах (для документов -
+и имени файла): одинаковые графики статистики у разных пользователей
+и повторные запросы того же отчета. Поэтому PDF строятся с invariant=1:
+иначе reportlab записывает в каждый файл дату создания и случайный ID.
+Сэкономленные байты и время загрузки учитываются в метриках.
+
+Переменные окружения:
+    TELEGRAM_FILE_TTL_DAYS - через сколько дней без использования запись удаляется (по умолчанию 90)
+"""
+
+import hashlib
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+import aiosqlite
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile, Message
+
+from monitoring.metrics import (
+    registry,
+    TELEGRAM_FILE_SENDS,
+    TELEGRAM_FILE_UPLOAD_BYTES,
+    TELEGRAM_FILE_SAVED_BYTES,
+    TELEGRAM_FILE_SAVED_SECONDS
+)
+
+logger = logging.getLogger(__name__)
+DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
+
+TELEGRAM_FILE_TTL_DAYS = int(os.getenv('TELEGRAM_FILE_TTL_DAYS', '90'))
+
+
+def content_hash(kind: str, content: bytes, filename: str) -> str:
+    """
+    Ключ файла в реестре
+
+    Документ хранит имя файла, поэтому для документов оно входит в ключ;
+    у фото имени нет, ключ - только содержимое.
+    """
+    digest = hashlib.sha256(content)
+    if kind == 'document':
+        digest.update(b'\0' + filename.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _extract_file(message: Message, kind: str) -> Tuple[Optional[str], int]:
+    """file_id и размер файла из ответа на отправку"""
+    if kind == 'photo' and getattr(message, 'photo', None):
+        # Самый большой вариант - тот, что был загружен
+        photo = message.photo[-1]
+        return photo.file_id, photo.file_size or 0
+    if kind == 'document' and getattr(message, 'document', None):
+        return message.document.file_id, message.document.file_size or 0
+    return None, 0
+
+
+async def get_file_id(key: str, kind: str) -> Optional[Tuple[str, float]]:
+    """
+    Получить file_id по ключу
+
+    Returns:
+        (file_id, время первой загрузки в секундах) или None
+    """
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            async with db.execute(
+                "SELECT file_id, upload_seconds FROM telegram_files WHERE content_hash = ? AND kind = ?",
+                (key, kind)
+            ) as cursor:
+                row = await cursor.fetchone()
+            return (row[0], row[1] or 0.0) if row else None
+    except Exception as e:
+        logger.warning(f"Ошибка чтения реестра файлов: {e}")
+        return None
+
+
+async def save_file_id(key: str, kind: str, file_id: str, size: int, upload_seconds: float) -> None:
+    """Сохранить file_id загруженного файла"""
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            await db.execute(
+                """
+                INSERT OR REPLACE INTO telegram_files
+                (content_hash, kind, file_id, file_size, upload_seconds)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (key, kind, file_id, size, upload_seconds)
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Ошибка записи в реестр файлов: {e}")
+
+
+async def _touch_file_id(key: str, kind: str) -> None:
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            await db.execute(
+                """
+                UPDATE telegram_files
+                SET uses = uses + 1, last_used_at = CURRENT_TIMESTAMP
+                WHERE content_hash = ? AND kind = ?
+                """,
+                (key, kind)
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Ошибка записи в реестр файлов: {e}")
+
+
+async def forget_file_id(key: str, kind: str) -> None:
+    """Удалить запись (Telegram больше не принимает этот file_id)"""
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            await db.execute(
+                "DELETE FROM telegram_files WHERE content_hash = ? AND kind = ?",
+                (key, kind)
+            )
+            await db.commit()
+    except Exception as e:
+        logger.warning(f"Ошибка записи в реестр файлов: {e}")
+
+
+async def cleanup_unused_files(days: int = TELEGRAM_FILE_TTL_DAYS) -> int:
+    """
+    Удалить записи, которые не использовались дольше days дней
+
+    Returns:
+        Количество удаленных записей
+    """
+    try:
+        async with aiosqlite.connect(DB_PATH) as db:
+            cursor = await db.execute(
+                "DELETE FROM telegram_files WHERE last_used_at < datetime('now', ?)",
+                (f'-{days} days',)
+            )
+            await db.commit()
+            if cursor.rowcount:
+                logger.info(f"Удалено {cursor.rowcount} неиспользуемых записей реестра файлов")
+            return cursor.rowcount
+    except Exception as e:
+        logger.warning(f"Ошибка очистки реестра файлов: {e}")
+        return 0
+
+
+async def send_file(
+    send: Callable[..., Awaitable[Message]],
+    kind: str,
+    content: bytes,
+    filename: str,
+    **kwargs: Any
+) -> Message:
+    """
+    Отправить файл по file_id, если это содержимое уже загружалось, иначе загрузить
+
+    Args:
+        send: Метод отправки (message.answer_photo, message.answer_document,
+            functools.partial(bot.send_document, chat_id) и т.п.)
+        kind: 'photo' или 'document' - имя параметра метода с файлом
+        content: Содержимое файла
+        filename: Имя файла
+        **kwargs: Остальные параметры метода (caption, parse_mode, reply_markup, ...)
+
+    Returns:
+        Отправленное сообщение
+    """
+    key = content_hash(kind, content, filename)
+
+    known = await get_file_id(key, kind)
+    if known is not None:
+        file_id, upload_seconds = known
+        started = time.monotonic()
+        try:
+            message = await send(**{kind: file_id}, **kwargs)
+        except TelegramBadRequest as e:
+            logger.info(f"file_id отклонен Telegram ({e}), файл будет загружен заново")
+            await forget_file_id(key, kind)
+        else:
+            elapsed = time.monotonic() - started
+            registry.inc(TELEGRAM_FILE_SENDS, (kind, 'reused'))
+            registry.inc(TELEGRAM_FILE_SAVED_BYTES, (kind,), len(content))
+            registry.inc(TELEGRAM_FILE_SAVED_SECONDS, (kind,), max(upload_seconds - elapsed, 0.0))
+            await _touch_file_id(key, kind)
+            return message
+
+    started = time.monotonic()
+    message = await send(**{kind: BufferedInputFile(content, filename=filename)}, **kwargs)
+    elapsed = time.monotonic() - started
+    registry.inc(TELEGRAM_FILE_SENDS, (kind, 'uploaded'))
+    registry.inc(TELEGRAM_FILE_UPLOAD_BYTES, (kind,), len(content))
+
+    file_id, size = _extract_file(message, kind)
+    if file_id:
+        await save_file_id(key, kind, file_id, size or len(content), elapsed)
+    return message
+
+
+async def answer_cached_photo(message: Message, content: bytes, filename: str, **kwargs: Any) -> Message:
+    """Ответить фото (см. send_file)"""
+    return await send_file(message.answer_photo, 'photo', content, filename, **kwargs)
+
+
+async def answer_cached_document(message: Message, content: bytes, filename: str, **kwargs: Any) -> Message:
+    """Ответить документом (см. send_file)"""
+    return await send_file(message.answer_document, 'document', content, filename, **kwargs)
@@ -4,7 +4,7 @@
 
 from aiogram import Router, F
 from aiogram.filters import Command, StateFilter
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove, BufferedInputFile
+from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
 from aiogram.fsm.context import FSMContext
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.types import InlineKeyboardButton
@@ -13,6 +13,7 @@ from typing import Union
 import re
 import logging
 
+from bot.file_registry import answer_cached_photo, answer_cached_document
 from bot.fsm import AddTrainingStates, ExportPDFStates
 from bot.keyboards import (
     get_main_menu_keyboard,
@@ -1178,14 +1179,6 @@ async def process_fatigue(callback: CallbackQuery, state: FSMContext):
                     f"Продолжайте тренироваться для повышения уровня!",
                     parse_mode="HTML"
                 )
-            elif new_idx < old_idx:
-                await callback.bot.send_message(
-                    callback.from_user.id,
-                    f"📉 <b>Уровень изменён</b>\n\n"
-                    f"Ваш уровень теперь {new_emoji} <b>{level_update['new_level'].capitalize()}</b>.\n\n"
-                    f"Добавляйте тренировки, чтобы вернуться к прежнему уровню!",
-                    parse_mode="HTML"
-                )
     except Exception as e:
         logger.error(f"Ошибка при обновлении уровня: {str(e)}")
 
@@ -1573,8 +1566,10 @@ async def show_trainings_period(callback: CallbackQuery, state: FSMContext):
             logger.info(f"Отправка объединённого графика для периода {period}...")
 
             if combined_graph:
-                graph_msg = await callback.message.answer_photo(
-                    photo=BufferedInputFile(combined_graph.read(), filename="statistics.png"),
+                graph_msg = await answer_cached_photo(
+                    callback.message,
+                    combined_graph.read(),
+                    "statistics.png",
                     caption=f"📊 Статистика тренировок {caption_suffix}"
                 )
                 new_message_ids.append(graph_msg.message_id)
@@ -1830,8 +1825,10 @@ async def confirm_delete(callback: CallbackQuery):
                 caption_suffix = period_captions.get(period, '')
                 combined_graph = generate_graphs(trainings, period, days, distance_unit)
                 if combined_graph:
-                    await callback.message.answer_photo(
-                        photo=BufferedInputFile(combined_graph.read(), filename="statistics.png"),
+                    await answer_cached_photo(
+                        callback.message,
+                        combined_graph.read(),
+                        "statistics.png",
                         caption=f"📊 Статистика тренировок {caption_suffix}"
                     )
                     logger.info("Объединённый график отправлен")
@@ -2404,8 +2401,10 @@ async def generate_and_send_pdf(message: Message, user_id: int, start_date: str,
         total_distance = stats.get('total_distance', 0)
         distance_text = format_distance(total_distance, distance_unit) if total_distance else f"0 {distance_unit}"
 
-        await message.answer_document(
-            BufferedInputFile(pdf_buffer.read(), filename=filename),
+        await answer_cached_document(
+            message,
+            pdf_buffer.read(),
+            filename,
             caption=f"📥 *Экспорт тренировок*\n\n"
                     f"Период: {period_text}\n"
                     f"Тренировок: {len(trainings)}\n"
@@ -2508,14 +2507,11 @@ async def handle_calendar_end_date_navigation(callback: CallbackQuery, state: FS
         await callback.answer()
         return
 
-    callback_data_normalized = callback.data.replace("cal_end_", "cal_")
-    new_keyboard = CalendarKeyboard.handle_navigation(callback_data_normalized, prefix="cal", max_date=datetime.now(), show_cancel=True, cancel_callback="trainings:export:cancel")
+    new_keyboard = CalendarKeyboard.handle_navigation(callback.data, prefix="cal_end", max_date=datetime.now(), show_cancel=True, cancel_callback="trainings:export:cancel")
 
     if new_keyboard:
-        final_keyboard = CalendarKeyboard.replace_prefix_in_keyboard(new_keyboard, "cal", "cal_end")
-
         try:
-            await callback.message.edit_reply_markup(reply_markup=final_keyboard)
+            await callback.message.edit_reply_markup(reply_markup=new_keyboard)
         except Exception as e:
             if "message is not modified" not in str(e).lower():
                 logger.error(f"Ошибка при обновлении календаря: {str(e)}")
@@ -0,0 +1,81 @@
+"""
+Кэш готовых клавиатур
+
+Построение InlineKeyboardMarkup - это создание и валидация pydantic-модели
+для каждой кнопки, поэтому статичные меню и страницы календаря строятся
+один раз и затем отдаются из ограниченного LRU-кэша по ключу
+(вид клавиатуры, параметры). Клавиатуры из кэша общие для всех пользователей -
+их нельзя изменять, только отправлять.
+"""
+
+import functools
+import os
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, TypeVar
+
+# Максимальное количество клавиатур в кэше
+KEYBOARD_CACHE_SIZE = int(os.getenv('KEYBOARD_CACHE_SIZE', '512'))
+
+T = TypeVar('T')
+
+
+class KeyboardCache:
+    """Ограниченный по размеру кэш клавиатур (вытесняются давно не использованные)"""
+
+    def __init__(self, max_entries: int = KEYBOARD_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._keyboards: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._keyboards)
+
+    def get_or_build(self, key: Hashable, build: Callable[[], T]) -> T:
+        """
+        Получить клавиатуру по ключу, построив ее при отсутствии
+
+        Args:
+            key: Вид клавиатуры и все параметры, от которых зависит ее содержимое
+            build: Функция построения клавиатуры
+        """
+        keyboard = self._keyboards.get(key)
+        if keyboard is not None:
+            self.hits += 1
+            self._keyboards.move_to_end(key)
+            return keyboard
+
+        self.misses += 1
+        keyboard = self._keyboards[key] = build()
+        while len(self._keyboards) > self.max_entries:
+            self._keyboards.popitem(last=False)
+        return keyboard
+
+    def clear(self) -> None:
+        self._keyboards.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+keyboard_cache = KeyboardCache()
+
+
+def cached_keyboard(func: Callable[..., T]) -> Callable[..., T]:
+    """
+    Декоратор для функций, строящих клавиатуру только из своих аргументов
+
+    Вызовы с нехэшируемыми аргументами (списки, словари) строят клавиатуру
+    без кэша. Исходная функция доступна как __wrapped__.
+    """
+    kind = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (kind, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+        return keyboard_cache.get_or_build(key, lambda: func(*args, **kwargs))
+
+    return wrapper
@@ -5,8 +5,10 @@
 from aiogram.types import ReplyKeyboardMarkup, KeyboardButton, InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
 from database.queries import format_date_by_setting  
+from bot.keyboard_cache import cached_keyboard
 
 
+@cached_keyboard
 def get_main_menu_keyboard(is_coach: bool = False) -> ReplyKeyboardMarkup:
     """
     Главное меню бота
@@ -92,6 +94,7 @@ def get_training_types_keyboard(allowed_types: list = None) -> InlineKeyboardMar
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_cancel_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура с кнопкой отмены"""
     builder = ReplyKeyboardBuilder()
@@ -99,6 +102,7 @@ def get_cancel_keyboard() -> ReplyKeyboardMarkup:
     return builder.as_markup(resize_keyboard=True)
 
 
+@cached_keyboard
 def get_skip_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура с кнопками пропуска и отмены"""
     builder = ReplyKeyboardBuilder()
@@ -109,6 +113,7 @@ def get_skip_keyboard() -> ReplyKeyboardMarkup:
     return builder.as_markup(resize_keyboard=True)
 
 
+@cached_keyboard
 def get_fatigue_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для выбора уровня усилий"""
     builder = InlineKeyboardBuilder()
@@ -119,6 +124,7 @@ def get_fatigue_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_period_keyboard(period: str = None) -> InlineKeyboardMarkup:
     """Клавиатура выбора периода для просмотра тренировок
 
@@ -150,6 +156,7 @@ def get_period_keyboard(period: str = None) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_date_keyboard(for_coach: bool = False) -> ReplyKeyboardMarkup:
     """
     Клавиатура выбора даты тренировки
@@ -263,6 +270,7 @@ def get_training_detail_keyboard(period: str, training_id: int = None):
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_export_type_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора типа экспорта в PDF"""
     builder = InlineKeyboardBuilder()
@@ -281,6 +289,7 @@ def get_export_type_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_export_period_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора периода для экспорта в PDF"""
     builder = InlineKeyboardBuilder()
@@ -300,6 +309,7 @@ def get_export_period_keyboard() -> InlineKeyboardMarkup:
 
 
 
+@cached_keyboard
 def get_swimming_location_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора места для плавания"""
     builder = InlineKeyboardBuilder()
@@ -312,6 +322,7 @@ def get_swimming_location_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_pool_length_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора длины бассейна"""
     builder = InlineKeyboardBuilder()
@@ -322,6 +333,7 @@ def get_pool_length_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_swimming_styles_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора стилей плавания (множественный выбор)"""
     builder = InlineKeyboardBuilder()
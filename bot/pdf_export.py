@@ -111,7 +111,28 @@ async def create_training_pdf(trainings: list, period_text: str, stats: dict, us
     user_settings = await get_user_settings(user_id)
     distance_unit = user_settings.get('distance_unit', 'км') if user_settings else 'км'
     date_format = user_settings.get('date_format', 'DD.MM.YYYY') if user_settings else 'DD.MM.YYYY'
-    
+
+    return render_training_pdf(trainings, period_text, stats, distance_unit, date_format)
+
+
+def render_training_pdf(trainings: list, period_text: str, stats: dict,
+                        distance_unit: str = 'км', date_format: str = 'DD.MM.YYYY') -> BytesIO:
+    """
+    Строит PDF с тренировками по уже загруженным данным (без обращений к БД)
+
+    Синхронная функция: ее можно выполнять в пуле процессов
+    (недельные отчеты, notifications.weekly_reports).
+
+    Args:
+        trainings: Список тренировок из БД
+        period_text: Текстовое описание периода
+        stats: Словарь со статистикой
+        distance_unit: Единица расстояния пользователя
+        date_format: Формат даты пользователя
+
+    Returns:
+        BytesIO объект с PDF документом
+    """
     buffer = BytesIO()
     
     doc = SimpleDocTemplate(
@@ -120,7 +141,8 @@ async def create_training_pdf(trainings: list, period_text: str, stats: dict, us
         rightMargin=2*cm,
         leftMargin=2*cm,
         topMargin=2*cm,
-        bottomMargin=2*cm
+        bottomMargin=2*cm,
+        invariant=1
     )
     
     styles = getSampleStyleSheet()
@@ -227,17 +227,14 @@ async def process_calendar_navigation(callback: CallbackQuery, state: FSMContext
         await callback.answer()
         return
 
-    callback_data_normalized = callback.data.replace("coach_cal_", "cal_")
     new_keyboard = CalendarKeyboard.handle_navigation(
-        callback_data_normalized,
-        prefix="cal"
+        callback.data,
+        prefix="coach_cal"
     )
 
     if new_keyboard:
-        final_keyboard = CalendarKeyboard.replace_prefix_in_keyboard(new_keyboard, "cal", "coach_cal")
-
         try:
-            await callback.message.edit_reply_markup(reply_markup=final_keyboard)
+            await callback.message.edit_reply_markup(reply_markup=new_keyboard)
         except Exception as e:
             if "message is not modified" not in str(e).lower():
                 logger.error(f"Ошибка при обновлении календаря: {str(e)}")
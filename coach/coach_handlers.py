@@ -163,7 +163,7 @@ async def show_student_trainings_by_period(callback: CallbackQuery, state: FSMCo
     from database.queries import get_training_statistics, get_user_settings, get_trainings_by_period
     from utils.unit_converter import format_distance, format_swimming_distance
     from datetime import datetime, timedelta
-    from aiogram.types import BufferedInputFile
+    from bot.file_registry import answer_cached_photo
     from bot.graphs import generate_graphs
     import logging
 
@@ -380,8 +380,10 @@ async def show_student_trainings_by_period(callback: CallbackQuery, state: FSMCo
             logger.info(f"Отправка графика для ученика {student_id}, период {period}...")
 
             if combined_graph:
-                graph_msg = await callback.message.answer_photo(
-                    photo=BufferedInputFile(combined_graph.read(), filename="statistics.png"),
+                graph_msg = await answer_cached_photo(
+                    callback.message,
+                    combined_graph.read(),
+                    "statistics.png",
                     caption=f"📊 Статистика тренировок {display_name} {caption_suffix}"
                 )
                 new_message_ids.append(graph_msg.message_id)
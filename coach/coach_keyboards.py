@@ -4,8 +4,10 @@
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from bot.keyboard_cache import cached_keyboard
 
 
+@cached_keyboard
 def get_coach_main_menu() -> InlineKeyboardMarkup:
     """Главное меню тренера"""
     builder = InlineKeyboardBuilder()
@@ -107,6 +109,7 @@ def get_confirm_remove_student_keyboard(student_id: int) -> InlineKeyboardMarkup
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_add_coach_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура для добавления тренера (со стороны ученика)"""
     builder = InlineKeyboardBuilder()
@@ -124,6 +127,7 @@ def get_add_coach_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_student_coach_info_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура с информацией о тренере (со стороны ученика)"""
     builder = InlineKeyboardBuilder()
@@ -141,6 +145,7 @@ def get_student_coach_info_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_confirm_remove_coach_keyboard() -> InlineKeyboardMarkup:
     """Подтверждение отключения от тренера"""
     builder = InlineKeyboardBuilder()
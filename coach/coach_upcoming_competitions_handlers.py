@@ -8,12 +8,14 @@ from aiogram.types import Message, CallbackQuery, InlineKeyboardButton
 from aiogram.fsm.context import FSMContext
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from datetime import datetime
+from typing import Dict, List
 import asyncio
 import os
 
 from competitions.competitions_fsm import CoachUpcomingCompetitionsStates
 from competitions.parser import SPORT_CODES, SPORT_NAMES
-from competitions.competitions_fetcher import fetch_all_competitions, SERVICE_CODES, SERVICE_NAMES
+from competitions.competitions_fetcher import SERVICE_CODES, SERVICE_NAMES
+from competitions.result_sets import get_competition_result_set, find_competition
 from database.queries import get_user_settings
 from utils.date_formatter import DateFormatter
 from coach.coach_training_queries import can_coach_access_student, get_student_display_name
@@ -337,16 +339,77 @@ async def coach_select_sport(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-async def show_coach_competitions_results(message: Message, state: FSMContext, page: int = 1):
-    """Показать результаты поиска соревнований для тренера"""
+async def _hidden_competition_ids(student_id: int, competitions: List[Dict]) -> List[str]:
+    """ID соревнований, на все дистанции которых ученик уже зарегистрирован (скрываются из поиска)"""
+    import aiosqlite
+    import json
+    DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
+
+    hidden = []
+    async with aiosqlite.connect(DB_PATH) as db:
+        for comp in competitions:
+            comp_id_from_api = comp.get('id')
+            async with db.execute(
+                "SELECT id FROM competitions WHERE source_url = ?",
+                (comp.get('url', comp_id_from_api),)
+            ) as cursor:
+                comp_row = await cursor.fetchone()
+
+            if not comp_row:
+                continue
+
+            comp_db_id = comp_row[0]
+
+            distances_json = comp.get('distances', [])
+            if isinstance(distances_json, str):
+                try:
+                    distances = json.loads(distances_json)
+                except:
+                    distances = distances_json
+            else:
+                distances = distances_json
+
+            if not distances:
+                continue
+
+            occupied_count = 0
+            for dist in distances:
+                if isinstance(dist, dict):
+                    distance_km = dist.get('distance', 0)
+                    distance_name = dist.get('name', str(distance_km))
+                else:
+                    distance_km = float(dist)
+                    distance_name = str(dist)
+
+                async with db.execute(
+                    """
+                    SELECT id FROM competition_participants
+                    WHERE user_id = ? AND competition_id = ? AND distance = ? AND distance_name = ?
+                    """,
+                    (student_id, comp_db_id, distance_km, distance_name)
+                ) as cursor:
+                    reg_row = await cursor.fetchone()
+                    if reg_row:
+                        occupied_count += 1
+
+            if occupied_count >= len(distances):
+                logger.info(f"Skipping competition '{comp.get('title')}' - all distances occupied for student {student_id}")
+                hidden.append(comp['id'])
+
+    return hidden
+
+
+async def show_coach_competitions_results(message: Message, state: FSMContext, page: int = 1, new_search: bool = True):
+    """
+    Показать результаты поиска соревнований для тренера
+
+    Результат поиска берется из общего хранилища (competitions.result_sets),
+    поэтому переход по страницам не обращается к сервисам соревнований.
+    """
     data = await state.get_data()
-    city = data.get('city')
     city_display = data.get('city_display', 'Все города')
-    sport = data.get('sport')
     sport_display = data.get('sport_display', 'Все виды спорта')
-    period_months = data.get('period_months', 1)
     period_display = data.get('period_display', '1 месяц')
-    service = data.get('service')
     service_display = data.get('service_display', 'Все сервисы')
     student_display_name = data.get('student_display_name', '')
     student_id = data.get('student_id')
@@ -355,97 +418,34 @@ async def show_coach_competitions_results(message: Message, state: FSMContext, p
     settings = await get_user_settings(user_id)
     date_format = settings.get('date_format', 'ДД.ММ.ГГГГ') if settings else 'ДД.ММ.ГГГГ'
 
-    loading_text = (
-        f"🔍 <b>Поиск соревнований...</b>\n\n"
-        f"Ученик: <b>{student_display_name}</b>\n"
-        f"📍 Город: <b>{city_display}</b>\n"
-        f"📅 Период: <b>{period_display}</b>\n"
-        f"🏃 Спорт: <b>{sport_display}</b>\n"
-        f"🌐 Сервис: <b>{service_display}</b>"
-    )
-
-    try:
-        await message.edit_text(loading_text, parse_mode="HTML")
-    except:
-        msg = await message.answer(loading_text, parse_mode="HTML")
-        message = msg
-
-    try:
-        logger.info(f"Coach fetching competitions: city={city}, sport={sport}, period_months={period_months}, service={service}")
-
-        all_competitions = await fetch_all_competitions(
-            city=city,
-            sport=sport,
-            limit=1000,
-            period_months=period_months,
-            service=service
+    if new_search:
+        loading_text = (
+            f"🔍 <b>Поиск соревнований...</b>\n\n"
+            f"Ученик: <b>{student_display_name}</b>\n"
+            f"📍 Город: <b>{city_display}</b>\n"
+            f"📅 Период: <b>{period_display}</b>\n"
+            f"🏃 Спорт: <b>{sport_display}</b>\n"
+            f"🌐 Сервис: <b>{service_display}</b>"
         )
 
-        logger.info(f"Received {len(all_competitions)} competitions")
-
-        import aiosqlite
-        import json
-        DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
-
-        filtered_competitions = []
-        async with aiosqlite.connect(DB_PATH) as db:
-            for comp in all_competitions:
-                comp_id_from_api = comp.get('id')
-                async with db.execute(
-                    "SELECT id FROM competitions WHERE source_url = ?",
-                    (comp.get('url', comp_id_from_api),)
-                ) as cursor:
-                    comp_row = await cursor.fetchone()
-
-                if not comp_row:
-                    filtered_competitions.append(comp)
-                    continue
-
-                comp_db_id = comp_row[0]
-
-                distances_json = comp.get('distances', [])
-                if isinstance(distances_json, str):
-                    try:
-                        distances = json.loads(distances_json)
-                    except:
-                        distances = distances_json
-                else:
-                    distances = distances_json
-
-                if not distances:
-                    filtered_competitions.append(comp)
-                    continue
+        try:
+            await message.edit_text(loading_text, parse_mode="HTML")
+        except:
+            msg = await message.answer(loading_text, parse_mode="HTML")
+            message = msg
 
-                occupied_count = 0
-                for dist in distances:
-                    if isinstance(dist, dict):
-                        distance_km = dist.get('distance', 0)
-                        distance_name = dist.get('name', str(distance_km))
-                    else:
-                        distance_km = float(dist)
-                        distance_name = str(dist)
+    try:
+        result = await get_competition_result_set(data)
 
-                    async with db.execute(
-                        """
-                        SELECT id FROM competition_participants
-                        WHERE user_id = ? AND competition_id = ? AND distance = ? AND distance_name = ?
-                        """,
-                        (student_id, comp_db_id, distance_km, distance_name)
-                    ) as cursor:
-                        reg_row = await cursor.fetchone()
-                        if reg_row:
-                            occupied_count += 1
-
-                if occupied_count < len(distances):
-                    filtered_competitions.append(comp)
-                else:
-                    logger.info(f"Skipping competition '{comp.get('title')}' - all distances occupied for student {student_id}")
+        # Скрытые соревнования (все дистанции ученика заняты) пересчитываются при новом поиске
+        hidden_ids = data.get('hidden_competition_ids')
+        if new_search or hidden_ids is None:
+            hidden_ids = await _hidden_competition_ids(student_id, result.items)
+            await state.update_data(hidden_competition_ids=hidden_ids)
 
-        all_competitions = filtered_competitions
+        all_competitions = result.visible(hidden_ids)
         logger.info(f"After filtering: {len(all_competitions)} competitions available")
 
-        await state.update_data(all_competitions=all_competitions)
-
         items_per_page = 10
         total_pages = (len(all_competitions) + items_per_page - 1) // items_per_page
 
@@ -551,7 +551,7 @@ async def coach_navigate_page(callback: CallbackQuery, state: FSMContext):
     page_str = callback.data.split(":", 2)[2]
     page = int(page_str)
 
-    await show_coach_competitions_results(callback.message, state, page)
+    await show_coach_competitions_results(callback.message, state, page, new_search=False)
     await callback.answer()
 
 
@@ -561,25 +561,16 @@ async def show_coach_competition_detail(callback: CallbackQuery, state: FSMConte
     comp_id = callback.data.split(":", 1)[1]
 
     data = await state.get_data()
-    all_competitions = data.get('all_competitions', [])
     student_display_name = data.get('student_display_name', '')
     student_id = data.get('student_id')
 
     try:
-        comp = None
-        comp_index = None
-        for idx, c in enumerate(all_competitions):
-            if c['id'] == comp_id:
-                comp = c
-                comp_index = idx
-                break
+        comp = await find_competition(data, comp_id)
 
         if not comp:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
             return
 
-        await state.update_data(current_comp_index=comp_index)
-
         user_id = callback.from_user.id
         settings = await get_user_settings(user_id)
         date_format = settings.get('date_format', 'ДД.ММ.ГГГГ') if settings else 'ДД.ММ.ГГГГ'
@@ -637,17 +628,17 @@ async def show_coach_competition_detail(callback: CallbackQuery, state: FSMConte
             if is_all_registered:
                 logger.info("Showing: ❌ Отменить участие (registered on all)")
                 builder.row(
-                    InlineKeyboardButton(text="❌ Отменить участие", callback_data=f"coach_comp:cancel:{comp_index}")
+                    InlineKeyboardButton(text="❌ Отменить участие", callback_data=f"coach_comp:cancel:{comp_id}")
                 )
             elif is_participant:
                 logger.info("Showing: ➕ Добавить дистанцию (registered on some)")
                 builder.row(
-                    InlineKeyboardButton(text="➕ Добавить дистанцию", callback_data=f"coach_comp:participate:{comp_index}")
+                    InlineKeyboardButton(text="➕ Добавить дистанцию", callback_data=f"coach_comp:participate:{comp_id}")
                 )
             else:
                 logger.info("Showing: 📩 Предложить ученику (not registered)")
                 builder.row(
-                    InlineKeyboardButton(text="📩 Предложить ученику", callback_data=f"coach_comp:participate:{comp_index}")
+                    InlineKeyboardButton(text="📩 Предложить ученику", callback_data=f"coach_comp:participate:{comp_id}")
                 )
         else:
             service = comp.get('service', '')
@@ -657,23 +648,23 @@ async def show_coach_competition_detail(callback: CallbackQuery, state: FSMConte
                 if is_participant:
                     logger.info(f"Showing: ➕ Добавить дистанцию ({service}, registered)")
                     builder.row(
-                        InlineKeyboardButton(text="➕ Добавить дистанцию", callback_data=f"coach_comp:participate:{comp_index}")
+                        InlineKeyboardButton(text="➕ Добавить дистанцию", callback_data=f"coach_comp:participate:{comp_id}")
                     )
                 else:
                     logger.info(f"Showing: 📩 Предложить ученику ({service}, not registered)")
                     builder.row(
-                        InlineKeyboardButton(text="📩 Предложить ученику", callback_data=f"coach_comp:participate:{comp_index}")
+                        InlineKeyboardButton(text="📩 Предложить ученику", callback_data=f"coach_comp:participate:{comp_id}")
                     )
             else:
                 if is_participant:
                     logger.info("Showing: ❌ Отменить участие (single registration)")
                     builder.row(
-                        InlineKeyboardButton(text="❌ Отменить участие", callback_data=f"coach_comp:cancel:{comp_index}")
+                        InlineKeyboardButton(text="❌ Отменить участие", callback_data=f"coach_comp:cancel:{comp_id}")
                     )
                 else:
                     logger.info("Showing: 📩 Предложить ученику (single registration)")
                     builder.row(
-                        InlineKeyboardButton(text="📩 Предложить ученику", callback_data=f"coach_comp:participate:{comp_index}")
+                        InlineKeyboardButton(text="📩 Предложить ученику", callback_data=f"coach_comp:participate:{comp_id}")
                     )
 
         builder.row(
@@ -699,12 +690,10 @@ async def show_coach_competition_detail(callback: CallbackQuery, state: FSMConte
 @router.callback_query(F.data.startswith("coach_comp:participate:"))
 async def coach_participate_in_competition(callback: CallbackQuery, state: FSMContext):
     """Начать процесс регистрации ученика на соревнование"""
-    comp_index_str = callback.data.split(":", 2)[2]
-    comp_index = int(comp_index_str)
+    comp_id = callback.data.split(":", 2)[2]
 
     try:
         data = await state.get_data()
-        all_competitions = data.get('all_competitions', [])
         student_id = data.get('student_id')
         student_display_name = data.get('student_display_name', '')
 
@@ -713,14 +702,13 @@ async def coach_participate_in_competition(callback: CallbackQuery, state: FSMCo
             await callback.answer("Нет доступа", show_alert=True)
             return
 
-        if comp_index >= len(all_competitions):
+        comp = await find_competition(data, comp_id)
+
+        if not comp:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
             return
 
-        comp = all_competitions[comp_index]
-        comp_id = comp['id']
-
-        await state.update_data(pending_competition_id=comp_id, current_comp_index=comp_index)
+        await state.update_data(pending_competition_id=comp_id)
 
         distances = comp.get('distances', [])
 
@@ -746,7 +734,7 @@ async def coach_participate_in_competition(callback: CallbackQuery, state: FSMCo
                     callback_data = f"coach_comp:already_registered:{i}"
                 else:
                     button_text = f"☐ {converted_name}"
-                    callback_data = f"coach_comp:toggle_dist:{comp_index}:{i}"
+                    callback_data = f"coach_comp:toggle_dist:{comp_id}:{i}"
 
                 builder.row(InlineKeyboardButton(
                     text=button_text,
@@ -755,7 +743,7 @@ async def coach_participate_in_competition(callback: CallbackQuery, state: FSMCo
 
             builder.row(InlineKeyboardButton(
                 text="✅ Продолжить",
-                callback_data=f"coach_comp:confirm_distances:{comp_index}"
+                callback_data=f"coach_comp:confirm_distances:{comp_id}"
             ))
             builder.row(InlineKeyboardButton(text="◀️ Назад", callback_data=f"coach_compdetail:{comp_id}"))
 
@@ -838,12 +826,10 @@ async def coach_cancel_participation(callback: CallbackQuery, state: FSMContext)
     """Отменить участие ученика в соревновании"""
     from database.queries import remove_competition_participant
 
-    comp_index_str = callback.data.split(":", 2)[2]
-    comp_index = int(comp_index_str)
+    comp_id = callback.data.split(":", 2)[2]
 
     try:
         data = await state.get_data()
-        all_competitions = data.get('all_competitions', [])
         student_id = data.get('student_id')
 
         coach_id = callback.from_user.id
@@ -851,13 +837,12 @@ async def coach_cancel_participation(callback: CallbackQuery, state: FSMContext)
             await callback.answer("Нет доступа", show_alert=True)
             return
 
-        if comp_index >= len(all_competitions):
+        comp = await find_competition(data, comp_id)
+
+        if not comp:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
             return
 
-        comp = all_competitions[comp_index]
-        comp_id = comp['id']
-
         await remove_competition_participant(student_id, comp.get('url', comp_id))
 
         await callback.answer(
@@ -887,21 +872,19 @@ async def coach_toggle_distance_selection(callback: CallbackQuery, state: FSMCon
     """Toggle distance selection для тренера"""
     try:
         parts = callback.data.split(":", 3)
-        comp_index = int(parts[2])
+        comp_id = parts[2]
         distance_idx = int(parts[3])
 
         data = await state.get_data()
         selected_distances = data.get('selected_distances', [])
         registered_distances = data.get('registered_distances', [])
-        all_competitions = data.get('all_competitions', [])
         student_display_name = data.get('student_display_name', '')
+        competition = await find_competition(data, comp_id)
 
-        if comp_index >= len(all_competitions):
+        if not competition:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
             return
 
-        competition = all_competitions[comp_index]
-        comp_id = competition['id']
         distances = competition.get('distances', [])
 
         if distance_idx in registered_distances:
@@ -936,7 +919,7 @@ async def coach_toggle_distance_selection(callback: CallbackQuery, state: FSMCon
             else:
                 checkbox = "✓" if i in selected_distances else "☐"
                 button_text = f"{checkbox} {converted_name}"
-                callback_data = f"coach_comp:toggle_dist:{comp_index}:{i}"
+                callback_data = f"coach_comp:toggle_dist:{comp_id}:{i}"
 
             builder.row(InlineKeyboardButton(
                 text=button_text,
@@ -945,7 +928,7 @@ async def coach_toggle_distance_selection(callback: CallbackQuery, state: FSMCon
 
         builder.row(InlineKeyboardButton(
             text="✅ Продолжить",
-            callback_data=f"coach_comp:confirm_distances:{comp_index}"
+            callback_data=f"coach_comp:confirm_distances:{comp_id}"
         ))
         builder.row(InlineKeyboardButton(text="◀️ Назад", callback_data=f"coach_compdetail:{comp_id}"))
 
@@ -961,8 +944,7 @@ async def coach_toggle_distance_selection(callback: CallbackQuery, state: FSMCon
 async def coach_confirm_distances_selection(callback: CallbackQuery, state: FSMContext):
     """Подтверждение выбора дистанций для ученика"""
     try:
-        comp_index_str = callback.data.split(":", 2)[2]
-        comp_index = int(comp_index_str)
+        comp_id = callback.data.split(":", 2)[2]
 
         data = await state.get_data()
         selected_distances = data.get('selected_distances', [])
@@ -971,14 +953,12 @@ async def coach_confirm_distances_selection(callback: CallbackQuery, state: FSMC
             await callback.answer("⚠️ Выберите хотя бы одну дистанцию", show_alert=True)
             return
 
-        all_competitions = data.get('all_competitions', [])
+        competition = await find_competition(data, comp_id)
 
-        if comp_index >= len(all_competitions):
+        if not competition:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
             return
 
-        competition = all_competitions[comp_index]
-        comp_id = competition['id']
         distances = competition.get('distances', [])
 
         distances_to_process = []
@@ -1059,10 +1039,9 @@ async def coach_prompt_for_distance_time(callback: CallbackQuery, state: FSMCont
             callback_data=f"coach_comp:back_dist_time:{index-1}"
         ))
     elif len(distances_to_process) > 1:
-        comp_index_val = data.get('current_comp_index', 0)
         builder.row(InlineKeyboardButton(
             text="◀️ К выбору дистанций",
-            callback_data=f"coach_comp:participate:{comp_index_val}"
+            callback_data=f"coach_comp:participate:{comp_id}"
         ))
     else:
         builder.row(InlineKeyboardButton(
@@ -1380,14 +1359,13 @@ async def coach_skip_target_time(callback: CallbackQuery, state: FSMContext):
 
     try:
         data = await state.get_data()
-        all_competitions = data.get('all_competitions', [])
         selected_distance = data.get('selected_distance')
         selected_distance_name = data.get('selected_distance_name')
         student_id = data.get('student_id')
         student_display_name = data.get('student_display_name', '')
         coach_id = callback.from_user.id
 
-        comp = next((c for c in all_competitions if c['id'] == comp_id), None)
+        comp = await find_competition(data, comp_id)
 
         if not comp:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
@@ -1660,10 +1638,9 @@ async def coach_process_target_time(message: Message, state: FSMContext):
                         callback_data=f"coach_comp:back_dist_time:{next_index-1}"
                     ))
                 elif len(distances_to_process) > 1:
-                    comp_index_val2 = data.get('current_comp_index', 0)
                     builder.row(InlineKeyboardButton(
                         text="◀️ К выбору дистанций",
-                        callback_data=f"coach_comp:participate:{comp_index_val2}"
+                        callback_data=f"coach_comp:participate:{comp_id_val}"
                     ))
                 else:
                     builder.row(InlineKeyboardButton(
@@ -1686,7 +1663,6 @@ async def coach_process_target_time(message: Message, state: FSMContext):
 
         else:
             comp_id = data.get('pending_competition_id')
-            all_competitions = data.get('all_competitions', [])
             selected_distance = data.get('selected_distance')
             selected_distance_name = data.get('selected_distance_name', '')
             coach_id = message.from_user.id
@@ -1695,7 +1671,7 @@ async def coach_process_target_time(message: Message, state: FSMContext):
                 await message.answer("❌ Ошибка: соревнование не найдено")
                 return
 
-            comp = next((c for c in all_competitions if c['id'] == comp_id), None)
+            comp = await find_competition(data, comp_id)
 
             if not comp:
                 await message.answer("❌ Соревнование не найдено")
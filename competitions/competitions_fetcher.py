@@ -44,70 +44,70 @@ async def fetch_all_competitions(
 
     if use_russiarunning:
         try:
-            logger.info("Fetching competitions from RussiaRunning...")
+            logger.debug("Fetching competitions from RussiaRunning...")
             russiarunning_comps = await fetch_russiarunning(
                 city=city,
                 sport=sport,
                 limit=limit if service == "RussiaRunning" else 1000,  
                 period_months=period_months
             )
-            logger.info(f"Received {len(russiarunning_comps)} competitions from RussiaRunning")
+            logger.debug(f"Received {len(russiarunning_comps)} competitions from RussiaRunning")
             all_competitions.extend(russiarunning_comps)
         except Exception as e:
             logger.error(f"Error fetching from RussiaRunning: {e}")
 
     if use_timerman:
         try:
-            logger.info("Fetching competitions from Timerman...")
+            logger.debug("Fetching competitions from Timerman...")
             timerman_comps = await fetch_timerman(
                 city=city,
                 sport=sport,
                 limit=limit if service == "Timerman" else 1000,
                 period_months=period_months
             )
-            logger.info(f"Received {len(timerman_comps)} competitions from Timerman")
+            logger.debug(f"Received {len(timerman_comps)} competitions from Timerman")
             all_competitions.extend(timerman_comps)
         except Exception as e:
             logger.error(f"Error fetching from Timerman: {e}")
 
     if use_heroleague:
         try:
-            logger.info("Fetching competitions from HeroLeague...")
+            logger.debug("Fetching competitions from HeroLeague...")
             heroleague_comps = await fetch_heroleague(
                 city=city,
                 sport=sport,
                 limit=limit if service == "HeroLeague" else 1000,
                 period_months=period_months
             )
-            logger.info(f"Received {len(heroleague_comps)} competitions from HeroLeague")
+            logger.debug(f"Received {len(heroleague_comps)} competitions from HeroLeague")
             all_competitions.extend(heroleague_comps)
         except Exception as e:
             logger.error(f"Error fetching from HeroLeague: {e}")
 
     if use_regplace:
         try:
-            logger.info("Fetching competitions from reg.place...")
+            logger.debug("Fetching competitions from reg.place...")
             regplace_comps = await fetch_regplace(
                 city=city,
                 sport=sport,
                 limit=limit if service == "reg.place" else 1000,
                 period_months=period_months
             )
-            logger.info(f"Received {len(regplace_comps)} competitions from reg.place")
+            logger.debug(f"Received {len(regplace_comps)} competitions from reg.place")
             all_competitions.extend(regplace_comps)
         except Exception as e:
             logger.error(f"Error fetching from reg.place: {e}")
 
     if use_runc:
         try:
-            logger.info("Fetching competitions from RunC...")
+            logger.debug("Fetching competitions from RunC...")
             runc_comps = await fetch_runc(
                 city=city,
                 sport=sport,
                 limit=limit if service == "RunC" else 1000,
                 period_months=period_months
             )
-            logger.info(f"Received {len(runc_comps)} competitions from RunC")
+            logger.debug(f"Received {len(runc_comps)} competitions from RunC")
             all_competitions.extend(runc_comps)
         except Exception as e:
             logger.error(f"Error fetching from RunC: {e}")
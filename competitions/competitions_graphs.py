@@ -17,26 +17,19 @@ from collections import defaultdict
 import io
 import logging
 
+from utils.time_formatter import parse_duration
+
 logger = logging.getLogger(__name__)
 
 plt.rcParams['font.family'] = 'DejaVu Sans'
 
 
-def _time_to_seconds(time_str: str) -> int:
-    """Конвертировать время HH:MM:SS в секунды"""
-    if not time_str:
-        return 0
-    try:
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            hours, minutes, seconds = map(int, parts)
-            return hours * 3600 + minutes * 60 + seconds
-        elif len(parts) == 2:
-            minutes, seconds = map(int, parts)
-            return minutes * 60 + seconds
-        return 0
-    except (ValueError, IndexError):
-        return 0
+def _finish_seconds(p: Dict[str, Any]) -> float:
+    """Время финиша в секундах (из колонки finish_seconds, если она есть в выборке)"""
+    seconds = p.get('finish_seconds')
+    if seconds is None:
+        seconds = parse_duration(p.get('finish_time'))
+    return seconds or 0
 
 
 def _seconds_to_time(seconds: int) -> str:
@@ -108,7 +101,7 @@ async def generate_competitions_graphs(
                 if distance not in standard_distances:
                     continue
                 date_obj = datetime.strptime(p['date'], '%Y-%m-%d')
-                time_seconds = _time_to_seconds(p['finish_time'])
+                time_seconds = _finish_seconds(p)
                 if time_seconds > 0:
                     by_distance[distance].append((date_obj, time_seconds))
 
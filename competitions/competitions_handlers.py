@@ -27,7 +27,7 @@ from competitions.competitions_queries import (
     register_for_competition,
     unregister_from_competition,
     is_user_registered,
-    get_user_competitions,
+    get_user_competitions_page,
     add_competition_result,
     get_competition_participants_count,
     get_user_personal_records,
@@ -427,28 +427,37 @@ async def register_user_for_competition(callback: CallbackQuery, state: FSMConte
 
 
 @router.callback_query(F.data == "comp:my")
-async def show_my_competitions(callback: CallbackQuery, state: FSMContext, page: int = 1):
-    """Показать предстоящие соревнования пользователя с пагинацией"""
+async def show_my_competitions(callback: CallbackQuery, state: FSMContext, page: int = 1,
+                               cursor: int = None, backward: bool = False):
+    """
+    Показать предстоящие соревнования пользователя с пагинацией
+
+    Args:
+        page: Номер страницы (для отображения)
+        cursor: ID участия на границе соседней страницы (None - первая страница)
+        backward: True - страница перед курсором
+    """
     import logging
     logger = logging.getLogger(__name__)
 
     user_id = callback.from_user.id
     logger.info(f"show_my_competitions called for user_id={user_id}, page={page}")
 
-    all_competitions = await get_user_competitions(user_id, status_filter='upcoming')
-    logger.info(f"Got {len(all_competitions)} upcoming competitions for user {user_id}")
-
     ITEMS_PER_PAGE = 10
-    total_pages = (len(all_competitions) + ITEMS_PER_PAGE - 1) // ITEMS_PER_PAGE if all_competitions else 1
-    page = max(1, min(page, total_pages))  
+    result = await get_user_competitions_page(
+        user_id, status_filter='upcoming', cursor=cursor, backward=backward, limit=ITEMS_PER_PAGE
+    )
+    if not result['items'] and cursor is not None:
+        # Участие на границе страницы удалено - начинаем с первой страницы
+        page = 1
+        result = await get_user_competitions_page(user_id, status_filter='upcoming', limit=ITEMS_PER_PAGE)
 
+    competitions = result['items']
+    page = max(1, page)
     start_idx = (page - 1) * ITEMS_PER_PAGE
-    end_idx = start_idx + ITEMS_PER_PAGE
-    competitions = all_competitions[start_idx:end_idx]
-
-    logger.info(f"Showing page {page}/{total_pages}, competitions {start_idx+1}-{min(end_idx, len(all_competitions))} of {len(all_competitions)}")
+    has_pages = result['has_prev'] or result['has_next']
 
-    if not all_competitions:
+    if not competitions:
         text = (
             "✅ <b>МОИ СОРЕВНОВАНИЯ</b>\n\n"
             "У вас пока нет запланированных соревнований.\n\n"
@@ -483,8 +492,8 @@ async def show_my_competitions(callback: CallbackQuery, state: FSMContext, page:
                 parse_mode="HTML"
             )
     else:
-        if total_pages > 1:
-            text = f"✅ <b>МОИ СОРЕВНОВАНИЯ</b> (стр. {page}/{total_pages})\n\n"
+        if has_pages:
+            text = f"✅ <b>МОИ СОРЕВНОВАНИЯ</b> (стр. {page})\n\n"
         else:
             text = "✅ <b>МОИ СОРЕВНОВАНИЯ</b>\n\n"
 
@@ -588,18 +597,24 @@ async def show_my_competitions(callback: CallbackQuery, state: FSMContext, page:
                 )
             )
 
-        if total_pages > 1:
+        if has_pages:
             pagination_buttons = []
-            if page > 1:
+            if result['has_prev']:
                 pagination_buttons.append(
-                    InlineKeyboardButton(text="⬅️ Назад", callback_data=f"comp:my_page:{page-1}")
+                    InlineKeyboardButton(
+                        text="⬅️ Назад",
+                        callback_data=f"comp:my_page:p:{page-1}:{competitions[0]['participant_id']}"
+                    )
                 )
             pagination_buttons.append(
-                InlineKeyboardButton(text=f"{page}/{total_pages}", callback_data="comp:my_noop")
+                InlineKeyboardButton(text=f"{page}", callback_data="comp:my_noop")
             )
-            if page < total_pages:
+            if result['has_next']:
                 pagination_buttons.append(
-                    InlineKeyboardButton(text="Вперед ➡️", callback_data=f"comp:my_page:{page+1}")
+                    InlineKeyboardButton(
+                        text="Вперед ➡️",
+                        callback_data=f"comp:my_page:n:{page+1}:{competitions[-1]['participant_id']}"
+                    )
                 )
             builder.row(*pagination_buttons)
 
@@ -628,9 +643,15 @@ async def show_my_competitions(callback: CallbackQuery, state: FSMContext, page:
 
 @router.callback_query(F.data.startswith("comp:my_page:"))
 async def my_competitions_pagination(callback: CallbackQuery, state: FSMContext):
-    """Handle pagination for my competitions"""
-    page = int(callback.data.split(":")[2])
-    await show_my_competitions(callback, state, page=page)
+    """Handle pagination for my competitions: comp:my_page:<n|p>:<page>:<cursor>"""
+    parts = callback.data.split(":")
+    if len(parts) != 5:
+        # Кнопки старого формата (номер страницы) - открываем первую страницу
+        await show_my_competitions(callback, state)
+        return
+
+    direction, page, cursor = parts[2], int(parts[3]), int(parts[4])
+    await show_my_competitions(callback, state, page=page, cursor=cursor, backward=direction == 'p')
 
 
 @router.callback_query(F.data == "comp:my_noop")
@@ -1468,7 +1489,7 @@ async def process_target_time_edit(message: Message, state: FSMContext):
             parse_mode="HTML"
         )
 
-        all_competitions = await get_user_competitions(user_id, status_filter='upcoming')
+        all_competitions = (await get_user_competitions_page(user_id, status_filter='upcoming'))['items']
 
         if not all_competitions:
             text = (
@@ -1751,15 +1772,27 @@ async def show_my_results_period(callback: CallbackQuery, state: FSMContext):
     await show_my_results_with_period(callback, state, period)
 
 
-async def show_my_results_with_period(callback: CallbackQuery, state: FSMContext, period: str = "all"):
+@router.callback_query(F.data.startswith("comp:my_res_page:"))
+async def my_results_pagination(callback: CallbackQuery, state: FSMContext):
+    """Пагинация результатов: comp:my_res_page:<период>:<n|p>:<страница>:<курсор>"""
+    _, _, period, direction, page, cursor = callback.data.split(":")
+    await show_my_results_with_period(
+        callback, state, period, page=int(page), cursor=int(cursor), backward=direction == 'p'
+    )
+
+
+async def show_my_results_with_period(callback: CallbackQuery, state: FSMContext, period: str = "all",
+                                      page: int = 1, cursor: int = None, backward: bool = False):
     """
     Показать завершенные соревнования за выбранный период
 
     Args:
         period: "all", "year", "6months", "month"
+        page: Номер страницы (для отображения)
+        cursor: ID участия на границе соседней страницы (None - первая страница)
+        backward: True - страница перед курсором
     """
     user_id = callback.from_user.id
-    from competitions.competitions_queries import get_user_competitions_by_period
     from utils.time_formatter import calculate_pace
     from datetime import datetime, timedelta
 
@@ -1785,11 +1818,20 @@ async def show_my_results_with_period(callback: CallbackQuery, state: FSMContext
         date_from = datetime(year, now.month, 1)
         period_name = "За год"
 
-    if period == "all":
-        from competitions.competitions_queries import get_user_competitions
-        finished_comps = await get_user_competitions(user_id, status_filter='finished')
-    else:
-        finished_comps = await get_user_competitions_by_period(user_id, date_from)
+    ITEMS_PER_PAGE = 10
+    result = await get_user_competitions_page(
+        user_id, status_filter='finished', date_from=date_from,
+        cursor=cursor, backward=backward, limit=ITEMS_PER_PAGE
+    )
+    if not result['items'] and cursor is not None:
+        # Участие на границе страницы удалено - начинаем с первой страницы
+        page = 1
+        result = await get_user_competitions_page(
+            user_id, status_filter='finished', date_from=date_from, limit=ITEMS_PER_PAGE
+        )
+
+    finished_comps = result['items']
+    has_pages = result['has_prev'] or result['has_next']
 
     if not finished_comps:
         text = (
@@ -1801,7 +1843,8 @@ async def show_my_results_with_period(callback: CallbackQuery, state: FSMContext
         text = f"🏅 <b>МОИ РЕЗУЛЬТАТЫ - {period_name}</b>\n\n"
 
         if finished_comps:
-            text += f"🏁 <b>ЗАВЕРШЕННЫЕ СОРЕВНОВАНИЯ</b> ({len(finished_comps)})\n\n"
+            text += "🏁 <b>ЗАВЕРШЕННЫЕ СОРЕВНОВАНИЯ</b>"
+            text += f" (стр. {page})\n\n" if has_pages else "\n\n"
 
             from utils.date_formatter import get_user_date_format, DateFormatter
             from competitions.competitions_utils import format_competition_distance as format_dist_with_units
@@ -1812,7 +1855,7 @@ async def show_my_results_with_period(callback: CallbackQuery, state: FSMContext
             settings = await get_user_settings(user_id)
             distance_unit = settings.get('distance_unit', 'км') if settings else 'км'
 
-            for i, comp in enumerate(finished_comps, 1):
+            for i, comp in enumerate(finished_comps, (page - 1) * ITEMS_PER_PAGE + 1):
                 distance_name = comp.get('distance_name')
                 is_simple_number = False
                 if distance_name:
@@ -1861,7 +1904,7 @@ async def show_my_results_with_period(callback: CallbackQuery, state: FSMContext
                                 ) as cursor:
                                     row = await cursor.fetchone()
                                     gender = row[0] if row and row[0] else 'male'
-                            time_sec = time_to_seconds(comp['finish_time'])
+                            time_sec = comp.get('finish_seconds') or time_to_seconds(comp['finish_time'])
 
                             kwargs = {}
                             if sport_type and sport_type.lower().startswith('пла'):
@@ -1890,6 +1933,24 @@ async def show_my_results_with_period(callback: CallbackQuery, state: FSMContext
         InlineKeyboardButton(text="➕ Добавить прошедшее соревнование", callback_data=f"comp:add_past:{period}")
     )
 
+    if has_pages:
+        pagination_buttons = []
+        if result['has_prev']:
+            pagination_buttons.append(
+                InlineKeyboardButton(
+                    text="⬅️ Назад",
+                    callback_data=f"comp:my_res_page:{period}:p:{page-1}:{finished_comps[0]['participant_id']}"
+                )
+            )
+        if result['has_next']:
+            pagination_buttons.append(
+                InlineKeyboardButton(
+                    text="Вперед ➡️",
+                    callback_data=f"comp:my_res_page:{period}:n:{page+1}:{finished_comps[-1]['participant_id']}"
+                )
+            )
+        builder.row(*pagination_buttons)
+
     if finished_comps:
         builder.row(
             InlineKeyboardButton(text="🗑️ Удалить результат", callback_data="comp:delete_result_menu")
@@ -2,7 +2,6 @@
 Загрузка соревнований из Russia Running API и runc.run
 """
 
-import aiohttp
 import asyncio
 import json
 import logging
@@ -11,6 +10,7 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from bs4 import BeautifulSoup
 from competitions.competitions_queries import add_competition
+from utils.http_client import http_client
 
 logger = logging.getLogger(__name__)
 
@@ -60,21 +60,20 @@ class RussiaRunningAPI:
             if month:
                 params['month'] = month
 
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.EVENTS_URL,
-                    headers=self.headers,
-                    params=params,
-                    timeout=10
-                ) as response:
-
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"Loaded {len(data)} events from Russia Running API")
-                        return data
-                    else:
-                        logger.warning(f"Russia Running API returned status {response.status}, using test data")
-                        return self._get_test_data(city, year, month)
+            async with http_client.get(
+                self.EVENTS_URL,
+                headers=self.headers,
+                params=params,
+                timeout=10
+            ) as response:
+
+                if response.status == 200:
+                    data = await response.json()
+                    logger.info(f"Loaded {len(data)} events from Russia Running API")
+                    return data
+                else:
+                    logger.warning(f"Russia Running API returned status {response.status}, using test data")
+                    return self._get_test_data(city, year, month)
 
         except Exception as e:
             logger.warning(f"Russia Running API unavailable: {e}, using test data")
@@ -453,18 +452,17 @@ class RunCRunParser:
             Список соревнований в формате БД
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.BASE_URL,
-                    headers=self.headers,
-                    timeout=15
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(f"RunC.Run returned status {response.status}")
-                        return []
-
-                    html = await response.text()
-                    return self._parse_html(html)
+            async with http_client.get(
+                self.BASE_URL,
+                headers=self.headers,
+                timeout=15
+            ) as response:
+                if response.status != 200:
+                    logger.warning(f"RunC.Run returned status {response.status}")
+                    return []
+
+                html = await response.text()
+                return self._parse_html(html)
 
         except Exception as e:
             logger.error(f"Failed to fetch runc.run competitions: {e}")
@@ -702,18 +700,17 @@ class RegPlaceParser:
             Список соревнований в формате БД
         """
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.BASE_URL,
-                    headers=self.headers,
-                    timeout=15
-                ) as response:
-                    if response.status != 200:
-                        logger.warning(f"Reg.place returned status {response.status}")
-                        return []
-
-                    html = await response.text()
-                    return self._parse_html(html)
+            async with http_client.get(
+                self.BASE_URL,
+                headers=self.headers,
+                timeout=15
+            ) as response:
+                if response.status != 200:
+                    logger.warning(f"Reg.place returned status {response.status}")
+                    return []
+
+                html = await response.text()
+                return self._parse_html(html)
 
         except Exception as e:
             logger.error(f"Failed to fetch reg.place competitions: {e}")
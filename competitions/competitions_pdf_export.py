@@ -161,7 +161,8 @@ async def create_competitions_pdf(user_id: int, period_param: str) -> BytesIO:
         rightMargin=2*cm,
         leftMargin=2*cm,
         topMargin=2*cm,
-        bottomMargin=2*cm
+        bottomMargin=2*cm,
+        invariant=1
     )
 
     styles = getSampleStyleSheet()
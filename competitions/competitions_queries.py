@@ -4,11 +4,13 @@
 
 import aiosqlite
 import os
+import re
 import json
 import logging
 from datetime import datetime, date
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from utils.time_formatter import normalize_time
+from competitions.statistics_queries import begin_stats_change, apply_stats_change
 
 logger = logging.getLogger(__name__)
 
@@ -247,7 +249,7 @@ async def get_student_competitions_for_coach(
 
         async with db.execute(
             f"""
-            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time,
+            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time, cp.target_seconds, cp.finish_seconds,
                    cp.place_overall, cp.place_age_category, cp.age_category,
                    cp.result_comment, cp.result_photo, cp.heart_rate, cp.qualification, cp.status as participant_status,
                    cp.registered_at, cp.result_added_at, cp.proposal_status,
@@ -273,6 +275,32 @@ async def get_student_competitions_for_coach(
             return competitions
 
 
+def _fts_match_query(query: str) -> Optional[str]:
+    """
+    Поисковый запрос FTS5: все слова запроса, каждое как префикс
+
+    Регистр приводит индекс, 'ё' заменяется на 'е' так же, как при индексации.
+
+    Returns:
+        Выражение для MATCH или None, если в запросе нет слов
+    """
+    words = re.findall(r'\w+', query.lower().replace('ё', 'е'))
+    if not words:
+        return None
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _month_range(year: int, month: Optional[int] = None) -> Tuple[str, str]:
+    """Границы месяца (или года) [начало, конец) в формате дат таблицы competitions"""
+    if month:
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    else:
+        start = date(year, 1, 1)
+        end = date(year + 1, 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
 async def search_competitions(
     query: str = None,
     city: str = None,
@@ -284,8 +312,12 @@ async def search_competitions(
     """
     Поиск соревнований по различным критериям
 
+    Текстовый поиск идет по полнотекстовому индексу competitions_fts
+    (название, город, место, организатор) с префиксным совпадением слов,
+    результаты упорядочены по релевантности, затем по дате.
+
     Args:
-        query: Поисковый запрос (по названию)
+        query: Поисковый запрос (по названию, городу, месту, организатору)
         city: Город
         month: Месяц (1-12)
         year: Год
@@ -300,26 +332,32 @@ async def search_competitions(
 
         # Строим динамический запрос
         # Только официальные соревнования (is_official = 1)
-        conditions = ["date >= date('now')", "is_official = 1"]
+        source = "competitions AS c"
+        conditions = ["c.is_official = 1", "c.date >= date('now')"]
         params = []
+        order_by = "c.date ASC"
 
         if query:
-            conditions.append("(name LIKE ? OR city LIKE ?)")
-            params.extend([f"%{query}%", f"%{query}%"])
+            match = _fts_match_query(query)
+            if match is None:
+                return []
+            source += " JOIN competitions_fts ON competitions_fts.rowid = c.id"
+            conditions.append("competitions_fts MATCH ?")
+            params.append(match)
+            # Совпадение в названии весит больше, чем в городе, месте и организаторе
+            order_by = "bm25(competitions_fts, 10.0, 5.0, 2.0, 1.0), c.date ASC"
 
         if city:
-            conditions.append("city = ?")
+            conditions.append("c.city = ?")
             params.append(city)
 
-        if month and year:
-            conditions.append("strftime('%Y-%m', date) = ?")
-            params.append(f"{year:04d}-{month:02d}")
-        elif year:
-            conditions.append("strftime('%Y', date) = ?")
-            params.append(str(year))
+        # Диапазон дат вместо strftime() - использует индекс по дате
+        if year:
+            conditions.append("c.date >= ? AND c.date < ?")
+            params.extend(_month_range(year, month))
 
         if competition_type:
-            conditions.append("type = ?")
+            conditions.append("c.type = ?")
             params.append(competition_type)
 
         where_clause = " AND ".join(conditions)
@@ -327,9 +365,9 @@ async def search_competitions(
 
         async with db.execute(
             f"""
-            SELECT * FROM competitions
+            SELECT c.* FROM {source}
             WHERE {where_clause}
-            ORDER BY date ASC
+            ORDER BY {order_by}
             LIMIT ?
             """,
             params
@@ -381,7 +419,7 @@ async def get_student_competitions_for_coach(
         # Получаем ВСЕ соревнования ученика, включая pending и rejected proposals
         async with db.execute(
             f"""
-            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time,
+            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time, cp.target_seconds, cp.finish_seconds,
                    cp.place_overall, cp.place_age_category, cp.age_category,
                    cp.result_comment, cp.result_photo, cp.heart_rate, cp.qualification, cp.status as participant_status,
                    cp.registered_at, cp.result_added_at, cp.proposal_status,
@@ -634,93 +672,164 @@ async def update_target_time(
 
 async def get_user_competitions(
     user_id: int,
-    status_filter: str = None
+    status_filter: str = None,
+    competition_id: int = None
 ) -> List[Dict[str, Any]]:
     """
     Получить соревнования пользователя
 
+    Для списков с пагинацией используйте get_user_competitions_page.
+
     Args:
         user_id: ID пользователя
         status_filter: Фильтр по статусу ('upcoming', 'finished')
+        competition_id: Только участия в этом соревновании (карточка результата)
 
     Returns:
         Список соревнований с данными участия
     """
-    import logging
-    logger = logging.getLogger(__name__)
-
     async with aiosqlite.connect(DB_PATH) as db:
         db.row_factory = aiosqlite.Row
 
-        if status_filter == 'upcoming':
-            date_condition = "c.date >= date('now')"
-        elif status_filter == 'finished':
-            date_condition = "c.date < date('now')"
-        else:
-            date_condition = "1=1"
-
-        # Добавим логирование для диагностики
-        logger.info(f"get_user_competitions: user_id={user_id}, status_filter={status_filter}, date_condition={date_condition}")
-
-        # Сначала проверим, есть ли вообще записи в competition_participants для этого пользователя
-        async with db.execute(
-            "SELECT COUNT(*) FROM competition_participants WHERE user_id = ?",
-            (user_id,)
-        ) as cursor:
-            count_row = await cursor.fetchone()
-            logger.info(f"Total competition_participants records for user {user_id}: {count_row[0]}")
-
-        # Проверим записи без фильтра по дате
-        async with db.execute(
-            """
-            SELECT c.id, c.name, c.date, cp.distance, cp.distance_name
-            FROM competitions c
-            JOIN competition_participants cp ON c.id = cp.competition_id
-            WHERE cp.user_id = ?
-            """,
-            (user_id,)
-        ) as cursor:
-            all_rows = await cursor.fetchall()
-            logger.info(f"All competitions for user (no date filter): {len(all_rows)}")
-            for row in all_rows:
-                logger.info(f"  - comp_id={row[0]}, name={row[1]}, date={row[2]}, distance={row[3]}, distance_name={row[4]}")
+        conditions = ["cp.user_id = ?", _status_condition(status_filter), _VISIBLE_PROPOSAL_CONDITION]
+        params = [user_id]
 
-        # Проверим текущую дату в SQLite
-        async with db.execute("SELECT date('now')") as cursor:
-            now_row = await cursor.fetchone()
-            logger.info(f"SQLite current date: {now_row[0]}")
+        if competition_id is not None:
+            conditions.append("c.id = ?")
+            params.append(competition_id)
 
-        # НОВАЯ УПРОЩЕННАЯ ЛОГИКА: показываем все зарегистрированные соревнования
+        # Показываем все зарегистрированные соревнования
         # Исключаем только pending (ожидают решения) и rejected (отклонены)
         async with db.execute(
             f"""
-            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time,
+            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time, cp.target_seconds, cp.finish_seconds,
                    cp.place_overall, cp.place_age_category, cp.age_category,
                    cp.result_comment, cp.result_photo, cp.heart_rate, cp.qualification, cp.status as participant_status,
                    cp.registered_at, cp.result_added_at, cp.proposal_status
             FROM competitions c
             JOIN competition_participants cp ON c.id = cp.competition_id
-            WHERE cp.user_id = ? AND {date_condition}
-              AND (cp.proposal_status IS NULL
-                   OR cp.proposal_status NOT IN ('pending', 'rejected'))
+            WHERE {" AND ".join(conditions)}
             ORDER BY c.date ASC
             """,
-            (user_id,)
+            params
         ) as cursor:
             rows = await cursor.fetchall()
-            logger.info(f"Competitions after applying filter: {len(rows)}")
             competitions = []
             for row in rows:
                 comp = dict(row)
-                if comp.get('distances'):
-                    try:
-                        comp['distances'] = json.loads(comp['distances'])
-                    except:
-                        pass
+                _decode_distances(comp)
                 competitions.append(comp)
+            logger.debug(f"get_user_competitions: user_id={user_id}, status_filter={status_filter}, rows={len(competitions)}")
             return competitions
 
 
+# Участия, ожидающие решения или отклоненные (предложения тренера), в списках не показываются
+_VISIBLE_PROPOSAL_CONDITION = "(cp.proposal_status IS NULL OR cp.proposal_status NOT IN ('pending', 'rejected'))"
+
+# Колонки для списков "Мои соревнования" и "Мои результаты" (без описаний и служебных полей)
+_LIST_COLUMNS = """
+    cp.id AS participant_id, c.id, c.name, c.date, c.sport_type, c.distances,
+    cp.distance, cp.distance_name, cp.target_time, cp.finish_time, cp.finish_seconds,
+    cp.place_overall, cp.place_age_category, cp.qualification, cp.heart_rate
+"""
+
+
+def _status_condition(status_filter: Optional[str]) -> str:
+    if status_filter == 'upcoming':
+        return "c.date >= date('now')"
+    if status_filter == 'finished':
+        return "c.date < date('now')"
+    return "1=1"
+
+
+def _decode_distances(comp: Dict[str, Any]) -> None:
+    if comp.get('distances'):
+        try:
+            comp['distances'] = json.loads(comp['distances'])
+        except:
+            pass
+
+
+async def get_user_competitions_page(
+    user_id: int,
+    status_filter: str = None,
+    date_from: Optional[datetime] = None,
+    date_to: Optional[datetime] = None,
+    cursor: Optional[int] = None,
+    backward: bool = False,
+    limit: int = 10
+) -> Dict[str, Any]:
+    """
+    Страница соревнований пользователя для списков (keyset-пагинация)
+
+    Участия упорядочены по (дата соревнования, ID участия). Курсор - ID участия
+    (competition_participants.id) первой или последней строки текущей страницы,
+    поэтому стоимость страницы не зависит от ее номера. Для списка выбираются
+    только нужные колонки, дистанции разбираются из JSON только для строк страницы.
+
+    Args:
+        user_id: ID пользователя
+        status_filter: Фильтр по статусу ('upcoming', 'finished')
+        date_from: Начало периода (опционально)
+        date_to: Конец периода (опционально)
+        cursor: ID участия, от которого строится страница (None - первая страница)
+        backward: True - страница перед курсором, False - после курсора
+        limit: Размер страницы
+
+    Returns:
+        {'items': [...], 'has_prev': bool, 'has_next': bool};
+        в каждой строке participant_id - курсор для соседних страниц
+    """
+    conditions = ["cp.user_id = ?", _status_condition(status_filter), _VISIBLE_PROPOSAL_CONDITION]
+    params: List[Any] = [user_id]
+
+    if date_from:
+        conditions.append("c.date >= ?")
+        params.append(date_from.strftime('%Y-%m-%d'))
+
+    if date_to:
+        conditions.append("c.date <= ?")
+        params.append(date_to.strftime('%Y-%m-%d'))
+
+    order = "DESC" if backward else "ASC"
+    if cursor is not None:
+        conditions.append(
+            f"(c.date, cp.id) {'<' if backward else '>'} ("
+            "SELECT c2.date, cp2.id FROM competition_participants cp2"
+            " JOIN competitions c2 ON c2.id = cp2.competition_id WHERE cp2.id = ?)"
+        )
+        params.append(cursor)
+
+    params.append(limit + 1)
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            f"""
+            SELECT {_LIST_COLUMNS}
+            FROM competition_participants cp
+            JOIN competitions c ON c.id = cp.competition_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY c.date {order}, cp.id {order}
+            LIMIT ?
+            """,
+            params
+        ) as db_cursor:
+            rows = [dict(row) for row in await db_cursor.fetchall()]
+
+    has_more = len(rows) > limit
+    items = rows[:limit]
+    if backward:
+        items.reverse()
+
+    for comp in items:
+        _decode_distances(comp)
+
+    if backward:
+        return {'items': items, 'has_prev': has_more, 'has_next': True}
+    return {'items': items, 'has_prev': cursor is not None, 'has_next': has_more}
+
+
 async def get_student_competitions_for_coach(
     student_id: int,
     status_filter: str = None
@@ -755,7 +864,7 @@ async def get_student_competitions_for_coach(
         # Получаем ВСЕ соревнования ученика, включая pending и rejected proposals
         async with db.execute(
             f"""
-            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time,
+            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time, cp.target_seconds, cp.finish_seconds,
                    cp.place_overall, cp.place_age_category, cp.age_category,
                    cp.result_comment, cp.result_photo, cp.heart_rate, cp.qualification, cp.status as participant_status,
                    cp.registered_at, cp.result_added_at, cp.proposal_status,
@@ -815,7 +924,7 @@ async def get_user_competitions_by_period(
 
         async with db.execute(
             f"""
-            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time,
+            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time, cp.target_seconds, cp.finish_seconds,
                    cp.place_overall, cp.place_age_category, cp.age_category,
                    cp.result_comment, cp.result_photo, cp.heart_rate, cp.qualification, cp.status as participant_status,
                    cp.registered_at, cp.result_added_at
@@ -873,7 +982,7 @@ async def get_student_competitions_for_coach(
         # Получаем ВСЕ соревнования ученика, включая pending и rejected proposals
         async with db.execute(
             f"""
-            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time,
+            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time, cp.target_seconds, cp.finish_seconds,
                    cp.place_overall, cp.place_age_category, cp.age_category,
                    cp.result_comment, cp.result_photo, cp.heart_rate, cp.qualification, cp.status as participant_status,
                    cp.registered_at, cp.result_added_at, cp.proposal_status,
@@ -1021,6 +1130,10 @@ async def add_competition_result(
             f"distance={distance}, qualification={qualification}"
         )
 
+        # Результат и статистика соревнований пишутся в одной транзакции
+        await db.execute("BEGIN IMMEDIATE")
+        stats_change = await begin_stats_change(db, user_id, competition_id)
+
         cursor = await db.execute(
             """
             UPDATE competition_participants
@@ -1045,6 +1158,8 @@ async def add_competition_result(
 
         # Логируем результат сохранения
         logger.info(f"[add_competition_result] Обновлено строк: {cursor.rowcount}")
+        if cursor.rowcount > 0:
+            await apply_stats_change(db, user_id, competition_id, stats_change)
         await db.commit()
 
         # Проверяем и обновляем личный рекорд
@@ -1127,7 +1242,10 @@ async def update_competition_result(
             # Если не удалось рассчитать разряд, продолжаем без него
             logger.error(f"[update_competition_result] Ошибка расчета разряда: {e}", exc_info=True)
 
-        # Обновляем только время и разряд
+        # Обновляем только время и разряд (вместе со статистикой соревнований)
+        await db.execute("BEGIN IMMEDIATE")
+        stats_change = await begin_stats_change(db, user_id, competition_id)
+
         cursor = await db.execute(
             """
             UPDATE competition_participants
@@ -1137,6 +1255,8 @@ async def update_competition_result(
             """,
             (normalized_time, qualification, user_id, competition_id)
         )
+        if cursor.rowcount > 0:
+            await apply_stats_change(db, user_id, competition_id, stats_change)
         await db.commit()
 
         # Проверяем и обновляем личный рекорд
@@ -1165,6 +1285,9 @@ async def delete_competition_result(user_id: int, competition_id: int) -> bool:
         True если удаление успешно
     """
     async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("BEGIN IMMEDIATE")
+        stats_change = await begin_stats_change(db, user_id, competition_id)
+
         cursor = await db.execute(
             """
             UPDATE competition_participants
@@ -1181,6 +1304,8 @@ async def delete_competition_result(user_id: int, competition_id: int) -> bool:
             """,
             (user_id, competition_id)
         )
+        if cursor.rowcount > 0:
+            await apply_stats_change(db, user_id, competition_id, stats_change)
         await db.commit()
 
         # Обновляем рейтинг пользователя после удаления результата
@@ -1297,55 +1422,33 @@ async def update_personal_record(
     """
     from utils.time_formatter import parse_time_to_seconds
 
-    async with aiosqlite.connect(DB_PATH) as db:
-        # Получаем текущий рекорд
-        async with db.execute(
-            "SELECT best_time FROM personal_records WHERE user_id = ? AND distance = ?",
-            (user_id, distance)
-        ) as cursor:
-            row = await cursor.fetchone()
-
-        # Преобразуем новое время в секунды для корректного сравнения
-        new_time_seconds = parse_time_to_seconds(time)
-        if new_time_seconds is None:
-            return False
-
-        # Сравниваем времена
-        if row:
-            current_best = row[0]
-            # Преобразуем текущий лучший результат в секунды
-            current_best_seconds = parse_time_to_seconds(current_best)
-            if current_best_seconds is None:
-                # Если текущий рекорд поврежден, заменяем его
-                current_best_seconds = float('inf')
-
-            # Сравниваем по секундам - меньше секунд = лучше время
-            if new_time_seconds < current_best_seconds:
-                # Обновляем рекорд
-                await db.execute(
-                    """
-                    UPDATE personal_records
-                    SET best_time = ?, competition_id = ?, qualification = ?, date = date('now'), updated_at = CURRENT_TIMESTAMP
-                    WHERE user_id = ? AND distance = ?
-                    """,
-                    (time, competition_id, qualification, user_id, distance)
-                )
-                await db.commit()
-                return True
-        else:
-            # Создаём новый рекорд
-            await db.execute(
-                """
-                INSERT INTO personal_records (user_id, distance, best_time, competition_id, qualification, date)
-                VALUES (?, ?, ?, ?, ?, date('now'))
-                """,
-                (user_id, distance, time, competition_id, qualification)
-            )
-            await db.commit()
-            return True
-
+    new_time_seconds = parse_time_to_seconds(time)
+    if new_time_seconds is None:
         return False
 
+    async with aiosqlite.connect(DB_PATH) as db:
+        # Сравнение с текущим рекордом выполняется в SQL по best_seconds:
+        # строка вставляется, если рекорда нет, и обновляется, только если новое время лучше
+        # (поврежденный рекорд с best_seconds = NULL заменяется)
+        cursor = await db.execute(
+            """
+            INSERT INTO personal_records (user_id, distance, best_time, best_seconds, competition_id, qualification, date)
+            VALUES (?, ?, ?, ?, ?, ?, date('now'))
+            ON CONFLICT(user_id, distance) DO UPDATE SET
+                best_time = excluded.best_time,
+                best_seconds = excluded.best_seconds,
+                competition_id = excluded.competition_id,
+                qualification = excluded.qualification,
+                date = date('now'),
+                updated_at = CURRENT_TIMESTAMP
+            WHERE personal_records.best_seconds IS NULL
+               OR excluded.best_seconds < personal_records.best_seconds
+            """,
+            (user_id, distance, time, new_time_seconds, competition_id, qualification)
+        )
+        await db.commit()
+        return cursor.rowcount > 0
+
 
 async def get_user_personal_records(user_id: int) -> Dict[float, Dict[str, Any]]:
     """
@@ -1470,7 +1573,7 @@ async def get_user_competitions_with_details(
                 c.id, c.name, c.date, c.city, c.country, c.location,
                 c.distances, c.type, c.sport_type, c.description, c.official_url,
                 c.organizer, c.registration_status, c.status,
-                cp.distance, cp.distance_name, cp.target_time, cp.finish_time,
+                cp.distance, cp.distance_name, cp.target_time, cp.finish_time, cp.target_seconds, cp.finish_seconds,
                 cp.place_overall, cp.place_age_category, cp.age_category,
                 cp.qualification, cp.result_comment, cp.result_photo, cp.status as participant_status
             FROM competitions c
@@ -1529,7 +1632,7 @@ async def get_student_competitions_for_coach(
         # Получаем ВСЕ соревнования ученика, включая pending и rejected proposals
         async with db.execute(
             f"""
-            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time,
+            SELECT c.*, cp.distance, cp.distance_name, cp.target_time, cp.finish_time, cp.target_seconds, cp.finish_seconds,
                    cp.place_overall, cp.place_age_category, cp.age_category,
                    cp.result_comment, cp.result_photo, cp.heart_rate, cp.qualification, cp.status as participant_status,
                    cp.registered_at, cp.result_added_at, cp.proposal_status,
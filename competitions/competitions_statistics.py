@@ -4,10 +4,11 @@
 
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
-from collections import defaultdict
 import json
 import logging
 
+from utils.time_formatter import parse_duration
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,25 +26,33 @@ def calculate_pace(distance_km: float, time_str: str) -> Optional[str]:
     if not time_str or not distance_km or distance_km <= 0:
         return None
 
-    try:
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            hours, minutes, seconds = map(int, parts)
-            total_seconds = hours * 3600 + minutes * 60 + seconds
-        elif len(parts) == 2:
-            minutes, seconds = map(int, parts)
-            total_seconds = minutes * 60 + seconds
-        else:
-            return None
+    return _format_pace(parse_duration(time_str), distance_km)
 
-        pace_seconds = total_seconds / distance_km
-        pace_minutes = int(pace_seconds // 60)
-        pace_secs = int(pace_seconds % 60)
 
-        return f"{pace_minutes:02d}:{pace_secs:02d}"
-    except (ValueError, ZeroDivisionError):
+def _format_pace(total_seconds: Optional[float], distance_km: float) -> Optional[str]:
+    """Темп (мин/км) по времени в секундах"""
+    if not total_seconds or not distance_km or distance_km <= 0:
         return None
 
+    pace_seconds = total_seconds / distance_km
+    pace_minutes = int(pace_seconds // 60)
+    pace_secs = int(pace_seconds % 60)
+
+    return f"{pace_minutes:02d}:{pace_secs:02d}"
+
+
+def _row_seconds(p: Dict[str, Any], field: str) -> Optional[float]:
+    """
+    Время из строки участия в секундах
+
+    Берется готовая колонка finish_seconds/target_seconds, строка разбирается
+    только если колонки нет в выборке
+    """
+    seconds = p.get(f'{field}_seconds')
+    if seconds is None:
+        seconds = parse_duration(p.get(f'{field}_time'))
+    return seconds
+
 
 def _normalize_sport_type(sport_type: str) -> str:
     """
@@ -72,204 +81,245 @@ def _normalize_sport_type(sport_type: str) -> str:
         return 'бег'  
 
 
-def calculate_competitions_statistics(participants: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """
-    Рассчитать статистику по соревнованиям пользователя
+# Сколько лучших мест хранится в статистике
+TOP_PLACES_LIMIT = 5
 
-    Args:
-        participants: Список участий с данными соревнований (JOIN competitions)
 
-    Returns:
-        Словарь со статистикой
+def _distance_key(distance: float) -> str:
+    """Ключ дистанции в сохраняемом состоянии (JSON допускает только строковые ключи)"""
+    return repr(float(distance))
+
+
+def empty_statistics_state() -> Dict[str, Any]:
     """
-    if not participants:
-        return {
-            'total_competitions': 0,
-            'finished': 0,
-            'dns': 0,
-            'dnf': 0,
-            'registered': 0,
-            'by_type': {},
-            'by_distance': {},
-            'total_distance': 0,
-            'personal_records': {},
-            'average_pace_by_distance': {},
-            'cities': set(),
-            'countries': set(),
-            'organizers': set(),
-            'best_places_overall': [],
-            'best_places_category': []
-        }
+    Пустое состояние статистики
 
-    stats = {
-        'total_competitions': len(participants),
+    Состояние хранит только складываемые величины (счетчики, суммы темпов,
+    счетчики городов/организаторов) и топы (рекорды, лучшие места),
+    поэтому его можно обновлять по одной строке участия и сохранять в JSON.
+    """
+    return {
+        'total_competitions': 0,
         'finished': 0,
         'dns': 0,
         'dnf': 0,
         'registered': 0,
-        'by_type': defaultdict(int),
-        'by_distance': defaultdict(int),
+        'by_type': {},
+        'by_distance': {},
         'total_distance': 0.0,
-        'personal_records': {},  
-        'average_pace_by_distance': {},
-        'cities': set(),
-        'countries': set(),
-        'organizers': set(),
+        'pace_sums': {},  # {дистанция: [сумма темпов (сек/км), количество]}
+        'cities': {},
+        'countries': {},
+        'organizers': {},
+        'goal_achievement': {'achieved': 0, 'not_achieved': 0, 'no_goal': 0},
+        'personal_records': {},
         'best_places_overall': [],
-        'best_places_category': [],
-        'goal_achievement': {'achieved': 0, 'not_achieved': 0, 'no_goal': 0}
+        'best_places_category': []
     }
 
-    # Собираем темпы по дистанциям для вычисления среднего
-    pace_data = defaultdict(list)
 
-    for p in participants:
-        # Подсчитываем статусы участия (финишировал, не вышел на старт и т.д.)
-        status = p.get('status', 'registered')
-        if status == 'finished':
-            stats['finished'] += 1
-        elif status == 'dns':
-            stats['dns'] += 1
-        elif status == 'dnf':
-            stats['dnf'] += 1
-        elif status == 'registered':
-            stats['registered'] += 1
-
-        # Группируем по виду спорта (бег, плавание, велоспорт)
-        sport_type = _normalize_sport_type(p.get('sport_type', 'бег'))
-        stats['by_type'][sport_type] += 1
-
-        # Считаем дистанции только для финишировавших
-        distance = p.get('distance')
-        if distance and status == 'finished':
-            stats['by_distance'][distance] += 1
-            stats['total_distance'] += distance
-
-        # Собираем уникальные города и страны
-        if p.get('city'):
-            stats['cities'].add(p['city'])
-        if p.get('country'):
-            stats['countries'].add(p['country'])
-
-        if p.get('organizer'):
-            stats['organizers'].add(p['organizer'])
-
-        # Обрабатываем только финиши с результатом
-        if status == 'finished' and distance and p.get('finish_time'):
-            finish_time = p['finish_time']
-
-            # Отслеживаем личные рекорды (PR) по каждой дистанции
-            if distance not in stats['personal_records']:
-                # Первый результат на этой дистанции - автоматически рекорд
-                stats['personal_records'][distance] = {
-                    'time': finish_time,
-                    'competition': p.get('name', 'Без названия'),
-                    'date': p.get('date'),
-                    'pace': calculate_pace(distance, finish_time),
-                    'qualification': p.get('qualification')
-                }
-            else:
-                # Сравниваем с текущим рекордом и обновляем если быстрее
-                current_pr = stats['personal_records'][distance]['time']
-                if _compare_times(finish_time, current_pr) < 0:
-                    stats['personal_records'][distance] = {
-                        'time': finish_time,
-                        'competition': p.get('name', 'Без названия'),
-                        'date': p.get('date'),
-                        'pace': calculate_pace(distance, finish_time),
-                        'qualification': p.get('qualification')
-                    }
-
-            # Собираем темпы для расчета среднего темпа по дистанции
-            pace_seconds = _time_to_seconds(finish_time)
-            if pace_seconds:
-                pace_data[distance].append(pace_seconds / distance)
-
-            # Проверяем выполнение целевого времени
-            target_time = p.get('target_time')
-            if target_time:
-                if _compare_times(finish_time, target_time) <= 0:
-                    stats['goal_achievement']['achieved'] += 1
-                else:
-                    stats['goal_achievement']['not_achieved'] += 1
+def _bump(counter: Dict[str, Any], key: Any, sign: int) -> None:
+    """Изменить счетчик и удалить ключ, если он обнулился"""
+    value = counter.get(key, 0) + sign
+    if value:
+        counter[key] = value
+    else:
+        counter.pop(key, None)
+
+
+def apply_participation(state: Dict[str, Any], p: Dict[str, Any], sign: int = 1) -> None:
+    """
+    Добавить (sign=1) или вычесть (sign=-1) вклад одного участия в складываемые счетчики
+
+    Рекорды и лучшие места здесь не меняются - см. merge_records/rebuild_records
+
+    Args:
+        state: Состояние статистики
+        p: Участие с данными соревнования
+        sign: 1 или -1
+    """
+    state['total_competitions'] += sign
+
+    # Подсчитываем статусы участия (финишировал, не вышел на старт и т.д.)
+    status = p.get('status') or 'registered'
+    if status in ('finished', 'dns', 'dnf', 'registered'):
+        state[status] += sign
+
+    # Группируем по виду спорта (бег, плавание, велоспорт)
+    _bump(state['by_type'], _normalize_sport_type(p.get('sport_type', 'бег')), sign)
+
+    # Считаем дистанции только для финишировавших
+    distance = p.get('distance')
+    if distance and status == 'finished':
+        _bump(state['by_distance'], _distance_key(distance), sign)
+        state['total_distance'] = round(state['total_distance'] + sign * distance, 3)
+
+    # Собираем уникальные города, страны и организаторов
+    for field, key in (('city', 'cities'), ('country', 'countries'), ('organizer', 'organizers')):
+        if p.get(field):
+            _bump(state[key], p[field], sign)
+
+    # Обрабатываем только финиши с результатом
+    if status == 'finished' and distance and p.get('finish_time'):
+        finish_seconds = _row_seconds(p, 'finish')
+
+        # Собираем темпы для расчета среднего темпа по дистанции
+        if finish_seconds:
+            pace = state['pace_sums'].setdefault(_distance_key(distance), [0.0, 0])
+            pace[0] += sign * finish_seconds / distance
+            pace[1] += sign
+            if pace[1] <= 0:
+                state['pace_sums'].pop(_distance_key(distance))
+
+        # Проверяем выполнение целевого времени
+        goals = state['goal_achievement']
+        if p.get('target_time'):
+            target_seconds = _row_seconds(p, 'target')
+            if finish_seconds is None or target_seconds is None or finish_seconds <= target_seconds:
+                goals['achieved'] += sign
             else:
-                stats['goal_achievement']['no_goal'] += 1
-
-            place_overall = p.get('place_overall')
-            if place_overall:
-                stats['best_places_overall'].append({
-                    'place': place_overall,
-                    'competition': p.get('name', 'Без названия'),
-                    'date': p.get('date'),
-                    'distance': distance
-                })
-
-            place_category = p.get('place_age_category')
-            if place_category:
-                stats['best_places_category'].append({
-                    'place': place_category,
-                    'competition': p.get('name', 'Без названия'),
-                    'date': p.get('date'),
-                    'distance': distance,
-                    'category': p.get('age_category', '')
-                })
-
-    for distance, paces in pace_data.items():
-        if paces:
-            avg_pace_seconds = sum(paces) / len(paces)
-            pace_minutes = int(avg_pace_seconds // 60)
-            pace_secs = int(avg_pace_seconds % 60)
-            stats['average_pace_by_distance'][distance] = f"{pace_minutes:02d}:{pace_secs:02d}"
+                goals['not_achieved'] += sign
+        else:
+            goals['no_goal'] += sign
 
-    stats['best_places_overall'].sort(key=lambda x: x['place'])
-    stats['best_places_category'].sort(key=lambda x: x['place'])
 
-    stats['best_places_overall'] = stats['best_places_overall'][:5]
-    stats['best_places_category'] = stats['best_places_category'][:5]
+def merge_records(state: Dict[str, Any], p: Dict[str, Any]) -> None:
+    """
+    Учесть участие в личных рекордах и лучших местах
 
-    stats['by_type'] = dict(stats['by_type'])
-    stats['by_distance'] = dict(stats['by_distance'])
+    Args:
+        state: Состояние статистики
+        p: Участие с данными соревнования
+    """
+    distance = p.get('distance')
+    if (p.get('status') or 'registered') != 'finished' or not distance or not p.get('finish_time'):
+        return
+
+    finish_seconds = _row_seconds(p, 'finish')
+    key = _distance_key(distance)
+
+    # Первый результат на этой дистанции - автоматически рекорд,
+    # иначе сравниваем с текущим рекордом и обновляем если быстрее
+    current_pr = state['personal_records'].get(key)
+    if current_pr is None or (
+        finish_seconds is not None and current_pr['seconds'] is not None
+        and finish_seconds < current_pr['seconds']
+    ):
+        state['personal_records'][key] = {
+            'time': p['finish_time'],
+            'seconds': finish_seconds,
+            'competition': p.get('name', 'Без названия'),
+            'date': p.get('date'),
+            'pace': _format_pace(finish_seconds, distance),
+            'qualification': p.get('qualification')
+        }
 
-    return stats
+    if p.get('place_overall'):
+        state['best_places_overall'].append({
+            'place': p['place_overall'],
+            'competition': p.get('name', 'Без названия'),
+            'date': p.get('date'),
+            'distance': distance
+        })
+        state['best_places_overall'].sort(key=lambda x: x['place'])
+        del state['best_places_overall'][TOP_PLACES_LIMIT:]
+
+    if p.get('place_age_category'):
+        state['best_places_category'].append({
+            'place': p['place_age_category'],
+            'competition': p.get('name', 'Без названия'),
+            'date': p.get('date'),
+            'distance': distance,
+            'category': p.get('age_category', '')
+        })
+        state['best_places_category'].sort(key=lambda x: x['place'])
+        del state['best_places_category'][TOP_PLACES_LIMIT:]
+
+
+def rebuild_records(state: Dict[str, Any], participants: List[Dict[str, Any]]) -> None:
+    """
+    Пересчитать рекорды и лучшие места (после удаления/ухудшения результата)
 
+    Args:
+        state: Состояние статистики
+        participants: Все участия пользователя (достаточно финишировавших)
+    """
+    state['personal_records'] = {}
+    state['best_places_overall'] = []
+    state['best_places_category'] = []
+    for p in participants:
+        merge_records(state, p)
 
-def _time_to_seconds(time_str: str) -> Optional[int]:
-    """Конвертировать время HH:MM:SS в секунды"""
-    if not time_str:
-        return None
-    try:
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            hours, minutes, seconds = map(int, parts)
-            return hours * 3600 + minutes * 60 + seconds
-        elif len(parts) == 2:
-            minutes, seconds = map(int, parts)
-            return minutes * 60 + seconds
-        return None
-    except (ValueError, IndexError):
-        return None
+
+def build_statistics_state(participants: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Построить состояние статистики по полному списку участий
+
+    Args:
+        participants: Список участий с данными соревнований (JOIN competitions)
+
+    Returns:
+        Состояние статистики
+    """
+    state = empty_statistics_state()
+    for p in participants:
+        apply_participation(state, p)
+        merge_records(state, p)
+    return state
 
 
-def _compare_times(time1: str, time2: str) -> int:
+def statistics_from_state(state: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Сравнить два времени в формате HH:MM:SS
+    Преобразовать состояние в статистику для сообщений, PDF и графиков
+
+    Args:
+        state: Состояние статистики
 
     Returns:
-        -1 если time1 < time2
-        0 если time1 == time2
-        1 если time1 > time2
+        Словарь со статистикой (формат calculate_competitions_statistics)
     """
-    sec1 = _time_to_seconds(time1)
-    sec2 = _time_to_seconds(time2)
+    average_pace = {}
+    for key, (pace_sum, count) in state['pace_sums'].items():
+        if count > 0:
+            avg_pace_seconds = pace_sum / count
+            pace_minutes = int(avg_pace_seconds // 60)
+            pace_secs = int(avg_pace_seconds % 60)
+            average_pace[float(key)] = f"{pace_minutes:02d}:{pace_secs:02d}"
+
+    return {
+        'total_competitions': state['total_competitions'],
+        'finished': state['finished'],
+        'dns': state['dns'],
+        'dnf': state['dnf'],
+        'registered': state['registered'],
+        'by_type': dict(state['by_type']),
+        'by_distance': {float(key): count for key, count in state['by_distance'].items()},
+        'total_distance': state['total_distance'],
+        'personal_records': {float(key): dict(pr) for key, pr in state['personal_records'].items()},
+        'average_pace_by_distance': average_pace,
+        'cities': set(state['cities']),
+        'countries': set(state['countries']),
+        'organizers': set(state['organizers']),
+        'best_places_overall': list(state['best_places_overall']),
+        'best_places_category': list(state['best_places_category']),
+        'goal_achievement': dict(state['goal_achievement'])
+    }
 
-    if sec1 is None or sec2 is None:
-        return 0
 
-    if sec1 < sec2:
-        return -1
-    elif sec1 > sec2:
-        return 1
-    return 0
+def calculate_competitions_statistics(participants: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Рассчитать статистику по соревнованиям пользователя
+
+    Используется для произвольных периодов; статистика за всё время
+    хранится в user_competition_stats (competitions.statistics_queries)
+
+    Args:
+        participants: Список участий с данными соревнований (JOIN competitions)
+
+    Returns:
+        Словарь со статистикой
+    """
+    return statistics_from_state(build_statistics_state(participants))
 
 
 def format_statistics_message(stats: Dict[str, Any], distance_unit: str = 'км') -> str:
@@ -5,7 +5,7 @@
 import logging
 from datetime import datetime, date
 from aiogram import Router, F
-from aiogram.types import CallbackQuery, Message, BufferedInputFile
+from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
 
 from .competitions_fsm import CompetitionsExportStates
@@ -19,8 +19,10 @@ from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from .competitions_queries import get_user_competitions_with_details
 from .competitions_statistics import calculate_competitions_statistics, format_statistics_message
+from .statistics_queries import get_user_competition_stats, get_user_finish_results
 from .competitions_pdf_export import create_competitions_pdf
 from .competitions_graphs import generate_competitions_graphs
+from bot.file_registry import answer_cached_photo, answer_cached_document
 from utils.date_formatter import DateFormatter, get_user_date_format
 from bot.calendar_keyboard import CalendarKeyboard
 from database.queries import get_user_settings
@@ -97,17 +99,19 @@ async def show_statistics_for_period(callback: CallbackQuery, period: str = 'all
 
         end_date = today
 
-        all_participants = await get_user_competitions_with_details(user_id)
-
         if start_date:
             participants = [
-                p for p in all_participants
+                p for p in await get_user_competitions_with_details(user_id)
                 if datetime.strptime(p['date'], '%Y-%m-%d').date() >= start_date
             ]
+            stats = calculate_competitions_statistics(participants) if participants else None
         else:
-            participants = all_participants
+            # Статистика за всё время поддерживается при записи результатов,
+            # участия загружаются только для графиков динамики (нужны лишь финиши)
+            stats = await get_user_competition_stats(user_id)
+            participants = await get_user_finish_results(user_id) if stats['total_competitions'] else []
 
-        if not participants:
+        if not stats or not stats['total_competitions']:
             try:
                 await callback.message.edit_text(
                     f"📊 У вас нет соревнований {period_text}\n\n"
@@ -128,8 +132,6 @@ async def show_statistics_for_period(callback: CallbackQuery, period: str = 'all
                 await state.update_data(statistics_message_ids=[menu_msg.message_id])
             return
 
-        stats = calculate_competitions_statistics(participants)
-
         settings = await get_user_settings(user_id)
         distance_unit = settings.get('distance_unit', 'км') if settings else 'км'
 
@@ -159,8 +161,10 @@ async def show_statistics_for_period(callback: CallbackQuery, period: str = 'all
 
             for i, buf in enumerate(graph_buffers):
                 caption = f"📊 Графики статистики соревнований {period_text}" if i == 0 else None
-                sent_msg = await callback.message.answer_photo(
-                    photo=BufferedInputFile(buf.read(), filename=f"competitions_stats_{i+1}.png"),
+                sent_msg = await answer_cached_photo(
+                    callback.message,
+                    buf.read(),
+                    f"competitions_stats_{i+1}.png",
                     caption=caption
                 )
                 new_message_ids.append(sent_msg.message_id)
@@ -247,10 +251,10 @@ async def export_halfyear(callback: CallbackQuery):
 
         filename = f"competitions_halfyear_{date.today().strftime('%Y%m%d')}.pdf"
 
-        document = BufferedInputFile(pdf_buffer.read(), filename=filename)
-
-        await callback.message.answer_document(
-            document=document,
+        await answer_cached_document(
+            callback.message,
+            pdf_buffer.read(),
+            filename,
             caption="📄 Экспорт соревнований за последние полгода"
         )
 
@@ -294,10 +298,10 @@ async def export_year(callback: CallbackQuery):
 
         filename = f"competitions_year_{date.today().strftime('%Y%m%d')}.pdf"
 
-        document = BufferedInputFile(pdf_buffer.read(), filename=filename)
-
-        await callback.message.answer_document(
-            document=document,
+        await answer_cached_document(
+            callback.message,
+            pdf_buffer.read(),
+            filename,
             caption="📄 Экспорт соревнований за последний год"
         )
 
@@ -470,14 +474,14 @@ async def process_export_end_calendar(callback: CallbackQuery, state: FSMContext
 
                 filename = f"competitions_custom_{start_date.strftime('%Y%m%d')}_{selected_date.strftime('%Y%m%d')}.pdf"
 
-                document = BufferedInputFile(pdf_buffer.read(), filename=filename)
-
                 formatted_start = await format_date_for_user(start_date, user_id)
                 formatted_end = await format_date_for_user(selected_date, user_id)
 
                 from aiogram.types import ReplyKeyboardRemove
-                await callback.message.answer_document(
-                    document=document,
+                await answer_cached_document(
+                    callback.message,
+                    pdf_buffer.read(),
+                    filename,
                     caption=f"📄 Экспорт соревнований за период {formatted_start} - {formatted_end}",
                     reply_markup=ReplyKeyboardRemove()
                 )
@@ -600,13 +604,13 @@ async def process_export_end_date_manual(message: Message, state: FSMContext):
 
             filename = f"competitions_custom_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.pdf"
 
-            document = BufferedInputFile(pdf_buffer.read(), filename=filename)
-
             formatted_start = await format_date_for_user(start_date, user_id)
             formatted_end = await format_date_for_user(end_date, user_id)
 
-            await message.answer_document(
-                document=document,
+            await answer_cached_document(
+                message,
+                pdf_buffer.read(),
+                filename,
                 caption=f"📄 Экспорт соревнований за период {formatted_start} - {formatted_end}"
             )
 
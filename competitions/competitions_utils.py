@@ -38,7 +38,21 @@ async def format_competition_distance(distance_km: float, user_id: int, case: st
         Отформатированная строка (например: "42.2 км", "800 м" или "26.2 мили", "880 ярдов")
     """
     distance_unit = await get_user_distance_unit(user_id)
+    return format_distance_in_unit(distance_km, distance_unit, case)
 
+
+def format_distance_in_unit(distance_km: float, distance_unit: str, case: str = 'nominative') -> str:
+    """
+    Форматировать дистанцию соревнования в заданных единицах (без запроса настроек)
+
+    Args:
+        distance_km: Дистанция в километрах
+        distance_unit: 'км' или 'мили'
+        case: Падеж ('nominative', 'genitive', 'accusative')
+
+    Returns:
+        Отформатированная строка
+    """
     marathon_cases = {
         'nominative': 'Марафон',
         'genitive': 'марафона',
@@ -629,7 +629,7 @@ async def show_competition_statistics(callback: CallbackQuery):
     user_id = callback.from_user.id
     stats = await get_user_competition_stats(user_id)
 
-    if not stats or stats['total_competitions'] == 0:
+    if stats['total_competitions'] == 0:
         text = (
             "📊 <b>СТАТИСТИКА СОРЕВНОВАНИЙ</b>\n\n"
             "У вас пока нет завершённых соревнований с результатами.\n\n"
@@ -642,42 +642,34 @@ async def show_competition_statistics(callback: CallbackQuery):
         text = "📊 <b>СТАТИСТИКА СОРЕВНОВАНИЙ</b>\n\n"
 
         text += f"🏆 <b>Всего соревнований:</b> {stats['total_competitions']}\n"
-        text += f"✅ <b>Завершено:</b> {stats['total_completed']}\n\n"
-
-        if stats['total_marathons'] > 0:
-            marathon_dist = await format_competition_distance(42.195, user_id)
-            text += f"🏃 <b>Марафоны ({marathon_dist}):</b> {stats['total_marathons']}\n"
-            if stats.get('best_marathon_time'):
-                normalized_time = normalize_time(stats['best_marathon_time'])
-                text += f"   ⏱️ Лучшее время: {normalized_time}\n"
+        text += f"✅ <b>Завершено:</b> {stats['finished']}\n\n"
+
+        # (дистанция для подписи, диапазон км, заголовок)
+        standard_distances = [
+            (42.195, 42.0, 42.3, "Марафоны ({})"),
+            (21.1, 21.0, 21.2, "Полумарафоны ({})"),
+            (10.0, 9.5, 10.5, "{}"),
+            (5.0, 4.5, 5.5, "{}"),
+        ]
+        for label_distance, min_km, max_km, title in standard_distances:
+            count = sum(n for d, n in stats['by_distance'].items() if min_km <= d <= max_km)
+            if count == 0:
+                continue
+
+            formatted_distance = await format_competition_distance(label_distance, user_id)
+            text += f"🏃 <b>{title.format(formatted_distance)}:</b> {count}\n"
+
+            records = [
+                pr for d, pr in stats['personal_records'].items()
+                if min_km <= d <= max_km and pr.get('seconds')
+            ]
+            if records:
+                best = min(records, key=lambda pr: pr['seconds'])
+                text += f"   ⏱️ Лучшее время: {normalize_time(best['time'])}\n"
             text += "\n"
 
-        if stats['total_half_marathons'] > 0:
-            half_marathon_dist = await format_competition_distance(21.1, user_id)
-            text += f"🏃 <b>Полумарафоны ({half_marathon_dist}):</b> {stats['total_half_marathons']}\n"
-            if stats.get('best_half_marathon_time'):
-                normalized_time = normalize_time(stats['best_half_marathon_time'])
-                text += f"   ⏱️ Лучшее время: {normalized_time}\n"
-            text += "\n"
-
-        if stats['total_10k'] > 0:
-            dist_10k = await format_competition_distance(10.0, user_id)
-            text += f"🏃 <b>{dist_10k}:</b> {stats['total_10k']}\n"
-            if stats.get('best_10k_time'):
-                normalized_time = normalize_time(stats['best_10k_time'])
-                text += f"   ⏱️ Лучшее время: {normalized_time}\n"
-            text += "\n"
-
-        if stats['total_5k'] > 0:
-            dist_5k = await format_competition_distance(5.0, user_id)
-            text += f"🏃 <b>{dist_5k}:</b> {stats['total_5k']}\n"
-            if stats.get('best_5k_time'):
-                normalized_time = normalize_time(stats['best_5k_time'])
-                text += f"   ⏱️ Лучшее время: {normalized_time}\n"
-            text += "\n"
-
-        if stats.get('total_distance_km', 0) > 0:
-            total_dist = await format_competition_distance(stats['total_distance_km'], user_id)
+        if stats.get('total_distance', 0) > 0:
+            total_dist = await format_competition_distance(stats['total_distance'], user_id)
             text += f"📏 <b>Общая дистанция:</b> {total_dist}\n"
 
     builder = InlineKeyboardBuilder()
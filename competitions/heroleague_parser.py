@@ -9,11 +9,18 @@ import logging
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
 
+from utils.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://heroleague.ru"
 API_ENDPOINT = f"{BASE_URL}/api/event/list"
 
+HEADERS = {
+    "Accept": "application/json",
+    "Referer": f"{BASE_URL}/calendar",
+}
+
 
 def normalize_sport_code(event_type_id: str) -> str:
     """
@@ -81,113 +88,103 @@ async def fetch_competitions(
         List[Dict]: Список соревнований
     """
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Accept": "application/json",
-        "Referer": f"{BASE_URL}/calendar",
-    }
-
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            logger.info(f"Fetching from HeroLeague API: {API_ENDPOINT}")
+        logger.info(f"Fetching from HeroLeague API: {API_ENDPOINT}")
+
+        async with http_client.get(API_ENDPOINT, headers=HEADERS, timeout=15) as response:
+
+            if response.status != 200:
+                logger.error(f"HeroLeague API returned status {response.status}")
+                return []
 
-            async with session.get(
-                API_ENDPOINT,
-                timeout=aiohttp.ClientTimeout(total=15)
-            ) as response:
+            data = await response.json()
 
-                if response.status != 200:
-                    logger.error(f"HeroLeague API returned status {response.status}")
-                    return []
+            events = data.get("values", [])
+            logger.info(f"Received {len(events)} event types from HeroLeague")
 
-                data = await response.json()
+            competitions = []
 
-                events = data.get("values", [])
-                logger.info(f"Received {len(events)} event types from HeroLeague")
+            # Обрабатываем каждое событие (тип соревнования) из API
+            for event in events:
+                event_type_id = event.get("event_type", {}).get("public_id", "")
 
-                competitions = []
+                # Фильтруем по виду спорта (бег, велосипед и т.д.)
+                if not matches_sport_type(event_type_id, sport):
+                    continue
 
-                # Обрабатываем каждое событие (тип соревнования) из API
-                for event in events:
-                    event_type_id = event.get("event_type", {}).get("public_id", "")
+                # Каждое событие может проходить в нескольких городах
+                for city_event in event.get("event_city", []):
+                    comp = parse_competition(event, city_event)
 
-                    # Фильтруем по виду спорта (бег, велосипед и т.д.)
-                    if not matches_sport_type(event_type_id, sport):
+                    if not comp:
                         continue
 
-                    # Каждое событие может проходить в нескольких городах
-                    for city_event in event.get("event_city", []):
-                        comp = parse_competition(event, city_event)
-
-                        if not comp:
-                            continue
-
-                        # Фильтруем по городу если указан
-                        if city and city.lower() not in comp.get("city", "").lower():
-                            continue
-
-                        # Фильтруем по периоду времени если указан
-                        if period_months:
-                            begin_date_str = comp.get("begin_date")
-                            if begin_date_str:
-                                try:
-                                    # Парсим дату начала соревнования и добавляем UTC если нет timezone
-                                    begin_date = datetime.fromisoformat(begin_date_str.replace('Z', '+00:00'))
-                                    if begin_date.tzinfo is None:
-                                        begin_date = begin_date.replace(tzinfo=timezone.utc)
-
-                                    now = datetime.now(timezone.utc)
-                                    year = now.year
-                                    month = now.month
-
-                                    # Вычисляем диапазон дат в зависимости от периода
-                                    if period_months == 1:
-                                        # Текущий месяц: с 1-го числа до конца месяца
-                                        from datetime import timedelta
-                                        start_date = datetime(year, month, 1, 0, 0, 0, tzinfo=timezone.utc)
-                                        if month == 12:
-                                            end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
-                                        else:
-                                            next_month_first = datetime(year, month + 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-                                            end_date = next_month_first - timedelta(seconds=1)
-
-                                    elif period_months == 12:
-                                        # Текущий год: с 1 января до 31 декабря
-                                        start_date = datetime(year, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-                                        end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
+                    # Фильтруем по городу если указан
+                    if city and city.lower() not in comp.get("city", "").lower():
+                        continue
 
+                    # Фильтруем по периоду времени если указан
+                    if period_months:
+                        begin_date_str = comp.get("begin_date")
+                        if begin_date_str:
+                            try:
+                                # Парсим дату начала соревнования и добавляем UTC если нет timezone
+                                begin_date = datetime.fromisoformat(begin_date_str.replace('Z', '+00:00'))
+                                if begin_date.tzinfo is None:
+                                    begin_date = begin_date.replace(tzinfo=timezone.utc)
+
+                                now = datetime.now(timezone.utc)
+                                year = now.year
+                                month = now.month
+
+                                # Вычисляем диапазон дат в зависимости от периода
+                                if period_months == 1:
+                                    # Текущий месяц: с 1-го числа до конца месяца
+                                    from datetime import timedelta
+                                    start_date = datetime(year, month, 1, 0, 0, 0, tzinfo=timezone.utc)
+                                    if month == 12:
+                                        end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
                                     else:
-                                        # По умолчанию: полгода вперед от текущей даты
-                                        from datetime import timedelta
-                                        start_date = now
-                                        end_date = now + timedelta(days=180)
-
-                                    # Пропускаем соревнования вне указанного диапазона
-                                    if begin_date < start_date or begin_date > end_date:
-                                        continue
-
-                                    # Дополнительная проверка: пропускаем прошедшие события
-                                    from datetime import timezone as tz
-                                    now_utc = datetime.now(tz.utc)
-                                    if begin_date.tzinfo is None:
-                                        begin_date = begin_date.replace(tzinfo=tz.utc)
-                                    if begin_date < now_utc:
-                                        logger.debug(f"Skipping past event: '{comp.get('title')}' on {begin_date.strftime('%Y-%m-%d')}")
-                                        continue
-                                except ValueError as e:
-                                    logger.warning(f"Date parsing error: {e}")
+                                        next_month_first = datetime(year, month + 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+                                        end_date = next_month_first - timedelta(seconds=1)
+
+                                elif period_months == 12:
+                                    # Текущий год: с 1 января до 31 декабря
+                                    start_date = datetime(year, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+                                    end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
+
+                                else:
+                                    # По умолчанию: полгода вперед от текущей даты
+                                    from datetime import timedelta
+                                    start_date = now
+                                    end_date = now + timedelta(days=180)
+
+                                # Пропускаем соревнования вне указанного диапазона
+                                if begin_date < start_date or begin_date > end_date:
                                     continue
 
-                        competitions.append(comp)
+                                # Дополнительная проверка: пропускаем прошедшие события
+                                from datetime import timezone as tz
+                                now_utc = datetime.now(tz.utc)
+                                if begin_date.tzinfo is None:
+                                    begin_date = begin_date.replace(tzinfo=tz.utc)
+                                if begin_date < now_utc:
+                                    logger.debug(f"Skipping past event: '{comp.get('title')}' on {begin_date.strftime('%Y-%m-%d')}")
+                                    continue
+                            except ValueError as e:
+                                logger.warning(f"Date parsing error: {e}")
+                                continue
 
-                        if len(competitions) >= limit:
-                            break
+                    competitions.append(comp)
 
                     if len(competitions) >= limit:
                         break
 
-                logger.info(f"Processed {len(competitions)} competitions from HeroLeague")
-                return competitions[:limit]
+                if len(competitions) >= limit:
+                    break
+
+            logger.info(f"Processed {len(competitions)} competitions from HeroLeague")
+            return competitions[:limit]
 
     except aiohttp.ClientError as e:
         logger.error(f"HTTP error while fetching HeroLeague competitions: {e}")
@@ -0,0 +1,79 @@
+"""
+Постраничная загрузка списков соревнований из API (RussiaRunning, Timerman)
+
+Первая страница загружается отдельно - из нее известно общее количество
+событий. Остальные страницы загружаются одновременно, но не больше
+PAGE_FETCH_WINDOW запросов сразу, и отдаются по порядку. Если потребитель
+перестал читать (набрал нужное количество соревнований или вышел за период),
+незавершенные запросы отменяются.
+"""
+
+import asyncio
+import logging
+import math
+import os
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Сколько страниц загружается одновременно
+PAGE_FETCH_WINDOW = int(os.getenv('PAGE_FETCH_WINDOW', '4'))
+
+PageFetcher = Callable[[int, int], Awaitable[Dict[str, Any]]]
+
+
+async def iter_pages(
+    fetch_page: PageFetcher,
+    page_size: int = 100,
+    max_pages: int = 20,
+    window: int = PAGE_FETCH_WINDOW
+) -> AsyncIterator[List[Dict]]:
+    """
+    Страницы списка по порядку
+
+    Если API вернуло общее количество (totalCount больше первой страницы),
+    загружаются только нужные страницы. Иначе страницы запрашиваются
+    окном до первой неполной.
+
+    Args:
+        fetch_page: Загрузка страницы fetch_page(skip, take) -> {'list', 'totalCount'}
+        page_size: Размер страницы
+        max_pages: Максимум страниц
+        window: Сколько страниц загружать одновременно
+
+    Yields:
+        Список событий страницы
+    """
+    first = await fetch_page(0, page_size)
+    events = first.get("list", [])
+    if not events:
+        return
+    yield events
+    if len(events) < page_size:
+        return
+
+    total = first.get("totalCount") or 0
+    if total > len(events):
+        last_page = min(math.ceil(total / page_size), max_pages)
+    else:
+        # Общее количество неизвестно - до первой неполной страницы
+        last_page = max_pages
+
+    pending: Deque[asyncio.Task] = deque()
+    next_page = 1
+    try:
+        while next_page < last_page or pending:
+            while next_page < last_page and len(pending) < window:
+                pending.append(asyncio.create_task(fetch_page(next_page * page_size, page_size)))
+                next_page += 1
+
+            events = (await pending.popleft()).get("list", [])
+            if not events:
+                return
+            yield events
+            if len(events) < page_size:
+                return
+    finally:
+        for task in pending:
+            task.cancel()
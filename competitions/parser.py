@@ -2,11 +2,13 @@
 Модуль для получения данных о соревнованиях с API reg.russiarunning.com
 """
 
-import aiohttp
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 import logging
 from datetime import datetime, timedelta
 
+from competitions.paging import iter_pages
+from utils.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://reg.russiarunning.com"
@@ -97,18 +99,12 @@ def matches_sport_type(event: Dict, target_sport: str) -> bool:
 class RussiaRunningParser:
     """Парсер для получения данных о соревнованиях с API reg.russiarunning.com"""
 
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-
     async def __aenter__(self):
-        """Создание сессии при входе в контекстный менеджер"""
-        self.session = aiohttp.ClientSession()
+        """Запросы идут через общий http_client - своя сессия не нужна"""
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Закрытие сессии при выходе из контекстного менеджера"""
-        if self.session:
-            await self.session.close()
+        pass
 
     async def get_events(
         self,
@@ -135,9 +131,6 @@ class RussiaRunningParser:
             - pageSize: размер страницы
             - currentPage: текущая страница
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-
         url = BASE_URL + API_ENDPOINT
 
         payload = {
@@ -157,11 +150,7 @@ class RussiaRunningParser:
             payload["Filter"]["DisciplineCode"] = sport
 
         try:
-            async with self.session.post(
-                url,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
+            async with http_client.post(url, json=payload, timeout=30) as response:
                 if response.status == 200:
                     data = await response.json()
                     return data
@@ -213,6 +202,55 @@ class RussiaRunningParser:
             ]
         """
 
+        stats = {'events': 0, 'pages': 0, 'period': 0, 'city': 0, 'sport': 0}
+        competitions = []
+        events = self.iter_competitions(city, sport, period_months, stats)
+        try:
+            async for comp in events:
+                competitions.append(comp)
+                if len(competitions) >= limit:
+                    break
+        finally:
+            # Незавершенные запросы страниц отменяются
+            await events.aclose()
+
+        logger.info(f"Fetched {stats['events']} events from API in {stats['pages']} requests")
+        logger.info(f"Filtering results: kept {len(competitions)} events, filtered out {stats['period']} total")
+        if stats['period']:
+            logger.info(f"  - Filtered by period: {stats['period']} events")
+        if stats['city']:
+            logger.info(f"  - Filtered by city: {stats['city']} events")
+        if stats['sport']:
+            logger.info(f"  - Filtered by sport: {stats['sport']} events")
+
+        return competitions
+
+    async def iter_competitions(
+        self,
+        city: Optional[str] = None,
+        sport: Optional[str] = None,
+        period_months: Optional[int] = None,
+        stats: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Соревнования из API по мере загрузки страниц (уже отфильтрованные)
+
+        Загрузка прекращается, когда потребитель перестал читать (limit
+        в get_competitions) или страницы закончились. Порядок событий в ответе
+        API не гарантирован, поэтому по датам страницы не отсекаются.
+
+        Args:
+            city: Название города для фильтрации
+            sport: Код вида спорта
+            period_months: Период в месяцах
+            stats: Словарь для счетчиков (events, pages, period, city, sport)
+
+        Yields:
+            Соревнование с упрощенной структурой (см. get_competitions)
+        """
+        if stats is None:
+            stats = {'events': 0, 'pages': 0, 'period': 0, 'city': 0, 'sport': 0}
+
         start_date = None
         end_date = None
         if period_months:
@@ -243,160 +281,114 @@ class RussiaRunningParser:
                 start_date = now
                 end_date = now + timedelta(days=180)
 
-        all_events = []
-        skip = 0
-        batch_size = 100
-        max_requests = 20  
-
-        for request_num in range(max_requests):
-            data = await self.get_events(
-                skip=skip,
-                take=batch_size,
-                city=None,  
-                sport=None  
-            )
-
-            events_batch = data.get("list", [])
-            if not events_batch:
-                break
-
-            all_events.extend(events_batch)
-
-            if len(events_batch) < batch_size:
-                break
-
-            skip += batch_size
-
-        logger.info(f"Fetched {len(all_events)} events from API in {request_num + 1} requests")
-
         if period_months:
             start_str = start_date.strftime('%Y-%m-%d') if start_date else 'None'
             end_str = end_date.strftime('%Y-%m-%d') if end_date else 'None'
             logger.info(f"Filtering by period: {period_months} months, from {start_str} to {end_str}")
 
-        competitions = []
-        events_list = all_events
-        filtered_count = 0  
-        filtered_by_period = 0
-        filtered_by_city = 0
-        filtered_by_sport = 0
-
-        for event in events_list:
-            try:
-                comp = {
-                    "id": event.get("id", ""),
-                    "title": event.get("title", ""),
-                    "code": event.get("code", ""),
-                    "city": event.get("cityName") or event.get("place", ""),
-                    "place": event.get("place", ""),
-                    "address": event.get("address", ""),
-                    "sport_code": event.get("disciplineCode", "run"),
-                    "image_url": event.get("imageUrl", ""),
-                    "participants_count": event.get("participantsCount", 0),
-                    "organizer": event.get("organizerName", ""),
-                    "service": "RussiaRunning",  
-                }
-
-                comp["begin_date"] = event.get("beginDate")
-                comp["end_date"] = event.get("endDate")
-
-                code = event.get("code", "")
-                if code:
-                    comp["url"] = f"https://reg.russiarunning.com/event/{code}"
-                else:
-                    comp["url"] = ""
-
-                distances = []
-                race_items = event.get("raceItems", [])
-                for race in race_items:
-                    distances.append({
-                        "id": race.get("id", ""),
-                        "name": race.get("name", ""),
-                        "distance": race.get("distance", 0),
-                        "sport": race.get("disciplineName", ""),
-                        "sport_code": race.get("disciplineCode", ""),
-                        "participants_count": race.get("participantsCount", 0),
-                        "race_date": race.get("raceDate")
-                    })
-
-                comp["distances"] = distances
-
-                if (start_date or end_date) and comp["begin_date"]:
-                    try:
-                        begin_date_obj = datetime.fromisoformat(comp["begin_date"].replace('Z', '+00:00'))
-                        if start_date and begin_date_obj < start_date:
-                            filtered_count += 1
-                            filtered_by_period += 1
-                            continue
-                        if end_date and begin_date_obj > end_date:
-                            filtered_count += 1
-                            filtered_by_period += 1
-                            continue
-
-                        from datetime import timezone as tz
-                        now_utc = datetime.now(tz.utc)
-                        if begin_date_obj.tzinfo is None:
-                            begin_date_obj = begin_date_obj.replace(tzinfo=tz.utc)
-                        if begin_date_obj < now_utc:
-                            filtered_count += 1
-                            filtered_by_period += 1
-                            logger.debug(f"Skipping past event: '{comp['title']}' on {begin_date_obj.strftime('%Y-%m-%d')}")
-                            continue
-                    except Exception as e:
-                        logger.error(f"Error parsing date for event {comp['id']}: {e}")
-
-                if city:
-                    event_city = event.get('cityName') or ''
-                    event_place = event.get('place') or ''
-                    event_address = event.get('address') or ''
-                    event_title = event.get('title') or ''
-
-                    city_lower = city.lower()
-                    event_city_lower = event_city.lower()
-                    event_place_lower = event_place.lower()
-                    event_address_lower = event_address.lower()
-                    event_title_lower = event_title.lower()
-
-                    city_found = (
-                        city_lower in event_address_lower or
-                        city_lower in event_place_lower or
-                        city_lower in event_title_lower or
-                        city_lower in event_city_lower
-                    )
-
-                    if not city_found:
-                        filtered_by_city += 1
-                        continue  
-
-                if sport:
-                    sport_matches = matches_sport_type(event, sport)
-
-                    if sport == "swim" and ('плав' in event.get('title', '').lower() or 'swim' in event.get('title', '').lower()):
-                        logger.info(f"Swimming event check: '{event.get('title', '')}' - disciplineCode: {event.get('disciplineCode')}, disciplineName: {event.get('disciplineName')}, matches: {sport_matches}")
-
-                    if not sport_matches:
-                        filtered_by_sport += 1
-                        continue  
-
-                competitions.append(comp)
-
-                if len(competitions) >= limit:
-                    break
-
-            except Exception as e:
-                logger.error(f"Error parsing event {event.get('id', 'unknown')}: {e}")
-                continue
-
-        logger.info(f"Filtering results: kept {len(competitions)} events, filtered out {filtered_count} total")
-        if filtered_by_period > 0:
-            logger.info(f"  - Filtered by period: {filtered_by_period} events")
-        if filtered_by_city > 0:
-            logger.info(f"  - Filtered by city: {filtered_by_city} events")
-        if filtered_by_sport > 0:
-            logger.info(f"  - Filtered by sport: {filtered_by_sport} events")
-
-        return competitions
-
+        async for page in iter_pages(self.get_events):
+            stats['pages'] += 1
+            stats['events'] += len(page)
+
+            for event in page:
+                try:
+                    comp = {
+                        "id": event.get("id", ""),
+                        "title": event.get("title", ""),
+                        "code": event.get("code", ""),
+                        "city": event.get("cityName") or event.get("place", ""),
+                        "place": event.get("place", ""),
+                        "address": event.get("address", ""),
+                        "sport_code": event.get("disciplineCode", "run"),
+                        "image_url": event.get("imageUrl", ""),
+                        "participants_count": event.get("participantsCount", 0),
+                        "organizer": event.get("organizerName", ""),
+                        "service": "RussiaRunning",  
+                    }
+
+                    comp["begin_date"] = event.get("beginDate")
+                    comp["end_date"] = event.get("endDate")
+
+                    code = event.get("code", "")
+                    if code:
+                        comp["url"] = f"https://reg.russiarunning.com/event/{code}"
+                    else:
+                        comp["url"] = ""
+
+                    distances = []
+                    race_items = event.get("raceItems", [])
+                    for race in race_items:
+                        distances.append({
+                            "id": race.get("id", ""),
+                            "name": race.get("name", ""),
+                            "distance": race.get("distance", 0),
+                            "sport": race.get("disciplineName", ""),
+                            "sport_code": race.get("disciplineCode", ""),
+                            "participants_count": race.get("participantsCount", 0),
+                            "race_date": race.get("raceDate")
+                        })
+
+                    comp["distances"] = distances
+
+                    if (start_date or end_date) and comp["begin_date"]:
+                        try:
+                            begin_date_obj = datetime.fromisoformat(comp["begin_date"].replace('Z', '+00:00'))
+                            if start_date and begin_date_obj < start_date:
+                                stats['period'] += 1
+                                continue
+                            if end_date and begin_date_obj > end_date:
+                                stats['period'] += 1
+                                continue
+
+                            from datetime import timezone as tz
+                            now_utc = datetime.now(tz.utc)
+                            if begin_date_obj.tzinfo is None:
+                                begin_date_obj = begin_date_obj.replace(tzinfo=tz.utc)
+                            if begin_date_obj < now_utc:
+                                stats['period'] += 1
+                                logger.debug(f"Skipping past event: '{comp['title']}' on {begin_date_obj.strftime('%Y-%m-%d')}")
+                                continue
+                        except Exception as e:
+                            logger.error(f"Error parsing date for event {comp['id']}: {e}")
+
+                    if city:
+                        event_city = event.get('cityName') or ''
+                        event_place = event.get('place') or ''
+                        event_address = event.get('address') or ''
+                        event_title = event.get('title') or ''
+
+                        city_lower = city.lower()
+                        event_city_lower = event_city.lower()
+                        event_place_lower = event_place.lower()
+                        event_address_lower = event_address.lower()
+                        event_title_lower = event_title.lower()
+
+                        city_found = (
+                            city_lower in event_address_lower or
+                            city_lower in event_place_lower or
+                            city_lower in event_title_lower or
+                            city_lower in event_city_lower
+                        )
+
+                        if not city_found:
+                            stats['city'] += 1
+                            continue  
+
+                    if sport:
+                        sport_matches = matches_sport_type(event, sport)
+
+                        if sport == "swim" and ('плав' in event.get('title', '').lower() or 'swim' in event.get('title', '').lower()):
+                            logger.info(f"Swimming event check: '{event.get('title', '')}' - disciplineCode: {event.get('disciplineCode')}, disciplineName: {event.get('disciplineName')}, matches: {sport_matches}")
+
+                        if not sport_matches:
+                            stats['sport'] += 1
+                            continue  
+
+                    yield comp
+
+                except Exception as e:
+                    logger.error(f"Error parsing event {event.get('id', 'unknown')}: {e}")
+                    continue
 
 
 async def fetch_competitions(
@@ -4,12 +4,15 @@
 API Endpoint: GET https://api.reg.place/v1/events
 """
 
-import aiohttp
 import asyncio
 import logging
-from typing import List, Dict, Optional
+import os
+import time
+from typing import Any, List, Dict, Optional
 from datetime import datetime, timezone
 
+from utils.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.reg.place/v1"
@@ -20,6 +23,126 @@ POSSIBLE_ENDPOINTS = [
     "https://reg.place/api/events",  
 ]
 
+HEADERS = {
+    "Accept": "application/json",
+}
+
+# Сколько секунд рабочий endpoint используется без повторного поиска
+ENDPOINT_HEALTH_TTL = int(os.getenv('REGPLACE_ENDPOINT_TTL', '3600'))
+ENDPOINT_TIMEOUT = 10
+
+
+class EndpointSelector:
+    """
+    Поиск рабочего endpoint reg.place с запоминанием
+
+    Рабочий endpoint запоминается на ENDPOINT_HEALTH_TTL, и запросы идут сразу
+    к нему. Если он перестал отвечать или срок истек, все endpoint опрашиваются
+    одновременно и берется первый по порядку в списке из тех, что вернули
+    список событий. Ответ 200 без списка событий (страница ошибки, другой
+    JSON) считается неудачным. Для каждого endpoint ведется счетчик успешных
+    и неудачных запросов.
+    """
+
+    def __init__(self, endpoints: List[str], ttl: float = ENDPOINT_HEALTH_TTL):
+        self.endpoints = endpoints
+        self.ttl = ttl
+        self.current: Optional[str] = None
+        self.checked_at = 0.0
+        self.stats = {endpoint: {'ok': 0, 'fail': 0} for endpoint in endpoints}
+        self._lock = asyncio.Lock()
+
+    def _record(self, endpoint: str, ok: bool) -> None:
+        self.stats[endpoint]['ok' if ok else 'fail'] += 1
+
+    async def _request(self, endpoint: str) -> Optional[List[Dict]]:
+        """Список событий из ответа endpoint или None (ошибка, статус не 200 или нет списка событий)"""
+        try:
+            async with http_client.get(endpoint, headers=HEADERS, timeout=ENDPOINT_TIMEOUT, retries=0) as response:
+                if response.status == 200:
+                    events = extract_events(await response.json())
+                    if events is not None:
+                        self._record(endpoint, True)
+                        return events
+                    logger.warning(f"reg.place endpoint {endpoint} returned no events list")
+                else:
+                    logger.warning(f"reg.place endpoint {endpoint} returned status {response.status}")
+        except asyncio.TimeoutError:
+            logger.warning(f"Timeout for endpoint {endpoint}")
+        except Exception as e:
+            logger.warning(f"Error trying endpoint {endpoint}: {e}")
+        self._record(endpoint, False)
+        return None
+
+    async def _probe(self) -> Optional[List[Dict]]:
+        """Опросить все endpoint одновременно, запомнить первый по порядку рабочий"""
+        tasks = [asyncio.create_task(self._request(endpoint)) for endpoint in self.endpoints]
+        try:
+            # Ответы разбираются в порядке списка: более приоритетный endpoint
+            # выбирается, даже если ответил позже
+            for endpoint, task in zip(self.endpoints, tasks):
+                data = await task
+                if data is not None:
+                    self.current = endpoint
+                    self.checked_at = time.monotonic()
+                    logger.info(f"Using reg.place endpoint: {endpoint}")
+                    return data
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        self.current = None
+        return None
+
+    async def fetch(self) -> Optional[List[Dict]]:
+        """
+        Загрузить список событий с рабочего endpoint
+
+        Returns:
+            Список событий или None, если ни один endpoint не вернул его
+        """
+        current = self.current
+        if current is not None and time.monotonic() - self.checked_at < self.ttl:
+            data = await self._request(current)
+            if data is not None:
+                return data
+            logger.warning(f"reg.place endpoint {current} stopped responding, probing alternates")
+
+        async with self._lock:
+            # Пока ждали, другой запрос мог уже найти рабочий endpoint
+            if self.current is not None and self.current != current:
+                data = await self._request(self.current)
+                if data is not None:
+                    return data
+            return await self._probe()
+
+    def success_rates(self) -> Dict[str, Optional[float]]:
+        """Доля успешных запросов по каждому endpoint (None - запросов не было)"""
+        return {
+            endpoint: stats['ok'] / (stats['ok'] + stats['fail']) if stats['ok'] + stats['fail'] else None
+            for endpoint, stats in self.stats.items()
+        }
+
+
+def extract_events(data: Any) -> Optional[List[Dict]]:
+    """
+    Список событий из JSON ответа reg.place
+
+    Returns:
+        Список событий или None, если в ответе его нет
+    """
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for key in ['events', 'items', 'data', 'results']:
+            if isinstance(data.get(key), list):
+                return data[key]
+        logger.debug(f"Could not find events list in response. Keys: {list(data.keys())}")
+    return None
+
+
+regplace_endpoints = EndpointSelector(POSSIBLE_ENDPOINTS)
+
 
 def normalize_sport_code(sport_type: str) -> str:
     """
@@ -89,136 +212,90 @@ async def fetch_competitions(
         List[Dict]: Список соревнований
     """
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Accept": "application/json",
-    }
-
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            data = None
-            successful_endpoint = None
-
-            for endpoint in POSSIBLE_ENDPOINTS:
-                try:
-                    logger.info(f"Trying reg.place endpoint: {endpoint}")
-
-                    async with session.get(
-                        endpoint,
-                        timeout=aiohttp.ClientTimeout(total=10)
-                    ) as response:
-
-                        if response.status == 200:
-                            data = await response.json()
-                            successful_endpoint = endpoint
-                            logger.info(f"SUCCESS! reg.place endpoint {endpoint} returned status 200")
-                            logger.info(f"Response type: {type(data)}")
-                            break
-                        else:
-                            logger.warning(f"reg.place endpoint {endpoint} returned status {response.status}")
-
-                except asyncio.TimeoutError:
-                    logger.warning(f"Timeout for endpoint {endpoint}")
-                except Exception as e:
-                    logger.warning(f"Error trying endpoint {endpoint}: {e}")
-
-            if not data:
-                logger.error("No working endpoint found for reg.place")
-                return []
-
-            logger.info(f"Using endpoint: {successful_endpoint}")
-
-            events = []
-            if isinstance(data, list):
-                events = data
-            elif isinstance(data, dict):
-                for key in ['events', 'items', 'data', 'results']:
-                    if key in data and isinstance(data[key], list):
-                        events = data[key]
-                        break
-
-                if not events:
-                    logger.warning(f"Could not find events list in response. Keys: {list(data.keys())}")
-                    return []
+        events = await regplace_endpoints.fetch()
+        if events is None:
+            logger.error(f"No working endpoint found for reg.place (success rates: {regplace_endpoints.success_rates()})")
+            return []
 
-            logger.info(f"Found {len(events)} events from reg.place")
+        logger.info(f"Found {len(events)} events from reg.place")
 
-            start_date = None
-            end_date = None
-            if period_months:
-                from datetime import timezone, timedelta
-                now = datetime.now(timezone.utc)
+        start_date = None
+        end_date = None
+        if period_months:
+            from datetime import timezone, timedelta
+            now = datetime.now(timezone.utc)
 
-                if period_months == 1:
-                    year = now.year
-                    month = now.month
+            if period_months == 1:
+                year = now.year
+                month = now.month
 
-                    start_date = datetime(year, month, 1, 0, 0, 0, tzinfo=timezone.utc)
+                start_date = datetime(year, month, 1, 0, 0, 0, tzinfo=timezone.utc)
 
-                    if month == 12:
-                        end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
-                    else:
-                        next_month_first = datetime(year, month + 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-                        end_date = next_month_first - timedelta(seconds=1)
-
-                elif period_months == 12:
-                    year = now.year
-                    start_date = datetime(year, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+                if month == 12:
                     end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
-
                 else:
-                    start_date = now
-                    end_date = now + timedelta(days=180)
+                    next_month_first = datetime(year, month + 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+                    end_date = next_month_first - timedelta(seconds=1)
 
-                logger.info(f"Period filter: {period_months} months, from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+            elif period_months == 12:
+                year = now.year
+                start_date = datetime(year, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+                end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
 
-            competitions = []
-            logger.info(f"Applying filters: city={city}, sport={sport}")
-            for event in events:
-                try:
-                    comp = parse_event(event)
-                    if comp:
-                        logger.debug(f"Before filtering: '{comp.get('title')}' - sport_code='{comp.get('sport_code')}', city='{comp.get('city')}'")
+            else:
+                start_date = now
+                end_date = now + timedelta(days=180)
 
-                        if not matches_filters(comp, city, sport):
-                            logger.debug(f"Event '{comp.get('title')}' was filtered out")
-                            continue
+            logger.info(f"Period filter: {period_months} months, from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
 
-                        logger.info(f"Event '{comp.get('title')}' passed all filters!")
+        competitions = []
+        logger.info(f"Applying filters: city={city}, sport={sport}")
+        for event in events:
+            try:
+                comp = parse_event(event)
+                if comp:
+                    logger.debug(f"Before filtering: '{comp.get('title')}' - sport_code='{comp.get('sport_code')}', city='{comp.get('city')}'")
 
-                        if period_months and start_date and end_date:
-                            comp_date = comp.get('start_time')
-                            if comp_date:
-                                if comp_date.tzinfo is None:
-                                    from datetime import timezone as tz
-                                    comp_date = comp_date.replace(tzinfo=tz.utc)
+                    if not matches_filters(comp, city, sport):
+                        logger.debug(f"Event '{comp.get('title')}' was filtered out")
+                        continue
 
-                                if comp_date < start_date or comp_date > end_date:
-                                    continue
+                    logger.info(f"Event '{comp.get('title')}' passed all filters!")
 
+                    if period_months and start_date and end_date:
                         comp_date = comp.get('start_time')
                         if comp_date:
                             if comp_date.tzinfo is None:
                                 from datetime import timezone as tz
                                 comp_date = comp_date.replace(tzinfo=tz.utc)
 
-                            from datetime import timezone, timedelta
-                            now_utc = datetime.now(timezone.utc)
-                            if comp_date < now_utc:
-                                logger.debug(f"Skipping past event: '{comp.get('title')}' on {comp_date.strftime('%Y-%m-%d')}")
+                            if comp_date < start_date or comp_date > end_date:
                                 continue
 
-                        competitions.append(comp)
+                    comp_date = comp.get('start_time')
+                    if comp_date:
+                        if comp_date.tzinfo is None:
+                            from datetime import timezone as tz
+                            comp_date = comp_date.replace(tzinfo=tz.utc)
+
+                        from datetime import timezone, timedelta
+                        now_utc = datetime.now(timezone.utc)
+                        if comp_date < now_utc:
+                            logger.debug(f"Skipping past event: '{comp.get('title')}' on {comp_date.strftime('%Y-%m-%d')}")
+                            continue
 
-                        if len(competitions) >= limit:
-                            break
+                    competitions.append(comp)
+
+                    if len(competitions) >= limit:
+                        break
 
-                except Exception as e:
-                    logger.error(f"Error parsing reg.place event: {e}")
-                    continue
+            except Exception as e:
+                logger.error(f"Error parsing reg.place event: {e}")
+                continue
 
-            logger.info(f"Parsed {len(competitions)} competitions from reg.place after filters")
-            return competitions
+        logger.info(f"Parsed {len(competitions)} competitions from reg.place after filters")
+        return competitions
 
     except Exception as e:
         logger.error(f"Error fetching from reg.place: {e}")
@@ -35,30 +35,24 @@ async def create_reminders_for_competition(user_id: int, competition_id: int, co
             '1day': 1
         }
 
+        rows = [
+            (user_id, competition_id, reminder_type, (comp_date - timedelta(days=days_before)).strftime('%Y-%m-%d'))
+            for reminder_type, days_before in reminder_periods.items()
+            if comp_date - timedelta(days=days_before) >= today
+        ]
+        result_reminder_date = comp_date + timedelta(days=1)
+        rows.append((user_id, competition_id, 'result_input', result_reminder_date.strftime('%Y-%m-%d')))
+
+        # При регистрации на несколько дистанций повторные вызовы отсекаются UNIQUE-ограничением
         async with aiosqlite.connect(DB_PATH) as db:
-            for reminder_type, days_before in reminder_periods.items():
-                scheduled_date = comp_date - timedelta(days=days_before)
-
-                if scheduled_date >= today:
-                    await db.execute(
-                        """
-                        INSERT OR IGNORE INTO competition_reminders
-                        (user_id, competition_id, reminder_type, scheduled_date, sent)
-                        VALUES (?, ?, ?, ?, 0)
-                        """,
-                        (user_id, competition_id, reminder_type, scheduled_date.strftime('%Y-%m-%d'))
-                    )
-
-            result_reminder_date = comp_date + timedelta(days=1)
-            await db.execute(
+            await db.executemany(
                 """
                 INSERT OR IGNORE INTO competition_reminders
                 (user_id, competition_id, reminder_type, scheduled_date, sent)
                 VALUES (?, ?, ?, ?, 0)
                 """,
-                (user_id, competition_id, 'result_input', result_reminder_date.strftime('%Y-%m-%d'))
+                rows
             )
-
             await db.commit()
 
         logger.info(f"Created reminders for user {user_id}, competition {competition_id}")
@@ -67,25 +61,75 @@ async def create_reminders_for_competition(user_id: int, competition_id: int, co
         logger.error(f"Error creating reminders: {e}")
 
 
-async def get_pending_reminders(today: Optional[date] = None) -> list:
+# Статусы в competition_reminders.sent
+REMINDER_PENDING = 0
+REMINDER_SENT = 1
+REMINDER_CLAIMED = 2  # Взято в обработку (sent_at = время захвата)
+
+REMINDER_BATCH_SIZE = 200
+# Через сколько минут захваченные, но не отмеченные напоминания возвращаются в очередь
+STALE_CLAIM_MINUTES = 60
+
+
+async def claim_due_reminders(today: Optional[date] = None, limit: int = REMINDER_BATCH_SIZE) -> list:
     """
-    Получить напоминания, которые нужно отправить сегодня
+    Атомарно захватить пачку напоминаний из очереди (по scheduled_date)
 
     Args:
         today: Дата для проверки (по умолчанию - сегодня)
+        limit: Размер пачки
 
     Returns:
-        Список напоминаний
+        Список ID захваченных напоминаний
     """
 
     if today is None:
         today = date.today()
 
+    async with aiosqlite.connect(DB_PATH) as db:
+        # BEGIN IMMEDIATE берет блокировку записи - две рассылки не захватят одно напоминание
+        await db.execute("BEGIN IMMEDIATE")
+        async with db.execute(
+            """
+            SELECT id FROM competition_reminders
+            WHERE sent = ? AND scheduled_date <= ?
+            ORDER BY scheduled_date, id
+            LIMIT ?
+            """,
+            (REMINDER_PENDING, today.strftime('%Y-%m-%d'), limit)
+        ) as cursor:
+            ids = [row[0] for row in await cursor.fetchall()]
+
+        if ids:
+            placeholders = ",".join("?" * len(ids))
+            await db.execute(
+                f"UPDATE competition_reminders SET sent = ?, sent_at = CURRENT_TIMESTAMP WHERE id IN ({placeholders})",
+                (REMINDER_CLAIMED, *ids)
+            )
+        await db.commit()
+        return ids
+
+
+async def get_reminders_by_ids(reminder_ids: list) -> list:
+    """
+    Получить данные для текстов напоминаний одним запросом
+
+    Args:
+        reminder_ids: ID напоминаний
+
+    Returns:
+        Список напоминаний с данными соревнования, дистанциями и настройками пользователя
+    """
+
+    if not reminder_ids:
+        return []
+
+    placeholders = ",".join("?" * len(reminder_ids))
     async with aiosqlite.connect(DB_PATH) as db:
         db.row_factory = aiosqlite.Row
 
         async with db.execute(
-            """
+            f"""
             SELECT
                 r.id,
                 r.user_id,
@@ -95,22 +139,79 @@ async def get_pending_reminders(today: Optional[date] = None) -> list:
                 c.name as competition_name,
                 c.date as competition_date,
                 c.type as competition_type,
-                cp.distance,
-                cp.target_time
+                (
+                    SELECT GROUP_CONCAT(cp.distance)
+                    FROM competition_participants cp
+                    WHERE cp.competition_id = r.competition_id AND cp.user_id = r.user_id
+                ) as distances,
+                (
+                    SELECT cp.target_time
+                    FROM competition_participants cp
+                    WHERE cp.competition_id = r.competition_id AND cp.user_id = r.user_id
+                    AND cp.target_time IS NOT NULL
+                    LIMIT 1
+                ) as target_time,
+                us.date_format,
+                us.distance_unit
             FROM competition_reminders r
             JOIN competitions c ON r.competition_id = c.id
-            LEFT JOIN competition_participants cp ON
-                r.competition_id = cp.competition_id AND
-                r.user_id = cp.user_id
-            WHERE r.scheduled_date <= ? AND r.sent = 0
-            ORDER BY r.scheduled_date, r.user_id
+            LEFT JOIN user_settings us ON us.user_id = r.user_id
+            WHERE r.id IN ({placeholders})
+            ORDER BY r.scheduled_date, r.id
             """,
-            (today.strftime('%Y-%m-%d'),)
+            reminder_ids
         ) as cursor:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
 
+async def get_pending_reminders(today: Optional[date] = None) -> list:
+    """
+    Получить напоминания, которые нужно отправить сегодня (без захвата)
+
+    Args:
+        today: Дата для проверки (по умолчанию - сегодня)
+
+    Returns:
+        Список напоминаний
+    """
+
+    if today is None:
+        today = date.today()
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            "SELECT id FROM competition_reminders WHERE sent = ? AND scheduled_date <= ? ORDER BY scheduled_date, id",
+            (REMINDER_PENDING, today.strftime('%Y-%m-%d'))
+        ) as cursor:
+            ids = [row[0] for row in await cursor.fetchall()]
+    return await get_reminders_by_ids(ids)
+
+
+async def mark_reminders_as_sent(reminder_ids: list):
+    """
+    Отметить пачку напоминаний как отправленные одним UPDATE
+
+    Args:
+        reminder_ids: ID напоминаний
+    """
+
+    if not reminder_ids:
+        return
+
+    placeholders = ",".join("?" * len(reminder_ids))
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute(
+            f"""
+            UPDATE competition_reminders
+            SET sent = ?, sent_at = CURRENT_TIMESTAMP
+            WHERE id IN ({placeholders})
+            """,
+            (REMINDER_SENT, *reminder_ids)
+        )
+        await db.commit()
+
+
 async def mark_reminder_as_sent(reminder_id: int):
     """
     Отметить напоминание как отправленное
@@ -119,57 +220,110 @@ async def mark_reminder_as_sent(reminder_id: int):
         reminder_id: ID напоминания
     """
 
+    await mark_reminders_as_sent([reminder_id])
+
+
+async def release_reminders(reminder_ids: list):
+    """
+    Вернуть захваченные напоминания в очередь (не удалось отправить)
+
+    Args:
+        reminder_ids: ID напоминаний
+    """
+
+    if not reminder_ids:
+        return
+
+    placeholders = ",".join("?" * len(reminder_ids))
     async with aiosqlite.connect(DB_PATH) as db:
         await db.execute(
+            f"UPDATE competition_reminders SET sent = ?, sent_at = NULL WHERE id IN ({placeholders})",
+            (REMINDER_PENDING, *reminder_ids)
+        )
+        await db.commit()
+
+
+async def release_stale_claims():
+    """Вернуть в очередь напоминания, захваченные рассылкой, которая не завершилась (например, рестарт бота)"""
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        cursor = await db.execute(
             """
             UPDATE competition_reminders
-            SET sent = 1, sent_at = CURRENT_TIMESTAMP
-            WHERE id = ?
+            SET sent = ?, sent_at = NULL
+            WHERE sent = ? AND sent_at < datetime('now', ?)
             """,
-            (reminder_id,)
+            (REMINDER_PENDING, REMINDER_CLAIMED, f'-{STALE_CLAIM_MINUTES} minutes')
         )
         await db.commit()
+        if cursor.rowcount:
+            logger.warning(f"Returned {cursor.rowcount} stale competition reminders to the queue")
 
 
 async def send_competition_reminders(bot):
     """
     Отправить все запланированные напоминания (вызывается планировщиком)
 
+    Напоминания забираются из очереди пачками, тексты формируются без дополнительных
+    запросов, отправка идет через общий ограничитель скорости, а вся пачка
+    отмечается отправленной одним UPDATE.
+
     Args:
         bot: Экземпляр бота для отправки сообщений
     """
+    from notifications.broadcaster import broadcast, FAILED
 
     try:
-        reminders = await get_pending_reminders()
+        await release_stale_claims()
 
-        if not reminders:
+        total_sent = 0
+        # Неотправленные остаются захваченными до конца запуска: следующие пачки их не берут,
+        # а в очередь они возвращаются в конце - для следующего запуска
+        retry = []
+        try:
+            while True:
+                reminder_ids = await claim_due_reminders()
+                if not reminder_ids:
+                    break
+
+                reminders = await get_reminders_by_ids(reminder_ids)
+                messages = []
+                for reminder in reminders:
+                    try:
+                        messages.append(render_reminder(reminder))
+                    except Exception as e:
+                        logger.error(f"Error rendering reminder {reminder['id']}: {e}")
+
+                results = await broadcast(bot, messages)
+
+                # Недоставляемые (бот заблокирован) тоже снимаем с очереди, чтобы не повторять их каждый день
+                done = {key for key, status in results.items() if status != FAILED}
+                retry.extend(rid for rid in reminder_ids if rid not in done)
+                await mark_reminders_as_sent(list(done))
+                total_sent += len(done)
+        finally:
+            if retry:
+                await release_reminders(retry)
+                logger.warning(f"{len(retry)} competition reminders returned to the queue")
+
+        if total_sent:
+            logger.info(f"Sent {total_sent} competition reminders")
+        else:
             logger.debug("No pending competition reminders")
-            return
-
-        logger.info(f"Found {len(reminders)} pending competition reminders")
-
-        for reminder in reminders:
-            try:
-                await send_single_reminder(bot, reminder)
-                await mark_reminder_as_sent(reminder['id'])
-                await asyncio.sleep(0.5)  
-
-            except Exception as e:
-                logger.error(f"Error sending reminder {reminder['id']}: {e}")
-
-        logger.info(f"Sent {len(reminders)} competition reminders")
 
     except Exception as e:
         logger.error(f"Error in send_competition_reminders: {e}")
 
 
-async def send_single_reminder(bot, reminder: dict):
+def render_reminder(reminder: dict) -> dict:
     """
-    Отправить одно напоминание
+    Сформировать сообщение напоминания
 
     Args:
-        bot: Экземпляр бота
-        reminder: Данные напоминания
+        reminder: Данные напоминания (из get_reminders_by_ids)
+
+    Returns:
+        Сообщение для broadcaster: {'key', 'chat_id', 'text', 'parse_mode', 'reply_markup'}
     """
 
     user_id = reminder['user_id']
@@ -180,8 +334,10 @@ async def send_single_reminder(bot, reminder: dict):
     comp_date = datetime.strptime(comp_date_str, '%Y-%m-%d').date()
     days_until = (comp_date - date.today()).days
 
+    message = {'key': reminder['id'], 'chat_id': user_id, 'parse_mode': "HTML"}
+
     if reminder_type == 'result_input':
-        text = (
+        message['text'] = (
             "🏁 <b>КАК ПРОШЛО СОРЕВНОВАНИЕ?</b>\n\n"
             f"Вчера было ваше соревнование:\n"
             f"🏆 <b>{comp_name}</b>\n\n"
@@ -205,21 +361,15 @@ async def send_single_reminder(bot, reminder: dict):
                 callback_data=f"comp:didnt_participate:{reminder['competition_id']}"
             )
         )
-
-        await bot.send_message(
-            user_id,
-            text,
-            parse_mode="HTML",
-            reply_markup=builder.as_markup()
-        )
+        message['reply_markup'] = builder.as_markup()
 
     else:
         day_word = "день" if days_until == 1 else "дня" if 2 <= days_until <= 4 else "дней"
 
-        from utils.date_formatter import get_user_date_format, DateFormatter
-        from competitions.competitions_utils import format_competition_distance
+        from utils.date_formatter import DateFormatter
+        from competitions.competitions_utils import format_distance_in_unit
 
-        user_date_format = await get_user_date_format(user_id)
+        user_date_format = reminder.get('date_format') or 'ДД.ММ.ГГГГ'
         formatted_date = DateFormatter.format_date(comp_date.strftime('%Y-%m-%d'), user_date_format)
 
         text = (
@@ -229,18 +379,38 @@ async def send_single_reminder(bot, reminder: dict):
             f"📅 Дата: {formatted_date}\n"
         )
 
-        if reminder.get('distance'):
-            distance_formatted = await format_competition_distance(reminder['distance'], user_id)
-            text += f"📏 Дистанция: {distance_formatted}\n"
+        if reminder.get('distances'):
+            distance_unit = reminder.get('distance_unit') or 'км'
+            distances = [
+                format_distance_in_unit(float(d), distance_unit)
+                for d in str(reminder['distances']).split(',') if d
+            ]
+            label = "Дистанция" if len(distances) == 1 else "Дистанции"
+            text += f"📏 {label}: {', '.join(distances)}\n"
 
         if reminder.get('target_time'):
             text += f"🎯 Ваша цель: {reminder['target_time']}\n"
 
         text += "\n💪 Удачной подготовки!"
+        message['text'] = text
+
+    return message
+
+
+async def send_single_reminder(bot, reminder: dict):
+    """
+    Отправить одно напоминание
+
+    Args:
+        bot: Экземпляр бота
+        reminder: Данные напоминания (из get_reminders_by_ids)
+    """
 
-        await bot.send_message(user_id, text, parse_mode="HTML")
+    message = render_reminder(reminder)
+    message.pop('key')
+    await bot.send_message(message.pop('chat_id'), message.pop('text'), **message)
 
-    logger.info(f"Sent {reminder_type} reminder to user {user_id} for competition {reminder['competition_id']}")
+    logger.info(f"Sent {reminder['reminder_type']} reminder to user {reminder['user_id']} for competition {reminder['competition_id']}")
 
 
 async def schedule_competition_reminders(bot):
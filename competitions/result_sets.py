@@ -0,0 +1,176 @@
+"""
+Общее хранилище результатов поиска соревнований
+
+Результат поиска (список соревнований из всех сервисов по фильтру) хранится
+в памяти под коротким ID, который вычисляется из параметров фильтра, поэтому
+пользователи с одинаковым фильтром используют один и тот же результат,
+а одновременные одинаковые поиски выполняют один запрос к сервисам.
+
+В FSM пользователя остаются только параметры фильтра и список скрытых
+соревнований (на которые пользователь уже зарегистрирован), страницы
+и карточки соревнований берутся из хранилища. Устаревший или вытесненный
+результат загружается заново по тем же параметрам.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Время жизни результата поиска (секунды) и максимальное число результатов в памяти
+RESULT_SET_TTL = int(os.getenv('RESULT_SET_TTL', '900'))
+RESULT_SET_MAX = int(os.getenv('RESULT_SET_MAX', '64'))
+
+# Максимальное количество соревнований в результате поиска
+RESULT_SET_LIMIT = 1000
+
+
+class ResultSet:
+    """Результат поиска: отсортированный список и индекс по ID соревнования"""
+
+    def __init__(self, result_id: str, items: List[Dict[str, Any]]):
+        self.id = result_id
+        self.items = items
+        self.positions = {item['id']: index for index, item in enumerate(items)}
+        self.created_at = time.monotonic()
+
+    def get(self, item_id: str) -> Optional[Dict[str, Any]]:
+        index = self.positions.get(item_id)
+        return self.items[index] if index is not None else None
+
+    def visible(self, hidden: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """Список без скрытых соревнований (без копирования, если скрытых нет)"""
+        hidden = set(hidden)
+        if not hidden:
+            return self.items
+        return [item for item in self.items if item['id'] not in hidden]
+
+
+class ResultSetStore:
+    """Ограниченный по размеру кэш результатов поиска с TTL (вытесняются самые старые)"""
+
+    def __init__(self, max_entries: int = RESULT_SET_MAX, ttl: float = RESULT_SET_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._sets: 'OrderedDict[str, ResultSet]' = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def make_id(key: Tuple) -> str:
+        """Короткий ID результата по параметрам поиска"""
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:12]
+
+    def __len__(self) -> int:
+        return len(self._sets)
+
+    def get(self, result_id: str) -> Optional[ResultSet]:
+        result = self._sets.get(result_id)
+        if result is None:
+            return None
+        if time.monotonic() - result.created_at > self.ttl:
+            del self._sets[result_id]
+            return None
+        self._sets.move_to_end(result_id)
+        return result
+
+    def put(self, result_id: str, items: List[Dict[str, Any]]) -> ResultSet:
+        result = self._sets[result_id] = ResultSet(result_id, items)
+        self._sets.move_to_end(result_id)
+        while len(self._sets) > self.max_entries:
+            self._sets.popitem(last=False)
+        return result
+
+    async def get_or_load(self, key: Tuple,
+                          loader: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> ResultSet:
+        """
+        Получить результат по параметрам поиска, загрузив его при отсутствии
+
+        Одновременные запросы с одинаковыми параметрами ждут одну загрузку.
+        """
+        result_id = self.make_id(key)
+        result = self.get(result_id)
+        if result is not None:
+            return result
+
+        loading = self._loading.get(result_id)
+        while loading is not None:
+            # wait не пробрасывает отмену загрузки ожидающим (а отмена ожидающего не отменяет загрузку)
+            await asyncio.wait([loading])
+            if not loading.cancelled():
+                return loading.result()
+            # Запрос, выполнявший загрузку, отменен - загружаем сами (или присоединяемся к новой загрузке)
+            loading = self._loading.get(result_id)
+
+        loading = self._loading[result_id] = asyncio.get_running_loop().create_future()
+        try:
+            result = self.put(result_id, await loader())
+            loading.set_result(result)
+            return result
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                loading.cancel()
+            else:
+                loading.set_exception(e)
+                # Исключение уже передано ожидающим - не логировать как необработанное
+                loading.exception()
+            raise
+        finally:
+            if self._loading.get(result_id) is loading:
+                del self._loading[result_id]
+
+    def clear(self) -> None:
+        self._sets.clear()
+
+
+competition_results = ResultSetStore()
+
+
+def search_key(data: Dict[str, Any]) -> Tuple:
+    """Параметры поиска соревнований из данных FSM"""
+    return (data.get('city'), data.get('sport'), data.get('period_months', 1), data.get('service'))
+
+
+async def get_competition_result_set(data: Dict[str, Any]) -> ResultSet:
+    """
+    Результат поиска соревнований по параметрам из данных FSM
+
+    Args:
+        data: Данные FSM (city, sport, period_months, service)
+
+    Returns:
+        Результат поиска (из памяти или загруженный из сервисов)
+    """
+    city, sport, period_months, service = key = search_key(data)
+
+    async def load() -> List[Dict[str, Any]]:
+        from competitions.competitions_fetcher import fetch_all_competitions
+
+        logger.info(f"Fetching competitions: city={city}, sport={sport}, period_months={period_months}, service={service}")
+        items = await fetch_all_competitions(
+            city=city,
+            sport=sport,
+            limit=RESULT_SET_LIMIT,
+            period_months=period_months,
+            service=service
+        )
+        logger.info(f"Received {len(items)} competitions")
+        return items
+
+    return await competition_results.get_or_load(key, load)
+
+
+async def get_visible_competitions(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Соревнования поиска без скрытых для пользователя (hidden_competition_ids в FSM)"""
+    result = await get_competition_result_set(data)
+    return result.visible(data.get('hidden_competition_ids') or ())
+
+
+async def find_competition(data: Dict[str, Any], comp_id: str) -> Optional[Dict[str, Any]]:
+    """Соревнование из результата поиска по ID"""
+    result = await get_competition_result_set(data)
+    return result.get(comp_id)
@@ -11,11 +11,19 @@ from datetime import datetime, timezone
 from bs4 import BeautifulSoup
 import re
 
+from utils.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://runc.run"
 EVENTS_LIST_URL = f"{BASE_URL}/"
 
+HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
+    "Referer": BASE_URL,
+}
+
 
 def normalize_sport_code(event_name: str, distances: str) -> str:
     """
@@ -86,123 +94,112 @@ async def fetch_competitions(
         List[Dict]: Список соревнований
     """
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
-        "Referer": BASE_URL,
-    }
-
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            logger.info(f"Fetching from RunC: {EVENTS_LIST_URL}")
+        logger.info(f"Fetching from RunC: {EVENTS_LIST_URL}")
 
-            async with session.get(
-                EVENTS_LIST_URL,
-                timeout=aiohttp.ClientTimeout(total=15)
-            ) as response:
+        async with http_client.get(EVENTS_LIST_URL, headers=HEADERS, timeout=15) as response:
 
-                if response.status != 200:
-                    logger.error(f"RunC returned status {response.status}")
-                    return []
+            if response.status != 200:
+                logger.error(f"RunC returned status {response.status}")
+                return []
 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'lxml')
+            html = await response.text()
+            soup = BeautifulSoup(html, 'lxml')
 
-                event_items = soup.find_all('div', class_='header-menu-sub-menu-race-item')
-                logger.info(f"Found {len(event_items)} event items on RunC")
+            event_items = soup.find_all('div', class_='header-menu-sub-menu-race-item')
+            logger.info(f"Found {len(event_items)} event items on RunC")
 
-                competitions = []
-                processed_urls = set()  
+            competitions = []
+            processed_urls = set()  
 
-                for item in event_items:
-                    link = item.find('a', class_='header-menu-sub-menu-race-item__race-name')
+            for item in event_items:
+                link = item.find('a', class_='header-menu-sub-menu-race-item__race-name')
 
-                    if not link or 'results.runc.run' in link.get('href', ''):
-                        continue
+                if not link or 'results.runc.run' in link.get('href', ''):
+                    continue
 
-                    event_url = link.get('href', '')
+                event_url = link.get('href', '')
 
-                    if event_url in processed_urls:
-                        continue
+                if event_url in processed_urls:
+                    continue
 
-                    processed_urls.add(event_url)
+                processed_urls.add(event_url)
 
-                    comp = parse_competition_from_menu_item(item)
+                comp = parse_competition_from_menu_item(item)
 
-                    if not comp:
-                        continue
+                if not comp:
+                    continue
 
-                    if city and city.lower() not in comp.get("city", "").lower():
-                        continue
+                if city and city.lower() not in comp.get("city", "").lower():
+                    continue
 
-                    event_name = comp.get("title", "")
-                    distances_text = comp.get("distances_text", "")
-                    if not matches_sport_type(event_name, distances_text, sport):
-                        continue
+                event_name = comp.get("title", "")
+                distances_text = comp.get("distances_text", "")
+                if not matches_sport_type(event_name, distances_text, sport):
+                    continue
 
-                    try:
-                        logger.info(f"Fetching details for: {comp.get('title')}")
-                        detailed_comp = await get_competition_details(
-                            comp.get('url'),
-                            begin_date=comp.get('begin_date'),
-                            end_date=comp.get('end_date')
-                        )
-                        if detailed_comp:
-                            comp = detailed_comp
-                    except Exception as e:
-                        logger.warning(f"Could not fetch details for {comp.get('title')}: {e}")
-
-                    if period_months:
-                        begin_date_str = comp.get("begin_date")
-                        if begin_date_str:
-                            try:
-                                begin_date = datetime.fromisoformat(begin_date_str.replace('Z', '+00:00'))
-                                if begin_date.tzinfo is None:
-                                    begin_date = begin_date.replace(tzinfo=timezone.utc)
-
-                                now = datetime.now(timezone.utc)
-                                year = now.year
-                                month = now.month
-
-                                if period_months == 1:
-                                    from datetime import timedelta
-                                    start_date = datetime(year, month, 1, 0, 0, 0, tzinfo=timezone.utc)
-                                    if month == 12:
-                                        end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
-                                    else:
-                                        next_month_first = datetime(year, month + 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-                                        end_date = next_month_first - timedelta(seconds=1)
+                try:
+                    logger.info(f"Fetching details for: {comp.get('title')}")
+                    detailed_comp = await get_competition_details(
+                        comp.get('url'),
+                        begin_date=comp.get('begin_date'),
+                        end_date=comp.get('end_date')
+                    )
+                    if detailed_comp:
+                        comp = detailed_comp
+                except Exception as e:
+                    logger.warning(f"Could not fetch details for {comp.get('title')}: {e}")
 
-                                elif period_months == 12:
-                                    start_date = datetime(year, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
-                                    end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
+                if period_months:
+                    begin_date_str = comp.get("begin_date")
+                    if begin_date_str:
+                        try:
+                            begin_date = datetime.fromisoformat(begin_date_str.replace('Z', '+00:00'))
+                            if begin_date.tzinfo is None:
+                                begin_date = begin_date.replace(tzinfo=timezone.utc)
+
+                            now = datetime.now(timezone.utc)
+                            year = now.year
+                            month = now.month
 
+                            if period_months == 1:
+                                from datetime import timedelta
+                                start_date = datetime(year, month, 1, 0, 0, 0, tzinfo=timezone.utc)
+                                if month == 12:
+                                    end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
                                 else:
-                                    from datetime import timedelta
-                                    start_date = now
-                                    end_date = now + timedelta(days=180)
+                                    next_month_first = datetime(year, month + 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+                                    end_date = next_month_first - timedelta(seconds=1)
 
-                                if begin_date < start_date or begin_date > end_date:
-                                    continue
+                            elif period_months == 12:
+                                start_date = datetime(year, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+                                end_date = datetime(year, 12, 31, 23, 59, 59, tzinfo=timezone.utc)
 
-                                now_utc = datetime.now(timezone.utc)
-                                if begin_date.tzinfo is None:
-                                    begin_date = begin_date.replace(tzinfo=timezone.utc)
-                                if begin_date < now_utc:
-                                    logger.debug(f"Skipping past event: '{comp.get('title')}' on {begin_date.strftime('%Y-%m-%d')}")
-                                    continue
-                            except ValueError as e:
-                                logger.warning(f"Date parsing error: {e}")
+                            else:
+                                from datetime import timedelta
+                                start_date = now
+                                end_date = now + timedelta(days=180)
+
+                            if begin_date < start_date or begin_date > end_date:
                                 continue
 
-                    competitions.append(comp)
+                            now_utc = datetime.now(timezone.utc)
+                            if begin_date.tzinfo is None:
+                                begin_date = begin_date.replace(tzinfo=timezone.utc)
+                            if begin_date < now_utc:
+                                logger.debug(f"Skipping past event: '{comp.get('title')}' on {begin_date.strftime('%Y-%m-%d')}")
+                                continue
+                        except ValueError as e:
+                            logger.warning(f"Date parsing error: {e}")
+                            continue
+
+                competitions.append(comp)
 
-                    if len(competitions) >= limit:
-                        break
+                if len(competitions) >= limit:
+                    break
 
-                logger.info(f"Processed {len(competitions)} competitions from RunC")
-                return competitions[:limit]
+            logger.info(f"Processed {len(competitions)} competitions from RunC")
+            return competitions[:limit]
 
     except aiohttp.ClientError as e:
         logger.error(f"HTTP error while fetching RunC competitions: {e}")
@@ -492,94 +489,83 @@ async def get_competition_details(
     Returns:
         Optional[Dict]: Детальная информация о соревновании или None
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "ru-RU,ru;q=0.9,en;q=0.8",
-        "Referer": BASE_URL,
-    }
-
     try:
-        async with aiohttp.ClientSession(headers=headers) as session:
-            event_url = competition_url
-            logger.info(f"Fetching event details from: {event_url}")
+        event_url = competition_url
+        logger.info(f"Fetching event details from: {event_url}")
 
-            async with session.get(
-                event_url,
-                timeout=aiohttp.ClientTimeout(total=15)
-            ) as response:
+        async with http_client.get(event_url, headers=HEADERS, timeout=15) as response:
 
-                if response.status != 200:
-                    logger.error(f"RunC event details returned status {response.status}")
-                    return None
+            if response.status != 200:
+                logger.error(f"RunC event details returned status {response.status}")
+                return None
 
-                html = await response.text()
-                soup = BeautifulSoup(html, 'lxml')
+            html = await response.text()
+            soup = BeautifulSoup(html, 'lxml')
 
-                title_elem = soup.find('h1') or soup.find('h2', class_=re.compile('title|name|event'))
-                title = title_elem.get_text(strip=True) if title_elem else "Без названия"
+            title_elem = soup.find('h1') or soup.find('h2', class_=re.compile('title|name|event'))
+            title = title_elem.get_text(strip=True) if title_elem else "Без названия"
 
-                distances, distances_text = parse_distances_from_detail_page(soup)
+            distances, distances_text = parse_distances_from_detail_page(soup)
 
-                if not begin_date or not end_date:
-                    date_elem = soup.find(text=re.compile(r'\d{1,2}\s+(января|февраля|марта|апреля|мая|июня|июля|августа|сентября|октября|ноября|декабря)\s+\d{4}'))
-                    date_str = date_elem.strip() if date_elem else ""
-                    if date_str:
-                        begin_date = parse_russian_date(date_str)
-                        end_date = begin_date  
-                    else:
-                        now_iso = datetime.now(timezone.utc).isoformat()
-                        begin_date = now_iso
-                        end_date = now_iso
+            if not begin_date or not end_date:
+                date_elem = soup.find(text=re.compile(r'\d{1,2}\s+(января|февраля|марта|апреля|мая|июня|июля|августа|сентября|октября|ноября|декабря)\s+\d{4}'))
+                date_str = date_elem.strip() if date_elem else ""
+                if date_str:
+                    begin_date = parse_russian_date(date_str)
+                    end_date = begin_date  
+                else:
+                    now_iso = datetime.now(timezone.utc).isoformat()
+                    begin_date = now_iso
+                    end_date = now_iso
 
-                date_str = ""
-                if begin_date and end_date:
-                    try:
-                        begin_dt = datetime.fromisoformat(begin_date.replace('Z', '+00:00'))
-                        end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
+            date_str = ""
+            if begin_date and end_date:
+                try:
+                    begin_dt = datetime.fromisoformat(begin_date.replace('Z', '+00:00'))
+                    end_dt = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
 
-                        months_ru = ["", "января", "февраля", "марта", "апреля", "мая", "июня",
-                                    "июля", "августа", "сентября", "октября", "ноября", "декабря"]
+                    months_ru = ["", "января", "февраля", "марта", "апреля", "мая", "июня",
+                                "июля", "августа", "сентября", "октября", "ноября", "декабря"]
 
-                        if begin_dt.date() == end_dt.date():
-                            date_str = f"{begin_dt.day} {months_ru[begin_dt.month]} {begin_dt.year}"
+                    if begin_dt.date() == end_dt.date():
+                        date_str = f"{begin_dt.day} {months_ru[begin_dt.month]} {begin_dt.year}"
+                    else:
+                        if begin_dt.month == end_dt.month:
+                            date_str = f"{begin_dt.day}-{end_dt.day} {months_ru[begin_dt.month]} {begin_dt.year}"
                         else:
-                            if begin_dt.month == end_dt.month:
-                                date_str = f"{begin_dt.day}-{end_dt.day} {months_ru[begin_dt.month]} {begin_dt.year}"
-                            else:
-                                date_str = f"{begin_dt.day} {months_ru[begin_dt.month]} - {end_dt.day} {months_ru[end_dt.month]} {begin_dt.year}"
-                    except:
-                        date_str = "Дата уточняется"
-
-                city = "Москва"  
-                city_elem = soup.find(text=re.compile(r'(Москва|Санкт-Петербург|Казань|Екатеринбург|Новосибирск)'))
-                if city_elem:
-                    city = city_elem.strip()
-
-                sport_code = normalize_sport_code(title, distances_text)
-
-                competition_id = competition_url.replace('https://', '').replace('http://', '').replace('/', '_').replace('.', '_')
-
-                event_details = {
-                    "id": competition_id,
-                    "title": title,
-                    "code": competition_id,
-                    "city": city,
-                    "place": city,
-                    "sport_code": sport_code,
-                    "organizer": "Беговое Сообщество",
-                    "service": "Беговое Сообщество",
-                    "begin_date": begin_date,
-                    "end_date": end_date,
-                    "formatted_date": date_str if date_str else "Дата уточняется",
-                    "description": distances_text,
-                    "distances_text": distances_text,
-                    "url": event_url,
-                    "distances": distances,
-                }
-
-                logger.info(f"Successfully parsed event {competition_id}: {title} with {len(distances)} distances")
-                return event_details
+                            date_str = f"{begin_dt.day} {months_ru[begin_dt.month]} - {end_dt.day} {months_ru[end_dt.month]} {begin_dt.year}"
+                except:
+                    date_str = "Дата уточняется"
+
+            city = "Москва"  
+            city_elem = soup.find(text=re.compile(r'(Москва|Санкт-Петербург|Казань|Екатеринбург|Новосибирск)'))
+            if city_elem:
+                city = city_elem.strip()
+
+            sport_code = normalize_sport_code(title, distances_text)
+
+            competition_id = competition_url.replace('https://', '').replace('http://', '').replace('/', '_').replace('.', '_')
+
+            event_details = {
+                "id": competition_id,
+                "title": title,
+                "code": competition_id,
+                "city": city,
+                "place": city,
+                "sport_code": sport_code,
+                "organizer": "Беговое Сообщество",
+                "service": "Беговое Сообщество",
+                "begin_date": begin_date,
+                "end_date": end_date,
+                "formatted_date": date_str if date_str else "Дата уточняется",
+                "description": distances_text,
+                "distances_text": distances_text,
+                "url": event_url,
+                "distances": distances,
+            }
+
+            logger.info(f"Successfully parsed event {competition_id}: {title} with {len(distances)} distances")
+            return event_details
 
     except aiohttp.ClientError as e:
         logger.error(f"HTTP error while fetching event details: {e}")
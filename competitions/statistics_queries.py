@@ -1,244 +1,215 @@
 """
 Функции для работы со статистикой соревнований
+
+Статистика за всё время хранится в user_competition_stats (одна строка на пользователя)
+и обновляется по разнице в той же транзакции, что и запись результата
+(add_competition_result, update_competition_result, delete_competition_result).
+Остальные изменения участий (регистрация, предложения тренера, правка соревнования)
+помечают строку устаревшей триггером - она пересчитывается при следующем чтении.
 """
 
+import json
 import aiosqlite
 import os
-from typing import Optional, Dict, Any
-from datetime import datetime
-from utils.time_formatter import normalize_time
+import logging
+from typing import Optional, Dict, Any, List
+
+from competitions.competitions_statistics import (
+    apply_participation,
+    build_statistics_state,
+    merge_records,
+    rebuild_records,
+    statistics_from_state
+)
 
 DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
+logger = logging.getLogger(__name__)
+
+# Участия, которые входят в статистику (как в get_user_competitions_with_details)
+PARTICIPATIONS_QUERY = """
+    SELECT
+        cp.id, cp.distance, cp.status, cp.finish_time, cp.finish_seconds,
+        cp.target_time, cp.target_seconds, cp.place_overall, cp.place_age_category,
+        cp.age_category, cp.qualification,
+        c.name, c.date, c.city, c.country, c.organizer, c.sport_type
+    FROM competition_participants cp
+    JOIN competitions c ON c.id = cp.competition_id
+    WHERE cp.user_id = ?
+      AND (cp.proposal_status IS NULL OR cp.proposal_status != 'pending')
+"""
 
 
-async def get_user_competition_stats(user_id: int) -> Optional[Dict[str, Any]]:
+async def _load_participations(
+    db: aiosqlite.Connection,
+    user_id: int,
+    competition_id: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Загрузить участия пользователя (все или в одном соревновании)"""
+    query = PARTICIPATIONS_QUERY
+    params = [user_id]
+    if competition_id is not None:
+        query += " AND cp.competition_id = ?"
+        params.append(competition_id)
+    query += " ORDER BY c.date ASC, cp.id ASC"
+
+    # row_factory соединения не меняем - оно принадлежит вызывающему коду
+    async with db.execute(query, params) as cursor:
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+
+
+async def _save_state(db: aiosqlite.Connection, user_id: int, state: Dict[str, Any]) -> None:
+    """Сохранить состояние статистики и снять пометку устаревания"""
+    await db.execute(
+        """
+        INSERT INTO user_competition_stats (user_id, stats, is_stale, updated_at)
+        VALUES (?, ?, 0, CURRENT_TIMESTAMP)
+        ON CONFLICT(user_id) DO UPDATE SET
+            stats = excluded.stats,
+            is_stale = 0,
+            updated_at = CURRENT_TIMESTAMP
+        """,
+        (user_id, json.dumps(state, ensure_ascii=False))
+    )
+
+
+async def rebuild_user_competition_stats(db: aiosqlite.Connection, user_id: int) -> Dict[str, Any]:
     """
-    Получить статистику соревнований пользователя
+    Пересчитать статистику пользователя по всем участиям (без commit)
 
     Args:
+        db: Открытое соединение
         user_id: ID пользователя
 
     Returns:
-        Словарь со статистикой или None
+        Состояние статистики
     """
+    participants = await _load_participations(db, user_id)
+    state = build_statistics_state(participants)
+    await _save_state(db, user_id, state)
+    return state
 
-    async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
 
+async def get_user_competition_stats(user_id: int) -> Dict[str, Any]:
+    """
+    Получить статистику соревнований пользователя за всё время
+
+    Args:
+        user_id: ID пользователя
+
+    Returns:
+        Словарь со статистикой (формат calculate_competitions_statistics)
+    """
+
+    async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute(
-            "SELECT * FROM user_competition_stats WHERE user_id = ?",
+            "SELECT stats, is_stale FROM user_competition_stats WHERE user_id = ?",
             (user_id,)
         ) as cursor:
             row = await cursor.fetchone()
 
-            if row:
-                return dict(row)
+        if row and not row[1]:
+            return statistics_from_state(json.loads(row[0]))
 
-        await db.execute(
-            """
-            INSERT INTO user_competition_stats (user_id)
-            VALUES (?)
-            """,
-            (user_id,)
-        )
+        state = await rebuild_user_competition_stats(db, user_id)
         await db.commit()
+        return statistics_from_state(state)
+
 
-        return {
-            'user_id': user_id,
-            'total_competitions': 0,
-            'total_completed': 0,
-            'total_marathons': 0,
-            'total_half_marathons': 0,
-            'total_10k': 0,
-            'total_5k': 0,
-            'best_marathon_time': None,
-            'best_half_marathon_time': None,
-            'best_10k_time': None,
-            'best_5k_time': None,
-            'total_distance_km': 0
-        }
-
-
-async def update_user_competition_stats(user_id: int):
+async def get_user_finish_results(user_id: int) -> List[Dict[str, Any]]:
     """
-    Обновить статистику соревнований пользователя на основе результатов
+    Получить финиши пользователя для графиков динамики результатов
 
     Args:
         user_id: ID пользователя
-    """
 
+    Returns:
+        Список финишей (distance, date, status, finish_time, finish_seconds) по дате
+    """
     async with aiosqlite.connect(DB_PATH) as db:
         db.row_factory = aiosqlite.Row
-
         async with db.execute(
             """
-            SELECT
-                cp.distance,
-                cp.finish_time,
-                c.date
+            SELECT cp.distance, c.date, cp.status, cp.finish_time, cp.finish_seconds
             FROM competition_participants cp
-            JOIN competitions c ON cp.competition_id = c.id
-            WHERE cp.participant_id = ?
+            JOIN competitions c ON c.id = cp.competition_id
+            WHERE cp.user_id = ?
+              AND cp.status = 'finished'
               AND cp.finish_time IS NOT NULL
-              AND c.date < date('now')
-            """,
-            (user_id,)
-        ) as cursor:
-            results = await cursor.fetchall()
-
-        if not results:
-            await db.execute(
-                """
-                UPDATE user_competition_stats
-                SET total_competitions = 0,
-                    total_completed = 0,
-                    total_marathons = 0,
-                    total_half_marathons = 0,
-                    total_10k = 0,
-                    total_5k = 0,
-                    best_marathon_time = NULL,
-                    best_half_marathon_time = NULL,
-                    best_10k_time = NULL,
-                    best_5k_time = NULL,
-                    total_distance_km = 0,
-                    updated_at = CURRENT_TIMESTAMP
-                WHERE user_id = ?
-                """,
-                (user_id,)
-            )
-            await db.commit()
-            return
-
-        total_completed = len(results)
-        total_marathons = 0
-        total_half_marathons = 0
-        total_10k = 0
-        total_5k = 0
-        total_distance = 0
-
-        best_marathon = None
-        best_half_marathon = None
-        best_10k = None
-        best_5k = None
-
-        for result in results:
-            distance = result['distance']
-            finish_time = result['finish_time']
-
-            total_distance += distance
-
-            if 42.0 <= distance <= 42.3:
-                total_marathons += 1
-                if finish_time:
-                    normalized_time = normalize_time(finish_time)
-                    if best_marathon is None or time_to_seconds(normalized_time) < time_to_seconds(best_marathon):
-                        best_marathon = normalized_time
-
-            elif 21.0 <= distance <= 21.2:
-                total_half_marathons += 1
-                if finish_time:
-                    normalized_time = normalize_time(finish_time)
-                    if best_half_marathon is None or time_to_seconds(normalized_time) < time_to_seconds(best_half_marathon):
-                        best_half_marathon = normalized_time
-
-            elif 9.5 <= distance <= 10.5:
-                total_10k += 1
-                if finish_time:
-                    normalized_time = normalize_time(finish_time)
-                    if best_10k is None or time_to_seconds(normalized_time) < time_to_seconds(best_10k):
-                        best_10k = normalized_time
-
-            elif 4.5 <= distance <= 5.5:
-                total_5k += 1
-                if finish_time:
-                    normalized_time = normalize_time(finish_time)
-                    if best_5k is None or time_to_seconds(normalized_time) < time_to_seconds(best_5k):
-                        best_5k = normalized_time
-
-        async with db.execute(
-            """
-            SELECT COUNT(*) as total
-            FROM competition_participants
-            WHERE participant_id = ?
+              AND (cp.proposal_status IS NULL OR cp.proposal_status != 'pending')
+            ORDER BY c.date ASC, cp.id ASC
             """,
             (user_id,)
         ) as cursor:
-            row = await cursor.fetchone()
-            total_competitions = row['total'] if row else 0
-
-        await db.execute(
-            """
-            UPDATE user_competition_stats
-            SET total_competitions = ?,
-                total_completed = ?,
-                total_marathons = ?,
-                total_half_marathons = ?,
-                total_10k = ?,
-                total_5k = ?,
-                best_marathon_time = ?,
-                best_half_marathon_time = ?,
-                best_10k_time = ?,
-                best_5k_time = ?,
-                total_distance_km = ?,
-                updated_at = CURRENT_TIMESTAMP
-            WHERE user_id = ?
-            """,
-            (
-                total_competitions,
-                total_completed,
-                total_marathons,
-                total_half_marathons,
-                total_10k,
-                total_5k,
-                best_marathon,
-                best_half_marathon,
-                best_10k,
-                best_5k,
-                round(total_distance, 2),
-                user_id
-            )
-        )
-
-        await db.commit()
+            return [dict(row) for row in await cursor.fetchall()]
 
 
-def time_to_seconds(time_str: str) -> int:
+async def begin_stats_change(
+    db: aiosqlite.Connection,
+    user_id: int,
+    competition_id: int
+) -> Optional[Dict[str, Any]]:
     """
-    Конвертировать время в формате HH:MM:SS в секунды
+    Запомнить статистику и участия до изменения результата
+
+    Вызывается внутри транзакции (BEGIN IMMEDIATE) до UPDATE competition_participants.
 
     Args:
-        time_str: Время в формате HH:MM:SS
+        db: Открытое соединение
+        user_id: ID пользователя
+        competition_id: ID соревнования
 
     Returns:
-        Количество секунд
+        Контекст для apply_stats_change или None, если статистика еще не построена
+        или устарела (тогда она пересчитается при чтении)
     """
-
-    try:
-        parts = time_str.split(':')
-        if len(parts) == 3:
-            hours, minutes, seconds = map(int, parts)
-            return hours * 3600 + minutes * 60 + seconds
-        elif len(parts) == 2:
-            minutes, seconds = map(int, parts)
-            return minutes * 60 + seconds
-        else:
-            return 0
-    except (ValueError, AttributeError):
-        return 0
-
-
-async def add_result_and_update_stats(user_id: int, competition_id: int, result_data: Dict[str, Any]):
+    async with db.execute(
+        "SELECT stats, is_stale FROM user_competition_stats WHERE user_id = ?",
+        (user_id,)
+    ) as cursor:
+        row = await cursor.fetchone()
+
+    if not row or row[1]:
+        return None
+
+    return {
+        'state': json.loads(row[0]),
+        'before': await _load_participations(db, user_id, competition_id)
+    }
+
+
+async def apply_stats_change(
+    db: aiosqlite.Connection,
+    user_id: int,
+    competition_id: int,
+    change: Optional[Dict[str, Any]]
+) -> None:
     """
-    Добавить результат соревнования и обновить статистику
+    Применить разницу участий в соревновании к статистике (без commit)
 
     Args:
+        db: Открытое соединение
         user_id: ID пользователя
         competition_id: ID соревнования
-        result_data: Данные результата (finish_time, place_overall, etc.)
+        change: Результат begin_stats_change
     """
-
-    from competitions.competitions_queries import add_competition_result
-
-    await add_competition_result(user_id, competition_id, result_data)
-
-    await update_user_competition_stats(user_id)
+    if change is None:
+        return
+
+    state = change['state']
+    after = await _load_participations(db, user_id, competition_id)
+
+    for p in change['before']:
+        apply_participation(state, p, sign=-1)
+    for p in after:
+        apply_participation(state, p)
+
+    # Рекорды и лучшие места нельзя "вычесть": если прежний результат мог в них входить,
+    # пересчитываем их по финишам пользователя
+    if any(p.get('status') == 'finished' and p.get('finish_time') for p in change['before']):
+        rebuild_records(state, await _load_participations(db, user_id))
+    else:
+        for p in after:
+            merge_records(state, p)
+
+    await _save_state(db, user_id, state)
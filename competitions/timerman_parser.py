@@ -2,11 +2,13 @@
 Модуль для получения данных о соревнованиях с API timerman.org
 """
 
-import aiohttp
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
 import logging
 from datetime import datetime, timedelta
 
+from competitions.paging import iter_pages
+from utils.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://timerman.org"
@@ -97,18 +99,12 @@ def matches_sport_type(event: Dict, target_sport: str) -> bool:
 class TimmermanParser:
     """Парсер для получения данных о соревнованиях с API timerman.org"""
 
-    def __init__(self):
-        self.session: Optional[aiohttp.ClientSession] = None
-
     async def __aenter__(self):
-        """Создание сессии при входе в контекстный менеджер"""
-        self.session = aiohttp.ClientSession()
+        """Запросы идут через общий http_client - своя сессия не нужна"""
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Закрытие сессии при выходе из контекстного менеджера"""
-        if self.session:
-            await self.session.close()
+        pass
 
     async def get_events(
         self,
@@ -133,9 +129,6 @@ class TimmermanParser:
             - list: список событий
             - totalCount: общее количество
         """
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-
         url = BASE_URL + API_ENDPOINT
 
         payload = {
@@ -163,11 +156,7 @@ class TimmermanParser:
         }
 
         try:
-            async with self.session.post(
-                url,
-                json=payload,
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as response:
+            async with http_client.post(url, json=payload, timeout=30) as response:
                 if response.status == 200:
                     data = await response.json()
                     if isinstance(data, list):
@@ -208,6 +197,56 @@ class TimmermanParser:
         Returns:
             Список словарей с информацией о соревнованиях
         """
+        stats = {'events': 0, 'pages': 0, 'period': 0, 'city': 0, 'sport': 0}
+        competitions = []
+        events = self.iter_competitions(city, sport, period_months, stats)
+        try:
+            async for comp in events:
+                competitions.append(comp)
+                if len(competitions) >= limit:
+                    break
+        finally:
+            # Незавершенные запросы страниц отменяются
+            await events.aclose()
+
+        logger.info(f"Fetched {stats['events']} events from Timerman API in {stats['pages']} requests")
+
+        logger.info(f"Timerman filtering results: kept {len(competitions)} events, filtered out {stats['period']} total")
+        if stats['period']:
+            logger.info(f"  - Filtered by period: {stats['period']} events")
+        if stats['city']:
+            logger.info(f"  - Filtered by city: {stats['city']} events")
+        if stats['sport']:
+            logger.info(f"  - Filtered by sport: {stats['sport']} events")
+
+        return competitions
+
+    async def iter_competitions(
+        self,
+        city: Optional[str] = None,
+        sport: Optional[str] = None,
+        period_months: Optional[int] = None,
+        stats: Optional[Dict[str, int]] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Соревнования из API по мере загрузки страниц (уже отфильтрованные)
+
+        Загрузка прекращается, когда потребитель перестал читать (limit
+        в get_competitions) или страницы закончились. Порядок событий в ответе
+        API не гарантирован, поэтому по датам страницы не отсекаются.
+
+        Args:
+            city: Название города для фильтрации
+            sport: Код вида спорта
+            period_months: Период в месяцах
+            stats: Словарь для счетчиков (events, pages, period, city, sport)
+
+        Yields:
+            Соревнование с упрощенной структурой (см. get_competitions)
+        """
+        if stats is None:
+            stats = {'events': 0, 'pages': 0, 'period': 0, 'city': 0, 'sport': 0}
+
         start_date = None
         end_date = None
         if period_months:
@@ -237,154 +276,109 @@ class TimmermanParser:
                 start_date = now
                 end_date = now + timedelta(days=180)
 
-        all_events = []
-        skip = 0
-        batch_size = 100
-        max_requests = 20
-
-        for request_num in range(max_requests):
-            data = await self.get_events(
-                skip=skip,
-                take=batch_size,
-                city=None,
-                sport=None
-            )
-
-            events_batch = data.get("list", [])
-            if not events_batch:
-                break
-
-            all_events.extend(events_batch)
-
-            if len(events_batch) < batch_size:
-                break
-
-            skip += batch_size
-
-        logger.info(f"Fetched {len(all_events)} events from Timerman API in {request_num + 1} requests")
-
-        competitions = []
-        filtered_count = 0
-        filtered_by_period = 0
-        filtered_by_city = 0
-        filtered_by_sport = 0
-
-        for event in all_events:
-            try:
-                comp = {
-                    "id": event.get("c", ""),  
-                    "title": event.get("t", ""),  
-                    "code": event.get("c", ""),
-                    "city": event.get("p", ""),  
-                    "place": event.get("p", ""),
-                    "address": event.get("address", ""),
-                    "sport_code": event.get("dc", "run"),  
-                    "image_url": event.get("ImageUrl", ""),
-                    "participants_count": event.get("pc", 0),  
-                    "organizer": event.get("on", "Timerman"),  
-                    "service": "Timerman",  
-                }
-
-                comp["begin_date"] = event.get("d")  
-                comp["end_date"] = event.get("ed") or event.get("d")  
-
-                code = event.get("c", "")
-                if code:
-                    comp["url"] = f"https://timerman.org/event/{code}"
-                else:
-                    comp["url"] = ""
-
-                distances = []
-                race_items = event.get("ri", [])
-                for race in race_items:
-                    distances.append({
-                        "id": race.get("id", ""),
-                        "name": race.get("n", ""),  
-                        "distance": race.get("d", 0),  
-                        "sport": race.get("dn", ""),  
-                        "sport_code": race.get("dc", ""),  
-                        "participants_count": race.get("pc", 0),  
-                        "race_date": race.get("sd")  
-                    })
-
-                comp["distances"] = distances
-
-                if (start_date or end_date) and comp["begin_date"]:
-                    try:
-                        from datetime import timezone
-                        begin_date_str = comp["begin_date"].replace('Z', '+00:00')
-                        begin_date_obj = datetime.fromisoformat(begin_date_str)
-
-                        if begin_date_obj.tzinfo is None:
-                            begin_date_obj = begin_date_obj.replace(tzinfo=timezone.utc)
-
-                        if start_date and begin_date_obj < start_date:
-                            filtered_count += 1
-                            filtered_by_period += 1
-                            continue
-                        if end_date and begin_date_obj > end_date:
-                            filtered_count += 1
-                            filtered_by_period += 1
-                            continue
-
-                        now_utc = datetime.now(timezone.utc)
-                        if begin_date_obj < now_utc:
-                            filtered_count += 1
-                            filtered_by_period += 1
-                            logger.debug(f"Skipping past event: '{comp['title']}' on {begin_date_obj.strftime('%Y-%m-%d')}")
+        async for page in iter_pages(self.get_events):
+            stats['pages'] += 1
+            stats['events'] += len(page)
+
+            for event in page:
+                try:
+                    comp = {
+                        "id": event.get("c", ""),  
+                        "title": event.get("t", ""),  
+                        "code": event.get("c", ""),
+                        "city": event.get("p", ""),  
+                        "place": event.get("p", ""),
+                        "address": event.get("address", ""),
+                        "sport_code": event.get("dc", "run"),  
+                        "image_url": event.get("ImageUrl", ""),
+                        "participants_count": event.get("pc", 0),  
+                        "organizer": event.get("on", "Timerman"),  
+                        "service": "Timerman",  
+                    }
+
+                    comp["begin_date"] = event.get("d")  
+                    comp["end_date"] = event.get("ed") or event.get("d")  
+
+                    code = event.get("c", "")
+                    if code:
+                        comp["url"] = f"https://timerman.org/event/{code}"
+                    else:
+                        comp["url"] = ""
+
+                    distances = []
+                    race_items = event.get("ri", [])
+                    for race in race_items:
+                        distances.append({
+                            "id": race.get("id", ""),
+                            "name": race.get("n", ""),  
+                            "distance": race.get("d", 0),  
+                            "sport": race.get("dn", ""),  
+                            "sport_code": race.get("dc", ""),  
+                            "participants_count": race.get("pc", 0),  
+                            "race_date": race.get("sd")  
+                        })
+
+                    comp["distances"] = distances
+
+                    if (start_date or end_date) and comp["begin_date"]:
+                        try:
+                            from datetime import timezone
+                            begin_date_str = comp["begin_date"].replace('Z', '+00:00')
+                            begin_date_obj = datetime.fromisoformat(begin_date_str)
+
+                            if begin_date_obj.tzinfo is None:
+                                begin_date_obj = begin_date_obj.replace(tzinfo=timezone.utc)
+
+                            if start_date and begin_date_obj < start_date:
+                                stats['period'] += 1
+                                continue
+                            if end_date and begin_date_obj > end_date:
+                                stats['period'] += 1
+                                continue
+
+                            now_utc = datetime.now(timezone.utc)
+                            if begin_date_obj < now_utc:
+                                stats['period'] += 1
+                                logger.debug(f"Skipping past event: '{comp['title']}' on {begin_date_obj.strftime('%Y-%m-%d')}")
+                                continue
+                        except Exception as e:
+                            logger.error(f"Error parsing date for event {comp['id']}: {e}")
+
+                    if city:
+                        event_city = event.get('cityName') or event.get('city') or ''
+                        event_place = event.get('place') or ''
+                        event_address = event.get('address') or ''
+                        event_title = event.get('title') or event.get('name') or ''
+
+                        city_lower = city.lower()
+                        event_city_lower = event_city.lower()
+                        event_place_lower = event_place.lower()
+                        event_address_lower = event_address.lower()
+                        event_title_lower = event_title.lower()
+
+                        city_found = (
+                            city_lower in event_address_lower or
+                            city_lower in event_place_lower or
+                            city_lower in event_title_lower or
+                            city_lower in event_city_lower
+                        )
+
+                        if not city_found:
+                            stats['city'] += 1
                             continue
-                    except Exception as e:
-                        logger.error(f"Error parsing date for event {comp['id']}: {e}")
-
-                if city:
-                    event_city = event.get('cityName') or event.get('city') or ''
-                    event_place = event.get('place') or ''
-                    event_address = event.get('address') or ''
-                    event_title = event.get('title') or event.get('name') or ''
-
-                    city_lower = city.lower()
-                    event_city_lower = event_city.lower()
-                    event_place_lower = event_place.lower()
-                    event_address_lower = event_address.lower()
-                    event_title_lower = event_title.lower()
-
-                    city_found = (
-                        city_lower in event_address_lower or
-                        city_lower in event_place_lower or
-                        city_lower in event_title_lower or
-                        city_lower in event_city_lower
-                    )
-
-                    if not city_found:
-                        filtered_by_city += 1
-                        continue
-
-                if sport:
-                    sport_matches = matches_sport_type(event, sport)
-
-                    if not sport_matches:
-                        filtered_by_sport += 1
-                        continue
 
-                competitions.append(comp)
+                    if sport:
+                        sport_matches = matches_sport_type(event, sport)
 
-                if len(competitions) >= limit:
-                    break
-
-            except Exception as e:
-                logger.error(f"Error parsing Timerman event {event.get('id', 'unknown')}: {e}")
-                continue
-
-        logger.info(f"Timerman filtering results: kept {len(competitions)} events, filtered out {filtered_count} total")
-        if filtered_by_period > 0:
-            logger.info(f"  - Filtered by period: {filtered_by_period} events")
-        if filtered_by_city > 0:
-            logger.info(f"  - Filtered by city: {filtered_by_city} events")
-        if filtered_by_sport > 0:
-            logger.info(f"  - Filtered by sport: {filtered_by_sport} events")
+                        if not sport_matches:
+                            stats['sport'] += 1
+                            continue
 
-        return competitions
+                    yield comp
 
+                except Exception as e:
+                    logger.error(f"Error parsing Timerman event {event.get('id', 'unknown')}: {e}")
+                    continue
 
 
 async def fetch_competitions(
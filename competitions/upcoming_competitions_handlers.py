@@ -7,11 +7,13 @@ from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove, InlineKey
 from aiogram.fsm.context import FSMContext
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from datetime import datetime
+from typing import Dict, List
 import asyncio
 
 from competitions.competitions_fsm import UpcomingCompetitionsStates
 from competitions.parser import SPORT_CODES, SPORT_NAMES
-from competitions.competitions_fetcher import fetch_all_competitions, SERVICE_CODES, SERVICE_NAMES
+from competitions.competitions_fetcher import SERVICE_CODES, SERVICE_NAMES
+from competitions.result_sets import get_competition_result_set, find_competition
 from database.queries import get_user_settings, add_competition_participant, is_user_participant, get_user_participant_competition_urls
 from utils.date_formatter import DateFormatter
 from utils.unit_converter import format_distance
@@ -302,84 +304,77 @@ async def select_sport(callback: CallbackQuery, state: FSMContext):
     await callback.answer()
 
 
-async def show_competitions_results(message: Message, state: FSMContext, page: int = 1):
-    """Показать результаты поиска соревнований"""
+async def _hidden_competition_ids(user_id: int, competitions: List[Dict]) -> List[str]:
+    """ID соревнований, на которые пользователь уже зарегистрирован (скрываются из поиска)"""
+    from database.queries import is_user_registered_all_distances, get_user_participant_competition_urls
+
+    participant_urls = await get_user_participant_competition_urls(user_id)
+    logger.info(f"User is participant in {len(participant_urls)} competitions")
+
+    hidden = []
+    for comp in competitions:
+        comp_url = comp.get('url', '')
+        distances_count = len(comp.get('distances', []))
+        sport_code = comp.get('sport_code', '')
+
+        if not comp_url:
+            continue
+
+        if distances_count <= 1:
+            if sport_code == "camp" and comp_url in participant_urls:
+                logger.info(f"Hiding competition (camp, registered): {comp.get('name', 'Unknown')}")
+                hidden.append(comp['id'])
+        elif await is_user_registered_all_distances(user_id, comp_url, distances_count):
+            logger.info(f"Hiding competition (all distances registered): {comp.get('name', 'Unknown')}")
+            hidden.append(comp['id'])
+
+    return hidden
+
+
+async def show_competitions_results(message: Message, state: FSMContext, page: int = 1, new_search: bool = True):
+    """
+    Показать результаты поиска соревнований
+
+    Результат поиска берется из общего хранилища (competitions.result_sets),
+    поэтому переход по страницам не обращается к сервисам соревнований.
+    """
     data = await state.get_data()
-    city = data.get('city')
     city_display = data.get('city_display', 'Все города')
-    sport = data.get('sport')
     sport_display = data.get('sport_display', 'Все виды спорта')
-    period_months = data.get('period_months', 1)
     period_display = data.get('period_display', '1 месяц')
-    service = data.get('service')
     service_display = data.get('service_display', 'Все сервисы')
 
     user_id = message.chat.id
     settings = await get_user_settings(user_id)
     date_format = settings.get('date_format', 'ДД.ММ.ГГГГ') if settings else 'ДД.ММ.ГГГГ'
 
-    loading_text = (
-        f"🔍 <b>Поиск соревнований...</b>\n\n"
-        f"📍 Город: <b>{city_display}</b>\n"
-        f"📅 Период: <b>{period_display}</b>\n"
-        f"🏃 Спорт: <b>{sport_display}</b>\n"
-        f"🌐 Сервис: <b>{service_display}</b>"
-    )
-
-    try:
-        await message.edit_text(loading_text, parse_mode="HTML")
-    except:
-        msg = await message.answer(loading_text, parse_mode="HTML")
-        message = msg
-
-    try:
-        logger.info(f"Fetching competitions: city={city}, sport={sport}, period_months={period_months}, service={service}")
-
-        all_competitions = await fetch_all_competitions(
-            city=city,
-            sport=sport,
-            limit=1000,  
-            period_months=period_months,
-            service=service
+    if new_search:
+        loading_text = (
+            f"🔍 <b>Поиск соревнований...</b>\n\n"
+            f"📍 Город: <b>{city_display}</b>\n"
+            f"📅 Период: <b>{period_display}</b>\n"
+            f"🏃 Спорт: <b>{sport_display}</b>\n"
+            f"🌐 Сервис: <b>{service_display}</b>"
         )
 
-        logger.info(f"Received {len(all_competitions)} competitions after filtering")
-
-        from database.queries import is_user_registered_all_distances, get_user_participant_competition_urls
-
-        participant_urls = await get_user_participant_competition_urls(user_id)
-        logger.info(f"User is participant in {len(participant_urls)} competitions")
+        try:
+            await message.edit_text(loading_text, parse_mode="HTML")
+        except:
+            msg = await message.answer(loading_text, parse_mode="HTML")
+            message = msg
 
-        filtered_competitions = []
-        for comp in all_competitions:
-            comp_url = comp.get('url', '')
-            distances_count = len(comp.get('distances', []))
-            sport_code = comp.get('sport_code', '')
+    try:
+        result = await get_competition_result_set(data)
 
-            if not comp_url:
-                filtered_competitions.append(comp)
-                continue
+        # Скрытые соревнования пересчитываются при новом поиске и после изменения регистраций
+        hidden_ids = data.get('hidden_competition_ids')
+        if new_search or hidden_ids is None:
+            hidden_ids = await _hidden_competition_ids(user_id, result.items)
+            await state.update_data(hidden_competition_ids=hidden_ids)
 
-            if distances_count <= 1:
-                if sport_code == "camp":
-                    if comp_url not in participant_urls:
-                        filtered_competitions.append(comp)
-                    else:
-                        logger.info(f"Hiding competition (camp, registered): {comp.get('name', 'Unknown')}")
-                else:
-                    filtered_competitions.append(comp)
-            else:
-                is_all_registered = await is_user_registered_all_distances(user_id, comp_url, distances_count)
-                if not is_all_registered:
-                    filtered_competitions.append(comp)
-                else:
-                    logger.info(f"Hiding competition (all distances registered): {comp.get('name', 'Unknown')}")
-
-        all_competitions = filtered_competitions
+        all_competitions = result.visible(hidden_ids)
         logger.info(f"After filtering participant competitions: {len(all_competitions)} competitions")
 
-        await state.update_data(all_competitions=all_competitions)
-
         items_per_page = 10
         total_pages = (len(all_competitions) + items_per_page - 1) // items_per_page
 
@@ -476,7 +471,7 @@ async def navigate_page(callback: CallbackQuery, state: FSMContext):
     page_str = callback.data.split(":", 2)[2]
     page = int(page_str)
 
-    await show_competitions_results(callback.message, state, page)
+    await show_competitions_results(callback.message, state, page, new_search=False)
     await callback.answer()
 
 
@@ -486,10 +481,8 @@ async def show_competition_detail(callback: CallbackQuery, state: FSMContext):
     comp_id = callback.data.split(":", 1)[1]
 
     data = await state.get_data()
-    all_competitions = data.get('all_competitions', [])
-
     try:
-        comp = next((c for c in all_competitions if c['id'] == comp_id), None)
+        comp = await find_competition(data, comp_id)
 
         if not comp:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
@@ -625,9 +618,7 @@ async def participate_in_competition(callback: CallbackQuery, state: FSMContext)
 
     try:
         data = await state.get_data()
-        all_competitions = data.get('all_competitions', [])
-
-        comp = next((c for c in all_competitions if c['id'] == comp_id), None)
+        comp = await find_competition(data, comp_id)
 
         if not comp:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
@@ -773,13 +764,7 @@ async def toggle_distance_selection(callback: CallbackQuery, state: FSMContext):
         data = await state.get_data()
         selected_distances = data.get('selected_distances', [])
         registered_distances = data.get('registered_distances', [])
-        all_competitions = data.get('all_competitions', [])
-
-        competition = None
-        for comp in all_competitions:
-            if comp.get('id') == comp_id:
-                competition = comp
-                break
+        competition = await find_competition(data, comp_id)
 
         if not competition:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
@@ -855,13 +840,7 @@ async def confirm_distances_selection(callback: CallbackQuery, state: FSMContext
             await callback.answer("⚠️ Выберите хотя бы одну дистанцию", show_alert=True)
             return
 
-        all_competitions = data.get('all_competitions', [])
-
-        competition = None
-        for comp in all_competitions:
-            if comp.get('id') == comp_id:
-                competition = comp
-                break
+        competition = await find_competition(data, comp_id)
 
         if not competition:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
@@ -1097,9 +1076,7 @@ async def select_distance(callback: CallbackQuery, state: FSMContext):
 
     try:
         data = await state.get_data()
-        all_competitions = data.get('all_competitions', [])
-
-        comp = next((c for c in all_competitions if c['id'] == comp_id), None)
+        comp = await find_competition(data, comp_id)
 
         if not comp:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
@@ -1141,9 +1118,7 @@ async def cancel_participation(callback: CallbackQuery, state: FSMContext):
 
     try:
         data = await state.get_data()
-        all_competitions = data.get('all_competitions', [])
-
-        comp = next((c for c in all_competitions if c['id'] == comp_id), None)
+        comp = await find_competition(data, comp_id)
 
         if not comp:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
@@ -1231,11 +1206,10 @@ async def skip_target_time(callback: CallbackQuery, state: FSMContext):
 
     try:
         data = await state.get_data()
-        all_competitions = data.get('all_competitions', [])
         selected_distance = data.get('selected_distance')
         selected_distance_name = data.get('selected_distance_name')
 
-        comp = next((c for c in all_competitions if c['id'] == comp_id), None)
+        comp = await find_competition(data, comp_id)
 
         if not comp:
             await callback.answer("❌ Соревнование не найдено", show_alert=True)
@@ -1439,7 +1413,6 @@ async def process_target_time(message: Message, state: FSMContext):
 
         else:
             comp_id = data.get('pending_competition_id')
-            all_competitions = data.get('all_competitions', [])
             selected_distance = data.get('selected_distance')
             selected_distance_name = data.get('selected_distance_name', '')
 
@@ -1447,7 +1420,7 @@ async def process_target_time(message: Message, state: FSMContext):
                 await message.answer("❌ Ошибка: соревнование не найдено")
                 return
 
-            comp = next((c for c in all_competitions if c['id'] == comp_id), None)
+            comp = await find_competition(data, comp_id)
 
             if not comp:
                 await message.answer("❌ Соревнование не найдено")
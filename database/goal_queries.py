@@ -0,0 +1,119 @@
+"""
+Функции для работы с прогрессом недельных целей
+
+Накопленные значения (объем, количество, объем по типам) хранятся в goal_progress
+по неделям и обновляются триггерами на trainings. Здесь - чтение прогресса,
+отметка отправленных порогов и перенос старых недель в архив.
+"""
+
+import aiosqlite
+import os
+import logging
+from datetime import datetime, timedelta, date
+from typing import Dict, Any, Optional
+
+from database.models import GOAL_PROGRESS_RETENTION_WEEKS
+
+DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
+logger = logging.getLogger(__name__)
+
+
+def get_week_start(day: Optional[date] = None) -> str:
+    """
+    Понедельник недели в формате YYYY-MM-DD (ключ недели в goal_progress)
+
+    Args:
+        day: Дата внутри недели (по умолчанию сегодня)
+    """
+    day = day or datetime.now().date()
+    return (day - timedelta(days=day.weekday())).strftime('%Y-%m-%d')
+
+
+async def get_week_goal_progress(user_id: int, week_start: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Получить прогресс пользователя за неделю
+
+    Args:
+        user_id: ID пользователя
+        week_start: Понедельник недели (по умолчанию текущая неделя)
+
+    Returns:
+        Словарь {goal_key: {'total': ..., 'milestone': ...}}
+    """
+    week_start = week_start or get_week_start()
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            "SELECT goal_key, total, milestone FROM goal_progress WHERE user_id = ? AND week_start = ?",
+            (user_id, week_start)
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+    return {
+        goal_key: {'total': round(total or 0, 2), 'milestone': milestone or 0}
+        for goal_key, total, milestone in rows
+    }
+
+
+async def update_goal_milestones(user_id: int, week_start: str, milestones: Dict[str, int]) -> None:
+    """
+    Сохранить отправленные пороги прогресса
+
+    Args:
+        user_id: ID пользователя
+        week_start: Понедельник недели
+        milestones: Словарь {goal_key: порог}
+    """
+    if not milestones:
+        return
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.executemany(
+            """
+            INSERT INTO goal_progress (user_id, week_start, goal_key, milestone)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(user_id, week_start, goal_key) DO UPDATE SET milestone = excluded.milestone
+            """,
+            [(user_id, week_start, goal_key, milestone) for goal_key, milestone in milestones.items()]
+        )
+        await db.commit()
+
+
+async def archive_old_goal_progress(keep_weeks: int = GOAL_PROGRESS_RETENTION_WEEKS) -> int:
+    """
+    Перенести прогресс старых недель в goal_progress_archive
+
+    Правки тренировок уже архивных недель попадают в goal_progress как разница
+    и при следующем переносе прибавляются к архивной строке.
+
+    Args:
+        keep_weeks: Сколько прошлых недель оставить кроме текущей
+
+    Returns:
+        Количество перенесенных строк
+    """
+    today = datetime.now().date()
+    cutoff = get_week_start(today - timedelta(weeks=keep_weeks))
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("BEGIN IMMEDIATE")
+        await db.execute(
+            """
+            INSERT INTO goal_progress_archive (user_id, week_start, goal_key, total, milestone)
+            SELECT user_id, week_start, goal_key, total, milestone
+            FROM goal_progress
+            WHERE week_start < ?
+            ON CONFLICT(user_id, week_start, goal_key) DO UPDATE SET
+                total = total + excluded.total,
+                milestone = MAX(milestone, excluded.milestone),
+                archived_at = CURRENT_TIMESTAMP
+            """,
+            (cutoff,)
+        )
+        cursor = await db.execute("DELETE FROM goal_progress WHERE week_start < ?", (cutoff,))
+        archived = cursor.rowcount
+        await db.commit()
+
+    if archived:
+        logger.info(f"В архив перенесено {archived} строк прогресса целей (недели до {cutoff})")
+    return archived
@@ -4,8 +4,8 @@
 
 import aiosqlite
 import os
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta, date
 
 DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
 
@@ -138,14 +138,48 @@ async def get_user_training_stats_for_level(user_id: int) -> Dict[str, Any]:
             }
 
 
+LEVELS_ORDER = ['новичок', 'любитель', 'профи', 'элитный']
+
+
+def _iso_week(day) -> str:
+    """Неделя в формате YYYY-WW"""
+    year, week, _ = day.isocalendar()
+    return f"{year}-{week:02d}"
+
+
+def _current_week_bounds() -> tuple:
+    """Понедельник и воскресенье текущей недели (YYYY-MM-DD)"""
+    today = datetime.now().date()
+    week_start = today - timedelta(days=today.weekday())
+    week_end = week_start + timedelta(days=6)
+    return week_start.strftime('%Y-%m-%d'), week_end.strftime('%Y-%m-%d')
+
+
+def _weeks_since(level_updated_week: Optional[str], current_week: str) -> int:
+    """Количество недель с момента последнего изменения уровня"""
+    if not level_updated_week:
+        return 0
+    try:
+        updated_year, updated_week = map(int, level_updated_week.split('-'))
+        current_year, current_week_num = map(int, current_week.split('-'))
+        updated_date = date.fromisocalendar(updated_year, updated_week, 1)
+        current_date = date.fromisocalendar(current_year, current_week_num, 1)
+        return (current_date - updated_date).days // 7
+    except ValueError:
+        return 0
+
+
+def _level_index(level: Optional[str]) -> int:
+    return LEVELS_ORDER.index(level) if level in LEVELS_ORDER else 0
+
+
 async def calculate_and_update_user_level(user_id: int) -> Dict[str, Any]:
     """
-    Рассчитать и обновить уровень пользователя на основе его активности
+    Проверить повышение уровня после сохранения тренировки или результата
 
-    Логика:
-    1. Уровень сохраняется 3 недели с момента последнего изменения
-    2. Уровень может только ПОВЫСИТЬСЯ, если заработан новый на текущей неделе
-    3. Уровень ПОНИЖАЕТСЯ только через 3 недели без тренировок
+    Уровень здесь может только ПОВЫСИТЬСЯ (если заработан новый на текущей неделе).
+    Понижение после 3 недель без тренировок выполняет еженедельная задача
+    recalculate_all_user_levels.
 
     Args:
         user_id: ID пользователя
@@ -158,56 +192,110 @@ async def calculate_and_update_user_level(user_id: int) -> Dict[str, Any]:
         get_level_emoji
     )
 
-    today = datetime.now()
-    year, week, _ = today.isocalendar()
-    current_week = f"{year}-{week:02d}"
-
-    current_level, level_updated_week = await get_user_level_with_week(user_id)
-    if not current_level:
-        current_level = 'новичок'
-        level_updated_week = current_week
-
-    stats = await get_user_training_stats_for_level(user_id)
-
-    earned_level = get_level_by_avg_trainings(stats['avg_per_week'])
-
-    levels_order = ['новичок', 'любитель', 'профи', 'элитный']
-    current_level_index = levels_order.index(current_level) if current_level in levels_order else 0
-    earned_level_index = levels_order.index(earned_level) if earned_level in levels_order else 0
+    current_week = _iso_week(datetime.now())
+    week_start, week_end = _current_week_bounds()
 
-    if level_updated_week:
-        try:
-            updated_year, updated_week = map(int, level_updated_week.split('-'))
-            from datetime import date
-            updated_date = date.fromisocalendar(updated_year, updated_week, 1)
-            current_date = date.fromisocalendar(year, week, 1)
-            weeks_diff = (current_date - updated_date).days // 7
-        except:
-            weeks_diff = 0
-    else:
-        weeks_diff = 0
-
-    new_level = current_level
-    level_changed = False
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            """
+            SELECT u.level, u.level_updated_week,
+                   (
+                       SELECT COUNT(*) FROM trainings t
+                       WHERE t.user_id = u.id AND t.date >= ? AND t.date <= ?
+                   ) AS current_week_trainings
+            FROM users u
+            WHERE u.id = ?
+            """,
+            (week_start, week_end, user_id)
+        ) as cursor:
+            row = await cursor.fetchone()
 
-    if earned_level_index > current_level_index:
-        new_level = earned_level
-        level_changed = True
+        current_level = row[0] if row and row[0] else 'новичок'
+        level_updated_week = row[1] if row and row[0] else current_week
+        current_week_trainings = row[2] if row else 0
 
-    elif weeks_diff >= 3 and stats['current_week_trainings'] == 0:
-        if current_level_index > 0:
-            new_level = levels_order[current_level_index - 1]
-            level_changed = True
+        earned_level = get_level_by_avg_trainings(current_week_trainings)
+        level_changed = _level_index(earned_level) > _level_index(current_level)
+        new_level = earned_level if level_changed else current_level
 
-    if level_changed:
-        await update_user_level(user_id, new_level, current_week)
+        if level_changed:
+            await db.execute(
+                "UPDATE users SET level = ?, level_updated_week = ? WHERE id = ?",
+                (new_level, current_week, user_id)
+            )
+            await db.commit()
 
     return {
         'old_level': current_level,
         'new_level': new_level,
         'level_changed': level_changed,
         'level_emoji': get_level_emoji(new_level),
-        'current_week_trainings': stats['current_week_trainings'],
-        'total_trainings': stats['total_trainings'],
-        'weeks_since_update': weeks_diff
+        'current_week_trainings': current_week_trainings,
+        'weeks_since_update': _weeks_since(level_updated_week, current_week)
     }
+
+
+async def recalculate_all_user_levels() -> List[Dict[str, Any]]:
+    """
+    Пересчитать уровни всех пользователей (еженедельная задача)
+
+    Логика:
+    1. Уровень ПОВЫШАЕТСЯ, если на текущей неделе заработан более высокий
+    2. Уровень ПОНИЖАЕТСЯ на одну ступень, если с последнего изменения прошло
+       не меньше 3 недель и за эти 3 недели не было тренировок
+
+    Returns:
+        Список изменений [{user_id, old_level, new_level}]
+    """
+    from ratings.user_levels import get_level_by_avg_trainings, LEVEL_RETENTION_WEEKS
+
+    now = datetime.now()
+    current_week = _iso_week(now)
+    week_start, week_end = _current_week_bounds()
+    inactive_since = (now.date() - timedelta(weeks=LEVEL_RETENTION_WEEKS)).strftime('%Y-%m-%d')
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            """
+            SELECT u.id, u.level, u.level_updated_week,
+                   COALESCE(SUM(t.date >= ? AND t.date <= ?), 0) AS current_week_trainings,
+                   MAX(t.date) AS last_training_date
+            FROM users u
+            LEFT JOIN trainings t ON t.user_id = u.id
+            GROUP BY u.id
+            """,
+            (week_start, week_end)
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        changes = []
+        for user_id, level, level_updated_week, week_trainings, last_training_date in rows:
+            current_level = level or 'новичок'
+            current_index = _level_index(current_level)
+            earned_index = _level_index(get_level_by_avg_trainings(week_trainings))
+
+            if earned_index > current_index:
+                new_index = earned_index
+            elif (
+                current_index > 0
+                and _weeks_since(level_updated_week, current_week) >= LEVEL_RETENTION_WEEKS
+                and (last_training_date is None or last_training_date < inactive_since)
+            ):
+                new_index = current_index - 1
+            else:
+                continue
+
+            changes.append({
+                'user_id': user_id,
+                'old_level': current_level,
+                'new_level': LEVELS_ORDER[new_index]
+            })
+
+        if changes:
+            await db.executemany(
+                "UPDATE users SET level = ?, level_updated_week = ? WHERE id = ?",
+                [(change['new_level'], current_week, change['user_id']) for change in changes]
+            )
+            await db.commit()
+
+    return changes
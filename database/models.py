@@ -28,6 +28,7 @@ CREATE TABLE IF NOT EXISTS trainings (
     -- Данные о дистанции и темпе
     distance REAL,
     avg_pace TEXT,  -- Средний темп (мин/км или мин/миля)
+    avg_pace_seconds REAL,  -- Темп в секундах (заполняется триггером из avg_pace)
     pace_unit TEXT,  -- Единица темпа
 
     -- Пульсовые данные
@@ -109,9 +110,11 @@ CREATE TABLE IF NOT EXISTS competition_participants (
     distance REAL,  -- Дистанция в км (42.195, 21.1, 10, 5)
     distance_name TEXT,  -- Название (для комплексных: акватлон, дуатлон)
     target_time TEXT,  -- Целевое время в формате HH:MM:SS
+    target_seconds REAL,  -- Целевое время в секундах (заполняется триггером)
 
     -- Результаты после финиша
     finish_time TEXT,  -- Фактическое время финиша HH:MM:SS
+    finish_seconds REAL,  -- Время финиша в секундах (заполняется триггером)
     place_overall INTEGER,  -- Место в общем зачете
     place_age_category INTEGER,  -- Место в возрастной категории
     age_category TEXT,  -- Возрастная категория (M30-39, F25-29)
@@ -171,6 +174,32 @@ CREATE TABLE IF NOT EXISTS ratings (
 )
 """
 
+CREATE_LEADERBOARD_SNAPSHOTS_TABLE = """
+CREATE TABLE IF NOT EXISTS leaderboard_snapshots (
+    period TEXT NOT NULL,  -- global, week, month, season
+    user_id INTEGER NOT NULL,
+    points REAL NOT NULL,  -- Очки за период
+    total_trainings INTEGER DEFAULT 0,  -- Выполненные тренировки за период (для разрешения равенства очков)
+    name TEXT,  -- Имя из настроек пользователя
+    username TEXT,  -- Username в Telegram
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (period, user_id),
+    FOREIGN KEY (user_id) REFERENCES users(id)
+)
+"""
+
+CREATE_USER_COMPETITION_STATS_TABLE = """
+CREATE TABLE IF NOT EXISTS user_competition_stats (
+    user_id INTEGER PRIMARY KEY,
+    stats TEXT NOT NULL,  -- JSON: счетчики, суммы темпов, рекорды и лучшие места (competitions_statistics)
+    is_stale INTEGER DEFAULT 0,  -- 1 = участия изменились в обход статистики, нужен пересчет
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    FOREIGN KEY (user_id) REFERENCES users(id)
+)
+"""
+
 CREATE_COACH_LINKS_TABLE = """
 CREATE TABLE IF NOT EXISTS coach_links (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -276,7 +305,7 @@ CREATE TABLE IF NOT EXISTS user_settings (
     weekly_report_day TEXT DEFAULT 'Понедельник',
     weekly_report_time TEXT DEFAULT '09:00',
     last_goal_notification_week TEXT,  -- DEPRECATED
-    goal_notifications TEXT,  -- JSON с достигнутыми целями
+    goal_notifications TEXT,  -- JSON с флагами целей без недельного прогресса (целевой вес)
 
     -- Напоминания о тренировках
     training_reminders_enabled INTEGER DEFAULT 0,  -- 0=выключены, 1=включены
@@ -303,6 +332,7 @@ CREATE TABLE IF NOT EXISTS personal_records (
 
     -- Данные о лучшем результате
     best_time TEXT NOT NULL,  -- Лучшее время в формате HH:MM:SS
+    best_seconds REAL,  -- Лучшее время в секундах (заполняется триггером)
     competition_id INTEGER,  -- ID соревнования где установлен рекорд
     date DATE NOT NULL,  -- Дата установления PR
     qualification TEXT,  -- Выполненный разряд (III, II, I, КМС, МС, МСМК)
@@ -328,9 +358,9 @@ CREATE TABLE IF NOT EXISTS competition_reminders (
     scheduled_date DATE NOT NULL,  -- Дата отправки напоминания
 
     -- Статус отправки
-    sent INTEGER DEFAULT 0,  -- 0=не отправлено, 1=отправлено
+    sent INTEGER DEFAULT 0,  -- 0=не отправлено, 1=отправлено, 2=взято в обработку рассылкой
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    sent_at TIMESTAMP,  -- Время фактической отправки
+    sent_at TIMESTAMP,  -- Время фактической отправки (для sent=2 - время захвата)
 
     FOREIGN KEY (user_id) REFERENCES users(id),
     FOREIGN KEY (competition_id) REFERENCES competitions(id),
@@ -527,6 +557,23 @@ CREATE TABLE IF NOT EXISTS ai_conversations (
 )
 """
 
+CREATE_AI_CONVERSATION_SUMMARIES_TABLE = """
+CREATE TABLE IF NOT EXISTS ai_conversation_summaries (
+    user_id INTEGER NOT NULL,
+    conversation_type TEXT NOT NULL,  -- psychologist, general, plan, correction
+
+    -- Сжатая история сообщений, не попавших в последние реплики
+    summary TEXT NOT NULL DEFAULT '',
+    summarized_until_id INTEGER DEFAULT 0,  -- Последний ai_conversations.id, вошедший в summary
+    turns_summarized INTEGER DEFAULT 0,  -- Сколько реплик свернуто в summary
+
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (user_id, conversation_type),
+    FOREIGN KEY (user_id) REFERENCES users(id)
+)
+"""
+
 CREATE_RESULT_PREDICTIONS_TABLE = """
 CREATE TABLE IF NOT EXISTS result_predictions (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -545,6 +592,7 @@ CREATE TABLE IF NOT EXISTS result_predictions (
     confidence_level REAL,  -- Уровень уверенности 0-100%
     ai_explanation TEXT NOT NULL,  -- Объяснение от AI
     key_factors TEXT,  -- JSON с факторами влияющими на прогноз
+    source TEXT,  -- Откуда времена: 'local' - локальный прогноз, NULL - времена посчитал AI
 
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
 
@@ -573,9 +621,73 @@ CREATE TABLE IF NOT EXISTS ta_user_settings (
 )
 """
 
+CREATE_AI_RESPONSE_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS ai_response_cache (
+    cache_key TEXT PRIMARY KEY,  -- SHA-256 от нормализованного промпта, модели и параметров
+    feature TEXT NOT NULL,  -- Функция AI (training_stats, health_stats, training_plan и т.д.)
+    model TEXT NOT NULL,  -- Модель, которая сгенерировала ответ
+    response TEXT NOT NULL,  -- Текст ответа AI
+
+    hits INTEGER DEFAULT 0,  -- Сколько раз ответ был отдан из кэша
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    expires_at REAL NOT NULL  -- Unix-время истечения срока жизни записи
+)
+"""
+
+CREATE_TELEGRAM_FILES_TABLE = """
+CREATE TABLE IF NOT EXISTS telegram_files (
+    content_hash TEXT NOT NULL,  -- SHA-256 содержимого (для документов - вместе с именем файла)
+    kind TEXT NOT NULL,  -- 'photo' или 'document'
+    file_id TEXT NOT NULL,  -- file_id из ответа Telegram на первую отправку
+    file_size INTEGER,  -- Размер файла в байтах
+    upload_seconds REAL,  -- Время первой загрузки (для оценки сэкономленного времени)
+
+    uses INTEGER DEFAULT 0,  -- Сколько раз файл отправлен по file_id
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (content_hash, kind)
+)
+"""
+
+# Полнотекстовый индекс соревнований (rowid = competitions.id, поддерживается триггерами)
+CREATE_COMPETITIONS_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS competitions_fts USING fts5(
+    name, city, location, organizer,
+    tokenize = 'unicode61 remove_diacritics 0',
+    prefix = '2 3'
+)
+"""
+
 # ==================== СПИСОК ВСЕХ ТАБЛИЦ ====================
 
 # Список таблиц для инициализации БД при первом запуске
+CREATE_GOAL_PROGRESS_TABLE = """
+CREATE TABLE IF NOT EXISTS goal_progress (
+    user_id INTEGER NOT NULL,
+    week_start DATE NOT NULL,  -- Понедельник недели
+    goal_key TEXT NOT NULL,  -- 'volume', 'count' или 'type_<тип тренировки>'
+    total REAL DEFAULT 0,  -- Накопленное значение (поддерживается триггерами на trainings)
+    milestone INTEGER DEFAULT 0,  -- Последний отправленный порог прогресса (50, 80, 100)
+
+    PRIMARY KEY (user_id, week_start, goal_key),
+    FOREIGN KEY (user_id) REFERENCES users(id)
+)
+"""
+
+CREATE_GOAL_PROGRESS_ARCHIVE_TABLE = """
+CREATE TABLE IF NOT EXISTS goal_progress_archive (
+    user_id INTEGER NOT NULL,
+    week_start DATE NOT NULL,
+    goal_key TEXT NOT NULL,
+    total REAL,
+    milestone INTEGER,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (user_id, week_start, goal_key)
+)
+"""
+
 ALL_TABLES = [
     CREATE_USERS_TABLE,
     CREATE_TRAININGS_TABLE,
@@ -584,6 +696,10 @@ ALL_TABLES = [
     CREATE_COMPETITION_REMINDERS_TABLE,
     CREATE_ACHIEVEMENTS_TABLE,
     CREATE_RATINGS_TABLE,
+    CREATE_LEADERBOARD_SNAPSHOTS_TABLE,
+    CREATE_USER_COMPETITION_STATS_TABLE,
+    CREATE_GOAL_PROGRESS_TABLE,
+    CREATE_GOAL_PROGRESS_ARCHIVE_TABLE,
     CREATE_COACH_LINKS_TABLE,
     CREATE_TRAINING_COMMENTS_TABLE,
     CREATE_HEALTH_METRICS_TABLE,
@@ -600,6 +716,233 @@ ALL_TABLES = [
     CREATE_RACE_PREPARATIONS_TABLE,
     CREATE_RACE_TACTICS_TABLE,
     CREATE_AI_CONVERSATIONS_TABLE,
+    CREATE_AI_CONVERSATION_SUMMARIES_TABLE,
     CREATE_RESULT_PREDICTIONS_TABLE,
-    CREATE_TA_USER_SETTINGS_TABLE
-]
\ No newline at end of file
+    CREATE_TA_USER_SETTINGS_TABLE,
+    CREATE_AI_RESPONSE_CACHE_TABLE,
+    CREATE_TELEGRAM_FILES_TABLE,
+    CREATE_COMPETITIONS_FTS_TABLE
+]
+
+# ==================== ИНДЕКСЫ ====================
+
+# Индексы создаются после таблиц при инициализации БД
+ALL_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_ai_response_cache_expires ON ai_response_cache(expires_at)",
+    "CREATE INDEX IF NOT EXISTS idx_competition_reminders_due ON competition_reminders(sent, scheduled_date)",
+    "CREATE INDEX IF NOT EXISTS idx_ai_conversations_user_type_created ON ai_conversations(user_id, conversation_type, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_trainings_user_date ON trainings(user_id, date)",
+    "CREATE INDEX IF NOT EXISTS idx_competition_participants_user_distance_finish ON competition_participants(user_id, distance, finish_seconds)",
+    "CREATE INDEX IF NOT EXISTS idx_competitions_official_date ON competitions(is_official, date)",
+]
+
+# ==================== ДЛИТЕЛЬНОСТИ В СЕКУНДАХ ====================
+
+def duration_sql(column: str) -> str:
+    """
+    SQL-выражение, переводящее строку времени в секунды (REAL)
+
+    Повторяет utils.time_formatter.parse_duration: "сс.сс", "мм:сс(.сс)", "ч:мм:сс(.сс)".
+    Для нераспознанных строк возвращает NULL.
+    """
+    t = f"trim(replace({column}, ',', '.'))"
+    rest = f"substr({t}, instr({t}, ':') + 1)"
+    return (
+        f"CASE"
+        f" WHEN {column} IS NULL OR {t} = '' OR {t} GLOB '*[^0-9:.]*' OR {t} GLOB '[:.]*'"
+        f" OR {t} GLOB '*:' OR {t} GLOB '*::*' OR {t} GLOB '*.*[:.]*' THEN NULL"
+        f" WHEN instr({t}, ':') = 0 THEN CAST({t} AS REAL)"
+        f" WHEN instr({rest}, ':') = 0 THEN"
+        f" CAST(substr({t}, 1, instr({t}, ':') - 1) AS INTEGER) * 60 + CAST({rest} AS REAL)"
+        f" WHEN instr(substr({rest}, instr({rest}, ':') + 1), ':') = 0 THEN"
+        f" CAST(substr({t}, 1, instr({t}, ':') - 1) AS INTEGER) * 3600"
+        f" + CAST(substr({rest}, 1, instr({rest}, ':') - 1) AS INTEGER) * 60"
+        f" + CAST(substr({rest}, instr({rest}, ':') + 1) AS REAL)"
+        f" ELSE NULL END"
+    )
+
+
+# (таблица, колонка с секундами, исходная текстовая колонка)
+DURATION_COLUMNS = [
+    ('competition_participants', 'finish_seconds', 'finish_time'),
+    ('competition_participants', 'target_seconds', 'target_time'),
+    ('personal_records', 'best_seconds', 'best_time'),
+    ('trainings', 'avg_pace_seconds', 'avg_pace'),
+]
+
+
+def _duration_triggers():
+    """Триггеры, заполняющие колонки *_seconds при любой записи времени"""
+    by_table = {}
+    for table, seconds_column, source_column in DURATION_COLUMNS:
+        by_table.setdefault(table, []).append((seconds_column, source_column))
+
+    triggers = []
+    for table, columns in by_table.items():
+        assignments = ", ".join(
+            f"{seconds_column} = {duration_sql('NEW.' + source_column)}"
+            for seconds_column, source_column in columns
+        )
+        sources = ", ".join(source_column for _, source_column in columns)
+        body = f"BEGIN UPDATE {table} SET {assignments} WHERE id = NEW.id; END"
+        triggers.append(f"CREATE TRIGGER IF NOT EXISTS trg_{table}_seconds_insert AFTER INSERT ON {table} {body}")
+        triggers.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_{table}_seconds_update AFTER UPDATE OF {sources} ON {table} {body}"
+        )
+    return triggers
+
+
+# Изменения участий в обход функций результата помечают статистику соревнований устаревшей
+COMPETITION_STATS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_competition_participants_stats_insert
+    AFTER INSERT ON competition_participants
+    BEGIN
+        UPDATE user_competition_stats SET is_stale = 1 WHERE user_id = NEW.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_competition_participants_stats_delete
+    AFTER DELETE ON competition_participants
+    BEGIN
+        UPDATE user_competition_stats SET is_stale = 1 WHERE user_id = OLD.user_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_competition_participants_stats_update
+    AFTER UPDATE OF user_id, distance, status, finish_time, target_time, place_overall,
+        place_age_category, age_category, qualification, proposal_status
+    ON competition_participants
+    BEGIN
+        UPDATE user_competition_stats SET is_stale = 1 WHERE user_id IN (NEW.user_id, OLD.user_id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_competitions_stats_update
+    AFTER UPDATE OF name, date, city, country, organizer, sport_type ON competitions
+    BEGIN
+        UPDATE user_competition_stats SET is_stale = 1
+        WHERE user_id IN (SELECT user_id FROM competition_participants WHERE competition_id = NEW.id);
+    END
+    """,
+]
+
+# ==================== ПРОГРЕСС НЕДЕЛЬНЫХ ЦЕЛЕЙ ====================
+
+def goal_progress_rows_sql(row: str, source: str = '') -> str:
+    """
+    SELECT строк прогресса (user_id, week_start, goal_key, total) по тренировкам
+
+    Повторяет подсчет get_training_statistics: учитываются выполненные тренировки,
+    объем - calculated_volume или distance, для силовых по типу - минуты.
+
+    Args:
+        row: Имя строки тренировки ('NEW'/'OLD' в триггере или псевдоним таблицы)
+        source: Таблица для выборки (пусто - поля берутся из NEW/OLD)
+    """
+    volume = f"COALESCE(NULLIF({row}.calculated_volume, 0), {row}.distance, 0)"
+    type_total = f"CASE WHEN {row}.type = 'силовая' THEN COALESCE({row}.duration, 0) ELSE {volume} END"
+    head = f"SELECT {row}.user_id AS user_id, date({row}.date, 'weekday 0', '-6 days') AS week_start"
+    tail = (
+        (f" FROM {source} AS {row}" if source else "") +
+        f" WHERE ({row}.is_planned = 0 OR {row}.duration IS NOT NULL) AND date({row}.date) IS NOT NULL"
+    )
+    return (
+        f"{head}, 'count' AS goal_key, 1 AS total{tail}"
+        f" UNION ALL {head}, 'volume', {volume}{tail}"
+        f" UNION ALL {head}, 'type_' || {row}.type, {type_total}{tail} AND {row}.type IS NOT NULL"
+    )
+
+
+def _goal_progress_change_sql(row: str, sign: int) -> str:
+    """Прибавить (sign=1) или вычесть (sign=-1) тренировку из накопленного прогресса"""
+    return f"""
+        INSERT INTO goal_progress (user_id, week_start, goal_key, total)
+        SELECT user_id, week_start, goal_key, {sign} * total FROM ({goal_progress_rows_sql(row)}) WHERE 1
+        ON CONFLICT(user_id, week_start, goal_key) DO UPDATE SET total = total + excluded.total;
+    """
+
+
+# Сколько недель прогресса хранится в goal_progress (более старые переносятся в архив)
+GOAL_PROGRESS_RETENTION_WEEKS = 4
+
+# Прогресс целей обновляется при любой записи тренировки (пользователем, тренером, импортом)
+GOAL_PROGRESS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trainings_goal_progress_insert
+    AFTER INSERT ON trainings
+    BEGIN
+        {_goal_progress_change_sql('NEW', 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trainings_goal_progress_delete
+    AFTER DELETE ON trainings
+    BEGIN
+        {_goal_progress_change_sql('OLD', -1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_trainings_goal_progress_update
+    AFTER UPDATE OF user_id, type, date, distance, calculated_volume, duration, is_planned ON trainings
+    BEGIN
+        {_goal_progress_change_sql('OLD', -1)}
+        {_goal_progress_change_sql('NEW', 1)}
+    END
+    """,
+]
+
+# ==================== ПОЛНОТЕКСТОВЫЙ ПОИСК СОРЕВНОВАНИЙ ====================
+
+# Колонки competitions, попадающие в competitions_fts
+COMPETITIONS_FTS_COLUMNS = ('name', 'city', 'location', 'organizer')
+
+
+def competitions_fts_values_sql(row: str) -> str:
+    """
+    Значения колонок competitions_fts для строки соревнования
+
+    Регистр приводит токенизатор unicode61. Диакритика не удаляется (иначе 'й' совпадет с 'и'),
+    поэтому 'ё' заменяется на 'е' здесь и в поисковом запросе.
+
+    Args:
+        row: Имя строки ('NEW'/'OLD' в триггере или псевдоним таблицы)
+    """
+    return ", ".join(
+        f"replace(replace(COALESCE({row}.{column}, ''), 'ё', 'е'), 'Ё', 'Е')"
+        for column in COMPETITIONS_FTS_COLUMNS
+    )
+
+
+_FTS_COLUMNS_LIST = ", ".join(COMPETITIONS_FTS_COLUMNS)
+
+# Индекс обновляется при любой записи соревнования (импорт из API, пользовательские, тренерские)
+COMPETITIONS_FTS_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_competitions_fts_insert
+    AFTER INSERT ON competitions
+    BEGIN
+        INSERT INTO competitions_fts (rowid, {_FTS_COLUMNS_LIST}) VALUES (NEW.id, {competitions_fts_values_sql('NEW')});
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_competitions_fts_delete
+    AFTER DELETE ON competitions
+    BEGIN
+        DELETE FROM competitions_fts WHERE rowid = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS trg_competitions_fts_update
+    AFTER UPDATE OF {_FTS_COLUMNS_LIST} ON competitions
+    BEGIN
+        DELETE FROM competitions_fts WHERE rowid = OLD.id;
+        INSERT INTO competitions_fts (rowid, {_FTS_COLUMNS_LIST}) VALUES (NEW.id, {competitions_fts_values_sql('NEW')});
+    END
+    """,
+]
+
+# Триггеры создаются после индексов при инициализации БД
+ALL_TRIGGERS = (
+    _duration_triggers() + COMPETITION_STATS_TRIGGERS + GOAL_PROGRESS_TRIGGERS + COMPETITIONS_FTS_TRIGGERS
+)
\ No newline at end of file
@@ -6,9 +6,13 @@ import aiosqlite
 import os
 import json
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
-from database.models import ALL_TABLES
+from database.models import (
+    ALL_TABLES, ALL_INDEXES, ALL_TRIGGERS, DURATION_COLUMNS, duration_sql,
+    GOAL_PROGRESS_RETENTION_WEEKS, goal_progress_rows_sql,
+    COMPETITIONS_FTS_COLUMNS, competitions_fts_values_sql
+)
 
 DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
 
@@ -26,6 +30,14 @@ async def init_db():
 
         for table_sql in ALL_TABLES:
             await db.execute(table_sql)
+        await _migrate_duration_columns(db)
+        await _migrate_prediction_source(db)
+        for index_sql in ALL_INDEXES:
+            await db.execute(index_sql)
+        await _backfill_goal_progress(db)
+        await _backfill_competitions_fts(db)
+        for trigger_sql in ALL_TRIGGERS:
+            await db.execute(trigger_sql)
         await db.commit()
 
         import logging
@@ -33,6 +45,98 @@ async def init_db():
         logger.info(f"Database initialized with WAL mode at {DB_PATH}")
 
 
+async def _backfill_competitions_fts(db: aiosqlite.Connection) -> None:
+    """
+    Заполнить полнотекстовый индекс competitions_fts существующими соревнованиями
+
+    Выполняется один раз - до создания триггеров, которые дальше поддерживают индекс.
+
+    Args:
+        db: Открытое соединение
+    """
+    async with db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_competitions_fts_insert'"
+    ) as cursor:
+        if await cursor.fetchone():
+            return
+
+    await db.execute("DELETE FROM competitions_fts")
+    await db.execute(
+        f"""
+        INSERT INTO competitions_fts (rowid, {', '.join(COMPETITIONS_FTS_COLUMNS)})
+        SELECT c.id, {competitions_fts_values_sql('c')} FROM competitions AS c
+        """
+    )
+
+
+async def _backfill_goal_progress(db: aiosqlite.Connection) -> None:
+    """
+    Заполнить goal_progress по тренировкам последних недель
+
+    Выполняется один раз - до создания триггеров, которые дальше поддерживают прогресс.
+
+    Args:
+        db: Открытое соединение
+    """
+    async with db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'trg_trainings_goal_progress_insert'"
+    ) as cursor:
+        if await cursor.fetchone():
+            return
+
+    from datetime import timedelta
+    today = datetime.now().date()
+    since = today - timedelta(days=today.weekday(), weeks=GOAL_PROGRESS_RETENTION_WEEKS)
+
+    await db.execute(
+        f"""
+        INSERT OR IGNORE INTO goal_progress (user_id, week_start, goal_key, total)
+        SELECT user_id, week_start, goal_key, SUM(total)
+        FROM ({goal_progress_rows_sql('t', 'trainings')})
+        WHERE week_start >= ?
+        GROUP BY user_id, week_start, goal_key
+        """,
+        (since.strftime('%Y-%m-%d'),)
+    )
+
+
+async def _migrate_duration_columns(db: aiosqlite.Connection) -> None:
+    """
+    Добавить колонки *_seconds в существующую БД и заполнить их по текстовым значениям
+
+    Args:
+        db: Открытое соединение
+    """
+    for table, seconds_column, source_column in DURATION_COLUMNS:
+        async with db.execute(f"PRAGMA table_info({table})") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        if seconds_column not in columns:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {seconds_column} REAL")
+
+        await db.execute(
+            f"""
+            UPDATE {table}
+            SET {seconds_column} = {duration_sql(source_column)}
+            WHERE {seconds_column} IS NULL AND {source_column} IS NOT NULL
+            """
+        )
+
+
+async def _migrate_prediction_source(db: aiosqlite.Connection) -> None:
+    """
+    Добавить колонку source в result_predictions
+
+    Существующие прогнозы остаются с NULL - их времена посчитал AI.
+
+    Args:
+        db: Открытое соединение
+    """
+    async with db.execute("PRAGMA table_info(result_predictions)") as cursor:
+        columns = {row[1] for row in await cursor.fetchall()}
+    if 'source' not in columns:
+        await db.execute("ALTER TABLE result_predictions ADD COLUMN source TEXT")
+
+
 async def add_user(user_id: int, username: str) -> None:
     """
     Добавить пользователя в базу данных
@@ -282,6 +386,73 @@ async def get_trainings_by_period(user_id: int, period: str) -> list:
             return [dict(row) for row in rows]
 
 
+def summarize_trainings(trainings: list) -> Dict[str, Any]:
+    """
+    Статистика по списку тренировок (см. get_training_statistics)
+
+    Args:
+        trainings: Тренировки (строки trainings: type, distance, calculated_volume, duration, fatigue_level)
+
+    Returns:
+        Словарь со статистикой: total_count, total_distance, types_count,
+        types_distance, types_duration, avg_fatigue
+    """
+    if not trainings:
+        return {
+            'total_count': 0,
+            'total_distance': 0.0,
+            'types_count': {},
+            'types_distance': {},
+            'types_duration': {},
+            'avg_fatigue': 0
+        }
+
+    total_count = len(trainings)
+    total_distance = 0.0
+    types_count = {}
+    types_distance = {}  
+    types_duration = {}  
+    fatigue_sum = 0
+    fatigue_count = 0
+
+    for training in trainings:
+        t_type = training['type']
+
+        if t_type:
+            types_count[t_type] = types_count.get(t_type, 0) + 1
+
+        distance = training['distance']
+        calculated_volume = training['calculated_volume']
+        duration = training['duration']
+
+        if calculated_volume:  
+            total_distance += calculated_volume
+            if t_type:
+                types_distance[t_type] = types_distance.get(t_type, 0) + calculated_volume
+        elif distance:  
+            total_distance += distance
+            if t_type:
+                types_distance[t_type] = types_distance.get(t_type, 0) + distance
+
+        if duration and t_type:
+            types_duration[t_type] = types_duration.get(t_type, 0) + duration
+
+        if training['fatigue_level']:
+            fatigue_sum += training['fatigue_level']
+            fatigue_count += 1
+
+    avg_fatigue = round(fatigue_sum / fatigue_count, 1) if fatigue_count > 0 else 0
+
+    return {
+        'total_count': total_count,
+        'total_distance': round(total_distance, 2),
+        'types_count': types_count,
+        'types_distance': types_distance,
+        'types_duration': types_duration,  
+        'avg_fatigue': avg_fatigue
+    }
+
+
 async def get_training_statistics(user_id: int, period: str) -> Dict[str, Any]:
     """
     Получить статистику тренировок за календарный период
@@ -334,61 +505,8 @@ async def get_training_statistics(user_id: int, period: str) -> Dict[str, Any]:
             (user_id, start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d'))
         ) as cursor:
             trainings = await cursor.fetchall()
-        
-        if not trainings:
-            return {
-                'total_count': 0,
-                'total_distance': 0.0,
-                'types_count': {},
-                'types_distance': {},
-                'types_duration': {},
-                'avg_fatigue': 0
-            }
-        
-        total_count = len(trainings)
-        total_distance = 0.0
-        types_count = {}
-        types_distance = {}  
-        types_duration = {}  
-        fatigue_sum = 0
-        fatigue_count = 0
-
-        for training in trainings:
-            t_type = training['type']
-
-            if t_type:
-                types_count[t_type] = types_count.get(t_type, 0) + 1
-
-            distance = training['distance']
-            calculated_volume = training['calculated_volume']
-            duration = training['duration']
 
-            if calculated_volume:  
-                total_distance += calculated_volume
-                if t_type:
-                    types_distance[t_type] = types_distance.get(t_type, 0) + calculated_volume
-            elif distance:  
-                total_distance += distance
-                if t_type:
-                    types_distance[t_type] = types_distance.get(t_type, 0) + distance
-
-            if duration and t_type:
-                types_duration[t_type] = types_duration.get(t_type, 0) + duration
-
-            if training['fatigue_level']:
-                fatigue_sum += training['fatigue_level']
-                fatigue_count += 1
-
-        avg_fatigue = round(fatigue_sum / fatigue_count, 1) if fatigue_count > 0 else 0
-
-        return {
-            'total_count': total_count,
-            'total_distance': round(total_distance, 2),
-            'types_count': types_count,
-            'types_distance': types_distance,
-            'types_duration': types_duration,  
-            'avg_fatigue': avg_fatigue
-        }
+    return summarize_trainings(trainings)
 
 async def get_trainings_by_custom_period(user_id: int, start_date: str, end_date: str) -> list:
     """
@@ -419,6 +537,41 @@ async def get_trainings_by_custom_period(user_id: int, start_date: str, end_date
             return [dict(row) for row in rows]
 
 
+async def get_trainings_for_users(user_ids: List[int], start_date: str, end_date: str) -> Dict[int, list]:
+    """
+    Получить тренировки нескольких пользователей за период одним запросом
+
+    Args:
+        user_ids: ID пользователей
+        start_date: Начальная дата в формате 'YYYY-MM-DD'
+        end_date: Конечная дата в формате 'YYYY-MM-DD'
+
+    Returns:
+        {user_id: список тренировок (от старых к новым)} - для каждого из user_ids
+    """
+    result = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return result
+
+    placeholders = ",".join("?" * len(user_ids))
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            f"""
+            SELECT * FROM trainings
+            WHERE user_id IN ({placeholders})
+            AND date >= ?
+            AND date <= ?
+            AND (is_planned = 0 OR duration IS NOT NULL)
+            ORDER BY user_id, date ASC
+            """,
+            (*user_ids, start_date, end_date)
+        ) as cursor:
+            async for row in cursor:
+                result[row['user_id']].append(dict(row))
+    return result
+
+
 async def get_statistics_by_custom_period(user_id: int, start_date: str, end_date: str) -> Dict[str, Any]:
     """
     Получить статистику тренировок за произвольный период
@@ -71,179 +71,163 @@ async def get_user_rating(user_id: int) -> Optional[Dict[str, Any]]:
             return dict(row) if row else None
 
 
-async def get_global_rankings(limit: int = 10) -> List[Dict[str, Any]]:
-    """
-    Получить глобальный рейтинг (топ пользователей по общим очкам)
-
-    Args:
-        limit: Количество пользователей в топе
-
-    Returns:
-        Список пользователей с рейтингом
-    """
-    async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        async with db.execute(
-            """
-            SELECT
-                r.user_id,
-                r.points,
-                r.week_points,
-                r.month_points,
-                r.season_points,
-                u.username,
-                us.name,
-                COUNT(DISTINCT t.id) as total_trainings
-            FROM ratings r
-            LEFT JOIN users u ON r.user_id = u.id
-            LEFT JOIN user_settings us ON r.user_id = us.user_id
-            LEFT JOIN trainings t ON r.user_id = t.user_id
-            GROUP BY r.user_id
-            ORDER BY r.points DESC, total_trainings DESC
-            LIMIT ?
-            """,
-            (limit,)
-        ) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+# Поле очков в таблице ratings для каждого периода рейтинга
+PERIOD_POINTS_FIELDS = {
+    'global': 'points',
+    'week': 'week_points',
+    'month': 'month_points',
+    'season': 'season_points'
+}
 
 
-async def get_weekly_rankings(limit: int = 10) -> List[Dict[str, Any]]:
+async def get_leaderboard_snapshots() -> List[Dict[str, Any]]:
     """
-    Получить рейтинг за неделю
-
-    Args:
-        limit: Количество пользователей в топе
+    Получить сохраненные снимки рейтингов всех периодов
 
     Returns:
-        Список пользователей с рейтингом за неделю
+        Список строк снимков (period, user_id, points, total_trainings, name, username)
     """
     async with aiosqlite.connect(DB_PATH) as db:
         db.row_factory = aiosqlite.Row
         async with db.execute(
             """
-            SELECT
-                r.user_id,
-                r.week_points as points,
-                u.username,
-                us.name
-            FROM ratings r
-            LEFT JOIN users u ON r.user_id = u.id
-            LEFT JOIN user_settings us ON r.user_id = us.user_id
-            WHERE r.week_points > 0
-            ORDER BY r.week_points DESC
-            LIMIT ?
-            """,
-            (limit,)
+            SELECT period, user_id, points, total_trainings, name, username
+            FROM leaderboard_snapshots
+            """
         ) as cursor:
             rows = await cursor.fetchall()
             return [dict(row) for row in rows]
 
 
-async def get_monthly_rankings(limit: int = 10) -> List[Dict[str, Any]]:
+async def build_leaderboard_snapshot_rows() -> List[Dict[str, Any]]:
     """
-    Получить рейтинг за месяц
+    Построить снимки рейтингов заново по таблице ratings
 
-    Args:
-        limit: Количество пользователей в топе
+    Используется только при первом запуске, когда таблица снимков пуста.
+    Для каждого периода в строку снимка попадает число выполненных
+    тренировок за этот период.
 
     Returns:
-        Список пользователей с рейтингом за месяц
+        Список строк снимков для всех периодов
     """
+    from ratings.rating_calculator import get_period_dates
+
+    period_params = []
+    for period in ('week', 'month', 'season'):
+        start_date, end_date = get_period_dates(period)
+        period_params.extend([start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')])
+
     async with aiosqlite.connect(DB_PATH) as db:
         db.row_factory = aiosqlite.Row
         async with db.execute(
             """
             SELECT
                 r.user_id,
-                r.month_points as points,
+                r.points,
+                r.week_points,
+                r.month_points,
+                r.season_points,
                 u.username,
-                us.name
+                us.name,
+                COALESCE(t.global_trainings, 0) as global_trainings,
+                COALESCE(t.week_trainings, 0) as week_trainings,
+                COALESCE(t.month_trainings, 0) as month_trainings,
+                COALESCE(t.season_trainings, 0) as season_trainings
             FROM ratings r
             LEFT JOIN users u ON r.user_id = u.id
             LEFT JOIN user_settings us ON r.user_id = us.user_id
-            WHERE r.month_points > 0
-            ORDER BY r.month_points DESC
-            LIMIT ?
+            LEFT JOIN (
+                SELECT user_id,
+                       COUNT(*) as global_trainings,
+                       SUM(date >= ? AND date <= ?) as week_trainings,
+                       SUM(date >= ? AND date <= ?) as month_trainings,
+                       SUM(date >= ? AND date <= ?) as season_trainings
+                FROM trainings
+                WHERE is_planned = 0 OR duration IS NOT NULL
+                GROUP BY user_id
+            ) t ON r.user_id = t.user_id
             """,
-            (limit,)
+            period_params
         ) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
-
-
-async def get_seasonal_rankings(limit: int = 10) -> List[Dict[str, Any]]:
+            ratings = [dict(row) for row in await cursor.fetchall()]
+
+    rows = []
+    for rating in ratings:
+        for period, field in PERIOD_POINTS_FIELDS.items():
+            points = rating[field] or 0
+            if period != 'global' and points <= 0:
+                continue
+            rows.append({
+                'period': period,
+                'user_id': rating['user_id'],
+                'points': points,
+                'total_trainings': rating[f'{period}_trainings'],
+                'name': rating['name'],
+                'username': rating['username']
+            })
+    return rows
+
+
+async def save_leaderboard_snapshot_rows(rows: List[Dict[str, Any]],
+                                         removed: Optional[List[tuple]] = None) -> None:
     """
-    Получить рейтинг за сезон
+    Сохранить изменения снимков рейтингов
 
     Args:
-        limit: Количество пользователей в топе
-
-    Returns:
-        Список пользователей с рейтингом за сезон
+        rows: Строки для вставки/обновления
+        removed: Пары (period, user_id) для удаления (очки за период обнулились)
     """
     async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
-        async with db.execute(
-            """
-            SELECT
-                r.user_id,
-                r.season_points as points,
-                u.username,
-                us.name
-            FROM ratings r
-            LEFT JOIN users u ON r.user_id = u.id
-            LEFT JOIN user_settings us ON r.user_id = us.user_id
-            WHERE r.season_points > 0
-            ORDER BY r.season_points DESC
-            LIMIT ?
-            """,
-            (limit,)
-        ) as cursor:
-            rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+        if rows:
+            await db.executemany(
+                """
+                INSERT INTO leaderboard_snapshots
+                (period, user_id, points, total_trainings, name, username, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(period, user_id) DO UPDATE SET
+                    points = excluded.points,
+                    total_trainings = excluded.total_trainings,
+                    name = excluded.name,
+                    username = excluded.username,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                [
+                    (r['period'], r['user_id'], r['points'], r['total_trainings'], r['name'], r['username'])
+                    for r in rows
+                ]
+            )
+        if removed:
+            await db.executemany(
+                "DELETE FROM leaderboard_snapshots WHERE period = ? AND user_id = ?",
+                removed
+            )
+        await db.commit()
 
 
-async def get_user_rank(user_id: int, period: str = 'global') -> Optional[int]:
+async def get_user_leaderboard_profile(user_id: int) -> Dict[str, Any]:
     """
-    Получить место пользователя в рейтинге
+    Получить отображаемое имя пользователя для рейтинга
 
     Args:
         user_id: ID пользователя
-        period: Период ('global', 'week', 'month', 'season')
 
     Returns:
-        Место в рейтинге или None
+        Словарь с name и username
     """
-    if period == 'week':
-        points_field = 'week_points'
-    elif period == 'month':
-        points_field = 'month_points'
-    elif period == 'season':
-        points_field = 'season_points'
-    else:  
-        points_field = 'points'
-
     async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute(
-            f"SELECT {points_field} FROM ratings WHERE user_id = ?",
-            (user_id,)
-        ) as cursor:
-            row = await cursor.fetchone()
-            if not row or row[0] == 0:
-                return None
-            user_points = row[0]
-
-        async with db.execute(
-            f"""
-            SELECT COUNT(*) + 1 as rank
-            FROM ratings
-            WHERE {points_field} > ?
+            """
+            SELECT u.username, us.name
+            FROM users u
+            LEFT JOIN user_settings us ON us.user_id = u.id
+            WHERE u.id = ?
             """,
-            (user_points,)
+            (user_id,)
         ) as cursor:
             row = await cursor.fetchone()
-            return row[0] if row else None
+            if not row:
+                return {'name': None, 'username': None}
+            return {'username': row[0], 'name': row[1]}
 
 
 async def get_all_users_for_rating_update() -> List[int]:
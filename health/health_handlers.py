@@ -4,12 +4,13 @@
 
 from aiogram import Router, F
 from aiogram.filters import StateFilter
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove, BufferedInputFile
+from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
 from aiogram.fsm.context import FSMContext
 from datetime import date, timedelta
 import re
 import logging
 
+from bot.file_registry import answer_cached_photo, answer_cached_document
 from health.health_fsm import HealthMetricsStates, HealthExportStates
 from health.health_keyboards import (
     get_health_menu_keyboard,
@@ -774,31 +775,22 @@ async def show_stats_and_graphs(callback: CallbackQuery):
     period_param = callback.data.split(":")[1]
     user_id = callback.from_user.id
 
-    logger.info(f"=== SHOW_STATS_AND_GRAPHS CALLED ===")
-    logger.info(f"User ID: {user_id}")
-    logger.info(f"Period param: {period_param}")
+    logger.debug(f"show_stats_and_graphs: user_id={user_id}, period={period_param}")
 
     await callback.answer("⏳ Загрузка данных...", show_alert=True)
 
     if period_param == "week":
         metrics = await get_current_week_metrics(user_id)
         period_name = "эту неделю"
-        logger.info(f"Period: CURRENT WEEK")
     elif period_param == "month":
         metrics = await get_current_month_metrics(user_id)
         period_name = "этот месяц"
-        logger.info(f"Period: CURRENT MONTH")
     else:
         days = int(period_param)
         metrics = await get_latest_health_metrics(user_id, days)
         period_name = f"{days} дней"
-        logger.info(f"Period: LAST {days} DAYS")
 
-    logger.info(f"Metrics retrieved: {len(metrics)} records")
-    if metrics:
-        logger.info("Dates in metrics:")
-        for m in metrics:
-            logger.info(f"  {m['date']}: pulse={m.get('morning_pulse')}, weight={m.get('weight')}, sleep={m.get('sleep_duration')}")
+    logger.debug(f"Metrics retrieved: {len(metrics)} records")
 
     if not metrics:
         stats = {}
@@ -917,9 +909,10 @@ async def show_stats_and_graphs(callback: CallbackQuery):
             graph_buffer = await generate_health_graphs(metrics, period_name, weight_goal)
             logger.info(f"Graph generated successfully, buffer size: {len(graph_buffer.getvalue())} bytes")
 
-            photo = BufferedInputFile(graph_buffer.read(), filename=f"health_stats.png")
-            await callback.message.answer_photo(
-                photo=photo,
+            await answer_cached_photo(
+                callback.message,
+                graph_buffer.read(),
+                "health_stats.png",
                 caption=f"📈 Графики метрик здоровья за {period_name}"
             )
             logger.info("Graph sent to user successfully")
@@ -1071,9 +1064,10 @@ async def show_sleep_analysis(callback: CallbackQuery):
         )
 
         graph_buffer = await generate_sleep_quality_graph(metrics, "30 дней")
-        photo = BufferedInputFile(graph_buffer.read(), filename="sleep_analysis.png")
-        await callback.message.answer_photo(
-            photo=photo,
+        await answer_cached_photo(
+            callback.message,
+            graph_buffer.read(),
+            "sleep_analysis.png",
             caption="📊 График анализа сна"
         )
 
@@ -1173,9 +1167,10 @@ async def export_health_pdf(callback: CallbackQuery, state: FSMContext):
 
         filename = f"health_{filename_part}_{date.today().strftime('%Y%m%d')}.pdf"
 
-        document = BufferedInputFile(pdf_buffer.read(), filename=filename)
-        await callback.message.answer_document(
-            document=document,
+        await answer_cached_document(
+            callback.message,
+            pdf_buffer.read(),
+            filename,
             caption=f"📄 Экспорт данных здоровья за {period_name}"
         )
 
@@ -1337,9 +1332,10 @@ async def process_export_end_date(message: Message, state: FSMContext):
 
             filename = f"health_{start_date.strftime('%Y%m%d')}_{end_date.strftime('%Y%m%d')}.pdf"
 
-            document = BufferedInputFile(pdf_buffer.read(), filename=filename)
-            await message.answer_document(
-                document=document,
+            await answer_cached_document(
+                message,
+                pdf_buffer.read(),
+                filename,
                 caption=f"📄 Экспорт данных здоровья за период:\n{period_name}"
             )
 
@@ -4,9 +4,10 @@
 import logging
 from datetime import date, datetime
 from aiogram import Router, F
-from aiogram.types import CallbackQuery, BufferedInputFile
+from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 
+from bot.file_registry import answer_cached_document
 from health.health_fsm import HealthExportStates
 from health.health_keyboards import get_health_menu_keyboard
 from health.health_queries import check_today_metrics_filled
@@ -128,14 +129,14 @@ async def process_export_end_calendar(callback: CallbackQuery, state: FSMContext
 
                 filename = f"health_custom_{start_date.strftime('%Y%m%d')}_{selected_date.strftime('%Y%m%d')}.pdf"
 
-                document = BufferedInputFile(pdf_buffer.read(), filename=filename)
-
                 formatted_start = await format_date_for_user(start_date, user_id)
                 formatted_end = await format_date_for_user(selected_date, user_id)
 
                 from aiogram.types import ReplyKeyboardRemove
-                await callback.message.answer_document(
-                    document=document,
+                await answer_cached_document(
+                    callback.message,
+                    pdf_buffer.read(),
+                    filename,
                     caption=f"📄 Экспорт данных здоровья за период {formatted_start} - {formatted_end}",
                     reply_markup=ReplyKeyboardRemove()
                 )
@@ -158,7 +158,8 @@ async def create_health_pdf(user_id: int, period_param: str) -> BytesIO:
         rightMargin=2*cm,
         leftMargin=2*cm,
         topMargin=2*cm,
-        bottomMargin=2*cm
+        bottomMargin=2*cm,
+        invariant=1
     )
 
     styles = getSampleStyleSheet()
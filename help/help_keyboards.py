@@ -4,8 +4,10 @@
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from bot.keyboard_cache import cached_keyboard
 
 
+@cached_keyboard
 def get_help_main_menu() -> InlineKeyboardMarkup:
     """Главное меню помощи"""
     builder = InlineKeyboardBuilder()
@@ -44,6 +46,7 @@ def get_help_main_menu() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_trainings_help_menu() -> InlineKeyboardMarkup:
     """Меню помощи по тренировкам"""
     builder = InlineKeyboardBuilder()
@@ -76,6 +79,7 @@ def get_trainings_help_menu() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_coach_help_menu() -> InlineKeyboardMarkup:
     """Меню помощи по функциям тренера"""
     builder = InlineKeyboardBuilder()
@@ -102,6 +106,7 @@ def get_coach_help_menu() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_faq_menu() -> InlineKeyboardMarkup:
     """Меню FAQ"""
     builder = InlineKeyboardBuilder()
@@ -128,6 +133,7 @@ def get_faq_menu() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_back_to_help_button() -> InlineKeyboardMarkup:
     """Кнопка возврата в главное меню помощи"""
     builder = InlineKeyboardBuilder()
@@ -137,6 +143,7 @@ def get_back_to_help_button() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_back_to_section_button(section: str) -> InlineKeyboardMarkup:
     """Кнопка возврата к разделу"""
     builder = InlineKeyboardBuilder()
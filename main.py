@@ -10,6 +10,7 @@ load_dotenv()
 import asyncio
 import logging
 import os
+from typing import Awaitable, Callable, List, Tuple
 from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 
@@ -31,39 +32,49 @@ from coach.coach_competitions_handlers import router as coach_competitions_route
 from coach.coach_upcoming_competitions_handlers import router as coach_upcoming_competitions_router
 from training_assistant.ta_handlers import router as training_assistant_router
 from help.help_handlers import router as help_router
+from monitoring.metrics_handlers import router as metrics_router, start_metrics_server
+from monitoring.middleware import setup_metrics_middleware
+from monitoring.db_hooks import install_db_instrumentation
+from monitoring.loop_watchdog import start_loop_watchdog
+from monitoring.logging_pipeline import setup_logging
 
 # Импортируем функции для работы с базой данных и фоновыми задачами
 from database.queries import init_db
-from notifications.notification_scheduler import start_notification_scheduler
+from notifications.notification_scheduler import notification_scheduler
 from utils.birthday_checker import schedule_birthday_check
 from ratings.rating_updater import schedule_rating_updates
+from ratings.level_updater import schedule_level_updates
 from competitions.reminder_scheduler import schedule_competition_reminders
 from utils.qualifications_scheduler import schedule_qualifications_check
 from utils.qualifications_checker import daily_standards_check
 from utils.database_backup import schedule_backups
-
-# Настраиваем логирование для отслеживания работы бота
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from ai.ai_cache import cleanup_expired_cache
+from bot.file_registry import cleanup_unused_files
+from database.goal_queries import archive_old_goal_progress
+from ratings.leaderboard import load_leaderboards
+from utils.http_client import http_client
+
+# Настраиваем логирование: запись в stderr из отдельного потока (LOG_LEVEL, LOG_FORMAT)
+setup_logging()
 logger = logging.getLogger(__name__)
 
 
-async def main():
-    """Основная функция запуска бота"""
-
-    # Получаем токен бота из переменных окружения
-    bot_token = os.getenv('BOT_TOKEN')
-    if not bot_token:
-        logger.error("BOT_TOKEN не найден в .env файле!")
-        return
+def create_dispatcher() -> Dispatcher:
+    """
+    Создать диспетчер со всеми роутерами и middleware
 
-    # Инициализируем бота и диспетчер с хранилищем состояний в памяти
-    bot = Bot(token=bot_token)
+    Используется при запуске бота и в нагрузочном тесте (benchmarks.load_test),
+    чтобы тест прогонял обновления через тот же набор обработчиков.
+    """
+    # Диспетчер с хранилищем состояний в памяти
     storage = MemoryStorage()
     dp = Dispatcher(storage=storage)
 
+    # Метрики: время обработчиков, ошибки, запросы к БД (команда /metrics, METRICS_PORT)
+    install_db_instrumentation()
+    setup_metrics_middleware(dp)
+    dp.include_router(metrics_router)
+
     # ВАЖНО: Порядок регистрации роутеров критичен!
     # Более специфичные роутеры должны быть зарегистрированы первыми,
     # иначе общие роутеры могут перехватить их callback'и
@@ -83,48 +94,124 @@ async def main():
     dp.include_router(ratings_router)
     dp.include_router(training_assistant_router)
     dp.include_router(help_router)
-    dp.include_router(router)  
+    dp.include_router(router)
+
+    return dp
+
 
+async def prepare_database() -> None:
+    """Подготовка базы данных при старте (один раз на запуск, до обработки обновлений)"""
     # Создаем таблицы в базе данных (если их еще нет)
     await init_db()
     logger.info("База данных инициализирована")
 
-    # Запускаем фоновую задачу для автоматического резервного копирования БД
-    asyncio.create_task(schedule_backups())
-    logger.info("Планировщик backup'ов базы данных запущен")
+    # Удаляем устаревшие ответы AI из кэша
+    await cleanup_expired_cache()
 
-    # Проверяем обновления спортивных нормативов ЕВСК при старте бота
+    # Удаляем давно не использованные file_id загруженных графиков и отчетов
+    await cleanup_unused_files()
+
+    # Переносим прогресс целей прошлых недель в архив (дальше - еженедельно в планировщике уведомлений)
+    await archive_old_goal_progress()
+
+
+async def check_standards_at_start(bot: Bot) -> None:
+    """Проверить обновления спортивных нормативов ЕВСК при старте бота"""
     logger.info("Проверка обновлений нормативов ЕВСК при старте...")
     try:
         await daily_standards_check(bot)
     except Exception as e:
         logger.error(f"Ошибка при проверке нормативов при старте: {e}")
 
-    # Запускаем планировщик уведомлений (напоминания о тренировках, здоровье и т.д.)
-    start_notification_scheduler(bot)
-    logger.info("Планировщик уведомлений запущен")
 
-    # Запускаем ежедневную проверку дней рождения пользователей для поздравлений
-    asyncio.create_task(schedule_birthday_check(bot))
-    logger.info("Планировщик поздравлений с днём рождения запущен")
+def get_background_jobs(bot: Bot) -> List[Tuple[str, Callable[[], Awaitable]]]:
+    """
+    Фоновые задачи бота
+
+    Returns:
+        Список (сообщение в лог после запуска, функция, создающая корутину задачи)
+    """
+    return [
+        # Автоматическое резервное копирование БД
+        ("Планировщик backup'ов базы данных запущен", lambda: schedule_backups()),
+        # Проверка обновлений нормативов ЕВСК при старте
+        ("Проверка нормативов ЕВСК при старте запущена", lambda: check_standards_at_start(bot)),
+        # Планировщик уведомлений (напоминания о тренировках, здоровье и т.д.)
+        ("Планировщик уведомлений запущен", lambda: notification_scheduler(bot)),
+        # Ежедневная проверка дней рождения пользователей для поздравлений
+        ("Планировщик поздравлений с днём рождения запущен", lambda: schedule_birthday_check(bot)),
+        # Еженедельное обновление рейтинга пользователей
+        ("Планировщик обновления рейтингов запущен", lambda: schedule_rating_updates()),
+        # Еженедельный пересчет уровней (повышение и понижение при неактивности)
+        ("Планировщик пересчета уровней запущен", lambda: schedule_level_updates(bot)),
+        # Отправка напоминаний о предстоящих соревнованиях
+        ("Планировщик напоминаний о соревнованиях запущен", lambda: schedule_competition_reminders(bot)),
+        # Ежемесячная проверка обновлений нормативов ЕВСК
+        ("Планировщик проверки обновлений нормативов ЕВСК запущен", lambda: schedule_qualifications_check(bot)),
+    ]
+
+
+def start_background_jobs(bot: Bot, worker_index: int = 0, workers: int = 1) -> None:
+    """
+    Запустить фоновые задачи
+
+    В режиме webhook задачи распределяются между процессами-воркерами
+    (задача i - воркеру i % workers), поэтому каждая выполняется ровно один раз.
+
+    Args:
+        bot: Экземпляр бота
+        worker_index: Номер текущего процесса
+        workers: Количество процессов
+    """
+    for index, (started_message, job) in enumerate(get_background_jobs(bot)):
+        if index % workers == worker_index:
+            asyncio.create_task(job())
+            logger.info(started_message)
+
+
+async def main():
+    """Основная функция запуска бота"""
+
+    # Получаем токен бота из переменных окружения
+    bot_token = os.getenv('BOT_TOKEN')
+    if not bot_token:
+        logger.error("BOT_TOKEN не найден в .env файле!")
+        return
+
+    # Режим webhook: фронтовой процесс принимает обновления и раздает их воркерам
+    if os.getenv('BOT_MODE', 'polling') == 'webhook':
+        from webhook.front import run_webhook
+        await run_webhook(bot_token)
+        return
+
+    # Инициализируем бота и диспетчер
+    bot = Bot(token=bot_token)
+    dp = create_dispatcher()
+
+    await prepare_database()
+
+    # Загружаем снимки рейтингов в память (экраны рейтингов читают только их)
+    await load_leaderboards()
+
+    # Общая HTTP-сессия для парсеров соревнований и нормативов
+    await http_client.start()
 
-    # Запускаем еженедельное обновление рейтинга пользователей
-    asyncio.create_task(schedule_rating_updates())
-    logger.info("Планировщик обновления рейтингов запущен")
+    start_background_jobs(bot)
 
-    # Запускаем отправку напоминаний о предстоящих соревнованиях
-    asyncio.create_task(schedule_competition_reminders(bot))
-    logger.info("Планировщик напоминаний о соревнованиях запущен")
+    # Замер задержки цикла событий и поиск блокирующего кода
+    start_loop_watchdog()
 
-    # Запускаем ежемесячную проверку обновлений нормативов ЕВСК
-    asyncio.create_task(schedule_qualifications_check(bot))
-    logger.info("Планировщик проверки обновлений нормативов ЕВСК запущен")
+    # Локальный HTTP endpoint метрик (если задан METRICS_PORT)
+    metrics_runner = await start_metrics_server()
 
     # Запускаем бота в режиме long polling (постоянное получение обновлений)
     logger.info("Бот запущен!")
     try:
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
+        if metrics_runner:
+            await metrics_runner.cleanup()
+        await http_client.close()
         await bot.session.close()
 
 
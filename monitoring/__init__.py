@@ -0,0 +1,3 @@
+"""
+Модуль мониторинга - метрики обработчиков и запросов к БД
+"""
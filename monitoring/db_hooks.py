@@ -0,0 +1,81 @@
+"""
+Замер запросов aiosqlite
+
+Модули бота открывают соединения напрямую (aiosqlite.connect(DB_PATH)), поэтому
+замер подключается один раз на уровне aiosqlite.Connection: каждый execute/executemany
+учитывается в гистограмме по месту вызова (модуль.функция) и в счетчике запросов
+текущего обновления Telegram.
+"""
+
+import functools
+import logging
+import os
+import sys
+import time
+from contextvars import ContextVar
+from typing import Optional, Dict, Any
+
+import aiosqlite
+from aiosqlite.context import Result
+
+from monitoring.metrics import registry, DB_QUERY_DURATION
+
+logger = logging.getLogger(__name__)
+
+# Статистика запросов обрабатываемого обновления (заполняет middleware)
+current_update_stats: ContextVar[Optional[Dict[str, Any]]] = ContextVar('current_update_stats', default=None)
+# Та же статистика по задаче asyncio - для чтения из других потоков (сторож цикла событий)
+active_update_stats: Dict[Any, Dict[str, Any]] = {}
+
+_SKIP_PATHS = (
+    os.path.dirname(aiosqlite.__file__),
+    os.path.dirname(os.path.abspath(__file__)),
+)
+_installed = False
+
+
+def _call_site() -> str:
+    """Первая функция бота в стеке вызова ('модуль.функция')"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if not frame.f_code.co_filename.startswith(_SKIP_PATHS):
+            return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return 'unknown'
+
+
+async def _timed(coro, site: str):
+    started = time.perf_counter()
+    try:
+        return await coro
+    finally:
+        elapsed = time.perf_counter() - started
+        registry.observe(DB_QUERY_DURATION, (site,), elapsed)
+        stats = current_update_stats.get()
+        if stats is not None:
+            stats['queries'] += 1
+            stats['db_seconds'] += elapsed
+
+
+def _instrument(method):
+    # execute/executemany обернуты в aiosqlite.context.contextmanager - берем исходную корутину,
+    # чтобы результат по-прежнему работал и как await, и как async with
+    original = getattr(method, '__wrapped__', method)
+
+    @functools.wraps(original)
+    def wrapper(self, *args, **kwargs):
+        return Result(_timed(original(self, *args, **kwargs), _call_site()))
+
+    return wrapper
+
+
+def install_db_instrumentation() -> None:
+    """Включить замер запросов для всех соединений aiosqlite процесса"""
+    global _installed
+    if _installed:
+        return
+
+    for name in ('execute', 'executemany'):
+        setattr(aiosqlite.Connection, name, _instrument(getattr(aiosqlite.Connection, name)))
+    _installed = True
+    logger.info("Замер запросов к БД включен")
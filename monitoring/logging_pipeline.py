@@ -0,0 +1,211 @@
+"""
+Логирование без блокировки цикла событий
+
+Записи из всех модулей попадают в очередь (QueueHandler), а в stderr их пишет
+отдельный поток (QueueListener). Перед постановкой в очередь к записи
+добавляется контекст обновления Telegram (update_id, user_id, обработчик),
+а шумные места вызова ограничиваются:
+
+- LOG_RATE_LIMIT - не больше N записей INFO/DEBUG в секунду с одного места
+  вызова (файл:строка); число пропущенных добавляется к следующей записи;
+- LOG_SAMPLING - доля записей INFO/DEBUG, которые пишутся для логгера
+  (например "health.health_handlers=0.1,competitions=0.2" - по префиксу имени).
+
+Предупреждения и ошибки пишутся всегда. LOG_FORMAT=json - структурированные
+записи (по одной JSON-строке), иначе - привычный текстовый формат.
+Уровень можно менять во время работы (set_log_level, команда /loglevel).
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from monitoring.db_hooks import current_update_stats
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+LOG_RATE_LIMIT = float(os.getenv('LOG_RATE_LIMIT', '20'))
+LOG_SAMPLING = os.getenv('LOG_SAMPLING', '')
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Поля записи, которые не выводятся как дополнительные в JSON
+_STANDARD_FIELDS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """
+    Разобрать настройку выборки 'логгер=доля,...'
+
+    Returns:
+        {префикс имени логгера: доля записей 0..1}
+    """
+    rates = {}
+    for part in spec.split(','):
+        name, _, rate = part.partition('=')
+        if name.strip() and rate.strip():
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class ContextFilter(logging.Filter):
+    """Добавляет к записи контекст обрабатываемого обновления Telegram"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        stats = current_update_stats.get()
+        if stats is not None:
+            record.update_id = stats.get('update_id')
+            record.user_id = stats.get('user_id')
+            record.handler = stats.get('handler')
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """Ограничение частоты и выборка записей INFO/DEBUG по местам вызова"""
+
+    def __init__(self, rate: float = LOG_RATE_LIMIT, sampling: Optional[Dict[str, float]] = None):
+        super().__init__()
+        self.rate = rate
+        self.sampling = sampling or {}
+        # Более длинные префиксы важнее ("health.health_handlers" важнее "health")
+        self._prefixes = sorted(self.sampling, key=len, reverse=True)
+        # {(файл, строка): [токены, время пополнения, пропущено]}
+        self._buckets: Dict[Tuple[str, int], list] = {}
+        self._lock = threading.Lock()
+
+    def _sample_rate(self, name: str) -> float:
+        for prefix in self._prefixes:
+            if name == prefix or name.startswith(prefix + '.'):
+                return self.sampling[prefix]
+        return 1.0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        if self.sampling and random.random() >= self._sample_rate(record.name):
+            return False
+
+        if self.rate <= 0:
+            return True
+
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [self.rate, now, 0]
+            else:
+                bucket[0] = min(self.rate, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] < 1:
+                bucket[2] += 1
+                return False
+
+            bucket[0] -= 1
+            if bucket[2]:
+                record.suppressed = bucket[2]
+                bucket[2] = 0
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись - одна JSON-строка"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field, value in vars(record).items():
+            if field not in _STANDARD_FIELDS and value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Текстовый формат с контекстом обновления в конце строки"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        context = []
+        if getattr(record, 'user_id', None) is not None:
+            context.append(f"user={record.user_id}")
+        if getattr(record, 'update_id', None) is not None:
+            context.append(f"update={record.update_id}")
+        if getattr(record, 'suppressed', None):
+            context.append(f"пропущено {record.suppressed}")
+        if context:
+            first_line, newline, rest = text.partition('\n')
+            text = f"{first_line} [{', '.join(context)}]{newline}{rest}"
+        return text
+
+
+def setup_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT) -> logging.handlers.QueueListener:
+    """
+    Настроить логирование процесса: очередь + поток записи в stderr
+
+    Повторный вызов возвращает уже запущенный поток записи.
+
+    Args:
+        level: Уровень корневого логгера
+        log_format: 'json' или 'text'
+
+    Returns:
+        Запущенный QueueListener (останавливается при выходе из процесса)
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if log_format == 'json' else TextFormatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(RateLimitFilter(sampling=parse_sampling(LOG_SAMPLING)))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
+
+
+def set_log_level(level: str, logger_name: Optional[str] = None) -> None:
+    """
+    Изменить уровень логирования во время работы
+
+    Args:
+        level: 'DEBUG', 'INFO', 'WARNING', 'ERROR'
+        logger_name: Имя логгера (None - корневой)
+
+    Raises:
+        ValueError: Неизвестный уровень
+    """
+    level = level.upper()
+    if not isinstance(logging.getLevelName(level), int):
+        raise ValueError(f"Неизвестный уровень логирования: {level}")
+    logging.getLogger(logger_name).setLevel(level)
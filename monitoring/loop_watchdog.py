@@ -0,0 +1,171 @@
+"""
+Сторож цикла событий: задержка цикла и поиск блокирующего кода
+
+Задача в цикле событий засыпает на LOOP_WATCHDOG_INTERVAL и замеряет, насколько
+позже она проснулась (задержка цикла). Фоновый поток следит за той же задачей:
+если цикл не отвечает дольше LOOP_BLOCK_THRESHOLD, поток снимает стек потока
+цикла (sys._current_frames) - это и есть код, который блокирует цикл.
+
+Блокировка учитывается в гистограмме LOOP_BLOCKS по паре
+(обработчик обновления или фоновая задача, место в коде бота), поэтому
+/metrics показывает, какие синхронные участки стоит выносить в поток.
+Полный стек пишется в лог при первой блокировке в каждом месте.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from monitoring.db_hooks import active_update_stats
+from monitoring.metrics import registry, LOOP_LAG, LOOP_BLOCKS
+
+logger = logging.getLogger(__name__)
+
+LOOP_WATCHDOG_INTERVAL = float(os.getenv('LOOP_WATCHDOG_INTERVAL', '0.1'))
+LOOP_BLOCK_THRESHOLD = float(os.getenv('LOOP_BLOCK_THRESHOLD', '0.25'))
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIP_PATHS = (os.path.dirname(os.path.abspath(__file__)),)
+
+# Последний стек для каждого места блокировки {(обработчик, место): стек}
+_block_samples: Dict[Tuple[str, str], str] = {}
+
+
+def _blocking_site(stack: traceback.StackSummary) -> str:
+    """Самый глубокий кадр кода бота ('модуль:строка функция'), иначе самый глубокий кадр"""
+    for frame in reversed(stack):
+        if frame.filename.startswith(_PROJECT_ROOT) and not frame.filename.startswith(_SKIP_PATHS):
+            path = os.path.relpath(frame.filename, _PROJECT_ROOT)
+            return f"{path}:{frame.lineno} {frame.name}"
+    if stack:
+        frame = stack[-1]
+        return f"{os.path.basename(frame.filename)}:{frame.lineno} {frame.name}"
+    return 'unknown'
+
+
+def _task_owner(task: Optional[asyncio.Task]) -> str:
+    """Обработчик обновления, выполняемый задачей, или имя фоновой задачи"""
+    if task is None:
+        return 'loop'
+    stats = active_update_stats.get(task)
+    if stats is not None:
+        return stats['handler']
+    coro = task.get_coro()
+    return f"task:{getattr(coro, '__qualname__', task.get_name())}"
+
+
+class LoopWatchdog:
+    """Замер задержки цикла событий и снятие стека блокирующего кода"""
+
+    def __init__(self, interval: float = LOOP_WATCHDOG_INTERVAL, threshold: float = LOOP_BLOCK_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._beat = time.monotonic()
+        self._sample: Optional[Tuple[str, str, str]] = None
+        self._stopped = threading.Event()
+
+    def _capture(self) -> Optional[Tuple[str, str, str]]:
+        """Снять стек потока цикла событий (вызывается из потока сторожа)"""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        stack = traceback.extract_stack(frame)
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        return _task_owner(task), _blocking_site(stack), ''.join(stack.format())
+
+    def _watch(self) -> None:
+        sampled_beat = None
+        while not self._stopped.wait(self.threshold / 2):
+            beat = self._beat
+            if beat != sampled_beat and time.monotonic() - beat > self.interval + self.threshold:
+                sampled_beat = beat
+                self._sample = self._capture()
+
+    def _record(self, lag: float) -> None:
+        sample, self._sample = self._sample, None
+        if lag < self.threshold:
+            return
+
+        if sample is None:
+            # Поток сторожа не успел снять стек (блокировка чуть дольше порога)
+            sample = ('unknown', 'unknown', '')
+        owner, site, stack = sample
+        registry.observe(LOOP_BLOCKS, (owner, site), lag)
+
+        key = (owner, site)
+        first = key not in _block_samples
+        if stack:
+            _block_samples[key] = stack
+        if first and stack:
+            logger.warning(f"Цикл событий заблокирован на {lag:.2f}s: {owner} в {site}\n{stack}")
+        else:
+            logger.warning(f"Цикл событий заблокирован на {lag:.2f}s: {owner} в {site}")
+
+    async def run(self) -> None:
+        """Задача сторожа (работает до отмены)"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        thread = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                self._beat = started = time.monotonic()
+                await asyncio.sleep(self.interval)
+                lag = max(time.monotonic() - started - self.interval, 0.0)
+                registry.observe(LOOP_LAG, (), lag)
+                self._record(lag)
+        finally:
+            self._stopped.set()
+
+
+def start_loop_watchdog() -> Optional[asyncio.Task]:
+    """
+    Запустить сторожа цикла событий в текущем цикле
+
+    LOOP_WATCHDOG_INTERVAL=0 отключает сторожа.
+
+    Returns:
+        Задача сторожа или None
+    """
+    if LOOP_WATCHDOG_INTERVAL <= 0:
+        return None
+    logger.info(
+        f"Сторож цикла событий запущен (порог блокировки {LOOP_BLOCK_THRESHOLD * 1000:.0f} мс)"
+    )
+    return asyncio.create_task(LoopWatchdog().run())
+
+
+def get_block_samples(limit: int = 5) -> List[Dict[str, Any]]:
+    """
+    Самые долгие блокировки цикла событий со стеком
+
+    Args:
+        limit: Количество мест
+
+    Returns:
+        Список {'handler', 'site', 'count', 'sum', 'max', 'stack'}, по убыванию суммарного времени
+    """
+    series = registry.to_json()['metrics'].get(LOOP_BLOCKS.name, [])
+    series = sorted(series, key=lambda item: item['sum'], reverse=True)[:limit]
+    return [
+        {
+            'handler': item['labels']['handler'],
+            'site': item['labels']['site'],
+            'count': item['count'],
+            'sum': item['sum'],
+            'max': item['max'],
+            'stack': _block_samples.get((item['labels']['handler'], item['labels']['site']), '')
+        }
+        for item in series
+    ]
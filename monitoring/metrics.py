@@ -0,0 +1,270 @@
+"""
+Реестр метрик процесса: счетчики, гистограммы и текущие значения
+
+Метрики хранятся в памяти процесса и выгружаются по запросу в формате
+Prometheus (text exposition) или JSON. Внешние зависимости не нужны.
+"""
+
+import json
+import math
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Any, List, Optional, Tuple
+
+# Границы корзин гистограмм длительностей (секунды)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Границы корзин для количества запросов к БД на одно обновление
+COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+LabelValues = Tuple[str, ...]
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами (накопление как в Prometheus)"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Оценка квантиля по корзинам (линейная интерполяция внутри корзины)"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for index, bucket_count in enumerate(self.counts):
+            upper = min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+            if seen + bucket_count >= rank and bucket_count:
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+            lower = upper
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'avg': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': round(self.quantile(0.5), 6),
+            'p95': round(self.quantile(0.95), 6),
+            'p99': round(self.quantile(0.99), 6),
+            'max': round(self.max, 6)
+        }
+
+
+class Metric:
+    """Семейство метрик одного имени с набором меток"""
+
+    def __init__(self, name: str, kind: str, help_text: str, labels: Tuple[str, ...],
+                 buckets: Optional[Tuple[float, ...]] = None):
+        self.name = name
+        self.kind = kind  # 'counter', 'gauge' или 'histogram'
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.values: Dict[LabelValues, Any] = {}
+
+
+class MetricsRegistry:
+    """Реестр метрик (потокобезопасный - может вызываться из фоновых потоков)"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _metric(self, name: str, kind: str, help_text: str, labels: Tuple[str, ...],
+                buckets: Optional[Tuple[float, ...]] = None) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = Metric(name, kind, help_text, labels, buckets)
+        return metric
+
+    def counter(self, name: str, help_text: str = '', labels: Tuple[str, ...] = ()) -> Metric:
+        return self._metric(name, 'counter', help_text, labels)
+
+    def gauge(self, name: str, help_text: str = '', labels: Tuple[str, ...] = ()) -> Metric:
+        return self._metric(name, 'gauge', help_text, labels)
+
+    def histogram(self, name: str, help_text: str = '', labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Metric:
+        return self._metric(name, 'histogram', help_text, labels, buckets)
+
+    def inc(self, metric: Metric, label_values: LabelValues = (), amount: float = 1) -> None:
+        """Увеличить счетчик или текущее значение"""
+        with self._lock:
+            metric.values[label_values] = metric.values.get(label_values, 0) + amount
+
+    def set(self, metric: Metric, label_values: LabelValues = (), value: float = 0) -> None:
+        """Установить текущее значение"""
+        with self._lock:
+            metric.values[label_values] = value
+
+    def observe(self, metric: Metric, label_values: LabelValues, value: float) -> None:
+        """Добавить наблюдение в гистограмму"""
+        with self._lock:
+            histogram = metric.values.get(label_values)
+            if histogram is None:
+                histogram = metric.values[label_values] = Histogram(metric.buckets)
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        """Сбросить все значения (определения метрик сохраняются)"""
+        with self._lock:
+            for metric in self._metrics.values():
+                metric.values.clear()
+            self.started_at = time.time()
+
+    def to_json(self) -> Dict[str, Any]:
+        """
+        Снимок метрик для JSON
+
+        Returns:
+            {'uptime_seconds': ..., 'metrics': {name: [{'labels': {...}, 'value': ...} или {'labels', 'count', 'avg', 'p95', ...}]}}
+        """
+        with self._lock:
+            metrics = {}
+            for metric in self._metrics.values():
+                series = []
+                for label_values, value in metric.values.items():
+                    item = {'labels': dict(zip(metric.labels, label_values))}
+                    if metric.kind == 'histogram':
+                        item.update(value.snapshot())
+                    else:
+                        item['value'] = value
+                    series.append(item)
+                metrics[metric.name] = series
+        return {'uptime_seconds': round(time.time() - self.started_at, 1), 'metrics': metrics}
+
+    def to_prometheus(self) -> str:
+        """Выгрузка в текстовом формате Prometheus"""
+        lines: List[str] = []
+        with self._lock:
+            for metric in self._metrics.values():
+                if metric.help_text:
+                    lines.append(f"# HELP {metric.name} {metric.help_text}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                for label_values, value in sorted(metric.values.items()):
+                    labels = list(zip(metric.labels, label_values))
+                    if metric.kind != 'histogram':
+                        lines.append(f"{metric.name}{_format_labels(labels)} {_format_number(value)}")
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(metric.buckets + (math.inf,), value.counts):
+                        cumulative += bucket_count
+                        le = '+Inf' if bound == math.inf else _format_number(bound)
+                        lines.append(
+                            f"{metric.name}_bucket{_format_labels(labels + [('le', le)])} {cumulative}"
+                        )
+                    lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_number(value.sum)}")
+                    lines.append(f"{metric.name}_count{_format_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_json_text(self) -> str:
+        return json.dumps(self.to_json(), ensure_ascii=False, indent=2)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: List[Tuple[str, Any]]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label(value)}"' for name, value in labels) + '}'
+
+
+def _format_number(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+# Общий реестр процесса
+registry = MetricsRegistry()
+
+# Обновления Telegram (внешний middleware диспетчера)
+UPDATES_IN_FLIGHT = registry.gauge(
+    'bot_updates_in_flight', 'Updates being processed right now'
+)
+UPDATE_DURATION = registry.histogram(
+    'bot_update_duration_seconds', 'Full update processing time by event type', ('event_type',)
+)
+UPDATE_ERRORS = registry.counter(
+    'bot_update_errors_total', 'Updates that raised an exception', ('event_type',)
+)
+
+# Обработчики (middleware событий - известен выбранный обработчик)
+HANDLER_DURATION = registry.histogram(
+    'bot_handler_duration_seconds', 'Handler latency', ('handler',)
+)
+HANDLER_ERRORS = registry.counter(
+    'bot_handler_errors_total', 'Handler exceptions', ('handler', 'error')
+)
+
+# Запросы к БД
+DB_QUERY_DURATION = registry.histogram(
+    'bot_db_query_duration_seconds', 'SQLite statement time by call site', ('site',)
+)
+DB_QUERIES_PER_UPDATE = registry.histogram(
+    'bot_db_queries_per_update', 'SQLite statements executed while handling one update', ('handler',),
+    buckets=COUNT_BUCKETS
+)
+
+# Режим webhook: обновления в очередях процессов-воркеров (считает фронтовой процесс)
+WORKER_QUEUE_DEPTH = registry.gauge(
+    'bot_worker_queue_depth', 'Updates queued or being processed by a webhook worker', ('worker',)
+)
+
+# Цикл событий (сторож monitoring.loop_watchdog)
+LOOP_LAG = registry.histogram(
+    'bot_event_loop_lag_seconds', 'Event loop scheduling delay'
+)
+LOOP_BLOCKS = registry.histogram(
+    'bot_event_loop_block_seconds', 'Event loop blocked by synchronous code', ('handler', 'site')
+)
+
+# Исходящие HTTP-запросы (парсеры соревнований и нормативов, utils.http_client)
+HTTP_REQUEST_DURATION = registry.histogram(
+    'bot_http_request_duration_seconds', 'Outbound HTTP request time to response headers', ('host', 'status')
+)
+HTTP_REQUEST_ERRORS = registry.counter(
+    'bot_http_request_errors_total', 'Outbound HTTP requests that failed without a response', ('host', 'error')
+)
+HTTP_REQUEST_RETRIES = registry.counter(
+    'bot_http_retries_total', 'Outbound HTTP request retries', ('host',)
+)
+
+# Отправка файлов в Telegram (bot.file_registry): загрузка или повтор по file_id
+TELEGRAM_FILE_SENDS = registry.counter(
+    'bot_telegram_file_sends_total', 'Photos and documents sent, by upload or by stored file_id', ('kind', 'result')
+)
+TELEGRAM_FILE_UPLOAD_BYTES = registry.counter(
+    'bot_telegram_file_upload_bytes_total', 'Bytes uploaded to Telegram', ('kind',)
+)
+TELEGRAM_FILE_SAVED_BYTES = registry.counter(
+    'bot_telegram_file_saved_bytes_total', 'Bytes not uploaded thanks to file_id reuse', ('kind',)
+)
+TELEGRAM_FILE_SAVED_SECONDS = registry.counter(
+    'bot_telegram_file_saved_seconds_total', 'Upload time saved by file_id reuse (first upload time minus resend time)', ('kind',)
+)
+
+# Недельные отчеты (notifications.weekly_reports): collect/load - на пачку, render/send - на отчет
+WEEKLY_REPORT_STAGE_DURATION = registry.histogram(
+    'bot_weekly_report_stage_seconds', 'Weekly report pipeline stage time', ('stage',)
+)
+WEEKLY_REPORTS = registry.counter(
+    'bot_weekly_reports_total', 'Weekly reports by outcome', ('result',)
+)
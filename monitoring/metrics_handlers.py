@@ -0,0 +1,249 @@
+"""
+Выгрузка метрик: команда /metrics для администраторов и локальный HTTP endpoint
+
+/metrics        - сводка (медленные обработчики, запросы к БД) + metrics.json
+/metrics prom   - файл в формате Prometheus
+/metrics reset  - сбросить накопленные значения
+/metrics blocks - стеки мест, блокирующих цикл событий
+/loglevel <уровень> [логгер] - изменить уровень логирования
+
+HTTP endpoint включается переменной METRICS_PORT и слушает только METRICS_HOST
+(по умолчанию 127.0.0.1): /metrics - Prometheus, /metrics.json - JSON.
+"""
+
+import logging
+import os
+from html import escape
+from typing import Any, Dict, List, Optional
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message, BufferedInputFile
+
+from monitoring.metrics import (
+    registry,
+    UPDATES_IN_FLIGHT,
+    HANDLER_DURATION,
+    HANDLER_ERRORS,
+    DB_QUERY_DURATION,
+    DB_QUERIES_PER_UPDATE,
+    LOOP_LAG,
+    LOOP_BLOCKS,
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_ERRORS,
+    TELEGRAM_FILE_SENDS,
+    TELEGRAM_FILE_SAVED_BYTES,
+    TELEGRAM_FILE_SAVED_SECONDS
+)
+from monitoring.loop_watchdog import get_block_samples
+from monitoring.logging_pipeline import set_log_level
+from utils.qualifications_checker import get_admin_user_ids
+
+logger = logging.getLogger(__name__)
+router = Router()
+
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+TOP_LIMIT = 10
+
+
+def _top(series: List[Dict[str, Any]], field: str, limit: int = TOP_LIMIT) -> List[Dict[str, Any]]:
+    return sorted(series, key=lambda item: item.get(field, 0), reverse=True)[:limit]
+
+
+def format_metrics_summary(snapshot: Dict[str, Any]) -> str:
+    """
+    Текстовая сводка по снимку метрик
+
+    Args:
+        snapshot: Результат registry.to_json()
+
+    Returns:
+        Текст сообщения (HTML)
+    """
+    metrics = snapshot['metrics']
+    in_flight = sum(item['value'] for item in metrics.get(UPDATES_IN_FLIGHT.name, []))
+
+    text = f"📊 <b>Метрики</b> (за {snapshot['uptime_seconds'] / 3600:.1f} ч)\n"
+    text += f"Обновлений в обработке: {in_flight:.0f}\n"
+    for item in metrics.get(LOOP_LAG.name, []):
+        text += f"Задержка цикла событий: p95 {item['p95'] * 1000:.0f} мс, макс {item['max'] * 1000:.0f} мс\n"
+    text += "\n"
+
+    blocks = _top(metrics.get(LOOP_BLOCKS.name, []), 'sum', 5)
+    if blocks:
+        text += "⛔ <b>Блокировки цикла событий (сумма / макс / раз):</b>\n"
+        for item in blocks:
+            text += (
+                f"• <code>{escape(item['labels']['handler'])}</code> в <code>{escape(item['labels']['site'])}</code>: "
+                f"{item['sum']:.2f} с / {item['max'] * 1000:.0f} мс / {item['count']}\n"
+            )
+        text += "\n"
+
+    handlers = _top(metrics.get(HANDLER_DURATION.name, []), 'p95')
+    if handlers:
+        text += "🐢 <b>Обработчики (p95 / среднее / вызовов):</b>\n"
+        for item in handlers:
+            text += (
+                f"• <code>{escape(item['labels']['handler'])}</code>: "
+                f"{item['p95'] * 1000:.0f} / {item['avg'] * 1000:.0f} мс / {item['count']}\n"
+            )
+        text += "\n"
+
+    errors = _top(metrics.get(HANDLER_ERRORS.name, []), 'value', 5)
+    if errors:
+        text += "❌ <b>Ошибки обработчиков:</b>\n"
+        for item in errors:
+            text += f"• <code>{escape(item['labels']['handler'])}</code> {item['labels']['error']}: {item['value']:.0f}\n"
+        text += "\n"
+
+    sites = _top(metrics.get(DB_QUERY_DURATION.name, []), 'sum')
+    if sites:
+        text += "🗄 <b>Запросы к БД (сумма / среднее / запросов):</b>\n"
+        for item in sites:
+            text += (
+                f"• <code>{escape(item['labels']['site'])}</code>: "
+                f"{item['sum']:.2f} с / {item['avg'] * 1000:.1f} мс / {item['count']}\n"
+            )
+        text += "\n"
+
+    per_update = _top(metrics.get(DB_QUERIES_PER_UPDATE.name, []), 'max', 5)
+    if per_update:
+        text += "🔁 <b>Запросов к БД на обновление (макс / среднее):</b>\n"
+        for item in per_update:
+            text += f"• <code>{escape(item['labels']['handler'])}</code>: {item['max']:.0f} / {item['avg']:.1f}\n"
+
+    requests = _top(metrics.get(HTTP_REQUEST_DURATION.name, []), 'p95', 5)
+    if requests:
+        text += "\n🌐 <b>Внешние сайты (p95 / среднее / запросов):</b>\n"
+        for item in requests:
+            text += (
+                f"• <code>{escape(item['labels']['host'])}</code> {item['labels']['status']}: "
+                f"{item['p95'] * 1000:.0f} / {item['avg'] * 1000:.0f} мс / {item['count']}\n"
+            )
+
+    http_errors = _top(metrics.get(HTTP_REQUEST_ERRORS.name, []), 'value', 5)
+    if http_errors:
+        text += "\n📡 <b>Сетевые ошибки:</b>\n"
+        for item in http_errors:
+            text += f"• <code>{escape(item['labels']['host'])}</code> {item['labels']['error']}: {item['value']:.0f}\n"
+
+    sends = metrics.get(TELEGRAM_FILE_SENDS.name, [])
+    if sends:
+        saved_bytes = {item['labels']['kind']: item['value'] for item in metrics.get(TELEGRAM_FILE_SAVED_BYTES.name, [])}
+        saved_seconds = {item['labels']['kind']: item['value'] for item in metrics.get(TELEGRAM_FILE_SAVED_SECONDS.name, [])}
+        counts: Dict[str, Dict[str, float]] = {}
+        for item in sends:
+            counts.setdefault(item['labels']['kind'], {})[item['labels']['result']] = item['value']
+        text += "\n📎 <b>Файлы в Telegram (по file_id / загружено, сэкономлено):</b>\n"
+        for kind, results in sorted(counts.items()):
+            text += (
+                f"• {kind}: {results.get('reused', 0):.0f} / {results.get('uploaded', 0):.0f}, "
+                f"{saved_bytes.get(kind, 0) / 1024 / 1024:.1f} МБ, {saved_seconds.get(kind, 0):.0f} с\n"
+            )
+
+    return text
+
+
+@router.message(Command("metrics"))
+async def metrics_command(message: Message, command: CommandObject):
+    """Показать метрики (только для администраторов из ADMIN_IDS)"""
+    if message.from_user.id not in await get_admin_user_ids():
+        return
+
+    arg = (command.args or '').strip().lower()
+
+    if arg == 'reset':
+        registry.reset()
+        await message.answer("✅ Метрики сброшены")
+        return
+
+    if arg == 'prom':
+        await message.answer_document(
+            BufferedInputFile(registry.to_prometheus().encode('utf-8'), filename="metrics.prom")
+        )
+        return
+
+    if arg == 'blocks':
+        samples = get_block_samples(TOP_LIMIT)
+        if not samples:
+            await message.answer("Блокировок цикла событий не было")
+            return
+        report = "\n\n".join(
+            f"{item['handler']} в {item['site']}: {item['count']} раз, "
+            f"всего {item['sum']:.2f} с, макс {item['max']:.2f} с\n{item['stack']}"
+            for item in samples
+        )
+        await message.answer_document(
+            BufferedInputFile(report.encode('utf-8'), filename="loop_blocks.txt")
+        )
+        return
+
+    snapshot = registry.to_json()
+    await message.answer(format_metrics_summary(snapshot), parse_mode="HTML")
+    await message.answer_document(
+        BufferedInputFile(registry.to_json_text().encode('utf-8'), filename="metrics.json")
+    )
+
+
+@router.message(Command("loglevel"))
+async def loglevel_command(message: Message, command: CommandObject):
+    """Изменить уровень логирования (только для администраторов из ADMIN_IDS)"""
+    if message.from_user.id not in await get_admin_user_ids():
+        return
+
+    args = (command.args or '').split()
+    if not args:
+        root_level = logging.getLevelName(logging.getLogger().level)
+        await message.answer(
+            f"Текущий уровень: <b>{root_level}</b>\n"
+            f"Использование: <code>/loglevel DEBUG|INFO|WARNING|ERROR [логгер]</code>",
+            parse_mode="HTML"
+        )
+        return
+
+    logger_name = args[1] if len(args) > 1 else None
+    try:
+        set_log_level(args[0], logger_name)
+    except ValueError as e:
+        await message.answer(f"❌ {e}")
+        return
+
+    logger.warning(f"Уровень логирования {logger_name or 'root'} изменен на {args[0].upper()}")
+    await message.answer(f"✅ Уровень {escape(logger_name or 'root')}: {escape(args[0].upper())}")
+
+
+async def start_metrics_server(port: Optional[int] = None):
+    """
+    Запустить HTTP endpoint метрик, если задан METRICS_PORT
+
+    Args:
+        port: Порт (по умолчанию METRICS_PORT)
+
+    Returns:
+        aiohttp AppRunner (для остановки) или None
+    """
+    port = port or os.getenv('METRICS_PORT')
+    if not port:
+        return None
+
+    from aiohttp import web
+
+    async def prometheus_handler(request):
+        return web.Response(
+            text=registry.to_prometheus(),
+            content_type='text/plain',
+            headers={'X-Content-Type-Options': 'nosniff'}
+        )
+
+    async def json_handler(request):
+        return web.json_response(registry.to_json())
+
+    app = web.Application()
+    app.router.add_get('/metrics', prometheus_handler)
+    app.router.add_get('/metrics.json', json_handler)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, METRICS_HOST, int(port)).start()
+    logger.info(f"Метрики доступны на http://{METRICS_HOST}:{port}/metrics")
+    return runner
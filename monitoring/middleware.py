@@ -0,0 +1,128 @@
+"""
+Middleware диспетчера для сбора метрик обработки обновлений
+
+UpdateMetricsMiddleware (внешний, на dp.update) замеряет полное время обработки,
+число обновлений в работе, ошибки и количество запросов к БД на обновление.
+HandlerMetricsMiddleware (внутренний, на событиях диспетчера - наследуется всеми
+роутерами) вызывается после фильтров, когда известен выбранный обработчик,
+и замеряет его время и ошибки.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.types import TelegramObject, Update
+
+from monitoring.db_hooks import current_update_stats, active_update_stats
+from monitoring.metrics import (
+    registry,
+    UPDATES_IN_FLIGHT,
+    UPDATE_DURATION,
+    UPDATE_ERRORS,
+    HANDLER_DURATION,
+    HANDLER_ERRORS,
+    DB_QUERIES_PER_UPDATE
+)
+
+logger = logging.getLogger(__name__)
+
+# Обновления дольше этого порога логируются с числом запросов к БД
+SLOW_UPDATE_SECONDS = float(os.getenv('SLOW_UPDATE_SECONDS', '1.0'))
+
+UNHANDLED = 'unhandled'
+
+
+def _handler_name(handler_object) -> str:
+    """Имя обработчика 'модуль.функция' по HandlerObject aiogram"""
+    callback = getattr(handler_object, 'callback', None)
+    if callback is None:
+        return UNHANDLED
+    return f"{getattr(callback, '__module__', '?')}.{getattr(callback, '__qualname__', repr(callback))}"
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Внешний middleware обновлений: общее время, обновления в работе, запросы к БД"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: Dict[str, Any]
+    ) -> Any:
+        event_type = getattr(event, 'event_type', None) or 'unknown'
+        user = data.get('event_from_user')
+        stats = {
+            'queries': 0,
+            'db_seconds': 0.0,
+            'handler': UNHANDLED,
+            # Контекст для записей лога (monitoring.logging_pipeline)
+            'update_id': getattr(event, 'update_id', None),
+            'user_id': user.id if user else None
+        }
+        token = current_update_stats.set(stats)
+        task = asyncio.current_task()
+        active_update_stats[task] = stats
+        registry.inc(UPDATES_IN_FLIGHT)
+        started = time.perf_counter()
+
+        try:
+            return await handler(event, data)
+        except Exception:
+            registry.inc(UPDATE_ERRORS, (event_type,))
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            registry.inc(UPDATES_IN_FLIGHT, amount=-1)
+            registry.observe(UPDATE_DURATION, (event_type,), elapsed)
+            registry.observe(DB_QUERIES_PER_UPDATE, (stats['handler'],), stats['queries'])
+            current_update_stats.reset(token)
+            active_update_stats.pop(task, None)
+
+            if elapsed >= SLOW_UPDATE_SECONDS:
+                logger.warning(
+                    f"Медленное обновление {event_type}: {elapsed:.2f}s, обработчик {stats['handler']}, "
+                    f"запросов к БД {stats['queries']} ({stats['db_seconds']:.2f}s)"
+                )
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Внутренний middleware событий: время и ошибки выбранного обработчика"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        name = _handler_name(data.get('handler'))
+        stats = current_update_stats.get()
+        if stats is not None:
+            stats['handler'] = name
+
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            registry.inc(HANDLER_ERRORS, (name, type(e).__name__))
+            raise
+        finally:
+            registry.observe(HANDLER_DURATION, (name,), time.perf_counter() - started)
+
+
+def setup_metrics_middleware(dp: Dispatcher) -> None:
+    """
+    Подключить middleware метрик к диспетчеру
+
+    Args:
+        dp: Диспетчер (внутренние middleware диспетчера действуют во всех вложенных роутерах)
+    """
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+
+    handler_middleware = HandlerMetricsMiddleware()
+    for event_name, observer in dp.observers.items():
+        if event_name not in ('update', 'error'):
+            observer.middleware(handler_middleware)
@@ -0,0 +1,130 @@
+"""
+Массовая отправка сообщений с ограничением скорости
+
+Telegram ограничивает рассылку ~30 сообщениями в секунду, поэтому все фоновые
+рассылки (напоминания, отчеты, уведомления) идут через общий ограничитель.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter, TelegramBadRequest
+
+from bot.file_registry import send_file
+
+logger = logging.getLogger(__name__)
+
+BROADCAST_RATE = float(os.getenv('BROADCAST_RATE', '25'))  # сообщений в секунду
+MAX_SEND_ATTEMPTS = 3
+
+# Результаты отправки
+SENT = 'sent'
+FAILED = 'failed'  # временная ошибка - можно повторить позже
+UNDELIVERABLE = 'undeliverable'  # пользователь заблокировал бота или чат недоступен
+
+
+class RateLimiter:
+    """Ограничитель скорости (token bucket), общий для всех рассылок процесса"""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Ждет, пока можно будет отправить следующее сообщение"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+_rate_limiter = RateLimiter(BROADCAST_RATE)
+
+
+async def _deliver(chat_id: int, send: Callable[[], Awaitable[Any]]) -> str:
+    """Отправка с ожиданием ограничителя и повтором после flood control"""
+    for attempt in range(MAX_SEND_ATTEMPTS):
+        await _rate_limiter.acquire()
+        try:
+            await send()
+            return SENT
+        except TelegramRetryAfter as e:
+            logger.warning(f"Flood control, waiting {e.retry_after}s before retry {attempt + 1}/{MAX_SEND_ATTEMPTS}")
+            await asyncio.sleep(e.retry_after)
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            logger.info(f"Message to {chat_id} is undeliverable: {e}")
+            return UNDELIVERABLE
+        except Exception as e:
+            logger.error(f"Error sending message to {chat_id}: {e}")
+            return FAILED
+    return FAILED
+
+
+async def send_with_limit(bot: Bot, chat_id: int, text: str, **kwargs) -> str:
+    """
+    Отправляет одно сообщение через общий ограничитель скорости
+
+    Args:
+        bot: Экземпляр бота
+        chat_id: ID получателя
+        text: Текст сообщения
+        **kwargs: Параметры send_message (parse_mode, reply_markup, ...)
+
+    Returns:
+        SENT, FAILED или UNDELIVERABLE
+    """
+    return await _deliver(chat_id, lambda: bot.send_message(chat_id, text, **kwargs))
+
+
+async def send_document_with_limit(bot: Bot, chat_id: int, content: bytes, filename: str, **kwargs) -> str:
+    """
+    Отправляет документ через общий ограничитель скорости
+
+    Повторное содержимое отправляется по file_id (bot.file_registry).
+
+    Args:
+        bot: Экземпляр бота
+        chat_id: ID получателя
+        content: Содержимое файла
+        filename: Имя файла
+        **kwargs: Параметры send_document (caption, parse_mode, ...)
+
+    Returns:
+        SENT, FAILED или UNDELIVERABLE
+    """
+    send = functools.partial(bot.send_document, chat_id)
+    return await _deliver(chat_id, lambda: send_file(send, 'document', content, filename, **kwargs))
+
+
+async def broadcast(bot: Bot, messages: Iterable[Dict[str, Any]]) -> Dict[Any, str]:
+    """
+    Отправляет пачку сообщений с ограничением скорости
+
+    Args:
+        bot: Экземпляр бота
+        messages: Сообщения [{'key', 'chat_id', 'text', ...параметры send_message}]
+
+    Returns:
+        Словарь {key: SENT | FAILED | UNDELIVERABLE}
+    """
+    results = {}
+    for message in messages:
+        params = dict(message)
+        key = params.pop('key')
+        chat_id = params.pop('chat_id')
+        text = params.pop('text')
+        results[key] = await send_with_limit(bot, chat_id, text, **params)
+    return results
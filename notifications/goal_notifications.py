@@ -2,12 +2,15 @@
 Модуль для отправки уведомлений о достижении целей и мотивационных сообщений
 """
 import aiosqlite
+import logging
 import os
 from datetime import datetime, timedelta
 from aiogram import Bot
 
 from database.queries import get_training_statistics, get_user_settings, update_user_setting
 
+logger = logging.getLogger(__name__)
+
 
 async def check_and_notify_goal_progress(bot: Bot, user_id: int):
     """
@@ -102,4 +105,4 @@ async def send_motivational_message_after_training(bot: Bot, user_id: int):
     try:
         await check_and_notify_goal_progress(bot, user_id)
     except Exception as e:
-        print(f"Ошибка отправки мотивационного сообщения пользователю {user_id}: {e}")
+        logger.error(f"Ошибка отправки мотивационного сообщения пользователю {user_id}: {e}")
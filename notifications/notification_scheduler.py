@@ -4,14 +4,15 @@
 """
 
 import asyncio
-from datetime import datetime, timedelta
+import logging
+from datetime import datetime
 import pytz
 from aiogram import Bot
-from database.queries import (
-    get_user_settings,
-    get_trainings_by_period,
-    get_training_statistics
-)
+from database.queries import get_user_settings
+from database.goal_queries import archive_old_goal_progress
+from notifications.weekly_reports import start_weekly_reports
+
+logger = logging.getLogger(__name__)
 
 
 async def check_birthdays(bot: Bot):
@@ -60,7 +61,7 @@ async def check_birthdays(bot: Bot):
                 try:
                     await bot.send_message(user_id, birthday_message, parse_mode="Markdown")
                 except Exception as e:
-                    print(f"Ошибка отправки поздравления пользователю {user_id}: {e}")
+                    logger.error(f"Ошибка отправки поздравления пользователю {user_id}: {e}")
 
 
 async def send_daily_reminders(bot: Bot):
@@ -106,7 +107,7 @@ async def send_daily_reminders(bot: Bot):
                         continue
 
                 except Exception as e:
-                    print(f"Ошибка обработки часового пояса для пользователя {user_id}: {e}")
+                    logger.error(f"Ошибка обработки часового пояса для пользователя {user_id}: {e}")
                     continue
 
                 async with db.execute(
@@ -143,107 +144,7 @@ async def send_daily_reminders(bot: Bot):
                             parse_mode="HTML"
                         )
                     except Exception as e:
-                        print(f"Ошибка отправки напоминания пользователю {user_id}: {e}")
-
-
-async def send_weekly_reports(bot: Bot):
-    """
-    Отправка недельных отчётов о тренировках и здоровье в виде PDF файла
-    Проверяет день недели и время для каждого пользователя
-    Использует timezone-aware datetime для корректной обработки часовых поясов
-    """
-    import aiosqlite
-    import os
-    from aiogram.types import BufferedInputFile
-    from bot.pdf_export import create_training_pdf
-
-    DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
-
-    utc_now = datetime.now(pytz.UTC)
-
-    weekday_map = {
-        'Monday': 'Понедельник',
-        'Tuesday': 'Вторник',
-        'Wednesday': 'Среда',
-        'Thursday': 'Четверг',
-        'Friday': 'Пятница',
-        'Saturday': 'Суббота',
-        'Sunday': 'Воскресенье'
-    }
-
-    async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
-
-        async with db.execute(
-            """
-            SELECT user_id, name, weekly_report_day, weekly_report_time, timezone
-            FROM user_settings
-            WHERE weekly_report_day IS NOT NULL AND weekly_report_time IS NOT NULL
-            """
-        ) as cursor:
-            rows = await cursor.fetchall()
-
-            for row in rows:
-                user_id = row['user_id']
-                name = row['name'] or "друг"
-                report_day = row['weekly_report_day']
-                report_time = row['weekly_report_time']
-                user_timezone_str = row['timezone'] or 'Europe/Moscow'
-
-                try:
-                    user_tz = pytz.timezone(user_timezone_str)
-
-                    user_now = utc_now.astimezone(user_tz)
-                    current_weekday = user_now.strftime('%A')  
-                    current_time = user_now.strftime('%H:%M')
-                    current_weekday_ru = weekday_map.get(current_weekday, 'Понедельник')
-
-                    if current_weekday_ru != report_day or current_time != report_time:
-                        continue
-
-                except Exception as e:
-                    print(f"Ошибка обработки часового пояса для пользователя {user_id}: {e}")
-                    continue
-
-                try:
-                    end_date = user_now.date()
-                    start_date = end_date - timedelta(days=7)
-
-                    trainings = await get_trainings_by_period(user_id, start_date, end_date)
-
-                    if not trainings:
-                        print(f"Пользователь {user_id}: нет тренировок за неделю, отчёт не отправлен")
-                        continue
-
-                    stats = await get_training_statistics(user_id, start_date, end_date)
-
-                    from utils.date_formatter import DateFormatter, get_user_date_format
-                    user_date_format = await get_user_date_format(user_id)
-                    start_str = DateFormatter.format_date(start_date.strftime('%Y-%m-%d'), user_date_format)
-                    end_str = DateFormatter.format_date(end_date.strftime('%Y-%m-%d'), user_date_format)
-                    period_text = f"{start_str} - {end_str}"
-
-                    pdf_buffer = await create_training_pdf(trainings, period_text, stats, user_id)
-
-                    today = user_now.strftime('%Y-%m-%d')
-                    filename = f"weekly_report_{today}.pdf"
-
-                    pdf_file = BufferedInputFile(
-                        pdf_buffer.read(),
-                        filename=filename
-                    )
-
-                    await bot.send_document(
-                        user_id,
-                        pdf_file,
-                        caption=f"📊 <b>Недельный отчёт</b>\n\nПривет, {name}! 👋\n\nТвой подробный отчёт за неделю готов!",
-                        parse_mode="HTML"
-                    )
-
-                except Exception as e:
-                    import traceback
-                    print(f"Ошибка генерации или отправки отчёта пользователю {user_id}: {e}")
-                    traceback.print_exc()
+                        logger.error(f"Ошибка отправки напоминания пользователю {user_id}: {e}")
 
 
 async def send_training_reminders(bot: Bot):
@@ -313,7 +214,7 @@ async def send_training_reminders(bot: Bot):
                         continue
 
                 except Exception as e:
-                    print(f"Ошибка обработки часового пояса для пользователя {user_id}: {e}")
+                    logger.error(f"Ошибка обработки часового пояса для пользователя {user_id}: {e}")
                     continue
 
                 today_date = user_now.date()
@@ -349,7 +250,7 @@ async def send_training_reminders(bot: Bot):
                         parse_mode="HTML"
                     )
                 except Exception as e:
-                    print(f"Ошибка отправки напоминания пользователю {user_id}: {e}")
+                    logger.error(f"Ошибка отправки напоминания пользователю {user_id}: {e}")
 
 
 async def notification_scheduler(bot: Bot):
@@ -364,14 +265,19 @@ async def notification_scheduler(bot: Bot):
             if now.hour == 0 and now.minute == 0:
                 await check_birthdays(bot)
 
+            # В начале недели переносим прогресс целей старых недель в архив
+            if now.weekday() == 0 and now.hour == 0 and now.minute == 5:
+                await archive_old_goal_progress()
+
             await send_daily_reminders(bot)
 
-            await send_weekly_reports(bot)
+            # Отчеты строятся и отправляются в фоне, не задерживая остальные уведомления
+            start_weekly_reports(bot)
 
             await send_training_reminders(bot)
 
         except Exception as e:
-            print(f"Ошибка в планировщике уведомлений: {e}")
+            logger.error(f"Ошибка в планировщике уведомлений: {e}")
 
         await asyncio.sleep(60)
 
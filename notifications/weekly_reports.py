@@ -0,0 +1,319 @@
+"""
+Недельные отчеты о тренировках: пакетная генерация и отправка
+
+Планировщик уведомлений раз в минуту вызывает start_weekly_reports: запуск
+идет фоновой задачей и не задерживает остальные уведомления, а пока
+предыдущий запуск не закончился, новый не начинается. Отчет получают
+пользователи, у которых день и время отчета (в их часовом поясе) попали
+в окно с предыдущего запуска, поэтому пропущенные минуты не теряют отчеты.
+Дальше пачками по WEEKLY_REPORT_BATCH:
+
+1. тренировки всех пользователей пачки загружаются одним запросом;
+2. PDF строятся в пуле из WEEKLY_REPORT_WORKERS процессов (пул создается
+   при первом запуске и используется повторно) - matplotlib и reportlab
+   не блокируют цикл событий;
+3. готовые отчеты по порядку отправляются через общий ограничитель
+   рассылок (notifications.broadcaster), пока следующие еще строятся.
+
+Время этапов пишется в метрики, итог запуска (отчетов в секунду на каждом
+этапе) - в лог.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import aiosqlite
+import pytz
+
+from database.queries import get_trainings_for_users, summarize_trainings
+from monitoring.metrics import registry, WEEKLY_REPORT_STAGE_DURATION, WEEKLY_REPORTS
+from utils.date_formatter import DateFormatter
+
+logger = logging.getLogger(__name__)
+DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
+
+# Сколько пользователей обрабатывается за один запрос к БД
+WEEKLY_REPORT_BATCH = int(os.getenv('WEEKLY_REPORT_BATCH', '200'))
+# Сколько процессов строят PDF
+WEEKLY_REPORT_WORKERS = int(os.getenv('WEEKLY_REPORT_WORKERS', '2'))
+
+# Отчеты, время которых прошло раньше, не досылаются (например, после долгой остановки бота)
+MAX_DUE_WINDOW = timedelta(minutes=10)
+REPORT_DAYS = 7
+
+WEEKDAYS_RU = ('Понедельник', 'Вторник', 'Среда', 'Четверг', 'Пятница', 'Суббота', 'Воскресенье')
+
+REPORT_CAPTION = "📊 <b>Недельный отчёт</b>\n\nПривет, {name}! 👋\n\nТвой подробный отчёт за неделю готов!"
+
+# Время предыдущего запуска (UTC) - начало окна следующего
+_last_run: Optional[datetime] = None
+# Текущий фоновый запуск (новый не начинается, пока он не закончился)
+_run_task: Optional[asyncio.Task] = None
+# Процессы для построения PDF (создаются при первом отчете и используются повторно)
+_render_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    global _render_pool
+    if _render_pool is None:
+        _render_pool = ProcessPoolExecutor(max_workers=max(WEEKLY_REPORT_WORKERS, 1))
+    return _render_pool
+
+
+def _discard_render_pool() -> None:
+    """Отказаться от пула, в котором упал процесс (следующий запуск создаст новый)"""
+    global _render_pool
+    if _render_pool is not None:
+        _render_pool.shutdown(wait=False, cancel_futures=True)
+        _render_pool = None
+
+
+def report_due_at(report_day: str, report_time: str, tz: pytz.BaseTzInfo,
+                  since: datetime, now: datetime) -> Optional[datetime]:
+    """
+    Время отчета пользователя, если оно попало в окно (since, now]
+
+    Args:
+        report_day: День недели отчета ('Понедельник', ...)
+        report_time: Время отчета 'ЧЧ:ММ'
+        tz: Часовой пояс пользователя
+        since: Начало окна (aware datetime)
+        now: Конец окна (aware datetime)
+
+    Returns:
+        Время отчета в часовом поясе пользователя или None
+    """
+    at = datetime.strptime(report_time, '%H:%M').time()
+    for day in {since.astimezone(tz).date(), now.astimezone(tz).date()}:
+        if WEEKDAYS_RU[day.weekday()] != report_day:
+            continue
+        due = tz.localize(datetime.combine(day, at))
+        if since < due <= now:
+            return due
+    return None
+
+
+async def collect_due_users(since: datetime, now: datetime) -> List[Dict[str, Any]]:
+    """
+    Пользователи, которым пора отправить недельный отчет
+
+    Returns:
+        [{'user_id', 'name', 'start_date', 'end_date', 'date_format', 'distance_unit'}]
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            """
+            SELECT user_id, name, weekly_report_day, weekly_report_time, timezone,
+                   date_format, distance_unit
+            FROM user_settings
+            WHERE weekly_report_day IS NOT NULL AND weekly_report_time IS NOT NULL
+            """
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+    due_users = []
+    for row in rows:
+        try:
+            tz = pytz.timezone(row['timezone'] or 'Europe/Moscow')
+            due = report_due_at(row['weekly_report_day'], row['weekly_report_time'], tz, since, now)
+        except Exception as e:
+            logger.error(f"Ошибка обработки времени отчета для пользователя {row['user_id']}: {e}")
+            continue
+        if due is None:
+            continue
+
+        end_date = due.date()
+        due_users.append({
+            'user_id': row['user_id'],
+            'name': row['name'] or "друг",
+            'start_date': end_date - timedelta(days=REPORT_DAYS),
+            'end_date': end_date,
+            'date_format': row['date_format'] or 'ДД.ММ.ГГГГ',
+            'distance_unit': row['distance_unit'] or 'км'
+        })
+    return due_users
+
+
+def _render_report(trainings: list, period_text: str, stats: dict,
+                   distance_unit: str, date_format: str) -> Tuple[bytes, float]:
+    """Построить PDF отчета (выполняется в процессе пула)"""
+    from bot.pdf_export import render_training_pdf
+
+    started = time.perf_counter()
+    buffer = render_training_pdf(trainings, period_text, stats, distance_unit, date_format)
+    return buffer.getvalue(), time.perf_counter() - started
+
+
+class PipelineStats:
+    """Количество и время по этапам одного запуска"""
+
+    STAGES = ('collect', 'load', 'render', 'send')
+
+    def __init__(self):
+        self.items = dict.fromkeys(self.STAGES, 0)
+        self.seconds = dict.fromkeys(self.STAGES, 0.0)
+        self.results: Dict[str, int] = {}
+
+    def add(self, stage: str, items: int, seconds: float) -> None:
+        self.items[stage] += items
+        self.seconds[stage] += seconds
+        registry.observe(WEEKLY_REPORT_STAGE_DURATION, (stage,), seconds)
+
+    def result(self, result: str) -> None:
+        self.results[result] = self.results.get(result, 0) + 1
+        registry.inc(WEEKLY_REPORTS, (result,))
+
+    def summary(self, total_seconds: float) -> str:
+        stages = []
+        for stage in self.STAGES:
+            items, seconds = self.items[stage], self.seconds[stage]
+            rate = f"{items / seconds:.1f}/с" if seconds > 0 else "-"
+            stages.append(f"{stage} {items} за {seconds:.2f} с ({rate})")
+        results = ", ".join(f"{name} {count}" for name, count in sorted(self.results.items()))
+        return f"{'; '.join(stages)}; итого {total_seconds:.2f} с: {results}"
+
+
+async def _deliver(bot, user: Dict[str, Any], render: asyncio.Future, stats: PipelineStats) -> None:
+    """Дождаться PDF пользователя и отправить его"""
+    from notifications.broadcaster import send_document_with_limit
+
+    user_id = user['user_id']
+    try:
+        content, render_seconds = await render
+    except Exception as e:
+        logger.error(f"Ошибка генерации отчёта пользователю {user_id}: {e}", exc_info=True)
+        if isinstance(e, BrokenProcessPool):
+            _discard_render_pool()
+        stats.result('render_failed')
+        return
+    stats.add('render', 1, render_seconds)
+
+    started = time.monotonic()
+    result = await send_document_with_limit(
+        bot,
+        user_id,
+        content,
+        f"weekly_report_{user['end_date'].strftime('%Y-%m-%d')}.pdf",
+        caption=REPORT_CAPTION.format(name=user['name']),
+        parse_mode="HTML"
+    )
+    stats.add('send', 1, time.monotonic() - started)
+    stats.result(result)
+
+
+async def _process_batch(bot, users: List[Dict[str, Any]], pool: ProcessPoolExecutor,
+                         stats: PipelineStats) -> None:
+    """Загрузить тренировки пачки пользователей, построить и отправить отчеты"""
+    started = time.monotonic()
+    trainings_by_user = await get_trainings_for_users(
+        [user['user_id'] for user in users],
+        min(user['start_date'] for user in users).strftime('%Y-%m-%d'),
+        max(user['end_date'] for user in users).strftime('%Y-%m-%d')
+    )
+    stats.add('load', len(users), time.monotonic() - started)
+
+    loop = asyncio.get_running_loop()
+    window = max(WEEKLY_REPORT_WORKERS, 1) * 2
+    pending: Deque[Tuple[Dict[str, Any], asyncio.Future]] = deque()
+    try:
+        for user in users:
+            # Даты отчета у пользователей в разных часовых поясах могут отличаться
+            start, end = user['start_date'].strftime('%Y-%m-%d'), user['end_date'].strftime('%Y-%m-%d')
+            trainings = [t for t in trainings_by_user[user['user_id']] if start <= t['date'] <= end]
+            if not trainings:
+                logger.debug(f"Пользователь {user['user_id']}: нет тренировок за неделю, отчёт не отправлен")
+                stats.result('no_trainings')
+                continue
+
+            date_format = user['date_format']
+            period_text = (
+                f"{DateFormatter.format_date(start, date_format)} - "
+                f"{DateFormatter.format_date(end, date_format)}"
+            )
+            render = loop.run_in_executor(
+                pool, _render_report,
+                trainings, period_text, summarize_trainings(trainings), user['distance_unit'], date_format
+            )
+            pending.append((user, render))
+
+            # Пока отправляется самый старый отчет, пул строит следующие
+            if len(pending) >= window:
+                await _deliver(bot, *pending.popleft(), stats)
+
+        while pending:
+            await _deliver(bot, *pending.popleft(), stats)
+    finally:
+        for _, render in pending:
+            render.cancel()
+
+
+async def send_weekly_reports(bot) -> Dict[str, int]:
+    """
+    Отправить недельные отчеты всем пользователям, чье время отчета наступило
+
+    Args:
+        bot: Экземпляр бота
+
+    Returns:
+        Количество пользователей по результатам (sent, failed, undeliverable,
+        no_trainings, render_failed)
+    """
+    global _last_run
+
+    now = datetime.now(pytz.UTC)
+    since = now - timedelta(minutes=1) if _last_run is None else max(_last_run, now - MAX_DUE_WINDOW)
+    _last_run = now
+
+    stats = PipelineStats()
+    run_started = time.monotonic()
+
+    started = time.monotonic()
+    due_users = await collect_due_users(since, now)
+    stats.add('collect', len(due_users), time.monotonic() - started)
+    if not due_users:
+        return stats.results
+
+    for offset in range(0, len(due_users), WEEKLY_REPORT_BATCH):
+        await _process_batch(bot, due_users[offset:offset + WEEKLY_REPORT_BATCH], _get_render_pool(), stats)
+
+    logger.info(f"Недельные отчеты: {stats.summary(time.monotonic() - run_started)}")
+    return stats.results
+
+
+async def _run_weekly_reports(bot) -> None:
+    try:
+        await send_weekly_reports(bot)
+    except Exception as e:
+        logger.error(f"Ошибка отправки недельных отчетов: {e}", exc_info=True)
+
+
+def start_weekly_reports(bot) -> Optional[asyncio.Task]:
+    """
+    Запустить send_weekly_reports фоновой задачей (вызывается планировщиком раз в минуту)
+
+    Если предыдущий запуск еще идет, новый не начинается: окно следующего
+    запуска начинается с времени предыдущего, поэтому отчеты пропущенных
+    минут будут отправлены.
+
+    Args:
+        bot: Экземпляр бота
+
+    Returns:
+        Задача запуска или None, если предыдущий запуск еще не закончился
+    """
+    global _run_task
+
+    if _run_task is not None and not _run_task.done():
+        logger.debug("Недельные отчеты: предыдущий запуск еще идет")
+        return None
+
+    _run_task = asyncio.create_task(_run_weekly_reports(bot))
+    return _run_task
@@ -0,0 +1,234 @@
+"""
+Снимки рейтингов (лидербордов) в памяти
+
+Для каждого периода хранится отсортированный список ключей
+(-очки, -тренировки, user_id): место пользователя ищется бинарным поиском,
+топ-N берется срезом. Снимки сохраняются в таблицу leaderboard_snapshots
+и обновляются после пересчета рейтинга пользователя, поэтому экраны рейтингов
+не обращаются к таблицам ratings и trainings.
+"""
+
+import asyncio
+import logging
+from bisect import bisect_left, insort
+from typing import Dict, Any, List, Optional
+
+from database.rating_queries import (
+    PERIOD_POINTS_FIELDS,
+    get_leaderboard_snapshots,
+    build_leaderboard_snapshot_rows,
+    save_leaderboard_snapshot_rows,
+    get_user_leaderboard_profile
+)
+
+logger = logging.getLogger(__name__)
+
+PERIODS = tuple(PERIOD_POINTS_FIELDS)
+
+
+class Leaderboard:
+    """Отсортированный рейтинг одного периода"""
+
+    def __init__(self):
+        self._keys: List[tuple] = []
+        self._entries: Dict[int, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _key(entry: Dict[str, Any]) -> tuple:
+        return (-entry['points'], -(entry.get('total_trainings') or 0), entry['user_id'])
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def upsert(self, entry: Dict[str, Any]) -> None:
+        """Добавить или обновить запись пользователя"""
+        self.remove(entry['user_id'])
+        self._entries[entry['user_id']] = entry
+        insort(self._keys, self._key(entry))
+
+    def remove(self, user_id: int) -> None:
+        """Удалить пользователя из рейтинга"""
+        entry = self._entries.pop(user_id, None)
+        if entry is None:
+            return
+        index = bisect_left(self._keys, self._key(entry))
+        if index < len(self._keys) and self._keys[index][2] == user_id:
+            del self._keys[index]
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Запись пользователя или None"""
+        return self._entries.get(user_id)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """
+        Место пользователя (пользователи с равными очками делят место)
+
+        Returns:
+            Место или None, если у пользователя нет очков за период
+        """
+        entry = self._entries.get(user_id)
+        if not entry or entry['points'] <= 0:
+            return None
+        # Количество пользователей со строго большим числом очков
+        return bisect_left(self._keys, (-entry['points'],)) + 1
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Первые limit записей рейтинга"""
+        return [self._entries[key[2]] for key in self._keys[:limit]]
+
+
+_leaderboards: Dict[str, Leaderboard] = {period: Leaderboard() for period in PERIODS}
+_loaded = False
+_load_lock = asyncio.Lock()
+
+
+def _fill(rows: List[Dict[str, Any]]) -> None:
+    """Заполнить рейтинги в памяти строками снимков"""
+    global _leaderboards
+    leaderboards = {period: Leaderboard() for period in PERIODS}
+    for row in rows:
+        board = leaderboards.get(row['period'])
+        if board is not None:
+            board.upsert(row)
+    _leaderboards = leaderboards
+
+
+async def load_leaderboards() -> None:
+    """
+    Загрузить снимки рейтингов из БД (при старте бота и после полного пересчета)
+
+    Если снимков еще нет, они строятся по таблице ratings и сохраняются.
+    """
+    global _loaded
+
+    async with _load_lock:
+        rows = await get_leaderboard_snapshots()
+        if not rows:
+            rows = await build_leaderboard_snapshot_rows()
+            if rows:
+                await save_leaderboard_snapshot_rows(rows)
+                logger.info(f"Построены снимки рейтингов: {len(rows)} записей")
+
+        _fill(rows)
+        _loaded = True
+        logger.debug(
+            "Загружены снимки рейтингов: " +
+            ", ".join(f"{period}={len(board)}" for period, board in _leaderboards.items())
+        )
+
+
+async def schedule_leaderboard_refresh(interval: float) -> None:
+    """
+    Периодически перечитывать снимки рейтингов из БД
+
+    Нужно, когда бот работает в нескольких процессах: каждый процесс держит
+    свою копию рейтингов в памяти и видит обновления других процессов только
+    через таблицу leaderboard_snapshots.
+
+    Args:
+        interval: Период обновления в секундах
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await load_leaderboards()
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении снимков рейтингов: {e}")
+
+
+async def _ensure_loaded() -> None:
+    if not _loaded:
+        await load_leaderboards()
+
+
+async def get_top(period: str = 'global', limit: int = 10) -> List[Dict[str, Any]]:
+    """
+    Получить топ рейтинга за период
+
+    Args:
+        period: Период ('global', 'week', 'month', 'season')
+        limit: Количество пользователей в топе
+
+    Returns:
+        Список пользователей (user_id, points, total_trainings, name, username)
+    """
+    await _ensure_loaded()
+    board = _leaderboards.get(period, _leaderboards['global'])
+    return board.top(limit)
+
+
+async def get_rank(user_id: int, period: str = 'global') -> Optional[int]:
+    """
+    Получить место пользователя в рейтинге
+
+    Args:
+        user_id: ID пользователя
+        period: Период ('global', 'week', 'month', 'season')
+
+    Returns:
+        Место в рейтинге или None
+    """
+    await _ensure_loaded()
+    board = _leaderboards.get(period, _leaderboards['global'])
+    return board.rank(user_id)
+
+
+async def get_user_entries(user_id: int) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Получить записи пользователя во всех рейтингах
+
+    Args:
+        user_id: ID пользователя
+
+    Returns:
+        {период: {'points', 'total_trainings', 'rank'} или None, если
+        пользователя нет в рейтинге за период}
+    """
+    await _ensure_loaded()
+    entries = {}
+    for period, board in _leaderboards.items():
+        entry = board.get(user_id)
+        entries[period] = None if entry is None else {
+            'points': entry['points'],
+            'total_trainings': entry.get('total_trainings') or 0,
+            'rank': board.rank(user_id)
+        }
+    return entries
+
+
+async def apply_rating_update(user_id: int, points_by_period: Dict[str, float],
+                              trainings_by_period: Dict[str, int]) -> None:
+    """
+    Обновить снимки рейтингов после пересчета очков пользователя
+
+    Args:
+        user_id: ID пользователя
+        points_by_period: Очки по периодам {'global': ..., 'week': ..., 'month': ..., 'season': ...}
+        trainings_by_period: Количество выполненных тренировок по тем же периодам
+    """
+    await _ensure_loaded()
+    profile = await get_user_leaderboard_profile(user_id)
+
+    rows = []
+    removed = []
+    for period in PERIODS:
+        points = points_by_period.get(period) or 0
+        board = _leaderboards[period]
+        # В рейтингах по периодам участвуют только пользователи с очками
+        if period != 'global' and points <= 0:
+            board.remove(user_id)
+            removed.append((period, user_id))
+            continue
+
+        entry = {
+            'period': period,
+            'user_id': user_id,
+            'points': points,
+            'total_trainings': trainings_by_period.get(period) or 0,
+            'name': profile['name'],
+            'username': profile['username']
+        }
+        board.upsert(entry)
+        rows.append(entry)
+
+    await save_leaderboard_snapshot_rows(rows, removed)
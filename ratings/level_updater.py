@@ -0,0 +1,100 @@
+"""
+Фоновая задача для еженедельного пересчета уровней пользователей
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, time
+
+from database.level_queries import recalculate_all_user_levels, LEVELS_ORDER
+from ratings.user_levels import get_level_emoji
+
+logger = logging.getLogger(__name__)
+
+# Пересчет в конце недели, когда тренировки текущей недели уже известны
+LEVEL_UPDATE_WEEKDAY = 6  # воскресенье
+LEVEL_UPDATE_TIME = time(23, 30)
+
+
+def build_level_change_message(change: dict) -> dict:
+    """
+    Сформировать уведомление об изменении уровня для broadcaster
+
+    Args:
+        change: {user_id, old_level, new_level}
+
+    Returns:
+        Сообщение {'key', 'chat_id', 'text', 'parse_mode'}
+    """
+    new_level = change['new_level']
+    new_emoji = get_level_emoji(new_level)
+
+    if LEVELS_ORDER.index(new_level) > LEVELS_ORDER.index(change['old_level']):
+        text = (
+            f"🎉 <b>Уровень повышен!</b>\n\n"
+            f"Вы поднялись до уровня {new_emoji} <b>{new_level.capitalize()}</b>!\n\n"
+            f"Продолжайте тренироваться для повышения уровня!"
+        )
+    else:
+        text = (
+            f"📉 <b>Уровень изменён</b>\n\n"
+            f"Ваш уровень теперь {new_emoji} <b>{new_level.capitalize()}</b>.\n\n"
+            f"Добавляйте тренировки, чтобы вернуться к прежнему уровню!"
+        )
+
+    return {
+        'key': change['user_id'],
+        'chat_id': change['user_id'],
+        'text': text,
+        'parse_mode': "HTML"
+    }
+
+
+async def update_all_levels(bot) -> None:
+    """
+    Пересчитать уровни всех пользователей и разослать уведомления об изменениях
+
+    Args:
+        bot: Экземпляр бота
+    """
+    from notifications.broadcaster import broadcast
+
+    try:
+        changes = await recalculate_all_user_levels()
+        logger.info(f"Пересчитаны уровни пользователей, изменений: {len(changes)}")
+
+        if changes:
+            await broadcast(bot, [build_level_change_message(change) for change in changes])
+
+    except Exception as e:
+        logger.error(f"Ошибка при пересчете уровней: {e}")
+
+
+async def schedule_level_updates(bot) -> None:
+    """
+    Запланировать еженедельный пересчет уровней
+
+    Пересчет происходит каждое воскресенье в 23:30
+    """
+    logger.info("Запущен планировщик пересчета уровней")
+
+    while True:
+        try:
+            now = datetime.now()
+
+            days_ahead = (LEVEL_UPDATE_WEEKDAY - now.weekday()) % 7
+            target_datetime = datetime.combine(now.date() + timedelta(days=days_ahead), LEVEL_UPDATE_TIME)
+            if target_datetime <= now:
+                target_datetime += timedelta(days=7)
+
+            delay = (target_datetime - now).total_seconds()
+
+            logger.info(f"Следующий пересчет уровней в {target_datetime.strftime('%Y-%m-%d %H:%M:%S')}")
+
+            await asyncio.sleep(delay)
+
+            await update_all_levels(bot)
+
+        except Exception as e:
+            logger.error(f"Ошибка в планировщике пересчета уровней: {e}")
+            await asyncio.sleep(3600)
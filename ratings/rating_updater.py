@@ -16,6 +16,7 @@ from ratings.rating_calculator import (
     calculate_total_points,
     get_period_dates
 )
+from ratings.leaderboard import apply_rating_update, load_leaderboards
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +56,22 @@ async def update_single_user_rating(user_id: int) -> None:
             season_points=season_points
         )
 
+        await apply_rating_update(
+            user_id,
+            {
+                'global': global_points,
+                'week': week_points,
+                'month': month_points,
+                'season': season_points
+            },
+            {
+                'global': len(trainings_all),
+                'week': len(trainings_week),
+                'month': len(trainings_month),
+                'season': len(trainings_season)
+            }
+        )
+
         logger.debug(
             f"Обновлен рейтинг пользователя {user_id}: "
             f"global={global_points}, week={week_points}, month={month_points}, season={season_points}"
@@ -80,6 +97,9 @@ async def update_all_ratings() -> None:
         for user_id in users:
             await update_single_user_rating(user_id)
 
+        # Перечитываем снимки целиком, чтобы синхронизировать рейтинги в памяти
+        await load_leaderboards()
+
         logger.info(f"Обновлены рейтинги {len(users)} пользователей")
 
     except Exception as e:
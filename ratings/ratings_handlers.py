@@ -7,18 +7,8 @@ from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command
 import logging
 
-from database.rating_queries import (
-    get_user_rating,
-    get_global_rankings,
-    get_weekly_rankings,
-    get_monthly_rankings,
-    get_seasonal_rankings,
-    get_user_rank
-)
-from database.level_queries import (
-    get_user_level,
-    get_user_training_stats_for_level
-)
+from ratings.leaderboard import get_top, get_user_entries
+from database.level_queries import get_user_level
 from ratings.rating_calculator import get_season_name
 from ratings.user_levels import (
     get_level_emoji,
@@ -109,21 +99,23 @@ async def show_my_rating(callback: CallbackQuery):
     level_emoji = get_level_emoji(user_level)
     level_data = get_level_info(user_level)
 
-    stats = await get_user_training_stats_for_level(user_id)
-
-    next_level = get_next_level_info(user_level, stats['avg_per_week'])
+    # Очки, места и количество тренировок по периодам - из снимков рейтингов
+    entries = await get_user_entries(user_id)
+    rating = entries['global']
+    total_trainings = rating['total_trainings'] if rating else 0
+    current_week_trainings = entries['week']['total_trainings'] if entries['week'] else 0
 
-    rating = await get_user_rating(user_id)
+    next_level = get_next_level_info(user_level, current_week_trainings)
 
     achievements_count = await get_user_achievements_count(user_id)
     achievements_points = await get_user_achievement_points(user_id)
 
     text = f"{level_emoji} **Ваш уровень: {user_level.capitalize()}**\n\n"
 
-    if stats['total_trainings'] > 0:
+    if total_trainings > 0:
         text += (
-            f"📅 **Эта неделя:** {stats['current_week_trainings']} тренировок\n"
-            f"💪 Всего тренировок: {stats['total_trainings']}\n"
+            f"📅 **Эта неделя:** {current_week_trainings} тренировок\n"
+            f"💪 Всего тренировок: {total_trainings}\n"
         )
 
         if next_level['has_next']:
@@ -145,28 +137,18 @@ async def show_my_rating(callback: CallbackQuery):
     if not rating or rating['points'] == 0:
         text += "У вас пока нет рейтинговых очков.\n"
     else:
-        global_rank = await get_user_rank(user_id, 'global')
-        week_rank = await get_user_rank(user_id, 'week')
-        month_rank = await get_user_rank(user_id, 'month')
-        season_rank = await get_user_rank(user_id, 'season')
-
         season_name = get_season_name()
-        text += f"🌍 **Глобальный:** {rating['points']:.1f} очков"
-
-        if global_rank:
-            text += f" (#{global_rank})"
-
-        text += f"\n📅 **За неделю:** {rating['week_points']:.1f} очков"
-        if week_rank:
-            text += f" (#{week_rank})"
-
-        text += f"\n📆 **За месяц:** {rating['month_points']:.1f} очков"
-        if month_rank:
-            text += f" (#{month_rank})"
-
-        text += f"\n🌸 **За сезон ({season_name}):** {rating['season_points']:.1f} очков"
-        if season_rank:
-            text += f" (#{season_rank})"
+        labels = (
+            ('global', "🌍 **Глобальный:**"),
+            ('week', "\n📅 **За неделю:**"),
+            ('month', "\n📆 **За месяц:**"),
+            ('season', f"\n🌸 **За сезон ({season_name}):**")
+        )
+        for period, label in labels:
+            entry = entries[period]
+            text += f"{label} {entry['points'] if entry else 0:.1f} очков"
+            if entry and entry['rank']:
+                text += f" (#{entry['rank']})"
 
     text += "\n\n━━━━━━━━━━━━━━━━\n🎖️ **Достижения**\n\n"
     text += f"Получено: {achievements_count}/55\n"
@@ -184,7 +166,7 @@ async def show_my_rating(callback: CallbackQuery):
 @router.callback_query(F.data == "achievements:top10")
 async def show_top10(callback: CallbackQuery):
     """Показать топ-10 глобального рейтинга"""
-    rankings = await get_global_rankings(limit=10)
+    rankings = await get_top('global', limit=10)
 
     if not rankings:
         await callback.message.edit_text(
@@ -235,17 +217,17 @@ async def show_period_ranking(callback: CallbackQuery):
     period = callback.data.split(":")[-1]
 
     if period == "week":
-        rankings = await get_weekly_rankings(limit=10)
+        rankings = await get_top('week', limit=10)
         title = "📅 Рейтинг за неделю"
     elif period == "month":
-        rankings = await get_monthly_rankings(limit=10)
+        rankings = await get_top('month', limit=10)
         title = "📆 Рейтинг за месяц"
     elif period == "season":
-        rankings = await get_seasonal_rankings(limit=10)
+        rankings = await get_top('season', limit=10)
         season_name = get_season_name()
         title = f"🌸 Рейтинг за сезон ({season_name})"
     else:  
-        rankings = await get_global_rankings(limit=10)
+        rankings = await get_top('global', limit=10)
         title = "🌍 Глобальный рейтинг"
 
     if not rankings:
@@ -80,19 +80,13 @@ async def handle_calendar_birth_date_navigation(callback: CallbackQuery, state:
         await callback.answer()
         return
 
-    callback_data_normalized = callback.data.replace("cal_birth_", "cal_")
-    logger.info(f"Нормализованный callback: {callback_data_normalized}")
-
-    new_keyboard = CalendarKeyboard.handle_navigation(callback_data_normalized, prefix="cal", max_date=datetime.now())
+    new_keyboard = CalendarKeyboard.handle_navigation(callback.data, prefix="cal_birth", max_date=datetime.now())
     logger.info(f"Получена новая клавиатура: {new_keyboard is not None}")
 
     if new_keyboard:
-        final_keyboard = CalendarKeyboard.replace_prefix_in_keyboard(new_keyboard, "cal", "cal_birth")
-        logger.info(f"Финальная клавиатура после замены префикса: {final_keyboard is not None}")
-
         try:
             logger.info("Попытка обновить клавиатуру...")
-            result = await callback.message.edit_reply_markup(reply_markup=final_keyboard)
+            result = await callback.message.edit_reply_markup(reply_markup=new_keyboard)
             logger.info(f"Клавиатура успешно обновлена! Result type: {type(result)}")
         except Exception as e:
             error_text = str(e).lower()
@@ -4,8 +4,10 @@
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, ReplyKeyboardMarkup, KeyboardButton
 from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
+from bot.keyboard_cache import cached_keyboard
 
 
+@cached_keyboard
 def get_settings_menu_keyboard(is_coach: bool = False) -> InlineKeyboardMarkup:
     """
     Главное меню настроек
@@ -50,6 +52,7 @@ def get_settings_menu_keyboard(is_coach: bool = False) -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_profile_settings_keyboard() -> InlineKeyboardMarkup:
     """Меню настроек профиля"""
     builder = InlineKeyboardBuilder()
@@ -79,6 +82,7 @@ def get_profile_settings_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_pulse_zones_menu_keyboard() -> InlineKeyboardMarkup:
     """Меню настроек пульсовых зон"""
     builder = InlineKeyboardBuilder()
@@ -93,6 +97,7 @@ def get_pulse_zones_menu_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_goals_settings_keyboard() -> InlineKeyboardMarkup:
     """Меню настройки целей"""
     builder = InlineKeyboardBuilder()
@@ -120,6 +125,7 @@ def get_goals_settings_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_units_settings_keyboard() -> InlineKeyboardMarkup:
     """Меню настройки единиц измерения"""
     builder = InlineKeyboardBuilder()
@@ -143,6 +149,7 @@ def get_units_settings_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_notifications_settings_keyboard() -> InlineKeyboardMarkup:
     """Меню настройки уведомлений"""
     builder = InlineKeyboardBuilder()
@@ -163,6 +170,7 @@ def get_notifications_settings_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_gender_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора пола"""
     builder = InlineKeyboardBuilder()
@@ -214,6 +222,7 @@ def get_training_types_selection_keyboard(selected_types: list) -> InlineKeyboar
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_distance_unit_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора единиц дистанции"""
     builder = InlineKeyboardBuilder()
@@ -229,6 +238,7 @@ def get_distance_unit_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_weight_unit_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора единиц веса"""
     builder = InlineKeyboardBuilder()
@@ -244,6 +254,7 @@ def get_weight_unit_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_date_format_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора формата даты"""
     builder = InlineKeyboardBuilder()
@@ -264,6 +275,7 @@ def get_date_format_keyboard() -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_weekday_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора дня недели"""
     builder = InlineKeyboardBuilder()
@@ -326,6 +338,7 @@ def get_training_type_goals_keyboard(main_types: list = None, type_goals: dict =
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_simple_cancel_keyboard() -> ReplyKeyboardMarkup:
     """Простая клавиатура с кнопкой отмены"""
     builder = ReplyKeyboardBuilder()
@@ -333,6 +346,7 @@ def get_simple_cancel_keyboard() -> ReplyKeyboardMarkup:
     return builder.as_markup(resize_keyboard=True)
 
 
+@cached_keyboard
 def get_cancel_delete_keyboard() -> ReplyKeyboardMarkup:
     """Клавиатура с кнопками отмены и удаления цели"""
     builder = ReplyKeyboardBuilder()
@@ -343,6 +357,7 @@ def get_cancel_delete_keyboard() -> ReplyKeyboardMarkup:
     return builder.as_markup(resize_keyboard=True)
 
 
+@cached_keyboard
 def get_timezone_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора часового пояса"""
     builder = InlineKeyboardBuilder()
@@ -425,6 +440,7 @@ def get_training_reminder_days_keyboard(selected_days: list) -> InlineKeyboardMa
     return builder.as_markup()
 
 
+@cached_keyboard
 def get_training_reminder_toggle_keyboard(is_enabled: bool) -> InlineKeyboardMarkup:
     """
     Клавиатура управления напоминаниями о тренировках
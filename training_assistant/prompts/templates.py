@@ -370,6 +370,11 @@ PROMPT_RESULT_PREDICTION = """Спрогнозируй результат спо
 - Пульсовые зоны и их соблюдение: {pulse_zone_adherence}
 - Тренировки по типам: {training_types_distribution}
 
+РАСЧЕТНЫЙ ПРОГНОЗ (формулы Ригеля и VDOT по рекордам и стартам):
+{local_prediction}
+
+ВАЖНО: Если расчетный прогноз есть, используй его времена без изменений - твоя задача объяснить их, а не пересчитать!
+
 ТРЕБОВАНИЯ:
 1. Проанализируй темпы на тренировках
 2. Оцени общий объем и готовность
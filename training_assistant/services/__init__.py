@@ -7,7 +7,7 @@ from training_assistant.services.workout_corrector import analyze_and_correct_wo
 from training_assistant.services.race_preparation import get_race_preparation_advice
 from training_assistant.services.race_tactics import generate_race_tactics
 from training_assistant.services.sports_psychologist import chat_with_psychologist
-from training_assistant.services.result_predictor import predict_race_result
+from training_assistant.services.result_predictor import predict_race_result, get_local_prediction
 from training_assistant.services.utils import get_user_preferences
 
 __all__ = [
@@ -17,5 +17,6 @@ __all__ = [
     'generate_race_tactics',
     'chat_with_psychologist',
     'predict_race_result',
+    'get_local_prediction',
     'get_user_preferences'
 ]
@@ -5,7 +5,7 @@
 import json
 import logging
 from typing import Dict, List, Any, Optional
-from ai.ai_analyzer import ai_client, _call_with_retry
+from ai.ai_analyzer import ai_client, _cached_completion
 from training_assistant.prompts.templates import (
     SYSTEM_PROMPT_COACH,
     PROMPT_TRAINING_PLAN,
@@ -101,8 +101,9 @@ async def generate_training_plan(
             health_data=health_str
         )
 
-        response = await _call_with_retry(
+        ai_response = await _cached_completion(
             ai_client,
+            feature="training_plan",
             model="google/gemini-2.5-flash",  
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT_COACH},
@@ -112,7 +113,6 @@ async def generate_training_plan(
             max_tokens=4000  
         )
 
-        ai_response = response.choices[0].message.content.strip()
         logger.info(f"Training plan generated for user {user_id}")
 
         json_str = None
@@ -0,0 +1,202 @@
+"""
+Локальный прогноз результата на дистанции (без обращения к AI)
+
+Прогноз строится по личным рекордам и результатам соревнований:
+- формула Ригеля с персональным показателем, подобранным по результатам пользователя
+- кривая VDOT (Daniels & Gilbert)
+Итоговое время корректируется по средненедельному объему за последние недели.
+"""
+
+import math
+import logging
+from datetime import date, datetime
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RIEGEL_EXPONENT = 1.06
+MIN_RIEGEL_EXPONENT = 1.02
+MAX_RIEGEL_EXPONENT = 1.15
+
+# Давность результата, при которой его вес уменьшается вдвое (дней)
+RECENCY_HALF_LIFE_DAYS = 180
+# Тренировки выполняются не в полную силу: время пересчитывается в гоночное
+TRAINING_EFFORT_FACTOR = 0.96
+TRAINING_EFFORT_WEIGHT = 0.3
+BASE_UNCERTAINTY = 0.02
+
+# Минимальный недельный объем (км) для дистанции и штраф за его нехватку
+VOLUME_REQUIREMENTS = [
+    (30.0, 50.0, 0.10),  # марафон и длиннее
+    (15.0, 30.0, 0.05),  # полумарафон
+    (8.0, 20.0, 0.03),   # 10 км
+    (0.0, 10.0, 0.02),   # короткие дистанции
+]
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    """Преобразует дату из БД (YYYY-MM-DD) в date"""
+    if isinstance(value, date):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value)[:10], '%Y-%m-%d').date()
+    except ValueError:
+        return None
+
+
+def _vdot(distance_m: np.ndarray, time_min: np.ndarray) -> np.ndarray:
+    """VDOT по дистанции (м) и времени (мин)"""
+    velocity = distance_m / time_min
+    vo2 = -4.60 + 0.182258 * velocity + 0.000104 * velocity ** 2
+    percent_max = (
+        0.8
+        + 0.1894393 * np.exp(-0.012778 * time_min)
+        + 0.2989558 * np.exp(-0.1932605 * time_min)
+    )
+    return vo2 / percent_max
+
+
+def _time_for_vdot(vdot: np.ndarray, distance_m: float) -> np.ndarray:
+    """
+    Время (мин) на дистанции для массива значений VDOT.
+    VDOT убывает с ростом времени, поэтому ищем корень бисекцией сразу по всему массиву.
+    Значения вне диапазона поиска (темп 1.5-20 мин/км) приводятся к его границам
+    """
+    distance_km = distance_m / 1000
+    low = np.full_like(vdot, distance_km * 1.5)
+    high = np.full_like(vdot, distance_km * 20.0)
+    vdot = np.clip(vdot, _vdot(distance_m, high), _vdot(distance_m, low))
+    for _ in range(50):
+        middle = (low + high) / 2
+        too_fast = _vdot(distance_m, middle) > vdot
+        low = np.where(too_fast, middle, low)
+        high = np.where(too_fast, high, middle)
+    return (low + high) / 2
+
+
+def fit_riegel_exponent(distances: np.ndarray, times: np.ndarray, weights: np.ndarray) -> float:
+    """
+    Подбирает персональный показатель Ригеля: log T = log a + b * log D
+
+    Если дистанции почти одинаковые, подобрать наклон нельзя - возвращается стандартный 1.06
+    """
+    if len(distances) < 2 or distances.max() / distances.min() < 1.5:
+        return DEFAULT_RIEGEL_EXPONENT
+
+    exponent = np.polyfit(np.log(distances), np.log(times), 1, w=np.sqrt(weights))[0]
+    return float(np.clip(exponent, MIN_RIEGEL_EXPONENT, MAX_RIEGEL_EXPONENT))
+
+
+def _volume_factor(target_distance: float, weekly_volume: Optional[float]) -> float:
+    """Замедление прогноза при недостаточном недельном объеме"""
+    if weekly_volume is None:
+        return 1.0
+    for min_distance, required_volume, penalty in VOLUME_REQUIREMENTS:
+        if target_distance >= min_distance:
+            shortfall = max(0.0, (required_volume - weekly_volume) / required_volume)
+            return 1.0 + penalty * shortfall
+    return 1.0
+
+
+def format_seconds(seconds: float) -> str:
+    """Форматирует секунды в H:MM:SS"""
+    total = int(round(seconds))
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+def predict_locally(
+    target_distance: float,
+    performances: List[Dict[str, Any]],
+    weekly_volume: Optional[float] = None,
+    as_of: Optional[date] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Мгновенный прогноз результата по прошлым выступлениям
+
+    Args:
+        target_distance: Целевая дистанция в км
+        performances: Выступления [{distance (км), time_seconds, date, source}],
+            source = 'race' для соревнований/рекордов, 'training' для тренировок
+        weekly_volume: Средненедельный беговой объем в км
+        as_of: Дата, на которую строится прогноз (по умолчанию сегодня)
+
+    Returns:
+        Dict с прогнозами (realistic/optimistic/conservative), уверенностью
+        и числовыми значениями в секундах, или None если данных нет
+    """
+    as_of = as_of or date.today()
+
+    rows = []
+    for perf in performances:
+        distance = perf.get('distance')
+        time_seconds = perf.get('time_seconds')
+        perf_date = _parse_date(perf.get('date'))
+        if not distance or not time_seconds or distance <= 0 or time_seconds <= 0:
+            continue
+        if perf_date and perf_date > as_of:
+            continue
+        age_days = (as_of - perf_date).days if perf_date else RECENCY_HALF_LIFE_DAYS
+        is_training = perf.get('source') == 'training'
+        if is_training:
+            time_seconds *= TRAINING_EFFORT_FACTOR
+        rows.append((float(distance), float(time_seconds), age_days, is_training))
+
+    if not rows:
+        return None
+
+    distances = np.array([r[0] for r in rows])
+    times = np.array([r[1] for r in rows])
+    ages = np.array([r[2] for r in rows], dtype=float)
+    is_training = np.array([r[3] for r in rows])
+
+    recency_weights = 0.5 ** (ages / RECENCY_HALF_LIFE_DAYS)
+    source_weights = np.where(is_training, TRAINING_EFFORT_WEIGHT, 1.0)
+    log_ratio = np.log(target_distance / distances)
+    proximity_weights = 1.0 / (1.0 + 2.0 * np.abs(log_ratio))
+    weights = recency_weights * source_weights * proximity_weights
+
+    exponent = fit_riegel_exponent(distances, times, recency_weights * source_weights)
+    riegel_times = times * np.exp(exponent * log_ratio)
+
+    vdots = _vdot(distances * 1000, times / 60)
+    vdot_times = _time_for_vdot(vdots, target_distance * 1000) * 60
+
+    # Оба метода комбинируем в лог-пространстве (геометрическое среднее)
+    log_predictions = (np.log(riegel_times) + np.log(vdot_times)) / 2
+    weights = weights / weights.sum()
+    mean_log = float(np.sum(weights * log_predictions))
+    spread = float(np.sqrt(np.sum(weights * (log_predictions - mean_log) ** 2)))
+
+    extrapolation = float(np.min(np.abs(log_ratio)))
+    uncertainty = BASE_UNCERTAINTY + spread + 0.02 * extrapolation
+    if is_training.all():
+        uncertainty += 0.03
+
+    realistic = math.exp(mean_log) * _volume_factor(target_distance, weekly_volume)
+    optimistic = realistic * math.exp(-uncertainty)
+    conservative = realistic * math.exp(uncertainty)
+    confidence = float(np.clip(100 - uncertainty * 600, 20, 95))
+
+    return {
+        'predictions': {
+            'realistic': format_seconds(realistic),
+            'optimistic': format_seconds(optimistic),
+            'conservative': format_seconds(conservative)
+        },
+        'seconds': {
+            'realistic': realistic,
+            'optimistic': optimistic,
+            'conservative': conservative
+        },
+        'confidence_level': round(confidence),
+        'riegel_exponent': round(exponent, 3),
+        'vdot': round(float(np.sum(weights * vdots)), 1),
+        'based_on': len(rows),
+        'source': 'local'
+    }
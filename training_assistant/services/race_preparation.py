@@ -4,7 +4,7 @@
 
 import logging
 from typing import Dict, Any, Optional
-from ai.ai_analyzer import ai_client, _call_with_retry
+from ai.ai_analyzer import ai_client, _cached_completion
 from training_assistant.prompts.templates import SYSTEM_PROMPT_COACH, PROMPT_RACE_PREPARATION
 from training_assistant.services.utils import get_user_preferences
 
@@ -59,8 +59,9 @@ async def get_race_preparation_advice(
             weekly_volume=f"{weekly_volume} км" if weekly_volume else "не указан"
         )
 
-        response = await _call_with_retry(
+        ai_response = await _cached_completion(
             ai_client,
+            feature="race_preparation",
             model="google/gemini-2.5-flash",  
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT_COACH},
@@ -70,7 +71,6 @@ async def get_race_preparation_advice(
             max_tokens=1500
         )
 
-        ai_response = response.choices[0].message.content.strip()
         logger.info(f"Race preparation advice generated for user {user_id}, {days_before} days before")
 
         return {"raw_response": ai_response}
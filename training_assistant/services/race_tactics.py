@@ -4,7 +4,7 @@
 
 import logging
 from typing import Dict, Any, Optional
-from ai.ai_analyzer import ai_client, _call_with_retry
+from ai.ai_analyzer import ai_client, _cached_completion
 from training_assistant.prompts.templates import SYSTEM_PROMPT_COACH, PROMPT_RACE_TACTICS
 from training_assistant.services.utils import get_user_preferences
 
@@ -67,8 +67,9 @@ async def generate_race_tactics(
             pulse_zones=_format_pulse_zones(pulse_zones or {})
         )
 
-        response = await _call_with_retry(
+        ai_response = await _cached_completion(
             ai_client,
+            feature="race_tactics",
             model="google/gemini-2.5-flash",  
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT_COACH},
@@ -78,7 +79,6 @@ async def generate_race_tactics(
             max_tokens=2000
         )
 
-        ai_response = response.choices[0].message.content.strip()
         logger.info(f"Race tactics generated for user {user_id}, {distance} km")
 
         return {"raw_response": ai_response}
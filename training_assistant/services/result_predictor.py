@@ -5,27 +5,62 @@
 import json
 import logging
 from typing import Dict, Any, Optional, List
-from ai.ai_analyzer import ai_client, _call_with_retry
+from ai.ai_analyzer import ai_client, _cached_completion
 from training_assistant.prompts.templates import (
     SYSTEM_PROMPT_COACH,
     PROMPT_RESULT_PREDICTION,
     format_trainings_for_prompt
 )
 from training_assistant.services.utils import get_user_preferences
+from training_assistant.services.race_predictor_engine import predict_locally
+from training_assistant.ta_queries import get_prediction_performances, get_weekly_running_volume
 
 logger = logging.getLogger(__name__)
 
 
+async def get_local_prediction(
+    user_id: int,
+    target_distance: float,
+    weekly_volume: Optional[float] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Мгновенный локальный прогноз по рекордам, стартам и недельному объему (без AI)
+
+    Args:
+        user_id: ID пользователя
+        target_distance: Целевая дистанция в км
+        weekly_volume: Средненедельный объем (если не указан - берется из БД)
+
+    Returns:
+        Dict с прогнозом или None, если данных недостаточно
+    """
+    try:
+        performances = await get_prediction_performances(user_id)
+        if weekly_volume is None:
+            weekly_volume = await get_weekly_running_volume(user_id)
+        prediction = predict_locally(target_distance, performances, weekly_volume)
+        if prediction:
+            prediction['weekly_volume'] = weekly_volume
+        return prediction
+    except Exception as e:
+        logger.error(f"Error in local prediction: {e}")
+        return None
+
+
 async def predict_race_result(
     user_id: int,
     target_distance: float,
     analysis_period: str,
     training_data: List[Dict[str, Any]],
     personal_records: Optional[Dict] = None,
-    weekly_volume: Optional[float] = None
+    weekly_volume: Optional[float] = None,
+    local_prediction: Optional[Dict[str, Any]] = None
 ) -> Optional[Dict[str, Any]]:
     """
-    Прогнозирует результат на дистанции на основе тренировок
+    Прогнозирует результат на дистанции на основе тренировок.
+
+    Времена берутся из локального прогноза (Ригель + VDOT), AI только добавляет
+    объяснение и рекомендации. Без AI возвращается локальный прогноз.
 
     Args:
         user_id: ID пользователя
@@ -34,13 +69,19 @@ async def predict_race_result(
         training_data: Данные тренировок за период
         personal_records: Личные рекорды
         weekly_volume: Средненедельный объем
+        local_prediction: Уже посчитанный локальный прогноз (чтобы не считать повторно)
 
     Returns:
         Dict с прогнозом или None при ошибке
     """
+    if local_prediction is None:
+        local_prediction = await get_local_prediction(user_id, target_distance, weekly_volume)
+    if weekly_volume is None and local_prediction:
+        weekly_volume = local_prediction.get('weekly_volume')
+
     if not ai_client:
         logger.warning("AI client not configured")
-        return None
+        return local_prediction
 
     try:
         user_prefs = await get_user_preferences(user_id)
@@ -62,11 +103,13 @@ async def predict_race_result(
             personal_records=_format_personal_records(personal_records or {}),
             weekly_volume=f"{weekly_volume} км" if weekly_volume else "не указан",
             pulse_zone_adherence=training_analysis.get('pulse_adherence', 'нет данных'),
-            training_types_distribution=training_analysis.get('types_distribution', 'нет данных')
+            training_types_distribution=training_analysis.get('types_distribution', 'нет данных'),
+            local_prediction=_format_local_prediction(local_prediction)
         )
 
-        response = await _call_with_retry(
+        ai_response = await _cached_completion(
             ai_client,
+            feature="result_prediction",
             model="google/gemini-2.5-flash",  
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT_COACH},
@@ -76,7 +119,6 @@ async def predict_race_result(
             max_tokens=1500
         )
 
-        ai_response = response.choices[0].message.content.strip()
         logger.info(f"Result prediction generated for user {user_id}, {target_distance} km")
 
         try:
@@ -88,14 +130,19 @@ async def predict_race_result(
                 json_str = ai_response
 
             prediction_data = json.loads(json_str)
-            return prediction_data
 
         except json.JSONDecodeError:
-            return {"prediction": ai_response, "raw_response": ai_response}
+            prediction_data = {"prediction": ai_response, "raw_response": ai_response, "explanation": ai_response}
+
+        # Числа всегда из локального прогноза - AI отвечает только за объяснение
+        if local_prediction:
+            prediction_data['predictions'] = local_prediction['predictions']
+            prediction_data['confidence_level'] = local_prediction['confidence_level']
+        return prediction_data
 
     except Exception as e:
         logger.error(f"Error predicting result: {e}")
-        return None
+        return local_prediction
 
 
 def _analyze_training_data(trainings: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -133,3 +180,19 @@ def _format_personal_records(records: Dict) -> str:
         formatted.append(f"- {distance} км: {time}")
 
     return "\n".join(formatted)
+
+
+def _format_local_prediction(prediction: Optional[Dict[str, Any]]) -> str:
+    """Форматирует локальный прогноз для промпта"""
+    if not prediction:
+        return "Нет данных (нет стартов и рекордов) - сделай прогноз сам"
+
+    preds = prediction['predictions']
+    return (
+        f"- Реалистичный: {preds['realistic']}\n"
+        f"- Оптимистичный: {preds['optimistic']}\n"
+        f"- Осторожный: {preds['conservative']}\n"
+        f"- Уверенность: {prediction['confidence_level']}%\n"
+        f"- VDOT: {prediction['vdot']}, показатель Ригеля: {prediction['riegel_exponent']}\n"
+        f"- Учтено результатов: {prediction['based_on']}"
+    )
@@ -4,8 +4,9 @@
 
 import logging
 from typing import List, Dict, Any, Optional
-from ai.ai_analyzer import ai_client, _call_with_retry
+from ai.ai_analyzer import ai_client, _cached_completion
 from training_assistant.prompts.templates import SYSTEM_PROMPT_PSYCHOLOGIST, PROMPT_PSYCHOLOGIST
+from training_assistant.ta_queries import RECENT_TURNS_IN_PROMPT
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,8 @@ async def chat_with_psychologist(
     user_id: int,
     user_message: str,
     conversation_history: Optional[List[Dict[str, str]]] = None,
-    athlete_context: Optional[Dict[str, Any]] = None
+    athlete_context: Optional[Dict[str, Any]] = None,
+    conversation_summary: Optional[str] = None
 ) -> Optional[str]:
     """
     Ведет диалог с пользователем как спортивный психолог
@@ -22,8 +24,9 @@ async def chat_with_psychologist(
     Args:
         user_id: ID пользователя
         user_message: Сообщение от пользователя
-        conversation_history: История диалога [{"user": "...", "ai": "..."}, ...]
+        conversation_history: Последние реплики диалога [{"user": "...", "ai": "..."}, ...]
         athlete_context: Контекст спортсмена (предстоящие соревнования, тренировки и т.д.)
+        conversation_summary: Краткое содержание более ранних реплик
 
     Returns:
         Ответ AI-психолога или None при ошибке
@@ -33,7 +36,7 @@ async def chat_with_psychologist(
         return None
 
     try:
-        history_str = _format_conversation_history(conversation_history or [])
+        history_str = _format_conversation_history(conversation_history or [], conversation_summary)
 
         context_str = _format_athlete_context(athlete_context or {})
 
@@ -48,21 +51,21 @@ async def chat_with_psychologist(
         ]
 
         if conversation_history:
-            for conv in conversation_history[-5:]:  
+            for conv in conversation_history[-RECENT_TURNS_IN_PROMPT:]:
                 messages.append({"role": "user", "content": conv.get("user", "")})
                 messages.append({"role": "assistant", "content": conv.get("ai", "")})
 
         messages.append({"role": "user", "content": prompt})
 
-        response = await _call_with_retry(
+        ai_response = await _cached_completion(
             ai_client,
+            feature="psychologist",
             model="google/gemini-2.5-flash",  
             messages=messages,
             temperature=0.8,  
             max_tokens=1000
         )
 
-        ai_response = response.choices[0].message.content.strip()
         logger.info(f"Psychologist response generated for user {user_id}")
 
         return ai_response
@@ -72,19 +75,22 @@ async def chat_with_psychologist(
         return None
 
 
-def _format_conversation_history(history: List[Dict[str, str]]) -> str:
-    """Форматирует историю диалога для промпта"""
-    if not history:
+def _format_conversation_history(history: List[Dict[str, str]], summary: Optional[str] = None) -> str:
+    """
+    Форматирует историю диалога для промпта.
+    Последние реплики уже переданы сообщениями, поэтому здесь только summary ранних
+    """
+    if not history and not summary:
         return "Это первое сообщение в диалоге"
 
-    formatted = []
-    for i, conv in enumerate(history[-5:], 1):  
-        formatted.append(f"Сообщение {i}:")
-        formatted.append(f"Спортсмен: {conv.get('user', '')}")
-        formatted.append(f"Психолог: {conv.get('ai', '')}")
-        formatted.append("")
+    if not summary:
+        return "Последние сообщения приведены выше"
 
-    return "\n".join(formatted)
+    return (
+        "Ранее спортсмен писал о следующем:\n"
+        f"{summary}\n"
+        "Последние сообщения приведены выше"
+    )
 
 
 def _format_athlete_context(context: Dict[str, Any]) -> str:
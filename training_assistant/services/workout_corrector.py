@@ -5,7 +5,7 @@
 import json
 import logging
 from typing import Dict, List, Any, Optional
-from ai.ai_analyzer import ai_client, _call_with_retry
+from ai.ai_analyzer import ai_client, _cached_completion
 from training_assistant.prompts.templates import SYSTEM_PROMPT_COACH, PROMPT_CORRECTION
 
 logger = logging.getLogger(__name__)
@@ -62,8 +62,9 @@ async def analyze_and_correct_workout(
             pulse_zones=_format_pulse_zones(pulse_zones or {})
         )
 
-        response = await _call_with_retry(
+        ai_response = await _cached_completion(
             ai_client,
+            feature="workout_correction",
             model="google/gemini-2.5-flash",  
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT_COACH},
@@ -73,7 +74,6 @@ async def analyze_and_correct_workout(
             max_tokens=1500
         )
 
-        ai_response = response.choices[0].message.content.strip()
         logger.info(f"Workout correction generated for user {user_id}")
 
         try:
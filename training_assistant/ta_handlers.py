@@ -6,10 +6,11 @@ import logging
 import re
 from datetime import datetime, timedelta
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, BufferedInputFile, ReplyKeyboardRemove
+from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
 from aiogram.fsm.context import FSMContext
 from aiogram.filters import Command
 
+from bot.file_registry import answer_cached_document
 from training_assistant.ta_fsm import (
     TrainingPlanStates,
     CorrectionStates,
@@ -372,11 +373,6 @@ async def process_days_done(callback: CallbackQuery, state: FSMContext):
                 duration_name = duration_names.get(data['plan_duration'], data['plan_duration'])
                 filename = f"plan_{sport_name}_{duration_name}_{datetime.now().strftime('%Y%m%d')}.pdf"
 
-                pdf_file = BufferedInputFile(
-                    pdf_buffer.read(),
-                    filename=filename
-                )
-
                 await processing_msg.delete()
 
                 caption = "✅ <b>Ваш персональный план тренировок готов!</b>\n\n"
@@ -387,8 +383,10 @@ async def process_days_done(callback: CallbackQuery, state: FSMContext):
                     caption += f"🎯 Ключевые тренировки: {key_workouts}\n"
                 caption += "\n📄 Полный план см. в прикрепленном PDF"
 
-                await callback.message.answer_document(
-                    pdf_file,
+                await answer_cached_document(
+                    callback.message,
+                    pdf_buffer.read(),
+                    filename,
                     caption=caption,
                     parse_mode="HTML",
                     reply_markup=get_back_to_menu_keyboard()
@@ -978,12 +976,13 @@ async def process_psychologist_message(message: Message, state: FSMContext):
     processing_msg = await message.answer("⏳ Обрабатываю...")
 
     try:
-        history = await get_recent_conversations(user_id, 'psychologist', limit=5)
+        memory = await get_conversation_memory(user_id, 'psychologist')
 
         ai_response = await chat_with_psychologist(
             user_id=user_id,
             user_message=user_message,
-            conversation_history=history
+            conversation_history=memory['recent'],
+            conversation_summary=memory['summary']
         )
 
         if ai_response:
@@ -1020,6 +1019,16 @@ async def process_psychologist_message(message: Message, state: FSMContext):
 
 
 
+def _format_prediction_times(prediction: dict) -> str:
+    """Форматирует три варианта прогноза"""
+    preds = prediction['predictions']
+    return (
+        f"🎯 <b>Реалистичный:</b> {preds.get('realistic', 'N/A')}\n"
+        f"🚀 <b>Оптимистичный:</b> {preds.get('optimistic', 'N/A')}\n"
+        f"🛡️ <b>Осторожный:</b> {preds.get('conservative', 'N/A')}\n\n"
+    )
+
+
 @router.callback_query(F.data == "ta:prediction")
 async def start_prediction(callback: CallbackQuery, state: FSMContext):
     """Начало прогноза результата"""
@@ -1055,7 +1064,10 @@ async def process_prediction_distance(message: Message, state: FSMContext):
             end_date.strftime('%Y-%m-%d')
         )
 
-        if not trainings:
+        # Локальный прогноз считается мгновенно - показываем его сразу, пока AI пишет объяснение
+        local_prediction = await get_local_prediction(user_id, distance)
+
+        if not trainings and not local_prediction:
             await processing_msg.edit_text(
                 "❌ Недостаточно данных для прогноза.\n"
                 "Добавьте больше тренировок.",
@@ -1064,29 +1076,42 @@ async def process_prediction_distance(message: Message, state: FSMContext):
             await state.clear()
             return
 
+        try:
+            from utils.unit_converter import format_distance_for_user
+            distance_str = await format_distance_for_user(float(distance), user_id)
+        except:
+            distance_str = f"{distance} км"
+
+        if local_prediction:
+            await processing_msg.edit_text(
+                f"✅ <b>Прогноз результата на {distance_str}</b>\n\n"
+                + _format_prediction_times(local_prediction)
+                + "⏳ <i>Готовлю объяснение прогноза...</i>",
+                parse_mode="HTML"
+            )
+
         prediction = await predict_race_result(
             user_id=user_id,
             target_distance=distance,
             analysis_period='month',
-            training_data=[dict(t) for t in trainings]
+            training_data=[dict(t) for t in trainings],
+            local_prediction=local_prediction
         )
 
         if prediction:
-            try:
-                from utils.unit_converter import format_distance_for_user
-                distance_str = await format_distance_for_user(float(distance), user_id)
-            except:
-                distance_str = f"{distance} км"
-
             response = f"✅ <b>Прогноз результата на {distance_str}</b>\n\n"
 
             if 'predictions' in prediction:
-                preds = prediction['predictions']
-                response += f"🎯 <b>Реалистичный:</b> {preds.get('realistic', 'N/A')}\n"
-                response += f"🚀 <b>Оптимистичный:</b> {preds.get('optimistic', 'N/A')}\n"
-                response += f"🛡️ <b>Осторожный:</b> {preds.get('conservative', 'N/A')}\n\n"
+                response += _format_prediction_times(prediction)
 
-            response += f"<b>Объяснение:</b>\n{prediction.get('explanation', 'N/A')}"
+            if prediction.get('source') == 'local':
+                response += (
+                    f"<b>Как посчитано:</b>\n"
+                    f"По {prediction['based_on']} результатам (формулы Ригеля и VDOT), "
+                    f"VDOT {prediction['vdot']}. Уверенность: {prediction['confidence_level']}%"
+                )
+            else:
+                response += f"<b>Объяснение:</b>\n{prediction.get('explanation', 'N/A')}"
 
             response += DISCLAIMER_TEXT
 
@@ -1095,6 +1120,20 @@ async def process_prediction_distance(message: Message, state: FSMContext):
                 reply_markup=get_back_to_menu_keyboard(),
                 parse_mode="HTML"
             )
+
+            preds = prediction.get('predictions') or {}
+            if all(preds.get(k) for k in ('realistic', 'optimistic', 'conservative')):
+                await save_result_prediction(
+                    user_id=user_id,
+                    distance=distance,
+                    based_on_period='month',
+                    predictions=prediction['predictions'],
+                    confidence_level=prediction.get('confidence_level'),
+                    ai_explanation=prediction.get('explanation', ''),
+                    key_factors=prediction.get('key_factors', []),
+                    # Времена в прогнозе всегда из локального расчета (AI только объясняет)
+                    source='local' if local_prediction else None
+                )
         else:
             await processing_msg.edit_text(
                 "❌ Ошибка создания прогноза.",
@@ -101,7 +101,8 @@ async def create_training_plan_pdf(plan_data: dict, sport_type: str, plan_durati
         rightMargin=1.5*cm,
         leftMargin=1.5*cm,
         topMargin=2*cm,
-        bottomMargin=2*cm
+        bottomMargin=2*cm,
+        invariant=1
     )
 
     styles = getSampleStyleSheet()
@@ -210,6 +210,85 @@ async def save_race_tactics(
 
 # ==================== AI CONVERSATIONS ====================
 
+# Сколько реплик каждого типа диалога храним на пользователя
+MAX_STORED_TURNS = 50
+# Сколько последних реплик передается в промпт как есть (остальные - в summary)
+RECENT_TURNS_IN_PROMPT = 3
+# Ограничения размера rolling summary
+SUMMARY_MAX_CHARS = 1500
+SUMMARY_SNIPPET_CHARS = 150
+
+
+def _summary_line(user_message: str) -> str:
+    """Сжимает реплику пользователя до одной строки для summary"""
+    text = " ".join((user_message or "").split())
+    if len(text) > SUMMARY_SNIPPET_CHARS:
+        text = text[:SUMMARY_SNIPPET_CHARS].rstrip() + "…"
+    return f"- {text}"
+
+
+def _trim_summary(summary: str) -> str:
+    """Оставляет в summary самые свежие строки в пределах SUMMARY_MAX_CHARS"""
+    if len(summary) <= SUMMARY_MAX_CHARS:
+        return summary
+    lines = summary.split("\n")
+    while lines and len("\n".join(lines)) > SUMMARY_MAX_CHARS:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+async def _roll_conversation_summary(
+    db: aiosqlite.Connection,
+    user_id: int,
+    conversation_type: str
+) -> None:
+    """
+    Сворачивает в summary реплики, вышедшие из окна последних сообщений,
+    и удаляет реплики сверх MAX_STORED_TURNS (они уже есть в summary)
+    """
+    async with db.execute("""
+        SELECT summary, summarized_until_id, turns_summarized
+        FROM ai_conversation_summaries
+        WHERE user_id = ? AND conversation_type = ?
+    """, (user_id, conversation_type)) as cursor:
+        row = await cursor.fetchone()
+    summary, summarized_until_id, turns_summarized = row if row else ('', 0, 0)
+
+    async with db.execute("""
+        SELECT id, user_message
+        FROM ai_conversations
+        WHERE user_id = ? AND conversation_type = ?
+        ORDER BY created_at DESC, id DESC
+        LIMIT -1 OFFSET ?
+    """, (user_id, conversation_type, RECENT_TURNS_IN_PROMPT)) as cursor:
+        older = [r for r in await cursor.fetchall() if r[0] > summarized_until_id]
+
+    if older:
+        older.reverse()
+        new_lines = "\n".join(_summary_line(r[1]) for r in older)
+        summary = _trim_summary(f"{summary}\n{new_lines}" if summary else new_lines)
+        await db.execute("""
+            INSERT INTO ai_conversation_summaries
+                (user_id, conversation_type, summary, summarized_until_id, turns_summarized, updated_at)
+            VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+            ON CONFLICT(user_id, conversation_type) DO UPDATE SET
+                summary = excluded.summary,
+                summarized_until_id = excluded.summarized_until_id,
+                turns_summarized = excluded.turns_summarized,
+                updated_at = CURRENT_TIMESTAMP
+        """, (user_id, conversation_type, summary, older[-1][0], turns_summarized + len(older)))
+
+    await db.execute("""
+        DELETE FROM ai_conversations
+        WHERE id IN (
+            SELECT id FROM ai_conversations
+            WHERE user_id = ? AND conversation_type = ?
+            ORDER BY created_at DESC, id DESC
+            LIMIT -1 OFFSET ?
+        )
+    """, (user_id, conversation_type, MAX_STORED_TURNS))
+
+
 async def save_conversation(
     user_id: int,
     conversation_type: str,
@@ -217,7 +296,10 @@ async def save_conversation(
     ai_response: str,
     context_data: Optional[Dict] = None
 ) -> Optional[int]:
-    """Сохраняет диалог с AI"""
+    """
+    Сохраняет диалог с AI.
+    Старые реплики сворачиваются в summary, хранится не более MAX_STORED_TURNS реплик
+    """
     async with aiosqlite.connect(DB_PATH) as db:
         cursor = await db.execute("""
             INSERT INTO ai_conversations (
@@ -227,12 +309,14 @@ async def save_conversation(
         """, (
             user_id,
             conversation_type,
-            json.dumps(context_data or {}, ensure_ascii=False),
+            json.dumps(context_data, ensure_ascii=False) if context_data else None,
             user_message,
             ai_response
         ))
+        conversation_id = cursor.lastrowid
+        await _roll_conversation_summary(db, user_id, conversation_type)
         await db.commit()
-        return cursor.lastrowid
+        return conversation_id
 
 
 async def get_recent_conversations(
@@ -241,24 +325,84 @@ async def get_recent_conversations(
     limit: int = 5
 ) -> List[Dict[str, Any]]:
     """Получает последние сообщения из диалога"""
+    page = await get_conversation_page(user_id, conversation_type, limit=limit)
+    return list(reversed(page['items']))  # Обратный порядок для хронологии
+
+
+async def get_conversation_page(
+    user_id: int,
+    conversation_type: str,
+    before_id: Optional[int] = None,
+    limit: int = 10
+) -> Dict[str, Any]:
+    """
+    Страница истории диалога (от новых к старым) с keyset-пагинацией
+
+    Args:
+        user_id: ID пользователя
+        conversation_type: Тип диалога
+        before_id: ID последней реплики предыдущей страницы (None - первая страница)
+        limit: Размер страницы
+
+    Returns:
+        {'items': [...], 'next_before_id': id для следующей страницы или None}
+    """
+    query = """
+        SELECT id, user_message, ai_response, created_at
+        FROM ai_conversations
+        WHERE user_id = ? AND conversation_type = ?
+    """
+    params: list = [user_id, conversation_type]
+    if before_id is not None:
+        query += """
+        AND (created_at, id) < (SELECT created_at, id FROM ai_conversations WHERE id = ?)
+        """
+        params.append(before_id)
+    query += " ORDER BY created_at DESC, id DESC LIMIT ?"
+    params.append(limit + 1)
+
     async with aiosqlite.connect(DB_PATH) as db:
         db.row_factory = aiosqlite.Row
+        async with db.execute(query, params) as cursor:
+            rows = await cursor.fetchall()
+
+    items = [
+        {
+            'id': row['id'],
+            'user': row['user_message'],
+            'ai': row['ai_response'],
+            'created_at': row['created_at']
+        }
+        for row in rows[:limit]
+    ]
+    return {
+        'items': items,
+        'next_before_id': items[-1]['id'] if len(rows) > limit else None
+    }
+
+
+async def get_conversation_memory(
+    user_id: int,
+    conversation_type: str,
+    recent_turns: int = RECENT_TURNS_IN_PROMPT
+) -> Dict[str, Any]:
+    """
+    Память диалога постоянного размера для промпта: rolling summary + последние реплики
+
+    Returns:
+        {'summary': str или None, 'recent': [{'user', 'ai', 'created_at'}, ...]}
+    """
+    async with aiosqlite.connect(DB_PATH) as db:
         async with db.execute("""
-            SELECT user_message, ai_response, created_at
-            FROM ai_conversations
+            SELECT summary FROM ai_conversation_summaries
             WHERE user_id = ? AND conversation_type = ?
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (user_id, conversation_type, limit)) as cursor:
-            rows = await cursor.fetchall()
-            return [
-                {
-                    'user': row['user_message'],
-                    'ai': row['ai_response'],
-                    'created_at': row['created_at']
-                }
-                for row in reversed(list(rows))  # Обратный порядок для хронологии
-            ]
+        """, (user_id, conversation_type)) as cursor:
+            row = await cursor.fetchone()
+
+    return {
+        'summary': row[0] if row and row[0] else None,
+        'recent': await get_recent_conversations(user_id, conversation_type, limit=recent_turns)
+    }
 
 
 # ==================== RESULT PREDICTIONS ====================
@@ -279,8 +423,8 @@ async def save_result_prediction(
                 user_id, distance, based_on_trainings_period,
                 predicted_time_realistic, predicted_time_optimistic,
                 predicted_time_conservative, confidence_level,
-                ai_explanation, key_factors
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ai_explanation, key_factors, source
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             user_id,
             distance,
@@ -290,12 +434,119 @@ async def save_result_prediction(
             predictions.get('conservative'),
             confidence_level,
             ai_explanation,
-            json.dumps(kwargs.get('key_factors', []), ensure_ascii=False)
+            json.dumps(kwargs.get('key_factors', []), ensure_ascii=False),
+            kwargs.get('source')
         ))
         await db.commit()
         return cursor.lastrowid
 
 
+async def get_prediction_performances(
+    user_id: int,
+    before_date: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Собирает беговые выступления пользователя для локального прогноза:
+    личные рекорды, результаты соревнований и самые быстрые тренировки за 90 дней
+
+    Args:
+        user_id: ID пользователя
+        before_date: Учитывать только данные до этой даты (YYYY-MM-DD), по умолчанию - сегодня
+
+    Returns:
+        Список [{distance, time_seconds, date, source}]
+    """
+    before_date = before_date or datetime.now().strftime('%Y-%m-%d')
+    trainings_from = (
+        datetime.strptime(before_date, '%Y-%m-%d') - timedelta(days=90)
+    ).strftime('%Y-%m-%d')
+    performances = []
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+
+        async with db.execute("""
+            SELECT pr.distance, pr.best_seconds AS time_seconds, pr.date
+            FROM personal_records pr
+            LEFT JOIN competitions c ON pr.competition_id = c.id
+            WHERE pr.user_id = ? AND pr.date <= ? AND pr.best_seconds > 0
+            AND (c.sport_type IS NULL OR c.sport_type LIKE 'бег%')
+            -- Рекорд, установленный на старте, уже есть среди финишей ниже
+            AND NOT EXISTS (
+                SELECT 1 FROM competition_participants rp
+                WHERE rp.competition_id = pr.competition_id
+                AND rp.user_id = pr.user_id
+                AND rp.distance = pr.distance
+                AND rp.finish_seconds > 0
+            )
+            UNION ALL
+            SELECT cp.distance, cp.finish_seconds AS time_seconds, c.date
+            FROM competition_participants cp
+            JOIN competitions c ON cp.competition_id = c.id
+            WHERE cp.user_id = ? AND c.date <= ?
+            AND cp.finish_seconds > 0
+            AND (c.sport_type IS NULL OR c.sport_type LIKE 'бег%')
+        """, (user_id, before_date, user_id, before_date)) as cursor:
+            for row in await cursor.fetchall():
+                if row['distance']:
+                    performances.append({
+                        'distance': row['distance'],
+                        'time_seconds': row['time_seconds'],
+                        'date': row['date'],
+                        'source': 'race'
+                    })
+
+        # Лучшие по темпу тренировки - запасной вариант для тех, у кого нет стартов
+        async with db.execute("""
+            SELECT distance, duration, date
+            FROM trainings
+            WHERE user_id = ? AND type = 'кросс'
+            AND date >= ? AND date <= ?
+            AND distance >= 3 AND duration > 0
+            AND (is_planned = 0 OR duration IS NOT NULL)
+            ORDER BY duration * 1.0 / distance ASC
+            LIMIT 3
+        """, (user_id, trainings_from, before_date)) as cursor:
+            for row in await cursor.fetchall():
+                performances.append({
+                    'distance': row['distance'],
+                    'time_seconds': row['duration'] * 60,
+                    'date': row['date'],
+                    'source': 'training'
+                })
+
+    return performances
+
+
+async def get_weekly_running_volume(
+    user_id: int,
+    weeks: int = 4,
+    end_date: Optional[str] = None
+) -> Optional[float]:
+    """
+    Средненедельный беговой объем (км) за последние недели
+
+    Returns:
+        Объем в км или None, если беговых тренировок не было
+    """
+    end = datetime.strptime(end_date, '%Y-%m-%d') if end_date else datetime.now()
+    start = end - timedelta(weeks=weeks)
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute("""
+            SELECT SUM(distance)
+            FROM trainings
+            WHERE user_id = ? AND type = 'кросс'
+            AND date > ? AND date <= ?
+            AND (is_planned = 0 OR duration IS NOT NULL)
+        """, (user_id, start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d'))) as cursor:
+            row = await cursor.fetchone()
+
+    if not row or row[0] is None:
+        return None
+    return round(row[0] / weeks, 1)
+
+
 # ==================== USER SETTINGS ====================
 
 async def get_or_create_ta_settings(user_id: int) -> Dict[str, Any]:
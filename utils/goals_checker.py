@@ -3,17 +3,22 @@
 """
 
 import json
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
 from aiogram import Bot
 
 from database.queries import (
     get_user_settings,
-    get_training_statistics,
-    get_training_type_goals,
-    get_trainings_by_period,
     update_user_setting
 )
+from database.goal_queries import get_week_start, get_week_goal_progress, update_goal_milestones
+
+# Пороги прогресса недельной цели по объему (%)
+VOLUME_MILESTONES = (50, 80, 100)
+
+
+def _crossed_milestone(total: float, goal: float, milestones=(100,)) -> int:
+    """Наибольший пройденный порог прогресса (0, если ни один не пройден)"""
+    progress_percent = (total / goal) * 100 if goal > 0 else 0
+    return max((m for m in milestones if progress_percent >= m), default=0)
 
 
 async def check_weekly_goals(user_id: int, bot: Bot, last_training_type: str = None) -> None:
@@ -22,6 +27,9 @@ async def check_weekly_goals(user_id: int, bot: Bot, last_training_type: str = N
     Отправляет отдельное уведомление о достижении каждой цели только один раз за неделю
     Также отправляет мотивационные сообщения о прогрессе
 
+    Прогресс берется из goal_progress (накапливается триггерами при записи тренировок),
+    уведомление отправляется, когда прогресс переходит порог выше уже отправленного.
+
     Args:
         user_id: ID пользователя
         bot: Экземпляр бота для отправки сообщений
@@ -31,28 +39,26 @@ async def check_weekly_goals(user_id: int, bot: Bot, last_training_type: str = N
     if not settings:
         return
 
-    stats = await get_training_statistics(user_id, 'week')
     distance_unit = settings.get('distance_unit', 'км')
 
-    # Формируем ключ текущей недели для отслеживания уведомлений
-    today = datetime.now().date()
-    current_week = today.strftime('%Y-%W')
+    week_start = get_week_start()
+    progress = await get_week_goal_progress(user_id, week_start)
+    reached = {}
 
-    # Получаем историю уже отправленных уведомлений
-    goal_notifications_json = settings.get('goal_notifications', '{}')
-    try:
-        goal_notifications = json.loads(goal_notifications_json) if goal_notifications_json else {}
-    except:
-        goal_notifications = {}
-
-    week_goals = goal_notifications.get(current_week, {})
+    def crossed(goal_key: str, goal: float, milestones=(100,)) -> int:
+        """Новый порог цели или 0, если он уже был отправлен"""
+        entry = progress.get(goal_key, {'total': 0, 'milestone': 0})
+        milestone = _crossed_milestone(entry['total'], goal, milestones)
+        return milestone if milestone > entry['milestone'] else 0
 
     weekly_volume_goal = settings.get('weekly_volume_goal')
     if weekly_volume_goal and last_training_type not in ['силовая', 'интервальная']:
-        total_distance = stats['total_distance']
+        total_distance = progress.get('volume', {}).get('total', 0)
         progress_percent = (total_distance / weekly_volume_goal) * 100 if weekly_volume_goal > 0 else 0
+        remaining = weekly_volume_goal - total_distance
+        milestone = crossed('volume', weekly_volume_goal, VOLUME_MILESTONES)
 
-        if progress_percent >= 100 and not week_goals.get('volume'):
+        if milestone == 100:
             await bot.send_message(
                 user_id,
                 f"🎉 <b>Поздравляем! Вы достигли цели по недельному объему!</b>\n\n"
@@ -61,101 +67,78 @@ async def check_weekly_goals(user_id: int, bot: Bot, last_training_type: str = N
                 f"💪 Отличная работа! Продолжайте в том же духе!",
                 parse_mode="HTML"
             )
-            week_goals['volume'] = True
-        # Отправляем мотивационные сообщения при достижении промежуточных целей
-        elif not week_goals.get('volume'):
-            remaining = weekly_volume_goal - total_distance
-
-            # При достижении 80% - мотивируем на финальный рывок
-            if 80 <= progress_percent < 100 and not week_goals.get('progress_80'):
-                await bot.send_message(
-                    user_id,
-                    f"🔥 <b>Почти у цели!</b>\n\n"
-                    f"Осталось всего <b>{remaining:.1f} {distance_unit}</b> до достижения недельной цели по объёму!\n\n"
-                    f"📊 Прогресс: {total_distance:.1f}/{weekly_volume_goal} {distance_unit} ({progress_percent:.0f}%)\n\n"
-                    f"💪 Молодец! Ещё немного!",
-                    parse_mode="HTML"
-                )
-                week_goals['progress_80'] = True
-            # При достижении 50% - поддерживаем мотивацию
-            elif 50 <= progress_percent < 80 and not week_goals.get('progress_50'):
-                await bot.send_message(
-                    user_id,
-                    f"💪 <b>Отличный прогресс!</b>\n\n"
-                    f"Вы прошли больше половины пути к цели по объёму!\n\n"
-                    f"📊 Прогресс: {total_distance:.1f}/{weekly_volume_goal} {distance_unit} ({progress_percent:.0f}%)\n"
-                    f"📉 Осталось: {remaining:.1f} {distance_unit}\n\n"
-                    f"🚀 Продолжайте в том же духе!",
-                    parse_mode="HTML"
-                )
-                week_goals['progress_50'] = True
+        # При достижении 80% - мотивируем на финальный рывок
+        elif milestone == 80:
+            await bot.send_message(
+                user_id,
+                f"🔥 <b>Почти у цели!</b>\n\n"
+                f"Осталось всего <b>{remaining:.1f} {distance_unit}</b> до достижения недельной цели по объёму!\n\n"
+                f"📊 Прогресс: {total_distance:.1f}/{weekly_volume_goal} {distance_unit} ({progress_percent:.0f}%)\n\n"
+                f"💪 Молодец! Ещё немного!",
+                parse_mode="HTML"
+            )
+        # При достижении 50% - поддерживаем мотивацию
+        elif milestone == 50:
+            await bot.send_message(
+                user_id,
+                f"💪 <b>Отличный прогресс!</b>\n\n"
+                f"Вы прошли больше половины пути к цели по объёму!\n\n"
+                f"📊 Прогресс: {total_distance:.1f}/{weekly_volume_goal} {distance_unit} ({progress_percent:.0f}%)\n"
+                f"📉 Осталось: {remaining:.1f} {distance_unit}\n\n"
+                f"🚀 Продолжайте в том же духе!",
+                parse_mode="HTML"
+            )
+
+        if milestone:
+            reached['volume'] = milestone
 
     weekly_count_goal = settings.get('weekly_trainings_goal')
-    if weekly_count_goal and stats['total_count'] >= weekly_count_goal and not week_goals.get('count'):
+    if weekly_count_goal and crossed('count', weekly_count_goal):
+        total_count = int(progress['count']['total'])
         await bot.send_message(
             user_id,
             f"🎉 <b>Поздравляем! Вы достигли цели по количеству тренировок!</b>\n\n"
-            f"🔢 Количество тренировок: {stats['total_count']}\n"
+            f"🔢 Количество тренировок: {total_count}\n"
             f"🎯 Цель: {weekly_count_goal}\n\n"
             f"💪 Отличная работа! Продолжайте в том же духе!",
             parse_mode="HTML"
         )
-        week_goals['count'] = True
+        reached['count'] = 100
 
     # Проверяем цели по типам тренировок (бег, плавание и т.д.)
-    type_goals = await get_training_type_goals(user_id)
-    if type_goals:
-        trainings = await get_trainings_by_period(user_id, 'week')
-
-        # Собираем статистику по каждому типу тренировки
-        type_stats = {}
-        for training in trainings:
-            t_type = training['type']
-
-            if t_type not in type_stats:
-                type_stats[t_type] = 0
-
-            # Для силовой считаем минуты, для остальных - километры
-            if t_type == 'силовая':
-                type_stats[t_type] += training.get('duration', 0)
-            else:
-                if training.get('calculated_volume'):
-                    type_stats[t_type] += training['calculated_volume']
-                elif training.get('distance'):
-                    type_stats[t_type] += training['distance']
-
-        for t_type, goal in type_goals.items():
-            current = type_stats.get(t_type, 0)
-            goal_key = f'type_{t_type}'
-
-            if current >= goal and not week_goals.get(goal_key):
-                if t_type == 'силовая':
-                    await bot.send_message(
-                        user_id,
-                        f"🎉 <b>Поздравляем! Вы достигли цели по типу '{t_type}'!</b>\n\n"
-                        f"🏃 {t_type.capitalize()}: {current:.0f} мин\n"
-                        f"🎯 Цель: {goal:.0f} мин\n\n"
-                        f"💪 Отличная работа! Продолжайте в том же духе!",
-                        parse_mode="HTML"
-                    )
-                else:
-                    await bot.send_message(
-                        user_id,
-                        f"🎉 <b>Поздравляем! Вы достигли цели по типу '{t_type}'!</b>\n\n"
-                        f"🏃 {t_type.capitalize()}: {current:.1f} {distance_unit}\n"
-                        f"🎯 Цель: {goal} {distance_unit}\n\n"
-                        f"💪 Отличная работа! Продолжайте в том же духе!",
-                        parse_mode="HTML"
-                    )
-                week_goals[goal_key] = True
-
-    goal_notifications[current_week] = week_goals
-
-    # Храним только последние 4 недели для экономии места в БД
-    weeks_to_keep = sorted(goal_notifications.keys(), reverse=True)[:4]
-    goal_notifications = {week: goal_notifications[week] for week in weeks_to_keep}
-
-    await update_user_setting(user_id, 'goal_notifications', json.dumps(goal_notifications))
+    # Для силовой прогресс считается в минутах, для остальных - в километрах
+    try:
+        type_goals = json.loads(settings['training_type_goals']) if settings.get('training_type_goals') else {}
+    except (TypeError, ValueError):
+        type_goals = {}
+
+    for t_type, goal in type_goals.items():
+        goal_key = f'type_{t_type}'
+        if not goal or not crossed(goal_key, goal):
+            continue
+
+        current = progress[goal_key]['total']
+        if t_type == 'силовая':
+            await bot.send_message(
+                user_id,
+                f"🎉 <b>Поздравляем! Вы достигли цели по типу '{t_type}'!</b>\n\n"
+                f"🏃 {t_type.capitalize()}: {current:.0f} мин\n"
+                f"🎯 Цель: {goal:.0f} мин\n\n"
+                f"💪 Отличная работа! Продолжайте в том же духе!",
+                parse_mode="HTML"
+            )
+        else:
+            await bot.send_message(
+                user_id,
+                f"🎉 <b>Поздравляем! Вы достигли цели по типу '{t_type}'!</b>\n\n"
+                f"🏃 {t_type.capitalize()}: {current:.1f} {distance_unit}\n"
+                f"🎯 Цель: {goal} {distance_unit}\n\n"
+                f"💪 Отличная работа! Продолжайте в том же духе!",
+                parse_mode="HTML"
+            )
+        reached[goal_key] = 100
+
+    await update_goal_milestones(user_id, week_start, reached)
 
 
 async def check_weight_goal(user_id: int, current_weight: float, bot: Bot) -> None:
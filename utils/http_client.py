@@ -0,0 +1,182 @@
+"""
+Общий HTTP-клиент для исходящих запросов (парсеры соревнований, нормативы)
+
+Все запросы процесса идут через одну aiohttp-сессию: соединения к сайту
+переиспользуются (keep-alive), пул ограничен по размеру и по хосту, а DNS
+кэшируется, поэтому повторные запросы не платят за DNS, TCP и TLS.
+
+Временные ошибки (сетевые, таймаут, 429 и 5xx) повторяются с экспоненциальной
+задержкой - по умолчанию только для GET/HEAD. Время до ответа и ошибки
+учитываются в метриках по хосту.
+
+Сессия создается при первом запросе (или в start) и закрывается в close -
+main.py и воркеры webhook вызывают их при запуске и остановке бота.
+
+Переменные окружения:
+    HTTP_POOL_LIMIT     - соединений всего (по умолчанию 100)
+    HTTP_POOL_PER_HOST  - соединений к одному хосту (по умолчанию 10)
+    HTTP_DNS_TTL        - время кэширования DNS, секунды (по умолчанию 300)
+    HTTP_TIMEOUT        - таймаут запроса по умолчанию, секунды (по умолчанию 30)
+    HTTP_RETRIES        - повторов временных ошибок (по умолчанию 2)
+    HTTP_BACKOFF        - базовая задержка перед повтором, секунды (по умолчанию 0.5)
+"""
+
+import asyncio
+import logging
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional, Union
+
+import aiohttp
+from yarl import URL
+
+from monitoring.metrics import registry, HTTP_REQUEST_DURATION, HTTP_REQUEST_ERRORS, HTTP_REQUEST_RETRIES
+
+logger = logging.getLogger(__name__)
+
+HTTP_POOL_LIMIT = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+HTTP_POOL_PER_HOST = int(os.getenv('HTTP_POOL_PER_HOST', '10'))
+HTTP_DNS_TTL = int(os.getenv('HTTP_DNS_TTL', '300'))
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '2'))
+HTTP_BACKOFF = float(os.getenv('HTTP_BACKOFF', '0.5'))
+
+# Статусы, при которых запрос повторяется
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Методы, которые повторяются без явного указания retries
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+# Максимальная задержка перед повтором (в том числе по Retry-After)
+MAX_RETRY_DELAY = 30.0
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+class HttpClient:
+    """Одна aiohttp-сессия процесса с пулом соединений, повторами и метриками"""
+
+    def __init__(
+        self,
+        limit: int = HTTP_POOL_LIMIT,
+        limit_per_host: int = HTTP_POOL_PER_HOST,
+        dns_ttl: int = HTTP_DNS_TTL,
+        timeout: float = HTTP_TIMEOUT,
+        retries: int = HTTP_RETRIES,
+        backoff: float = HTTP_BACKOFF
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_ttl = dns_ttl
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def start(self) -> aiohttp.ClientSession:
+        """
+        Создать сессию (если ее нет)
+
+        Сессия привязана к циклу событий: в новом цикле (повторный asyncio.run
+        в скриптах) создается новая.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={'User-Agent': USER_AGENT}
+            )
+            self._loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """Закрыть сессию и все соединения пула"""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+    def _retry_delay(self, attempt: int, response: Optional[aiohttp.ClientResponse]) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), MAX_RETRY_DELAY)
+        delay = self.backoff * 2 ** attempt
+        return min(delay + random.uniform(0, self.backoff), MAX_RETRY_DELAY)
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        retries: Optional[int] = None,
+        timeout: Union[float, aiohttp.ClientTimeout, None] = None,
+        **kwargs
+    ) -> AsyncIterator[aiohttp.ClientResponse]:
+        """
+        Выполнить запрос (async with http_client.request(...) as response)
+
+        Временные ошибки повторяются; если повторы закончились, отдается
+        последний ответ (429/5xx) или пробрасывается последняя ошибка.
+
+        Args:
+            method: HTTP-метод
+            url: Адрес
+            retries: Количество повторов (по умолчанию HTTP_RETRIES для GET/HEAD, 0 для остальных)
+            timeout: Таймаут запроса в секундах или aiohttp.ClientTimeout
+            **kwargs: Параметры aiohttp (headers, params, json, data, ssl, ...)
+        """
+        session = await self.start()
+        method = method.upper()
+        if retries is None:
+            retries = self.retries if method in IDEMPOTENT_METHODS else 0
+        if timeout is not None and not isinstance(timeout, aiohttp.ClientTimeout):
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        if timeout is not None:
+            kwargs['timeout'] = timeout
+        host = URL(url).host or 'unknown'
+
+        attempt = 0
+        while True:
+            started = time.monotonic()
+            try:
+                response = await session.request(method, url, **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                registry.inc(HTTP_REQUEST_ERRORS, (host, type(e).__name__))
+                if attempt >= retries:
+                    raise
+                logger.debug(f"{method} {url}: {type(e).__name__}, повтор {attempt + 1}/{retries}")
+                response = None
+            else:
+                registry.observe(HTTP_REQUEST_DURATION, (host, str(response.status)), time.monotonic() - started)
+                if response.status not in RETRY_STATUSES or attempt >= retries:
+                    break
+                logger.debug(f"{method} {url}: статус {response.status}, повтор {attempt + 1}/{retries}")
+                response.release()
+
+            registry.inc(HTTP_REQUEST_RETRIES, (host,))
+            await asyncio.sleep(self._retry_delay(attempt, response))
+            attempt += 1
+
+        try:
+            yield response
+        finally:
+            response.release()
+
+    def get(self, url: str, **kwargs):
+        """GET-запрос (см. request)"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs):
+        """POST-запрос (см. request)"""
+        return self.request('POST', url, **kwargs)
+
+
+# Клиент процесса
+http_client = HttpClient()
@@ -21,6 +21,8 @@ import aiosqlite
 import os
 import logging
 
+from utils.time_formatter import parse_duration
+
 logger = logging.getLogger(__name__)
 DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
 
@@ -34,22 +36,10 @@ def time_to_seconds(time_str: str) -> float:
     - "мм:сс" или "мм:сс.сс" (например, "15:30" или "1:05.34")
     - "ч:мм:сс" или "ч:мм:сс.сс" (например, "1:15:30" или "2:12:00")
     """
-    time_str = str(time_str).strip()
-    parts = time_str.split(':')
-
-    if len(parts) == 1:
-        return float(parts[0].replace(',', '.'))
-    elif len(parts) == 2:
-        minutes = int(parts[0])
-        seconds = float(parts[1].replace(',', '.'))
-        return minutes * 60 + seconds
-    elif len(parts) == 3:
-        hours = int(parts[0])
-        minutes = int(parts[1])
-        seconds = float(parts[2].replace(',', '.'))
-        return hours * 3600 + minutes * 60 + seconds
-    else:
+    seconds = parse_duration(time_str if isinstance(time_str, (int, float)) else str(time_str))
+    if seconds is None:
         raise ValueError(f"Неверный формат времени: {time_str}")
+    return seconds
 
 
 RUNNING_STANDARDS = {
@@ -4,12 +4,10 @@
 """
 
 import asyncio
-import hashlib
-import aiohttp
 import aiosqlite
 import os
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Dict, List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,31 +36,6 @@ SOURCES = {
 DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
 
 
-async def get_page_hash(url: str) -> Optional[str]:
-    """
-    Получает хеш содержимого страницы для отслеживания изменений.
-
-    Args:
-        url: URL страницы с нормативами
-
-    Returns:
-        MD5 хеш содержимого страницы или None при ошибке
-    """
-    try:
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                if response.status == 200:
-                    content = await response.text()
-                    return hashlib.md5(content.encode('utf-8')).hexdigest()
-                else:
-                    logger.warning(f"Не удалось загрузить {url}: статус {response.status}")
-                    return None
-    except Exception as e:
-        logger.error(f"Ошибка при загрузке {url}: {e}")
-        return None
-
-
 async def init_standards_tracking():
     """
     Инициализирует таблицу для отслеживания версий нормативов.
@@ -75,6 +48,8 @@ async def init_standards_tracking():
                 source_url TEXT NOT NULL,
                 last_check_date DATE,
                 content_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
                 last_update_date DATE,
                 version TEXT DEFAULT '2022-2025',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -86,79 +61,36 @@ async def init_standards_tracking():
 
 async def check_standards_updates() -> Dict[str, bool]:
     """
-    Проверяет обновления нормативов на официальных сайтах.
-    Если нормативов в БД нет - возвращает True для загрузки.
+    Проверяет обновления нормативов и сразу применяет изменения.
+
+    Файлы нормативов запрашиваются условными запросами (ETag / Last-Modified):
+    если файл не изменился, он не скачивается и не парсится. Изменившийся файл
+    парсится в отдельном процессе, и в БД записываются только отличия.
+    Если нормативов в БД нет - выполняется первичная загрузка.
 
     Returns:
         Словарь {sport_type: has_updates}
     """
+    from utils.standards_refresh import refresh_standards
+
     await init_standards_tracking()
 
     updates = {}
 
-    async with aiosqlite.connect(DB_PATH) as db:
-        db.row_factory = aiosqlite.Row
-
-        for sport_type, source in SOURCES.items():
-            logger.info(f"Проверка обновлений для {source['name']}...")
-
-            # Проверяем, есть ли уже нормативы в БД для данного вида спорта
-            table_name = f"{sport_type}_standards"
-            async with db.execute(f"SELECT COUNT(*) as cnt FROM {table_name}") as cursor:
-                row = await cursor.fetchone()
-                standards_count = row['cnt'] if row else 0
-
-            # Если нормативов нет в БД - помечаем для первичной загрузки
-            if standards_count == 0:
-                logger.warning(f"⚠️ Нормативы {source['name']} отсутствуют в БД - требуется загрузка")
-                updates[sport_type] = True
-                continue
-
-            # Получаем MD5 хеш текущей версии страницы с нормативами
-            current_hash = await get_page_hash(source['url'])
-            if not current_hash:
-                updates[sport_type] = False
-                continue
-
-            # Получаем сохраненный хеш из БД
-            async with db.execute(
-                "SELECT content_hash, last_check_date FROM standards_tracking WHERE sport_type = ?",
-                (sport_type,)
-            ) as cursor:
-                row = await cursor.fetchone()
-
-            if row:
-                saved_hash = row['content_hash']
-                # Сравниваем хеши - если отличаются, значит нормативы изменились
-                has_update = (saved_hash != current_hash)
-
-                # Обновляем информацию о проверке в БД
-                await db.execute("""
-                    UPDATE standards_tracking
-                    SET content_hash = ?,
-                        last_check_date = date('now'),
-                        last_update_date = CASE WHEN ? THEN date('now') ELSE last_update_date END,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE sport_type = ?
-                """, (current_hash, has_update, sport_type))
-
-                updates[sport_type] = has_update
-
-                if has_update:
-                    logger.warning(f"⚠️ ОБНАРУЖЕНЫ ИЗМЕНЕНИЯ В НОРМАТИВАХ: {source['name']}")
-                else:
-                    logger.info(f"✓ Нормативы {source['name']} актуальны")
-            else:
-                # Первая проверка - сохраняем текущее состояние
-                await db.execute("""
-                    INSERT INTO standards_tracking (sport_type, source_url, content_hash, last_check_date, last_update_date)
-                    VALUES (?, ?, ?, date('now'), date('now'))
-                """, (sport_type, source['url'], current_hash))
-
-                updates[sport_type] = False
-                logger.info(f"✓ Инициализирована отслеживание для {source['name']}")
+    for sport_type, source in SOURCES.items():
+        logger.info(f"Проверка обновлений для {source['name']}...")
+        try:
+            result = await refresh_standards(sport_type)
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении нормативов {source['name']}: {e}")
+            updates[sport_type] = False
+            continue
 
-        await db.commit()
+        updates[sport_type] = result['changed']
+        if result['changed']:
+            logger.warning(f"⚠️ ОБНАРУЖЕНЫ ИЗМЕНЕНИЯ В НОРМАТИВАХ: {source['name']} {result['counts']}")
+        elif result['ok']:
+            logger.info(f"✓ Нормативы {source['name']} актуальны")
 
     return updates
 
@@ -170,9 +102,13 @@ async def get_admin_user_ids() -> List[int]:
     Returns:
         Список user_id администраторов
     """
-    # Здесь можно добавить логику получения администраторов из БД
-    # Пока возвращаем пустой список
-    return []
+    # Администраторы задаются в .env: ADMIN_IDS=123456789,987654321
+    admin_ids = []
+    for value in os.getenv('ADMIN_IDS', '').split(','):
+        value = value.strip()
+        if value.isdigit():
+            admin_ids.append(int(value))
+    return admin_ids
 
 
 async def notify_about_updates(bot, updates: Dict[str, bool]):
@@ -224,49 +160,9 @@ async def daily_standards_check(bot):
     logger.info("Запуск ежедневной проверки обновлений нормативов ЕВСК")
 
     try:
+        # Изменения применяются в БД сразу при проверке
         updates = await check_standards_updates()
 
-        # Автоматическая загрузка новых нормативов при обнаружении изменений
-
-        # Плавание
-        if updates.get('swimming', False):
-            logger.info("Обнаружены изменения в нормативах по плаванию, попытка автоматической загрузки...")
-            try:
-                from utils.swimming_standards_parser import update_swimming_standards
-                success = await update_swimming_standards()
-                if success:
-                    logger.info("✓ Нормативы по плаванию успешно обновлены автоматически")
-                else:
-                    logger.warning("⚠ Не удалось автоматически обновить нормативы по плаванию")
-            except Exception as e:
-                logger.error(f"Ошибка при автоматическом обновлении нормативов по плаванию: {e}")
-
-        # Если есть обновления по бегу, пытаемся автоматически загрузить новые нормативы
-        if updates.get('running', False):
-            logger.info("Обнаружены изменения в нормативах по бегу, попытка автоматической загрузки...")
-            try:
-                from utils.running_standards_parser import update_running_standards
-                success = await update_running_standards()
-                if success:
-                    logger.info("✓ Нормативы по бегу успешно обновлены автоматически")
-                else:
-                    logger.warning("⚠ Не удалось автоматически обновить нормативы по бегу")
-            except Exception as e:
-                logger.error(f"Ошибка при автоматическом обновлении нормативов по бегу: {e}")
-
-        # Если есть обновления по велоспорту, пытаемся автоматически загрузить новые нормативы
-        if updates.get('cycling', False):
-            logger.info("Обнаружены изменения в нормативах по велоспорту, попытка автоматической загрузки...")
-            try:
-                from utils.cycling_standards_parser import update_cycling_standards
-                success = await update_cycling_standards()
-                if success:
-                    logger.info("✓ Нормативы по велоспорту успешно обновлены автоматически")
-                else:
-                    logger.warning("⚠ Не удалось автоматически обновить нормативы по велоспорту")
-            except Exception as e:
-                logger.error(f"Ошибка при автоматическом обновлении нормативов по велоспорту: {e}")
-
         # Если есть обновления, уведомляем администраторов
         if any(updates.values()):
             await notify_about_updates(bot, updates)
@@ -4,7 +4,6 @@
 """
 
 import asyncio
-import aiohttp
 import aiosqlite
 import os
 import logging
@@ -13,6 +12,8 @@ from datetime import datetime
 from typing import Dict, List, Optional
 from io import BytesIO
 
+from utils.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
@@ -76,17 +77,14 @@ async def download_xls_file(url: str) -> Optional[bytes]:
         Содержимое файла в байтах или None при ошибке
     """
     try:
-        # Используем connector без проверки SSL
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
-                if response.status == 200:
-                    content = await response.read()
-                    logger.info(f"Файл успешно загружен: {url} ({len(content)} байт)")
-                    return content
-                else:
-                    logger.error(f"Ошибка загрузки файла {url}: статус {response.status}")
-                    return None
+        async with http_client.get(url, timeout=60, ssl=False) as response:
+            if response.status == 200:
+                content = await response.read()
+                logger.info(f"Файл успешно загружен: {url} ({len(content)} байт)")
+                return content
+            else:
+                logger.error(f"Ошибка загрузки файла {url}: статус {response.status}")
+                return None
     except Exception as e:
         logger.error(f"Ошибка при загрузке файла {url}: {e}")
         return None
@@ -266,6 +264,7 @@ def parse_time_to_seconds(time_str: str) -> Optional[float]:
 async def save_standards_to_db(standards: List[Dict], version: str, effective_date: str, source_url: str):
     """
     Сохраняет нормативы в базу данных.
+    Записываются только отличия от активной версии, смена версии - в той же транзакции.
 
     Args:
         standards: Список нормативов
@@ -273,85 +272,29 @@ async def save_standards_to_db(standards: List[Dict], version: str, effective_da
         effective_date: Дата вступления в силу
         source_url: URL источника
     """
-    async with aiosqlite.connect(DB_PATH) as db:
-        # Проверяем, есть ли уже эта версия
-        async with db.execute(
-            "SELECT id FROM standards_versions WHERE sport_type = 'running' AND version = ?",
-            (version,)
-        ) as cursor:
-            existing = await cursor.fetchone()
-
-        if existing:
-            logger.info(f"Версия {version} уже существует в базе данных")
-            return
-
-        # Деактивируем старые версии
-        await db.execute(
-            "UPDATE standards_versions SET is_active = 0 WHERE sport_type = 'running'"
-        )
-
-        # Добавляем новую версию
-        await db.execute(
-            """
-            INSERT INTO standards_versions (sport_type, version, effective_date, source_url, is_active)
-            VALUES ('running', ?, ?, ?, 1)
-            """,
-            (version, effective_date, source_url)
-        )
-
-        # Сохраняем нормативы
-        for standard in standards:
-            await db.execute(
-                """
-                INSERT OR REPLACE INTO running_standards
-                (distance, gender, rank, time_seconds, version, effective_date)
-                VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    standard['distance'],
-                    standard['gender'],
-                    standard['rank'],
-                    standard['time_seconds'],
-                    version,
-                    effective_date
-                )
-            )
+    from utils.standards_refresh import apply_standards_diff
 
-        await db.commit()
-        logger.info(f"Сохранено {len(standards)} нормативов по бегу версии {version}")
+    await apply_standards_diff('running', standards, version, effective_date, source_url)
 
 
 async def update_running_standards() -> bool:
     """
     Обновляет нормативы по бегу из официального источника.
+    Загрузка, парсинг и запись выполняются инкрементальным конвейером utils.standards_refresh.
 
     Returns:
         True если обновление успешно, False в противном случае
     """
+    from utils.standards_refresh import refresh_standards
+
     logger.info("Начало обновления нормативов по бегу...")
 
     await init_standards_database()
 
-    source = RUNNING_SOURCES['current']
-
-    # Загружаем файл
-    file_content = await download_xls_file(source['url'])
-    if not file_content:
-        logger.error("Не удалось загрузить файл с нормативами по бегу")
-        return False
+    result = await refresh_standards('running', force=True)
 
-    # Парсим файл
-    standards = parse_running_xls(file_content)
-    if not standards:
-        logger.warning("Не удалось извлечь нормативы из файла (возможно, нужно адаптировать парсер)")
-        # Не считаем это критической ошибкой
-        return True
-
-    # Сохраняем в БД
-    await save_standards_to_db(standards, source['version'], source['effective_date'], source['url'])
-
-    logger.info(f"Обновление нормативов по бегу завершено: {len(standards)} нормативов")
-    return True
+    logger.info(f"Обновление нормативов по бегу завершено: {result['counts']}")
+    return result['ok']
 
 
 async def check_for_new_running_standards() -> Optional[Dict]:
@@ -366,26 +309,24 @@ async def check_for_new_running_standards() -> Optional[Dict]:
     page_url = 'https://rusathletics.info'
 
     try:
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.get(page_url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                if response.status != 200:
-                    logger.error(f"Ошибка загрузки страницы: статус {response.status}")
-                    return None
-
-                html = await response.text()
-
-                # Ищем ссылки на XLS файлы с нормативами
-                if 'legkaya_atletika' in html and '.xls' in html:
-                    current_version = RUNNING_SOURCES['current']['version']
-
-                    logger.info(f"Обнаружены документы на странице (текущая версия: {current_version})")
-
-                    return {
-                        'status': 'current',
-                        'version': current_version,
-                        'message': 'Используется актуальная версия нормативов'
-                    }
+        async with http_client.get(page_url, timeout=30, ssl=False) as response:
+            if response.status != 200:
+                logger.error(f"Ошибка загрузки страницы: статус {response.status}")
+                return None
+
+            html = await response.text()
+
+            # Ищем ссылки на XLS файлы с нормативами
+            if 'legkaya_atletika' in html and '.xls' in html:
+                current_version = RUNNING_SOURCES['current']['version']
+
+                logger.info(f"Обнаружены документы на странице (текущая версия: {current_version})")
+
+                return {
+                    'status': 'current',
+                    'version': current_version,
+                    'message': 'Используется актуальная версия нормативов'
+                }
     except Exception as e:
         logger.error(f"Ошибка при проверке обновлений: {e}")
         return None
@@ -0,0 +1,351 @@
+"""
+Инкрементальное обновление нормативов ЕВСК (бег, плавание, велоспорт).
+
+Этапы обновления:
+1. Условный HTTP-запрос (If-None-Match / If-Modified-Since) - файл скачивается только если изменился
+2. Парсинг XLS в отдельном процессе, чтобы pandas не блокировал event loop
+3. Сравнение новых строк с активной версией в таблице нормативов
+4. Применение только изменений и переключение активной версии в одной транзакции -
+   поиск разряда никогда не видит наполовину загруженную таблицу
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Any
+
+import aiosqlite
+
+from utils import running_standards_parser, swimming_standards_parser, cycling_standards_parser
+from utils.http_client import http_client
+
+logger = logging.getLogger(__name__)
+
+DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
+
+# Описание таблиц нормативов: ключевые столбцы и столбцы со значениями
+STANDARDS_TABLES = {
+    'running': {
+        'table': 'running_standards',
+        'key': ('distance', 'gender', 'rank'),
+        'values': ('time_seconds',),
+        'sources': running_standards_parser.RUNNING_SOURCES,
+        'parse': running_standards_parser.parse_running_xls,
+    },
+    'swimming': {
+        'table': 'swimming_standards',
+        'key': ('distance', 'pool_length', 'gender', 'rank'),
+        'values': ('time_seconds',),
+        'sources': swimming_standards_parser.SWIMMING_SOURCES,
+        'parse': swimming_standards_parser.parse_swimming_xls,
+    },
+    'cycling': {
+        'table': 'cycling_standards',
+        'key': ('distance', 'discipline', 'gender', 'rank'),
+        'values': ('time_seconds', 'place'),
+        'sources': cycling_standards_parser.CYCLING_SOURCES,
+        'parse': cycling_standards_parser.parse_cycling_xls,
+    },
+}
+
+
+async def init_refresh_tracking():
+    """
+    Создает таблицу отслеживания источников и добавляет столбцы для условных запросов
+    """
+    from utils.qualifications_checker import init_standards_tracking
+
+    await init_standards_tracking()
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute("PRAGMA table_info(standards_tracking)") as cursor:
+            columns = {row[1] for row in await cursor.fetchall()}
+        for column in ('etag', 'last_modified'):
+            if column not in columns:
+                await db.execute(f"ALTER TABLE standards_tracking ADD COLUMN {column} TEXT")
+        await db.commit()
+
+
+async def _get_tracking(sport_type: str) -> Dict[str, Any]:
+    """Сохраненные ETag, Last-Modified и хеш файла для вида спорта"""
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            "SELECT etag, last_modified, content_hash FROM standards_tracking WHERE sport_type = ?",
+            (sport_type,)
+        ) as cursor:
+            row = await cursor.fetchone()
+    return dict(row) if row else {}
+
+
+async def _save_tracking(
+    sport_type: str,
+    source_url: str,
+    etag: Optional[str],
+    last_modified: Optional[str],
+    content_hash: Optional[str],
+    changed: bool
+):
+    """Сохраняет результат проверки источника"""
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("""
+            INSERT INTO standards_tracking
+                (sport_type, source_url, etag, last_modified, content_hash, last_check_date, last_update_date)
+            VALUES (?, ?, ?, ?, ?, date('now'), date('now'))
+            ON CONFLICT(sport_type) DO UPDATE SET
+                source_url = excluded.source_url,
+                etag = COALESCE(excluded.etag, standards_tracking.etag),
+                last_modified = COALESCE(excluded.last_modified, standards_tracking.last_modified),
+                content_hash = COALESCE(excluded.content_hash, standards_tracking.content_hash),
+                last_check_date = date('now'),
+                last_update_date = CASE WHEN ? THEN date('now') ELSE standards_tracking.last_update_date END,
+                updated_at = CURRENT_TIMESTAMP
+        """, (sport_type, source_url, etag, last_modified, content_hash, changed))
+        await db.commit()
+
+
+async def fetch_if_modified(
+    url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None
+) -> Tuple[int, Optional[bytes], Optional[str], Optional[str]]:
+    """
+    Условный GET: файл передается только если изменился с прошлой загрузки
+
+    Returns:
+        (HTTP статус, содержимое или None, ETag, Last-Modified). Статус 0 - сетевая ошибка
+    """
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    try:
+        async with http_client.get(url, headers=headers, timeout=60, ssl=False) as response:
+            new_etag = response.headers.get('ETag')
+            new_last_modified = response.headers.get('Last-Modified')
+            if response.status == 200:
+                return 200, await response.read(), new_etag, new_last_modified
+            return response.status, None, new_etag, new_last_modified
+    except Exception as e:
+        logger.error(f"Ошибка при загрузке {url}: {e}")
+        return 0, None, None, None
+
+
+def _row_key(row: Dict, key_columns: Tuple[str, ...]) -> tuple:
+    """Ключ строки норматива (дистанция округляется, чтобы float не ломал сравнение)"""
+    return tuple(round(row[c], 3) if c == 'distance' else row[c] for c in key_columns)
+
+
+def diff_standards(
+    current: Dict[tuple, tuple],
+    new_rows: List[Dict],
+    key_columns: Tuple[str, ...],
+    value_columns: Tuple[str, ...]
+) -> Dict[str, List]:
+    """
+    Сравнивает новые нормативы с текущими
+
+    Args:
+        current: Текущие нормативы {ключ: значения}
+        new_rows: Новые нормативы из файла
+        key_columns: Ключевые столбцы
+        value_columns: Столбцы со значениями
+
+    Returns:
+        {'insert': [(ключ, значения)], 'update': [(ключ, значения)], 'delete': [ключ]}
+    """
+    incoming = {}
+    for row in new_rows:
+        incoming[_row_key(row, key_columns)] = tuple(row.get(c) for c in value_columns)
+
+    return {
+        'insert': [(k, v) for k, v in incoming.items() if k not in current],
+        'update': [(k, v) for k, v in incoming.items() if k in current and current[k] != v],
+        'delete': [k for k in current if k not in incoming],
+    }
+
+
+async def apply_standards_diff(
+    sport_type: str,
+    new_rows: List[Dict],
+    version: str,
+    effective_date: str,
+    source_url: Optional[str] = None,
+    file_hash: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Применяет изменения нормативов и переключает активную версию одной транзакцией.
+
+    Если версия новая, неизмененные строки копируются из активной версии средствами SQL,
+    а из Python записываются только отличия.
+
+    Returns:
+        Количество вставленных, обновленных и удаленных строк и признак смены версии
+    """
+    config = STANDARDS_TABLES[sport_type]
+    table = config['table']
+    key_columns = config['key']
+    value_columns = config['values']
+    data_columns = key_columns + value_columns
+    key_where = " AND ".join(
+        f"ROUND({c}, 3) = ?" if c == 'distance' else f"{c} = ?" for c in key_columns
+    )
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            async with db.execute(
+                "SELECT version FROM standards_versions WHERE sport_type = ? AND is_active = 1",
+                (sport_type,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            active_version = row[0] if row else None
+
+            if version != active_version:
+                await db.execute("""
+                    INSERT INTO standards_versions (sport_type, version, effective_date, source_url, is_active)
+                    VALUES (?, ?, ?, ?, 0)
+                    ON CONFLICT(sport_type, version) DO NOTHING
+                """, (sport_type, version, effective_date, source_url))
+                # Версия могла быть загружена раньше и деактивирована - начинаем с чистого листа
+                await db.execute(f"DELETE FROM {table} WHERE version = ?", (version,))
+                if active_version:
+                    columns_sql = ", ".join(data_columns)
+                    await db.execute(f"""
+                        INSERT INTO {table} ({columns_sql}, version, effective_date)
+                        SELECT {columns_sql}, ?, ? FROM {table} WHERE version = ?
+                    """, (version, effective_date, active_version))
+
+            async with db.execute(
+                f"SELECT {', '.join(data_columns)} FROM {table} WHERE version = ?",
+                (version,)
+            ) as cursor:
+                current = {}
+                for r in await cursor.fetchall():
+                    values = dict(zip(data_columns, r))
+                    current[_row_key(values, key_columns)] = tuple(values[c] for c in value_columns)
+
+            changes = diff_standards(current, new_rows, key_columns, value_columns)
+
+            if changes['delete']:
+                await db.executemany(
+                    f"DELETE FROM {table} WHERE version = ? AND {key_where}",
+                    [(version, *k) for k in changes['delete']]
+                )
+            if changes['update']:
+                set_sql = ", ".join(f"{c} = ?" for c in value_columns)
+                await db.executemany(
+                    f"UPDATE {table} SET {set_sql}, updated_at = CURRENT_TIMESTAMP WHERE version = ? AND {key_where}",
+                    [(*v, version, *k) for k, v in changes['update']]
+                )
+            if changes['insert']:
+                placeholders = ", ".join("?" for _ in data_columns)
+                await db.executemany(
+                    f"INSERT INTO {table} ({', '.join(data_columns)}, version, effective_date) "
+                    f"VALUES ({placeholders}, ?, ?)",
+                    [(*k, *v, version, effective_date) for k, v in changes['insert']]
+                )
+
+            # Переключение активной версии - в той же транзакции, что и данные
+            await db.execute("""
+                UPDATE standards_versions
+                SET is_active = CASE WHEN version = ? THEN 1 ELSE 0 END,
+                    file_hash = CASE WHEN version = ? THEN COALESCE(?, file_hash) ELSE file_hash END
+                WHERE sport_type = ?
+            """, (version, version, file_hash, sport_type))
+
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+    counts = {name: len(rows) for name, rows in changes.items()}
+    counts['switched'] = int(version != active_version)
+    logger.info(
+        f"Нормативы {sport_type} ({version}): +{counts['insert']} ~{counts['update']} -{counts['delete']}"
+    )
+    return counts
+
+
+# Процесс для парсинга XLS (создается при первом парсинге и используется повторно)
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+async def _parse_in_worker(sport_type: str, content: bytes) -> List[Dict]:
+    """Парсит XLS в отдельном процессе"""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=1)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_parse_pool, STANDARDS_TABLES[sport_type]['parse'], content)
+
+
+async def refresh_standards(sport_type: str, force: bool = False) -> Dict[str, Any]:
+    """
+    Проверяет источник нормативов и применяет изменения
+
+    Args:
+        sport_type: 'running', 'swimming' или 'cycling'
+        force: Игнорировать ETag/Last-Modified и хеш (принудительная загрузка)
+
+    Returns:
+        {'ok': bool, 'changed': bool, 'counts': {...}}
+    """
+    config = STANDARDS_TABLES[sport_type]
+    source = config['sources']['current']
+
+    await init_refresh_tracking()
+    tracking = {} if force else await _get_tracking(sport_type)
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            "SELECT COUNT(*) FROM standards_versions WHERE sport_type = ? AND is_active = 1",
+            (sport_type,)
+        ) as cursor:
+            has_active = (await cursor.fetchone())[0] > 0
+    if not has_active:
+        # Нормативов нет - загружаем файл целиком, без условных заголовков
+        tracking = {}
+
+    status, content, etag, last_modified = await fetch_if_modified(
+        source['url'], tracking.get('etag'), tracking.get('last_modified')
+    )
+
+    if status == 304:
+        logger.info(f"✓ Нормативы {sport_type} не изменились (304 Not Modified)")
+        await _save_tracking(sport_type, source['url'], etag, last_modified, None, False)
+        return {'ok': True, 'changed': False, 'counts': {}}
+
+    if status != 200:
+        if sport_type == 'cycling' and not has_active:
+            # Для велоспорта есть упрощенные нормативы на случай недоступности файла
+            rows = cycling_standards_parser.get_default_cycling_standards()
+            counts = await apply_standards_diff(
+                sport_type, rows, source['version'], source['effective_date'], source['url']
+            )
+            return {'ok': True, 'changed': True, 'counts': counts}
+        logger.warning(f"Не удалось загрузить нормативы {sport_type}: статус {status}")
+        return {'ok': False, 'changed': False, 'counts': {}}
+
+    content_hash = hashlib.md5(content).hexdigest()
+    if has_active and content_hash == tracking.get('content_hash'):
+        logger.info(f"✓ Нормативы {sport_type} не изменились (хеш совпадает)")
+        await _save_tracking(sport_type, source['url'], etag, last_modified, content_hash, False)
+        return {'ok': True, 'changed': False, 'counts': {}}
+
+    rows = await _parse_in_worker(sport_type, content)
+    if not rows:
+        logger.warning(f"Не удалось извлечь нормативы {sport_type} из файла (возможно, нужно адаптировать парсер)")
+        # ETag, Last-Modified и хеш этого файла не сохраняются - иначе следующая проверка его пропустит
+        await _save_tracking(sport_type, source['url'], None, None, None, False)
+        return {'ok': False, 'changed': False, 'counts': {}}
+
+    counts = await apply_standards_diff(
+        sport_type, rows, source['version'], source['effective_date'], source['url'], content_hash
+    )
+    changed = any(counts.values())
+    await _save_tracking(sport_type, source['url'], etag, last_modified, content_hash, changed)
+    return {'ok': True, 'changed': changed, 'counts': counts}
@@ -4,7 +4,6 @@
 """
 
 import asyncio
-import aiohttp
 import aiosqlite
 import os
 import logging
@@ -14,6 +13,8 @@ from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from io import BytesIO
 
+from utils.http_client import http_client
+
 logger = logging.getLogger(__name__)
 
 DB_PATH = os.getenv('DB_PATH', 'database.sqlite')
@@ -78,17 +79,14 @@ async def download_xls_file(url: str) -> Optional[bytes]:
         Содержимое файла в байтах или None при ошибке
     """
     try:
-        # Используем connector без проверки SSL
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as response:
-                if response.status == 200:
-                    content = await response.read()
-                    logger.info(f"Файл успешно загружен: {url} ({len(content)} байт)")
-                    return content
-                else:
-                    logger.error(f"Ошибка загрузки файла {url}: статус {response.status}")
-                    return None
+        async with http_client.get(url, timeout=60, ssl=False) as response:
+            if response.status == 200:
+                content = await response.read()
+                logger.info(f"Файл успешно загружен: {url} ({len(content)} байт)")
+                return content
+            else:
+                logger.error(f"Ошибка загрузки файла {url}: статус {response.status}")
+                return None
     except Exception as e:
         logger.error(f"Ошибка при загрузке файла {url}: {e}")
         return None
@@ -194,95 +192,40 @@ def parse_time_to_seconds(time_str: str) -> Optional[float]:
         return None
 
 
-async def save_standards_to_db(standards: List[Dict], version: str, effective_date: str):
+async def save_standards_to_db(standards: List[Dict], version: str, effective_date: str, source_url: Optional[str] = None):
     """
     Сохраняет нормативы в базу данных.
+    Записываются только отличия от активной версии, смена версии - в той же транзакции.
 
     Args:
         standards: Список нормативов
         version: Версия нормативов
         effective_date: Дата вступления в силу
+        source_url: URL источника
     """
-    async with aiosqlite.connect(DB_PATH) as db:
-        # Проверяем, есть ли уже эта версия
-        async with db.execute(
-            "SELECT id FROM standards_versions WHERE sport_type = 'swimming' AND version = ?",
-            (version,)
-        ) as cursor:
-            existing = await cursor.fetchone()
-
-        if existing:
-            logger.info(f"Версия {version} уже существует в базе данных")
-            return
-
-        # Деактивируем старые версии
-        await db.execute(
-            "UPDATE standards_versions SET is_active = 0 WHERE sport_type = 'swimming'"
-        )
-
-        # Добавляем новую версию
-        await db.execute(
-            """
-            INSERT INTO standards_versions (sport_type, version, effective_date, is_active)
-            VALUES ('swimming', ?, ?, 1)
-            """,
-            (version, effective_date)
-        )
-
-        # Сохраняем нормативы
-        for standard in standards:
-            await db.execute(
-                """
-                INSERT OR REPLACE INTO swimming_standards
-                (distance, pool_length, gender, rank, time_seconds, version, effective_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    standard['distance'],
-                    standard['pool_length'],
-                    standard['gender'],
-                    standard['rank'],
-                    standard['time_seconds'],
-                    version,
-                    effective_date
-                )
-            )
+    from utils.standards_refresh import apply_standards_diff
 
-        await db.commit()
-        logger.info(f"Сохранено {len(standards)} нормативов версии {version}")
+    await apply_standards_diff('swimming', standards, version, effective_date, source_url)
 
 
 async def update_swimming_standards() -> bool:
     """
     Обновляет нормативы по плаванию из официального источника.
+    Загрузка, парсинг и запись выполняются инкрементальным конвейером utils.standards_refresh.
 
     Returns:
         True если обновление успешно, False в противном случае
     """
+    from utils.standards_refresh import refresh_standards
+
     logger.info("Начало обновления нормативов по плаванию...")
 
     await init_standards_database()
 
-    source = SWIMMING_SOURCES['current']
-
-    # Загружаем файл
-    file_content = await download_xls_file(source['url'])
-    if not file_content:
-        logger.error("Не удалось загрузить файл с нормативами")
-        return False
-
-    # Парсим файл
-    standards = parse_swimming_xls(file_content)
-    if not standards:
-        logger.warning("Не удалось извлечь нормативы из файла (возможно, нужно адаптировать парсер)")
-        # Не считаем это ошибкой, так как структура файла может быть сложной
-        # Просто записываем, что файл был обработан
-
-    # Сохраняем в БД
-    await save_standards_to_db(standards, source['version'], source['effective_date'])
+    result = await refresh_standards('swimming', force=True)
 
-    logger.info("Обновление нормативов по плаванию завершено")
-    return True
+    logger.info(f"Обновление нормативов по плаванию завершено: {result['counts']}")
+    return result['ok']
 
 
 async def check_for_new_swimming_standards() -> Optional[Dict]:
@@ -298,32 +241,30 @@ async def check_for_new_swimming_standards() -> Optional[Dict]:
     page_url = 'https://www.russwimming.ru/documents/players/evsk/'
 
     try:
-        connector = aiohttp.TCPConnector(ssl=False)
-        async with aiohttp.ClientSession(connector=connector) as session:
-            async with session.get(page_url, timeout=aiohttp.ClientTimeout(total=30)) as response:
-                if response.status != 200:
-                    logger.error(f"Ошибка загрузки страницы: статус {response.status}")
-                    return None
-
-                html = await response.text()
-
-                # Ищем ссылки на XLS файлы с нормативами
-                # Простой поиск по ключевым словам
-                if 'plavanie' in html and '.xls' in html:
-                    # Извлекаем дату из названия файла
-                    # Например: "plavanie_dejstvuyut_c_26_noyabrya_2024_g"
-
-                    # Проверяем, отличается ли от текущей версии
-                    current_version = SWIMMING_SOURCES['current']['version']
-
-                    logger.info(f"Обнаружены документы на странице (текущая версия: {current_version})")
-
-                    # Здесь можно добавить более сложную логику сравнения версий
-                    return {
-                        'status': 'current',
-                        'version': current_version,
-                        'message': 'Используется актуальная версия нормативов'
-                    }
+        async with http_client.get(page_url, timeout=30, ssl=False) as response:
+            if response.status != 200:
+                logger.error(f"Ошибка загрузки страницы: статус {response.status}")
+                return None
+
+            html = await response.text()
+
+            # Ищем ссылки на XLS файлы с нормативами
+            # Простой поиск по ключевым словам
+            if 'plavanie' in html and '.xls' in html:
+                # Извлекаем дату из названия файла
+                # Например: "plavanie_dejstvuyut_c_26_noyabrya_2024_g"
+
+                # Проверяем, отличается ли от текущей версии
+                current_version = SWIMMING_SOURCES['current']['version']
+
+                logger.info(f"Обнаружены документы на странице (текущая версия: {current_version})")
+
+                # Здесь можно добавить более сложную логику сравнения версий
+                return {
+                    'status': 'current',
+                    'version': current_version,
+                    'message': 'Используется актуальная версия нормативов'
+                }
     except Exception as e:
         logger.error(f"Ошибка при проверке обновлений: {e}")
         return None
@@ -2,7 +2,63 @@
 Утилита для форматирования и нормализации времени результатов
 """
 import re
-from typing import Optional
+from typing import Optional, Union
+
+
+def parse_duration(value: Union[str, int, float, None]) -> Optional[float]:
+    """
+    Единый парсер длительности (результаты, целевое время, рекорды, темп)
+
+    Поддерживаемые форматы: "сс.сс", "мм:сс", "мм:сс.сс", "ч:мм:сс", "ч:мм:сс.сс"
+    (десятичный разделитель - точка или запятая). Та же логика в SQL -
+    database.models.duration_sql, по ней заполняются колонки *_seconds.
+
+    Args:
+        value: Строка времени или уже посчитанные секунды
+
+    Returns:
+        Длительность в секундах или None, если строку не удалось разобрать
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    parts = value.strip().replace(',', '.').split(':')
+    if len(parts) > 3 or not parts[0]:
+        return None
+
+    total = 0.0
+    for part in parts[:-1]:
+        if not part.isdigit():
+            return None
+        total = total * 60 + int(part)
+
+    seconds = parts[-1]
+    whole, _, fraction = seconds.partition('.')
+    if not whole.isdigit() or (fraction and not fraction.isdigit()):
+        return None
+    return total * 60 + float(seconds)
+
+
+def format_duration(seconds: Optional[float]) -> Optional[str]:
+    """
+    Форматировать длительность в H:MM:SS / M:SS (с сотыми, если они есть)
+
+    Args:
+        seconds: Длительность в секундах
+
+    Returns:
+        Строка времени или None
+    """
+    if seconds is None:
+        return None
+    hundredths = int(round(seconds * 100))
+    whole, hundredths = divmod(hundredths, 100)
+    result = seconds_to_time_str(whole)
+    if hundredths:
+        result += f".{hundredths:02d}"
+    return result
 
 
 def normalize_time(time_str: str) -> str:
@@ -113,30 +169,7 @@ def parse_time_to_seconds(time_str: str) -> Optional[float]:
     if not validate_time_format(time_str):
         return None
 
-    time_str = time_str.strip()
-
-    hundredths = 0.0
-    if '.' in time_str:
-        time_str, hundredths_str = time_str.split('.')
-        try:
-            hundredths_str = hundredths_str.ljust(2, '0')[:2]
-            hundredths = int(hundredths_str) / 100.0
-        except ValueError:
-            return None
-
-    parts = time_str.split(':')
-
-    try:
-        if len(parts) == 3:
-            hours, minutes, seconds = map(int, parts)
-            return hours * 3600 + minutes * 60 + seconds + hundredths
-        elif len(parts) == 2:
-            minutes, seconds = map(int, parts)
-            return minutes * 60 + seconds + hundredths
-    except ValueError:
-        return None
-
-    return None
+    return parse_duration(time_str)
 
 
 def seconds_to_time_str(seconds: int) -> str:
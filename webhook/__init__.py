@@ -0,0 +1,5 @@
+"""
+Режим webhook (BOT_MODE=webhook)
+Фронтовой процесс принимает обновления от Telegram и распределяет их
+по процессам-воркерам по ID пользователя
+"""
@@ -0,0 +1,220 @@
+"""
+Фронтовой процесс режима webhook
+
+Принимает обновления от Telegram (aiohttp), проверяет секретный токен и кладет
+обновление в очередь воркера по ID пользователя (user_id % WEBHOOK_WORKERS),
+поэтому обновления одного пользователя всегда обрабатываются одним воркером
+и по порядку. Ответ Telegram отправляется сразу после постановки в очередь.
+
+Переменные окружения:
+    WEBHOOK_URL     - публичный адрес (https://example.com), к нему добавляется WEBHOOK_PATH
+    WEBHOOK_PATH    - путь для обновлений (по умолчанию /webhook)
+    WEBHOOK_SECRET  - секретный токен (заголовок X-Telegram-Bot-Api-Secret-Token)
+    WEBHOOK_HOST    - адрес для прослушивания (по умолчанию 0.0.0.0)
+    WEBHOOK_PORT    - порт (по умолчанию 8080)
+    WEBHOOK_WORKERS - количество воркеров (по умолчанию число CPU)
+
+Служебные endpoint'ы доступны только на METRICS_HOST:METRICS_PORT (по умолчанию
+127.0.0.1, без METRICS_PORT не запускаются), а не на публичном WEBHOOK_HOST:
+    GET /workers - очередь и состояние каждого воркера (JSON)
+    GET /metrics - метрики фронтового процесса с глубиной очередей (Prometheus)
+"""
+
+import asyncio
+import hmac
+import logging
+import multiprocessing
+import os
+from typing import Any, Dict, List
+
+from monitoring.metrics import registry, WORKER_QUEUE_DEPTH
+from webhook.worker import run_worker, add_to_counter
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+WEBHOOK_HOST = os.getenv('WEBHOOK_HOST', '0.0.0.0')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8080'))
+
+# Как часто проверять, что процессы-воркеры живы
+WORKER_CHECK_SECONDS = 5
+WORKER_STOP_TIMEOUT = 30
+
+
+def get_shard_key(update: Dict[str, Any]) -> int:
+    """
+    Ключ шарда обновления - ID пользователя (или чата), 0 если его нет
+
+    Args:
+        update: JSON обновления Telegram
+
+    Returns:
+        ID пользователя
+    """
+    for field, event in update.items():
+        if field == 'update_id' or not isinstance(event, dict):
+            continue
+        for owner_field in ('from', 'user', 'chat'):
+            owner = event.get(owner_field)
+            if isinstance(owner, dict) and 'id' in owner:
+                return owner['id']
+        # У остальных событий (poll и т.п.) пользователя нет
+        return 0
+    return 0
+
+
+class WorkerHandle:
+    """Процесс-воркер и его очередь"""
+
+    def __init__(self, context, index: int, workers: int, bot_token: str):
+        self.context = context
+        self.index = index
+        self.workers = workers
+        self.bot_token = bot_token
+        self.queue = context.Queue()
+        self.pending = context.Value('i', 0)
+        self.process = None
+
+    def start(self) -> None:
+        self.process = self.context.Process(
+            target=run_worker,
+            args=(self.index, self.workers, self.bot_token, self.queue, self.pending),
+            name=f"bot-worker-{self.index}",
+            daemon=True
+        )
+        self.process.start()
+
+    def restart(self) -> None:
+        """
+        Перезапустить упавший процесс
+
+        Обновления, которые процесс взял из очереди, потеряны вместе с ним,
+        поэтому счетчик сбрасывается до числа обновлений, оставшихся в очереди.
+        """
+        try:
+            queued = self.queue.qsize()
+        except NotImplementedError:
+            # qsize не поддерживается на macOS
+            queued = 0
+        with self.pending.get_lock():
+            self.pending.value = queued
+        self.start()
+
+    def put(self, key: int, update: Dict[str, Any]) -> None:
+        add_to_counter(self.pending, 1)
+        self.queue.put((key, update))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'worker': self.index,
+            'pid': self.process.pid if self.process else None,
+            'alive': bool(self.process and self.process.is_alive()),
+            'pending': self.pending.value
+        }
+
+
+async def _watch_workers(handles: List[WorkerHandle]) -> None:
+    """Перезапускать упавшие воркеры (их очередь и шард сохраняются)"""
+    while True:
+        await asyncio.sleep(WORKER_CHECK_SECONDS)
+        for handle in handles:
+            if not handle.process.is_alive():
+                logger.error(
+                    f"Воркер {handle.index} завершился с кодом {handle.process.exitcode}, перезапуск"
+                )
+                handle.restart()
+
+
+async def run_webhook(bot_token: str) -> None:
+    """
+    Запустить бота в режиме webhook с несколькими процессами-воркерами
+
+    Args:
+        bot_token: Токен бота
+    """
+    from aiohttp import web
+    from aiogram import Bot
+
+    from main import create_dispatcher, prepare_database
+    from monitoring.metrics_handlers import METRICS_HOST
+
+    base_url = os.getenv('WEBHOOK_URL')
+    if not base_url:
+        logger.error("WEBHOOK_URL не задан для режима webhook!")
+        return
+
+    secret = os.getenv('WEBHOOK_SECRET', '')
+    workers = int(os.getenv('WEBHOOK_WORKERS') or os.cpu_count() or 1)
+
+    # Миграции и очистка выполняются один раз, до запуска воркеров
+    await prepare_database()
+
+    context = multiprocessing.get_context('spawn')
+    handles = [WorkerHandle(context, index, workers, bot_token) for index in range(workers)]
+    for handle in handles:
+        handle.start()
+
+    async def update_handler(request):
+        if secret and not hmac.compare_digest(
+            request.headers.get('X-Telegram-Bot-Api-Secret-Token', ''), secret
+        ):
+            return web.Response(status=401)
+
+        update = await request.json()
+        key = get_shard_key(update)
+        handles[key % workers].put(key, update)
+        return web.Response()
+
+    async def workers_handler(request):
+        return web.json_response([handle.stats() for handle in handles])
+
+    async def metrics_handler(request):
+        for handle in handles:
+            registry.set(WORKER_QUEUE_DEPTH, (str(handle.index),), handle.pending.value)
+        return web.Response(text=registry.to_prometheus(), content_type='text/plain')
+
+    app = web.Application()
+    app.router.add_post(WEBHOOK_PATH, update_handler)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+
+    # Очереди и метрики - только на локальном адресе, не на публичном порту webhook
+    metrics_runner = None
+    metrics_port = os.getenv('METRICS_PORT')
+    if metrics_port:
+        metrics_app = web.Application()
+        metrics_app.router.add_get('/workers', workers_handler)
+        metrics_app.router.add_get('/metrics', metrics_handler)
+
+        metrics_runner = web.AppRunner(metrics_app, access_log=None)
+        await metrics_runner.setup()
+        await web.TCPSite(metrics_runner, METRICS_HOST, int(metrics_port)).start()
+        logger.info(f"Очереди воркеров доступны на http://{METRICS_HOST}:{metrics_port}/workers")
+
+    bot = Bot(token=bot_token)
+    watcher = asyncio.create_task(_watch_workers(handles))
+    try:
+        await bot.set_webhook(
+            base_url.rstrip('/') + WEBHOOK_PATH,
+            secret_token=secret or None,
+            allowed_updates=create_dispatcher().resolve_used_update_types()
+        )
+        logger.info(f"Бот запущен в режиме webhook: {workers} воркеров, порт {WEBHOOK_PORT}")
+        await asyncio.Event().wait()
+    finally:
+        watcher.cancel()
+        await runner.cleanup()
+        if metrics_runner:
+            await metrics_runner.cleanup()
+        await bot.session.close()
+
+        # Воркеры дорабатывают уже полученные обновления и завершаются
+        for handle in handles:
+            handle.queue.put(None)
+        loop = asyncio.get_running_loop()
+        for handle in handles:
+            await loop.run_in_executor(None, handle.process.join, WORKER_STOP_TIMEOUT)
+            if handle.process.is_alive():
+                handle.process.terminate()
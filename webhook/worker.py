@@ -0,0 +1,115 @@
+"""
+Процесс-воркер режима webhook
+
+Воркер получает обновления из своей очереди (туда попадают только пользователи
+его шарда) и передает их в собственный диспетчер. Обновления разных
+пользователей обрабатываются конкурентно, обновления одного пользователя -
+строго по порядку: задача следующего обновления ждет завершения предыдущего.
+
+Фоновые задачи распределены между воркерами (start_background_jobs),
+поэтому каждая выполняется ровно в одном процессе.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Как часто воркер перечитывает снимки рейтингов, обновленные другими процессами
+LEADERBOARD_REFRESH_SECONDS = float(os.getenv('LEADERBOARD_REFRESH_SECONDS', '60'))
+
+
+def add_to_counter(counter, amount: int) -> None:
+    """Изменить общий между процессами счетчик (multiprocessing.Value)"""
+    with counter.get_lock():
+        counter.value += amount
+
+
+async def _process_update(dp, bot, data: Dict[str, Any], previous: Optional[asyncio.Task], pending) -> None:
+    """Обработать обновление после завершения предыдущего обновления того же пользователя"""
+    from aiogram.types import Update
+
+    try:
+        if previous is not None:
+            # Ошибка предыдущего обновления уже залогирована - ждем только завершения
+            await asyncio.wait([previous])
+
+        update = Update.model_validate(data, context={'bot': bot})
+        await dp.feed_update(bot, update)
+    except Exception as e:
+        logger.exception(f"Ошибка при обработке обновления {data.get('update_id')}: {e}")
+    finally:
+        add_to_counter(pending, -1)
+
+
+async def _worker_main(index: int, workers: int, bot_token: str, queue, pending) -> None:
+    from aiogram import Bot
+
+    from main import create_dispatcher, start_background_jobs
+    from monitoring.loop_watchdog import start_loop_watchdog
+    from monitoring.metrics_handlers import start_metrics_server
+    from ratings.leaderboard import load_leaderboards, schedule_leaderboard_refresh
+    from utils.http_client import http_client
+
+    bot = Bot(token=bot_token)
+    dp = create_dispatcher()
+
+    await load_leaderboards()
+    await http_client.start()
+    start_background_jobs(bot, index, workers)
+    start_loop_watchdog()
+    if workers > 1:
+        asyncio.create_task(schedule_leaderboard_refresh(LEADERBOARD_REFRESH_SECONDS))
+
+    # Метрики воркера - на METRICS_PORT + 1 + номер воркера
+    metrics_port = os.getenv('METRICS_PORT')
+    metrics_runner = await start_metrics_server(int(metrics_port) + 1 + index if metrics_port else None)
+
+    logger.info(f"Воркер {index + 1}/{workers} запущен (pid {os.getpid()})")
+
+    # Последняя задача каждого пользователя - следующая ждет ее завершения
+    tails: Dict[int, asyncio.Task] = {}
+
+    def release(key: int, task: asyncio.Task) -> None:
+        if tails.get(key) is task:
+            del tails[key]
+
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            item = await loop.run_in_executor(None, queue.get)
+            if item is None:
+                break
+
+            key, data = item
+            task = asyncio.create_task(_process_update(dp, bot, data, tails.get(key), pending))
+            tails[key] = task
+            task.add_done_callback(lambda done, key=key: release(key, done))
+
+        if tails:
+            await asyncio.wait(list(tails.values()))
+    finally:
+        if metrics_runner:
+            await metrics_runner.cleanup()
+        await http_client.close()
+        await bot.session.close()
+        logger.info(f"Воркер {index + 1}/{workers} остановлен")
+
+
+def run_worker(index: int, workers: int, bot_token: str, queue, pending) -> None:
+    """
+    Точка входа процесса-воркера
+
+    Args:
+        index: Номер воркера (0..workers-1)
+        workers: Количество воркеров
+        bot_token: Токен бота
+        queue: Очередь обновлений (кортежи (ключ шарда, JSON обновления); None - остановка)
+        pending: Счетчик обновлений воркера в очереди и в обработке
+    """
+    try:
+        asyncio.run(_worker_main(index, workers, bot_token, queue, pending))
+    except KeyboardInterrupt:
+        pass